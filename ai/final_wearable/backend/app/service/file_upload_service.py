@@ -5,7 +5,7 @@ from app.core.unzipper import extract_zip_to_temp
 from app.core.db_to_json import db_to_json
 from app.core.db_parser import parse_db_json_to_raw_data
 
-from app.utils.preprocess import preprocess_health_json
+from app.utils.preprocess import preprocess_health_json_batch
 from app.core.vector_store import save_daily_summary
 from app.core.llm_analysis import run_llm_analysis
 
@@ -61,8 +61,10 @@ class FileUploadService:
                     500, "DB Parser가 건강 데이터를 추출하지 못했습니다."
                 )
 
-            # 6) raw → Summary 생성 (정규화됨)
-            summary = preprocess_health_json(raw_data_for_llm)
+            # 6) raw → Summary 생성 (정규화됨, 배치 API 사용)
+            # (이 버전의 db_parser는 최신 1일치 raw만 반환)
+            summaries = preprocess_health_json_batch({"latest": raw_data_for_llm})
+            summary = summaries["latest"]
 
         except HTTPException:
             raise
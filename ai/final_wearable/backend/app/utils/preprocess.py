@@ -1,7 +1,10 @@
 import math
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from app.utils.platform_detection import detect_platform
 
+# 1970-01-01의 proleptic ordinal (epoch day + 이 값 = date ordinal)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
 
 def normalize_raw(raw_json: dict) -> dict:
     """
@@ -228,3 +231,33 @@ def preprocess_health_json(raw_json: dict) -> dict:
         "summary_text": summary_text,  # LLM 요약용
         "raw": raw_norm,  # 핵심: 정규화된 원본 수치
     }
+
+
+def preprocess_health_json_batch(raw_by_day: dict) -> dict:
+    """
+    여러 raw를 한 번에 전처리 → {key: summary}
+
+    - key가 Epoch Day(int)면 created_at을 해당 날짜로 설정
+      (datetime 연산 대신 EPOCH_ORDINAL 오프셋으로 계산)
+    - 그 외 key는 preprocess_health_json과 같이 현재 시간 사용
+    - 항목별 로그 대신 요약 1줄만 출력
+    """
+    now_iso = datetime.now(timezone.utc).isoformat()
+    summaries = {}
+
+    for key, raw_json in raw_by_day.items():
+        if isinstance(key, int) and 0 <= key < 100000:
+            day = date.fromordinal(EPOCH_ORDINAL + key)
+            created_at = f"{day.isoformat()}T00:00:00+00:00"
+        else:
+            created_at = now_iso
+
+        raw_norm = normalize_raw(raw_json)
+        summaries[key] = {
+            "created_at": created_at,
+            "summary_text": build_summary_text(raw_norm),
+            "raw": raw_norm,
+        }
+
+    print(f"[INFO] 배치 전처리 완료: {len(summaries)}건")
+    return summaries
@@ -3,8 +3,7 @@ App API Router - 앱에서 업로드한 데이터 조회용 API
 """
 
 from fastapi import APIRouter, Query, HTTPException
-from app.core.vector_store import collection
-import json
+from app.core.vector_store import get_all_summaries, get_recent_documents
 
 router = APIRouter(prefix="/api/app", tags=["app"])
 
@@ -31,65 +30,38 @@ def get_latest_app_data(
     print(f"[INFO] 앱 데이터 조회 요청: user_id={user_id}, watch_type={watch_type}")
 
     try:
-        # 1. 해당 사용자의 모든 데이터 조회
-        result = collection.get(where={"user_id": user_id})
+        # 1. 플랫폼 필터 (galaxy → samsung, apple → apple)
+        platform_filter = "samsung" if watch_type == "galaxy" else "apple"
 
-        if not result or not result["metadatas"]:
-            raise HTTPException(
-                status_code=404,
-                detail="업로드된 데이터가 없습니다. 먼저 스마트폰 앱에서 데이터를 전송해주세요.",
-            )
+        # 앱에서 업로드한 데이터만 (api_samsung, api_apple)
+        def is_app_data(item: dict) -> bool:
+            source = item.get("source", "")
+            platform = item.get("platform", "")
+            return f"api_{platform_filter}" in source or platform == platform_filter
 
-        metadatas = result["metadatas"]
-        
-        # 2. 플랫폼 필터링 (galaxy → samsung, apple → apple)
-        platform_filter = "samsung" if watch_type == "galaxy" else "apple"
-        
-        # 앱에서 업로드한 데이터만 필터링 (api_samsung, api_apple)
-        filtered_data = []
-        for meta in metadatas:
-            source = meta.get("source", "")
-            platform = meta.get("platform", "")
-            
-            # api_samsung 또는 api_apple 소스만 선택
-            if f"api_{platform_filter}" in source or platform == platform_filter:
-                filtered_data.append(meta)
-        
-        # 필터링된 데이터가 없으면 전체 데이터에서 최신 선택
-        if not filtered_data:
-            print(f"[WARN] {platform_filter} 플랫폼 데이터 없음, 전체 데이터에서 최신 선택")
-            filtered_data = metadatas
-
-        # 3. 날짜 기준 최신순 정렬
-        sorted_data = sorted(
-            filtered_data, 
-            key=lambda x: x.get("date", ""), 
-            reverse=True
-        )
+        # 2. 최신순 인덱스에서 최신 1건 (필터링된 데이터가 없으면 전체 데이터에서 최신)
+        latest = get_recent_documents(user_id, days=1, accept=is_app_data)
+        if not latest:
+            latest = get_recent_documents(user_id, days=1)
+            if latest:
+                print(f"[WARN] {platform_filter} 플랫폼 데이터 없음, 전체 데이터에서 최신 선택")
 
-        if not sorted_data:
+        if not latest:
             raise HTTPException(
                 status_code=404,
-                detail="해당 조건의 데이터가 없습니다.",
+                detail="업로드된 데이터가 없습니다. 먼저 스마트폰 앱에서 데이터를 전송해주세요.",
             )
 
-        # 4. 최신 데이터 추출
-        latest_meta = sorted_data[0]
-        date = latest_meta.get("date", "")
-        source = latest_meta.get("source", "unknown")
-        platform = latest_meta.get("platform", "unknown")
+        # 3. 최신 데이터 추출
+        latest_item = latest[0]
+        date = latest_item.get("date", "")
+        source = latest_item.get("source", "unknown")
+        platform = latest_item.get("platform", "unknown")
 
         print(f"[INFO] 최신 데이터 - 날짜: {date}, 출처: {source}, 플랫폼: {platform}")
 
-        # 5. summary_json에서 raw 데이터 파싱
-        summary_json = latest_meta.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except json.JSONDecodeError:
-            summary_dict = {}
-
-        raw_data = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
+        raw_data = latest_item.get("raw", {})
+        summary_text = latest_item.get("summary_text", "")
 
         if not raw_data:
             raise HTTPException(
@@ -142,9 +114,10 @@ def get_app_history(
     print(f"[INFO] 앱 히스토리 조회: user_id={user_id}, watch_type={watch_type}, limit={limit}")
 
     try:
-        result = collection.get(where={"user_id": user_id})
+        # 날짜 기준 최신순 (시계열 저장소, 없으면 ChromaDB)
+        items = get_all_summaries(user_id)
 
-        if not result or not result["metadatas"]:
+        if not items:
             return {
                 "success": True,
                 "user_id": user_id,
@@ -152,38 +125,23 @@ def get_app_history(
                 "data": [],
             }
 
-        metadatas = result["metadatas"]
-        
         # 플랫폼 필터링 (선택적)
         if watch_type:
             platform_filter = "samsung" if watch_type == "galaxy" else "apple"
-            metadatas = [
-                m for m in metadatas 
-                if platform_filter in m.get("source", "") or m.get("platform", "") == platform_filter
+            items = [
+                item for item in items
+                if platform_filter in item.get("source", "") or item.get("platform", "") == platform_filter
             ]
 
-        # 날짜 기준 최신순 정렬
-        sorted_data = sorted(
-            metadatas, 
-            key=lambda x: x.get("date", ""), 
-            reverse=True
-        )[:limit]
-
         history = []
-        for meta in sorted_data:
-            summary_json = meta.get("summary_json", "{}")
-            try:
-                summary_dict = json.loads(summary_json)
-            except:
-                summary_dict = {}
-
-            raw_data = summary_dict.get("raw", {})
+        for item in items[:limit]:
+            raw_data = item.get("raw", {})
 
             history.append({
-                "date": meta.get("date", ""),
-                "source": meta.get("source", "unknown"),
-                "platform": meta.get("platform", "unknown"),
-                "health_score": meta.get("health_score", 0),
+                "date": item.get("date", ""),
+                "source": item.get("source", "unknown"),
+                "platform": item.get("platform", "unknown"),
+                "health_score": item.get("health_score", 0),
                 "has_data": bool(raw_data),
                 "data_keys": list(raw_data.keys()) if raw_data else [],
             })
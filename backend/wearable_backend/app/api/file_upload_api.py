@@ -1,8 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, Query
+from fastapi import APIRouter, UploadFile, File, Query, Header, Request, Response
 from app.service.file_upload_service import FileUploadService
+from app.service.upload_job_service import UploadJobService
+from app.service.resumable_upload_service import ResumableUploadService
 
 router = APIRouter(prefix="/api/file", tags=["File Upload"])
 service = FileUploadService()
+job_service = UploadJobService(service)
+resumable_service = ResumableUploadService(job_service)
 
 @router.post("/upload")
 async def upload_file(
@@ -10,10 +14,96 @@ async def upload_file(
     user_id: str | None = Query(None),
     difficulty: str = Query("중"),
     duration: int = Query(30),
+    tz_offset_minutes: int | None = Query(None, ge=-720, le=840),
 ):
     return await service.process_file(
         file=file,
         user_id=user_id,
         difficulty=difficulty,
-        duration=duration
-    )
\ No newline at end of file
+        duration=duration,
+        tz_offset_minutes=tz_offset_minutes,
+    )
+
+
+# ------------------------------------------------------------
+# 비동기 작업 모드 (큰 ZIP 업로드 → job_id 즉시 반환 → 폴링)
+# 워커 시작 / 종료는 main.py lifespan
+# ------------------------------------------------------------
+@router.post("/upload/async")
+async def upload_file_async(
+    file: UploadFile = File(...),
+    user_id: str | None = Query(None),
+    difficulty: str = Query("중"),
+    duration: int = Query(30),
+    tz_offset_minutes: int | None = Query(None, ge=-720, le=840),
+):
+    """파일 저장 후 job_id 반환 (나머지 단계는 백그라운드 워커에서 실행)"""
+    return await job_service.submit(
+        file=file,
+        user_id=user_id,
+        difficulty=difficulty,
+        duration=duration,
+        tz_offset_minutes=tz_offset_minutes,
+    )
+
+
+@router.get("/jobs/{job_id}")
+def get_upload_job_status(job_id: str):
+    """단계별 진행 상태 + 소요 시간"""
+    return job_service.get_status(job_id)
+
+
+@router.get("/jobs/{job_id}/result")
+def get_upload_job_result(job_id: str):
+    """최종 결과 (summary + llm_result), 완료 전이면 409"""
+    return job_service.get_result(job_id)
+
+
+# ------------------------------------------------------------
+# 이어받기 업로드 (tus 방식: hash handshake → chunk PATCH → 작업 등록)
+# ------------------------------------------------------------
+@router.post("/uploads")
+async def create_resumable_upload(
+    filename: str = Query(...),
+    size: int = Query(..., gt=0),
+    sha256: str = Query(..., min_length=64, max_length=64),
+    user_id: str | None = Query(None),
+    difficulty: str = Query("중"),
+    duration: int = Query(30),
+    tz_offset_minutes: int | None = Query(None, ge=-720, le=840),
+):
+    """파일 SHA-256 + 크기 → action: ingested / resume / start + offset"""
+    return await resumable_service.handshake(
+        filename=filename,
+        size=size,
+        sha256=sha256,
+        user_id=user_id,
+        difficulty=difficulty,
+        duration=duration,
+        tz_offset_minutes=tz_offset_minutes,
+    )
+
+
+@router.head("/uploads/{upload_id}")
+def get_resumable_upload_offset(upload_id: str):
+    """현재 받은 바이트 수 (Upload-Offset / Upload-Length 헤더)"""
+    view = resumable_service.get_offset(upload_id)
+    return Response(
+        headers={
+            "Upload-Offset": str(view["offset"]),
+            "Upload-Length": str(view["size"]),
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+@router.patch("/uploads/{upload_id}")
+async def append_resumable_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+):
+    """Upload-Offset 위치부터 요청 본문(chunk)을 이어서 기록, 마지막 chunk면 작업 등록"""
+    return await resumable_service.append_chunk(
+        upload_id, upload_offset, request.stream()
+    )
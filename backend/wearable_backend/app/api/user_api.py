@@ -3,9 +3,12 @@ User API Router (수정 버전 - 날짜 기준 최신 데이터 조회)
 """
 
 from fastapi import APIRouter, Query, HTTPException
-from app.core.vector_store import collection, search_similar_summaries
+from app.core.vector_store import (
+    search_similar_summaries,
+    get_all_summaries,
+    get_recent_documents,
+)
 from app.core.llm_analysis import run_llm_analysis
-import json
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -31,42 +34,28 @@ def get_latest_analysis(
 
     # ✅ 1. 날짜 기준으로 최신 데이터 가져오기
     try:
-        result = collection.get(where={"user_id": user_id})
+        # 최신 날짜 문서 (최신순 인덱스, 같은 날짜 여러 출처는 저장 시 병합된 1개)
+        same_date_data = get_recent_documents(user_id, days=1)
 
-        if not result or not result["metadatas"]:
+        if not same_date_data:
             raise HTTPException(
                 404,
                 "업로드된 데이터가 없습니다. 먼저 스마트폰 앱에서 데이터를 전송해주세요.",
             )
 
-        # 날짜별로 정렬 (최신순)
-        metadatas = result["metadatas"]
-        sorted_data = sorted(metadatas, key=lambda x: x.get("date", ""), reverse=True)
-
-        if not sorted_data:
-            raise HTTPException(404, "데이터가 없습니다.")
-
         # 최신 데이터 추출
-        latest_meta = sorted_data[0]
-        date = latest_meta.get("date", "")
+        latest_item = same_date_data[0]
+        date = latest_item.get("date", "")
 
         print(f"[INFO] 최신 데이터 날짜: {date}")
 
-        # summary_json 파싱
-        summary_json = latest_meta.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
-
-        raw_data = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
+        raw_data = latest_item.get("raw", {})
+        summary_text = latest_item.get("summary_text", "")
 
         if not raw_data:
             raise HTTPException(400, "건강 데이터가 비어있습니다.")
 
         # 데이터 개수 및 출처 정보 출력
-        same_date_data = [m for m in sorted_data if m.get("date") == date]
         print(f"[INFO] 해당 날짜 데이터 개수: {len(same_date_data)}개")
         for idx, m in enumerate(same_date_data[:3], 1):
             source = m.get("source", "unknown")
@@ -141,34 +130,19 @@ def get_latest_analysis(
 def get_raw_history(user_id: str = Query(...)):
     """
     사용자가 업로드한 summary/raw 전체 조회
-    VectorDB에 저장된 summary_json을 파싱하여 반환
+    시계열 저장소(없으면 VectorDB + summary_store)에서 최신 날짜순으로 반환
     """
-    result = collection.get(where={"user_id": user_id})
-
-    ids = result.get("ids", [])
-    metas = result.get("metadatas", [])
-
     history = []
-    for doc_id, meta in zip(ids, metas):
-        # summary_json 파싱
-        sj = meta.get("summary_json", "{}")
-        try:
-            parsed = json.loads(sj)
-        except:
-            parsed = {}
-
-        raw = parsed.get("raw", {})
-        summary_text = parsed.get("summary_text", "")
-
+    for item in get_all_summaries(user_id):
         history.append(
             {
-                "doc_id": doc_id,
-                "date": meta.get("date"),
-                "source": meta.get("source", "unknown"),
-                "platform": meta.get("platform", "unknown"),
-                "health_score": meta.get("health_score", 0),
-                "summary_text": summary_text,
-                "raw": raw,
+                "doc_id": item["document_id"],
+                "date": item.get("date"),
+                "source": item.get("source", "unknown"),
+                "platform": item.get("platform", "unknown"),
+                "health_score": item.get("health_score", 0),
+                "summary_text": item.get("summary_text", ""),
+                "raw": item.get("raw", {}),
             }
         )
 
@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -64,5 +65,151 @@ DEFAULT_DURATION = 30  # 분
 RAG_TOP_K = int(os.getenv("RAG_TOP_K", "3"))
 RAG_SIMILARITY_THRESHOLD = float(os.getenv("RAG_SIMILARITY_THRESHOLD", "0.5"))
 
-# 임베딩 배치 사이즈
+# 임베딩 provider
+# openai  : OpenAI 임베딩 API (기본, OPENAI_EMBEDDING_MODEL)
+# hashing : 로컬 CPU feature hashing (네트워크 없음, 결정적 → 오프라인 실행 / 테스트용)
+# sentence: 로컬 sentence-transformers 모델 (pip install sentence-transformers 필요)
+# provider마다 ChromaDB 컬렉션을 따로 쓴다 (openai는 기존 summaries 그대로)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").lower()
+OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+HASHING_EMBEDDING_DIM = int(os.getenv("HASHING_EMBEDDING_DIM", "384"))
+SENTENCE_EMBEDDING_MODEL = os.getenv(
+    "SENTENCE_EMBEDDING_MODEL", "paraphrase-multilingual-MiniLM-L12-v2"
+)
+# 저장 / 검색 임베딩 차원 (0: provider 원본 차원, 예: 256 → 앞 256차원 + 재정규화)
+# 차원마다 ChromaDB 컬렉션을 따로 쓴다 (예: summaries_d256)
+# 선택 기준: python benchmarks/eval_embedding_dims.py (저장된 데이터로 검색 결과 유지율 측정)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "0"))
+
+# 임베딩 배치 사이즈 (요청 1번에 보내는 텍스트 수)
 EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+# 요청 1번의 입력 토큰 예산 (provider 요청 한도보다 작게)
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))
+# 동시에 보내는 배치 수
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+# 실패한 배치 재시도 (지수 백오프 + jitter, 초)
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+EMBEDDING_RETRY_BASE_DELAY = float(os.getenv("EMBEDDING_RETRY_BASE_DELAY", "0.5"))
+EMBEDDING_RETRY_MAX_DELAY = float(os.getenv("EMBEDDING_RETRY_MAX_DELAY", "20"))
+
+# 임베딩 캐시 ((모델, 정규화 텍스트 hash) → 벡터)
+# 메모리 LRU + SQLite(float16) 2단계, SQLite는 uvicorn 워커 간 공유
+EMBEDDING_CACHE_ENABLED = (
+    os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+)
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "2048"))
+EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# ============================================================
+# 로컬 데이터 저장소 (증분 업로드 상태, 업로드 작업 등)
+# ============================================================
+LOCAL_DATA_DIR = os.getenv("LOCAL_DATA_DIR", "./local_data")
+INGEST_STATE_DB = os.getenv(
+    "INGEST_STATE_DB", os.path.join(LOCAL_DATA_DIR, "ingest_state.sqlite3")
+)
+UPLOAD_JOB_DB = os.getenv(
+    "UPLOAD_JOB_DB", os.path.join(LOCAL_DATA_DIR, "upload_jobs.sqlite3")
+)
+EMBEDDING_CACHE_DB = os.getenv(
+    "EMBEDDING_CACHE_DB", os.path.join(LOCAL_DATA_DIR, "embedding_cache.sqlite3")
+)
+# summary 원본 JSON (Chroma metadata에는 필터용 작은 필드만 저장)
+SUMMARY_STORE_DB = os.getenv(
+    "SUMMARY_STORE_DB", os.path.join(LOCAL_DATA_DIR, "summary_store.sqlite3")
+)
+
+# 비동기 업로드 작업 워커 수
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+# 실행 중 작업 lease (초): 워커가 주기적으로 연장, 만료된 running 작업만 재시작 시 재등록
+UPLOAD_JOB_LEASE_SEC = int(os.getenv("UPLOAD_JOB_LEASE_SEC", "300"))
+# 작업당 최대 실행 횟수 (재등록 포함), 넘으면 failed 처리
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+
+# 이어받기(resumable) 업로드 세션 (파일 SHA-256 + 크기 handshake → chunk 단위 PATCH)
+RESUMABLE_UPLOAD_DB = os.getenv(
+    "RESUMABLE_UPLOAD_DB", os.path.join(LOCAL_DATA_DIR, "resumable_uploads.sqlite3")
+)
+# 마지막 chunk 이후 이 시간이 지난 미완료 세션은 부분 파일과 함께 삭제
+RESUMABLE_UPLOAD_TTL_HOURS = float(os.getenv("RESUMABLE_UPLOAD_TTL_HOURS", "24"))
+
+# ============================================================
+# 같은 날짜 여러 출처 병합 (api_samsung / zip_samsung / api_apple / zip_apple)
+# ============================================================
+# 저장할 때 날짜별로 출처 summary를 필드 단위로 병합해 문서 1개(벡터 1개)로 저장
+# 필드마다 우선순위가 가장 높은 출처 중 값이 있는(0이 아닌) 값을 사용
+# SOURCE_PRECEDENCE: 기본 우선순위 (쉼표 구분, 목록에 없는 출처는 최근 저장 순)
+#   비어 있으면 최근 저장한 출처 우선 (이전의 날짜별 중복 제거와 같은 기준)
+SOURCE_PRECEDENCE = [
+    source.strip()
+    for source in os.getenv("SOURCE_PRECEDENCE", "").split(",")
+    if source.strip()
+]
+# FIELD_SOURCE_PRECEDENCE: 필드별 우선순위 (JSON, 예: {"sleep_min": ["zip_apple"]})
+FIELD_SOURCE_PRECEDENCE = json.loads(os.getenv("FIELD_SOURCE_PRECEDENCE", "{}"))
+
+# ============================================================
+# 업로드 DB 파싱 설정
+# ============================================================
+# sql: 테이블별 GROUP BY 집계 쿼리 (기본, 가장 빠름)
+# stream: 필요한 컬럼만 chunk 단위로 읽어 Python에서 집계
+DB_PARSE_MODE = os.getenv("DB_PARSE_MODE", "sql")
+
+# Apple Health export.xml 파싱 방식
+# scan: "<Record " 단위로 잘라 필요한 속성만 읽음 (기본, 가장 빠름)
+# iterparse: ElementTree.iterparse 기준 구현
+APPLE_PARSE_MODE = os.getenv("APPLE_PARSE_MODE", "scan")
+
+# 심박수 series(epoch_millis) 날짜 버킷팅 기본 시간대 (UTC 기준 분, 기본 KST +540)
+# 업로드 요청의 tz_offset_minutes로 사용자별 지정 가능
+DEFAULT_TZ_OFFSET_MINUTES = int(os.getenv("DEFAULT_TZ_OFFSET_MINUTES", "540"))
+
+# 업로드 DB 테이블 동시 스캔 스레드 수 (읽기 전용 + immutable 연결, 1: 순차)
+# 기본: min(4, CPU 수)
+SQLITE_SCAN_WORKERS = int(
+    os.getenv("SQLITE_SCAN_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+# CPU 집약 단계(DB 파싱, 전처리) 프로세스 풀 크기
+# 0: 기존처럼 스레드 풀에서 실행 / N > 0: N개 프로세스에서 실행 (GIL 회피)
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "0"))
+
+# 업로드 결과 캐시 (파일 SHA-256 기준, 같은 파일 재업로드 시 파이프라인 생략)
+UPLOAD_CACHE_ENABLED = os.getenv("UPLOAD_CACHE_ENABLED", "true").lower() == "true"
+UPLOAD_CACHE_DIR = os.getenv(
+    "UPLOAD_CACHE_DIR", os.path.join(LOCAL_DATA_DIR, "upload_cache")
+)
+UPLOAD_CACHE_MAX_BYTES = int(
+    os.getenv("UPLOAD_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# 날짜 기반 조회용 사용자별 시계열 저장소 (numpy memmap)
+# false면 모든 날짜 조회를 기존처럼 ChromaDB metadata에서 처리
+TIMESERIES_STORE_ENABLED = (
+    os.getenv("TIMESERIES_STORE_ENABLED", "true").lower() == "true"
+)
+TIMESERIES_DIR = os.getenv(
+    "TIMESERIES_DIR", os.path.join(LOCAL_DATA_DIR, "timeseries")
+)
+
+# 최신 N일 조회용 사용자별 최신순 인덱스 (저장할 때마다 갱신)
+# false면 최신 조회를 시계열 저장소 / ChromaDB metadata 전체 정렬로 처리
+RECENCY_INDEX_ENABLED = os.getenv("RECENCY_INDEX_ENABLED", "true").lower() == "true"
+RECENCY_INDEX_DB = os.getenv(
+    "RECENCY_INDEX_DB", os.path.join(LOCAL_DATA_DIR, "recency_index.sqlite3")
+)
+
+# 유사 summary 검색용 사용자별 정확(brute-force) 벡터 인덱스 (numpy memmap, float32)
+# false면 기존처럼 ChromaDB HNSW 인덱스에서 user_id 필터로 검색
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR", os.path.join(LOCAL_DATA_DIR, "vector_index")
+)
+# 벡터 인덱스 저장 형식
+# float32: 기본 / int8: 행별 scale + int8 (파일 / 페이지 캐시 약 1/4, 검색 계산은 더 느림)
+VECTOR_INDEX_QUANTIZATION = os.getenv("VECTOR_INDEX_QUANTIZATION", "float32").lower()
+
+# 분석(run_llm_analysis) RAG 검색용 지표 벡터 kNN (시계열 저장소 metrics, 임베딩 호출 없음)
+# false면 기존처럼 query dict를 문자열로 임베딩해서 유사 summary 검색
+METRIC_INDEX_ENABLED = os.getenv("METRIC_INDEX_ENABLED", "true").lower() == "true"
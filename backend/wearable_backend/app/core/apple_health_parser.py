@@ -0,0 +1,433 @@
+"""
+Apple Health export.xml 스트리밍 파서
+
+아이폰 "건강 데이터 내보내기" 결과(export.zip → apple_health_export/export.xml)는
+수년치면 1GB를 넘는다. DOM으로 올리지 않고 순차적으로 읽으면서
+<Record> 하나마다 날짜별 누적값(합계/개수)에 바로 더한다.
+
+- 메모리: 날짜 수 × 항목 수 (레코드 수와 무관)
+- 날짜: startDate의 현지 날짜 (기기 기준 시간대, YYYYMMDD int)
+  수면은 endDate(기상일) 기준
+- 결과 raw_json은 normalize_raw가 읽는 key 그대로 (platform="apple" 분기)
+
+파서 2종 (db_parser / db_sql_parser 관계와 동일)
+- iterparse: ElementTree.iterparse + elem.clear() (기준 구현)
+- scan:      chunk를 "<Record " 기준으로 잘라 필요한 속성만 bytes.find (기본, 가장 빠름)
+  export.xml은 기계 생성 파일이라 속성 값이 항상 큰따옴표 + '<', '>' escape
+  → XML 트리 없이도 태그 경계/속성을 안전하게 찾을 수 있다
+  (결과 동일 여부는 test/test_apple_health_parser.py 참고)
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import BinaryIO, Dict
+
+# 읽기 단위 (scan 모드)
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+# ZIP 안의 Apple Health 내보내기 파일 이름 (export_cda.xml 제외)
+APPLE_EXPORT_NAME = "export.xml"
+
+SUM = "sum"
+MEAN = "mean"
+
+# =============================================================
+# 레코드 타입 → raw key
+# =============================================================
+QUANTITY_MAP = {
+    # Activity
+    "HKQuantityTypeIdentifierStepCount": ("steps", SUM),
+    "HKQuantityTypeIdentifierDistanceWalkingRunning": ("distance_km", SUM),
+    "HKQuantityTypeIdentifierFlightsClimbed": ("flights", SUM),
+    "HKQuantityTypeIdentifierAppleExerciseTime": ("exercise_min", SUM),
+    # Calories
+    "HKQuantityTypeIdentifierActiveEnergyBurned": ("activeEnergy", SUM),
+    "HKQuantityTypeIdentifierBasalEnergyBurned": ("basal_energy", SUM),
+    "HKQuantityTypeIdentifierDietaryEnergyConsumed": ("calories_intake", SUM),
+    # Vitals
+    "HKQuantityTypeIdentifierHeartRate": ("heart_rate", MEAN),
+    "HKQuantityTypeIdentifierRestingHeartRate": ("resting_heart_rate", MEAN),
+    "HKQuantityTypeIdentifierWalkingHeartRateAverage": ("walking_heart_rate", MEAN),
+    "HKQuantityTypeIdentifierHeartRateVariabilitySDNN": ("hrv", MEAN),
+    "HKQuantityTypeIdentifierOxygenSaturation": ("oxygen_saturation", MEAN),
+    "HKQuantityTypeIdentifierBloodPressureSystolic": ("systolic", MEAN),
+    "HKQuantityTypeIdentifierBloodPressureDiastolic": ("diastolic", MEAN),
+    "HKQuantityTypeIdentifierBloodGlucose": ("glucose", MEAN),
+    # Body
+    "HKQuantityTypeIdentifierBodyMass": ("weight", MEAN),
+    "HKQuantityTypeIdentifierHeight": ("height_m", MEAN),
+    "HKQuantityTypeIdentifierBodyMassIndex": ("bmi", MEAN),
+    "HKQuantityTypeIdentifierBodyFatPercentage": ("body_fat", MEAN),
+    "HKQuantityTypeIdentifierLeanBodyMass": ("lean_body", MEAN),
+}
+
+SLEEP_TYPE = "HKCategoryTypeIdentifierSleepAnalysis"
+
+# 실제 수면 단계만 합산 (InBed / Awake 제외)
+ASLEEP_VALUES = {
+    "HKCategoryValueSleepAnalysisAsleep",
+    "HKCategoryValueSleepAnalysisAsleepUnspecified",
+    "HKCategoryValueSleepAnalysisAsleepCore",
+    "HKCategoryValueSleepAnalysisAsleepDeep",
+    "HKCategoryValueSleepAnalysisAsleepREM",
+}
+
+# (raw key, unit) → normalize_raw 기준 단위 배율 (없으면 1)
+UNIT_SCALE = {
+    ("distance_km", "m"): 0.001,
+    ("distance_km", "mi"): 1.609344,
+    ("distance_km", "ft"): 0.0003048,
+    ("activeEnergy", "kJ"): 1 / 4.184,
+    ("basal_energy", "kJ"): 1 / 4.184,
+    ("calories_intake", "kJ"): 1 / 4.184,
+    ("exercise_min", "hr"): 60,
+    ("exercise_min", "s"): 1 / 60,
+    ("hrv", "s"): 1000,
+    ("oxygen_saturation", "%"): 100,
+    ("body_fat", "%"): 100,
+    ("weight", "lb"): 0.45359237,
+    ("weight", "g"): 0.001,
+    ("lean_body", "lb"): 0.45359237,
+    ("lean_body", "g"): 0.001,
+    ("height_m", "cm"): 0.01,
+    ("height_m", "in"): 0.0254,
+    ("height_m", "ft"): 0.3048,
+    ("glucose", "mmol<180.1558800000541>/L"): 18.01558800000541,
+}
+
+# 날짜별 누적 항목 (sleep_min은 수면 레코드에서 계산)
+ACC_KEYS = tuple(dict.fromkeys(key for key, _ in QUANTITY_MAP.values())) + (
+    "sleep_min",
+)
+# bucket 안 위치: [합계, 개수]가 ACC_KEYS 순서대로 이어진 flat list
+ACC_INDEX = {key: i * 2 for i, key in enumerate(ACC_KEYS)}
+
+# 정수로 내보낼 합계 항목
+INT_KEYS = ("steps", "flights")
+
+
+# =============================================================
+# 날짜별 누적
+# =============================================================
+
+
+class _DayAccumulator:
+    """
+    레코드 → 날짜별 [합계, 개수, ...] (두 파서 공용)
+
+    날짜 key / (type, unit) 배율은 처음 한 번만 계산해서 캐시한다.
+    type / unit / 날짜는 str, bytes 모두 받는다 (scan 모드는 bytes 그대로 전달).
+    """
+
+    def __init__(self):
+        self.grouped = {}
+        self.records = 0
+        self._day_keys = {}
+        self._targets = {}
+
+    def day_bucket(self, date_str) -> list:
+        """'YYYY-MM-DD' → 날짜 bucket"""
+        bucket = self._day_keys.get(date_str)
+        if bucket is None:
+            if isinstance(date_str, bytes):
+                date_str = date_str.decode()
+            day = int(date_str[:4] + date_str[5:7] + date_str[8:10])
+            bucket = self.grouped.get(day)
+            if bucket is None:
+                bucket = self.grouped[day] = [0.0] * (len(ACC_KEYS) * 2)
+            self._day_keys[date_str] = bucket
+            self._day_keys[date_str.encode()] = bucket
+        return bucket
+
+    def target(self, rtype, unit) -> tuple:
+        """(type, unit) → (bucket 위치, 단위 배율)"""
+        target = self._targets.get((rtype, unit))
+        if target is None:
+            name = rtype.decode() if isinstance(rtype, bytes) else rtype
+            unit_name = unit.decode() if isinstance(unit, bytes) else unit
+            key, _ = QUANTITY_MAP[name]
+            target = (ACC_INDEX[key], UNIT_SCALE.get((key, unit_name), 1))
+            self._targets[(rtype, unit)] = target
+        return target
+
+    def add_quantity(self, rtype, unit, start, value):
+        index, scale = self.target(rtype, unit)
+        try:
+            number = float(value) * scale
+        except (TypeError, ValueError):
+            return
+
+        bucket = self.day_bucket(start[:10])
+        bucket[index] += number
+        bucket[index + 1] += 1
+        self.records += 1
+
+    def add_sleep(self, start: str, end: str, value: str):
+        if value not in ASLEEP_VALUES:
+            return
+        try:
+            minutes = (_parse_time(end) - _parse_time(start)).total_seconds() / 60
+        except ValueError:
+            return
+        if minutes <= 0:
+            return
+
+        bucket = self.day_bucket(end[:10])
+        index = ACC_INDEX["sleep_min"]
+        bucket[index] += minutes
+        bucket[index + 1] += 1
+        self.records += 1
+
+    def result(self) -> Dict[int, dict]:
+        return {day: build_apple_raw_json(b) for day, b in self.grouped.items()}
+
+
+def _parse_time(value: str) -> datetime:
+    """'2024-01-01 07:50:00 +0900' → datetime"""
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S %z")
+
+
+def build_apple_raw_json(bucket: list) -> dict:
+    """누적 bucket → raw_json (normalize_raw 입력 key)"""
+    raw = {}
+    for key, agg in QUANTITY_MAP.values():
+        total, count = bucket[ACC_INDEX[key]], bucket[ACC_INDEX[key] + 1]
+        if not count:
+            raw[key] = 0
+        else:
+            raw[key] = total if agg == SUM else total / count
+    for key in INT_KEYS:
+        raw[key] = int(round(raw[key]))
+
+    index = ACC_INDEX["sleep_min"]
+    sleep_min = bucket[index] if bucket[index + 1] else 0
+    raw["sleep_min"] = sleep_min
+    raw["sleep_hr"] = sleep_min / 60 if sleep_min > 0 else 0
+
+    # 총 소모 칼로리 = 활동 + 기초대사
+    basal = raw.pop("basal_energy")
+    raw["total_calories"] = raw["activeEnergy"] + basal if basal else 0
+
+    return raw
+
+
+# =============================================================
+# 입력 열기 (XML 파일 또는 export.zip)
+# =============================================================
+
+
+def find_apple_export_member(zip_ref: zipfile.ZipFile) -> zipfile.ZipInfo | None:
+    """ZIP central directory에서 export.xml 항목 탐색 (압축 해제 없음)"""
+    for info in zip_ref.infolist():
+        if info.is_dir():
+            continue
+        if info.filename.replace("\\", "/").split("/")[-1] == APPLE_EXPORT_NAME:
+            return info
+    return None
+
+
+def is_apple_export_zip(zip_path: str) -> bool:
+    """ZIP 안에 Apple Health export.xml이 있는지"""
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            return find_apple_export_member(zip_ref) is not None
+    except zipfile.BadZipFile:
+        return False
+
+
+def _run_on_source(path: str, parse_stream):
+    """
+    .zip이면 export.xml 항목을 압축 해제하면서 바로 파싱 (디스크에 풀지 않음)
+    그 외에는 XML 파일로 연다.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, "r") as zip_ref:
+            info = find_apple_export_member(zip_ref)
+            if info is None:
+                raise FileNotFoundError(
+                    "ZIP 안에서 Apple Health export.xml을 찾지 못했습니다."
+                )
+            with zip_ref.open(info) as stream:
+                return parse_stream(stream)
+
+    with open(path, "rb") as stream:
+        return parse_stream(stream)
+
+
+# =============================================================
+# 1) 기준 구현: iterparse
+# =============================================================
+
+
+def _iterparse_stream(stream: BinaryIO) -> _DayAccumulator:
+    acc = _DayAccumulator()
+
+    context = ET.iterparse(stream, events=("start", "end"))
+    _, root = next(context)
+
+    # 최상위(<HealthData> 바로 아래) <Record>만 집계
+    # (<Correlation> 안의 혈압 Record는 최상위에도 같은 값이 있음)
+    depth = 0
+    for event, elem in context:
+        if event == "start":
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth:
+            continue
+
+        if elem.tag == "Record":
+            attrib = elem.attrib
+            rtype = attrib.get("type")
+            if rtype in QUANTITY_MAP:
+                acc.add_quantity(
+                    rtype,
+                    attrib.get("unit", ""),
+                    attrib.get("startDate", ""),
+                    attrib.get("value"),
+                )
+            elif rtype == SLEEP_TYPE:
+                acc.add_sleep(
+                    attrib.get("startDate", ""),
+                    attrib.get("endDate", ""),
+                    attrib.get("value"),
+                )
+
+        # 처리한 최상위 요소는 바로 버림 (메모리 고정)
+        root.clear()
+
+    return acc
+
+
+def parse_apple_export_iterparse(path: str) -> Dict[int, dict]:
+    """export.xml / export.zip → {YYYYMMDD: raw_json} (ElementTree 기준 구현)"""
+    return _run_on_source(path, _iterparse_stream).result()
+
+
+# =============================================================
+# 2) 기본 구현: chunk 스캔
+# =============================================================
+
+RECORD_OPEN = b"<Record "
+
+# 정규식 단계 없이 바로 거를 수 있도록 bytes로 변환
+_QUANTITY_TYPES = {rtype.encode() for rtype in QUANTITY_MAP}
+_SLEEP_TYPE = SLEEP_TYPE.encode()
+
+
+def _attr(segment: bytes, name: bytes, end: int) -> bytes | None:
+    """태그 범위(segment[:end]) 안에서 name="..." 값 (없으면 None)"""
+    i = segment.find(name, 0, end)
+    if i < 0:
+        return None
+    i += len(name)
+    return segment[i : segment.find(b'"', i)]
+
+
+def _scan_stream(stream: BinaryIO, chunk_size: int | None = None):
+    """
+    buffer를 "<Record " 기준으로 split → 조각마다 태그 끝('>')까지에서 필요한 속성만 find
+
+    - 조각 = Record 태그 + 다음 Record 전까지의 내용 (MetadataEntry, Correlation 태그 등)
+    - 조각 뒷부분의 <Correlation / </Correlation 위치로 다음 Record의 중첩 여부 판단
+    """
+    chunk_size = chunk_size or READ_CHUNK_SIZE
+    acc = _DayAccumulator()
+    day_keys = acc._day_keys
+    targets = acc._targets
+
+    in_correlation = False
+    tail = b""
+    records = 0
+
+    def update_correlation(segment: bytes, state: bool) -> bool:
+        opened = segment.rfind(b"<Correlation")
+        closed = segment.rfind(b"</Correlation")
+        if opened > closed:
+            return True
+        if closed > opened:
+            return False
+        return state
+
+    while True:
+        chunk = stream.read(chunk_size)
+
+        if chunk:
+            buffer = tail + chunk
+            # 마지막 Record 태그는 다음 chunk와 이어서 처리
+            cut = buffer.rfind(RECORD_OPEN)
+            if cut <= 0:
+                tail = buffer
+                continue
+            tail = buffer[cut:]
+            buffer = buffer[:cut]
+        else:
+            buffer, tail = tail, b""
+
+        segments = buffer.split(RECORD_OPEN)
+        in_correlation = update_correlation(segments[0], in_correlation)
+
+        for segment in segments[1:]:
+            nested = in_correlation
+            end = segment.find(b">")
+            if segment.find(b"Correlation", end) >= 0:
+                in_correlation = update_correlation(segment, in_correlation)
+            if nested:
+                continue
+
+            # type 속성이 없으면 i = 5 → 아래 두 분기 모두 해당 없음
+            i = segment.find(b'type="', 0, end) + 6
+            rtype = segment[i : segment.find(b'"', i)]
+
+            if rtype in _QUANTITY_TYPES:
+                i = segment.find(b' unit="', 0, end)
+                unit = segment[i + 7 : segment.find(b'"', i + 7)] if i >= 0 else b""
+                target = targets.get((rtype, unit)) or acc.target(rtype, unit)
+
+                d = segment.find(b' startDate="', 0, end)
+                v = segment.find(b' value="', 0, end)
+                if d < 0 or v < 0:
+                    continue
+                try:
+                    number = float(segment[v + 8 : segment.find(b'"', v + 8)])
+                except ValueError:
+                    continue
+
+                day = segment[d + 12 : d + 22]
+                bucket = day_keys.get(day) or acc.day_bucket(day)
+                index = target[0]
+                bucket[index] += number * target[1]
+                bucket[index + 1] += 1
+                records += 1
+            elif rtype == _SLEEP_TYPE:
+                acc.add_sleep(
+                    (_attr(segment, b' startDate="', end) or b"").decode(),
+                    (_attr(segment, b' endDate="', end) or b"").decode(),
+                    (_attr(segment, b' value="', end) or b"").decode(),
+                )
+
+        if not chunk:
+            break
+
+    acc.records += records
+    return acc
+
+
+def parse_apple_export_scan(path: str) -> Dict[int, dict]:
+    """export.xml / export.zip → {YYYYMMDD: raw_json} (chunk 스캔, 기본)"""
+    return _run_on_source(path, _scan_stream).result()
+
+
+# 파싱 방식 (cpu_tasks.parse_apple_export_packed)
+APPLE_PARSERS = {
+    "scan": parse_apple_export_scan,
+    "iterparse": parse_apple_export_iterparse,
+}
+
+
+def parse_apple_export(path: str, mode: str = "scan") -> Dict[int, dict]:
+    """Apple Health export.xml / export.zip → 날짜별 raw_json"""
+    parser = APPLE_PARSERS.get(mode, parse_apple_export_scan)
+    return parser(path)
@@ -0,0 +1,252 @@
+"""
+Analytic Query - "가장 많이 / 최고 / 최저 / 평균 / 추이" 질문 직접 계산
+
+"언제 가장 많이 걸었어?" 같은 질문은 의미 유사도 검색(질문 임베딩 → 비슷한 날)으로는
+정답(걸음 수 최댓값인 날)을 보장하지 못한다.
+- 질문에서 지표 키워드 + 집계(max / min / avg / trend)를 규칙으로 찾고
+  (기록을 묻는 표현이 있을 때만, "몇 걸음 걸어야 / 하면 최대로" 같은 조언 질문은 제외)
+- 사용자의 저장된 날짜별 지표(시계열 저장소 조회 결과)에서 바로 계산해 정확한 행을 반환
+- 임베딩 / LLM 호출 없음
+"""
+
+from datetime import date as date_cls
+
+# ================================================================
+#  지표 키워드 (앞에 있는 항목 우선: "안정시 심박"이 "심박"보다 먼저)
+#  (필드, 표시 이름, 단위, 키워드) / 키워드는 공백을 빼고 비교
+# ================================================================
+METRICS = [
+    ("resting_heart_rate", "안정시 심박수", "bpm", ["안정시심박", "휴식심박"]),
+    ("heart_rate", "심박수", "bpm", ["심박", "맥박", "heartrate"]),
+    ("active_calories", "활동 칼로리", "kcal", ["활동칼로리", "소모칼로리", "소모"]),
+    ("calories_intake", "섭취 칼로리", "kcal", ["섭취"]),
+    ("total_calories", "총 칼로리", "kcal", ["칼로리", "열량"]),
+    ("distance_km", "이동거리", "km", ["이동거리", "거리", "distance"]),
+    ("steps", "걸음 수", "보", ["걸음", "걸었", "걸은", "steps"]),
+    ("exercise_min", "운동 시간", "분", ["운동시간", "운동했", "운동한"]),
+    ("flights", "계단", "층", ["계단", "flights"]),
+    # "잠" 단독은 "잠깐 / 잠시"와 겹치므로 조사 / 어미와 함께
+    (
+        "sleep_hr",
+        "수면 시간",
+        "시간",
+        ["수면", "잠을", "잠이", "잠은", "잤", "잔날", "잔시간", "sleep"],
+    ),
+    ("body_fat", "체지방", "%", ["체지방"]),
+    ("weight", "체중", "kg", ["체중", "몸무게", "weight"]),
+    ("hrv", "HRV", "ms", ["hrv"]),
+    ("oxygen_saturation", "산소포화도", "%", ["산소", "oxygen"]),
+    ("glucose", "혈당", "mg/dL", ["혈당", "glucose"]),
+    ("diastolic", "이완기 혈압", "mmHg", ["이완기"]),
+    ("systolic", "수축기 혈압", "mmHg", ["수축기", "혈압"]),
+    ("health_score", "건강 점수", "점", ["건강점수", "점수"]),
+]
+
+# 집계 키워드 (앞에 있는 집계 우선)
+AGGREGATIONS = [
+    ("avg", ["평균", "average"]),
+    ("trend", ["추이", "추세", "트렌드", "변화", "경향", "늘었", "줄었"]),
+    (
+        "max",
+        ["가장많", "제일많", "가장높", "제일높", "가장길", "제일길", "가장오래"]
+        + ["제일오래", "최고", "최대", "최장", "max"],
+    ),
+    (
+        "min",
+        ["가장적", "제일적", "가장낮", "제일낮", "가장짧", "제일짧", "최저", "최소"]
+        + ["min"],
+    ),
+]
+
+# 자기 기록을 묻는 표현 (하나는 있어야 집계 질문, 기간 표현이 있으면 없어도 됨)
+HISTORY_CUES = (
+    ["언제", "며칠", "몇일", "어느날", "무슨날", "날", "기록", "동안", "지난", "최근"]
+    + ["요즘", "이번", "저번", "지금까지", "그동안", "내가", "나의", "제가", "저의"]
+    + ["알려", "보여", "확인"]
+)
+
+# 조언 / 조건 질문 ("몇 걸음 걸어야 건강해?", "몇 분 하면 최대로 소모돼?") → 집계 아님
+ADVICE_CUES = ["해야", "어야", "아야", "하면", "려면", "권장", "적정"]
+
+AGGREGATION_LABELS = {"max": "최고", "min": "최저", "avg": "평균", "trend": "추이"}
+
+# 추이: 기간 전체 변화량이 평균의 5% 미만이면 "유지"
+TREND_FLAT_RATIO = 0.05
+
+
+# ================================================================
+#  1) 질문 파싱
+# ================================================================
+def parse_analytic_query(message: str, has_period: bool = False) -> dict | None:
+    """
+    질문 → {"metric", "label", "unit", "aggregation"}
+
+    지표 / 집계 중 하나라도 없거나, 기록을 묻는 표현이 없거나(has_period: 기간 표현 감지됨),
+    조언 / 조건 질문이면 None
+    """
+    compact = message.strip().lower().replace(" ", "")
+
+    if any(cue in compact for cue in ADVICE_CUES):
+        return None
+    if not has_period and not any(cue in compact for cue in HISTORY_CUES):
+        return None
+
+    aggregation = next(
+        (agg for agg, keywords in AGGREGATIONS if any(k in compact for k in keywords)),
+        None,
+    )
+    if aggregation is None:
+        return None
+
+    for field, label, unit, keywords in METRICS:
+        if any(keyword in compact for keyword in keywords):
+            return {
+                "metric": field,
+                "label": label,
+                "unit": unit,
+                "aggregation": aggregation,
+            }
+    return None
+
+
+# ================================================================
+#  2) 계산
+# ================================================================
+def metric_value(item: dict, metric: str):
+    """조회 결과 item의 지표 값 (없음 / 0이면 None, 건강 점수는 item 필드)"""
+    value = (
+        item.get("health_score")
+        if metric == "health_score"
+        else (item.get("raw") or {}).get(metric)
+    )
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value == 0:
+        return None
+    return value
+
+
+def compute_aggregate(items: list[dict], query: dict, top_n: int = 3) -> dict:
+    """
+    날짜별 조회 결과에서 집계 계산
+
+    Returns:
+        query + value / count / start_date / end_date / rows
+        - max / min: 값 순 상위 top_n일 (같은 값이면 최신 날짜 먼저)
+        - avg: 평균, rows = 최고 / 최저일
+        - trend: 하루당 변화량(최소제곱 기울기) + 방향, rows = 첫날 / 마지막 날
+        값이 있는 날이 없으면 value None, rows []
+    """
+    metric, aggregation = query["metric"], query["aggregation"]
+    valued = [
+        (item, value)
+        for item in items
+        if (value := metric_value(item, metric)) is not None and item.get("date")
+    ]
+    # 날짜 오름차순
+    valued.sort(key=lambda pair: pair[0]["date"])
+
+    result = {
+        **query,
+        "value": None,
+        "count": len(valued),
+        "start_date": valued[0][0]["date"] if valued else None,
+        "end_date": valued[-1][0]["date"] if valued else None,
+        "rows": [],
+    }
+    if not valued:
+        return result
+
+    values = [value for _, value in valued]
+
+    if aggregation in ("max", "min"):
+        # 최신 날짜 먼저 → 안정 정렬로 같은 값은 최신 날짜 우선
+        ranked = sorted(
+            reversed(valued),
+            key=lambda pair: pair[1],
+            reverse=aggregation == "max",
+        )
+        result["value"] = ranked[0][1]
+        result["rows"] = [item for item, _ in ranked[:top_n]]
+
+    elif aggregation == "avg":
+        result["value"] = sum(values) / len(values)
+        high = max(reversed(valued), key=lambda pair: pair[1])[0]
+        low = min(reversed(valued), key=lambda pair: pair[1])[0]
+        result["rows"] = [high] if high is low else [high, low]
+
+    else:  # trend
+        days = [date_cls.fromisoformat(item["date"]).toordinal() for item, _ in valued]
+        slope = _slope(days, values)
+        change = slope * (days[-1] - days[0])
+        mean = sum(values) / len(values)
+
+        if len(valued) < 2 or abs(change) < abs(mean) * TREND_FLAT_RATIO:
+            direction = "유지"
+        else:
+            direction = "증가" if change > 0 else "감소"
+
+        result["value"] = slope
+        result["trend"] = {
+            "slope_per_day": slope,
+            "change": change,
+            "mean": mean,
+            "first": values[0],
+            "last": values[-1],
+            "direction": direction,
+        }
+        result["rows"] = [valued[0][0]] + ([valued[-1][0]] if len(valued) > 1 else [])
+
+    return result
+
+
+def _slope(xs: list[int], ys: list[float]) -> float:
+    """최소제곱 기울기 (x가 모두 같으면 0)"""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+# ================================================================
+#  3) LLM 컨텍스트 포맷팅
+# ================================================================
+def _format_value(value, unit: str) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:,.1f}{unit}"
+    return f"{value:,.0f}{unit}"
+
+
+def format_aggregate(result: dict) -> str:
+    """compute_aggregate 결과 → 답변에 그대로 인용할 계산 결과 텍스트"""
+    label, unit = result["label"], result["unit"]
+    title = f"{label} {AGGREGATION_LABELS[result['aggregation']]}"
+
+    if result["value"] is None:
+        return f"[{title}] 해당 기간에 {label} 데이터 없음"
+
+    period = f"{result['start_date']} ~ {result['end_date']}, {result['count']}일 기준"
+    lines = [f"[{title} ({period})]"]
+
+    if result["aggregation"] in ("max", "min"):
+        for rank, item in enumerate(result["rows"], 1):
+            value = metric_value(item, result["metric"])
+            lines.append(f"{rank}. {item['date']}: {_format_value(value, unit)}")
+
+    elif result["aggregation"] == "avg":
+        lines.append(f"평균: {_format_value(result['value'], unit)}")
+        high, low = result["rows"][0], result["rows"][-1]
+        high_value = metric_value(high, result["metric"])
+        low_value = metric_value(low, result["metric"])
+        lines.append(f"최고: {high['date']} {_format_value(high_value, unit)}")
+        lines.append(f"최저: {low['date']} {_format_value(low_value, unit)}")
+
+    else:
+        trend = result["trend"]
+        lines.append(
+            f"{_format_value(trend['first'], unit)} → "
+            f"{_format_value(trend['last'], unit)} "
+            f"(하루 평균 {trend['slope_per_day']:+,.2f}{unit}, {trend['direction']})"
+        )
+
+    return "\n".join(lines)
@@ -2,6 +2,7 @@
 Chat Generator - 개선 버전
 - 기본: 최신 데이터 기반 응답
 - 시간 표현 감지: 해당 날짜/기간 데이터 사용
+- 지표 집계 질문: 직접 계산한 결과(날짜 / 수치)를 그대로 전달
 - 비교/패턴 키워드: 의미 유사도 검색 활용
 """
 
@@ -12,6 +13,7 @@ from openai import OpenAI
 from app.core.chatbot_engine.intent_classifier import classify_intent
 from app.core.chatbot_engine.persona import get_persona_prompt
 from app.core.chatbot_engine.rag_query import query_health_data
+from app.core.chatbot_engine.analytic_query import format_aggregate
 from app.core.llm_analysis import run_llm_analysis
 from app.core.health_interpreter import (
     interpret_health_data,
@@ -96,6 +98,10 @@ class ChatGenerator:
         similar = rag_result.get("similar_days", [])
         mode = rag_result.get("mode", "unknown")
 
+        # 지표 집계 결과 (계산된 날짜 / 수치)
+        if mode == "aggregate":
+            return format_aggregate(rag_result["aggregate"])
+
         if not similar:
             return "데이터 없음"
 
@@ -219,8 +225,17 @@ class ChatGenerator:
             # 데이터 컨텍스트 생성
             data_context = self._format_data_context(rag, message)
 
+            # 지표 집계 모드: 계산 결과를 그대로 인용
+            if mode == "aggregate":
+                system = self._build_system_prompt(persona_prompt, "comparison")
+                user_prompt = f"""질문: {message}
+
+{data_context}
+
+**계산 결과의 날짜와 수치를 그대로 사용해 2-3문장으로 답변하세요.**"""
+
             # 비교/패턴 모드면 다른 프롬프트
-            if use_similarity and len(similar) > 1:
+            elif use_similarity and len(similar) > 1:
                 system = self._build_system_prompt(persona_prompt, "comparison")
                 user_prompt = f"""질문: {message}
 
@@ -2,6 +2,7 @@
 Intent Classifier - 개선 버전
 - 시간 표현 감지 추가
 - 비교/패턴 키워드 감지 추가
+- 지표 집계 질문 감지 추가 (가장 많이 / 최고 / 최저 / 평균 / 추이)
 - 규칙 기반만 사용 (LLM 호출 없음)
 """
 
@@ -9,6 +10,8 @@ import time
 import re
 from datetime import datetime, timedelta
 
+from app.core.chatbot_engine.analytic_query import parse_analytic_query
+
 # ================================================================
 #  캐싱 (5분 TTL)
 # ================================================================
@@ -365,7 +368,8 @@ def classify_intent(message: str) -> dict:
         {
             "intent": "health_query" | "routine_request" | "default_chat",
             "time_context": { ... } | None,
-            "use_similarity": True | False
+            "use_similarity": True | False,
+            "analytic": {"metric", "aggregation", ...} | None
         }
     """
     # 캐시 확인
@@ -379,16 +383,20 @@ def classify_intent(message: str) -> dict:
     # 2) 비교/패턴 키워드 감지
     use_similarity = detect_comparison_pattern(message)
 
-    # 3) 기본 intent 분류
+    # 3) 지표 집계 질문 감지 (예: "언제 가장 많이 걸었어?" → steps 최댓값)
+    analytic = parse_analytic_query(message, has_period=time_context["detected"])
+
+    # 4) 기본 intent 분류
     base_intent = _rule_based_intent(message)
 
-    if not base_intent:
-        base_intent = "default_chat"
+    if not base_intent or (analytic and base_intent != "routine_request"):
+        base_intent = "health_query" if analytic else "default_chat"
 
     result = {
         "intent": base_intent,
         "time_context": time_context if time_context["detected"] else None,
         "use_similarity": use_similarity,
+        "analytic": analytic,
     }
 
     _cache_set(message, result)
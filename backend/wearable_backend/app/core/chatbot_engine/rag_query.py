@@ -2,6 +2,7 @@
 RAG Query - 개선 버전
 - 기본: 최신 데이터
 - 시간 표현 감지: 해당 기간 필터링
+- 지표 집계 질문: 저장된 날짜별 지표에서 직접 계산 (임베딩 없음)
 - 비교/패턴 키워드: 의미 유사도 검색
 """
 
@@ -12,7 +13,9 @@ from app.core.vector_store import (
     get_recent_summaries,
     get_summaries_by_date,
     get_summaries_by_date_range,
+    get_all_summaries,
 )
+from app.core.chatbot_engine.analytic_query import compute_aggregate
 
 
 # ------------------------------------------------------------
@@ -152,7 +155,45 @@ def query_by_similarity(message: str, user_id: str, top_k: int = 5) -> dict:
 
 
 # ------------------------------------------------------------
-# 7) 통합 쿼리 함수 (메인)
+# 7) 지표 집계 (가장 많이 / 최고 / 최저 / 평균 / 추이)
+# ------------------------------------------------------------
+def query_by_aggregation(
+    user_id: str, analytic: dict, time_context: dict | None = None
+) -> dict:
+    """
+    저장된 날짜별 지표에서 max / min / avg / trend 직접 계산 (의미 유사도 검색 없음)
+
+    Args:
+        user_id: 사용자 ID
+        analytic: parse_analytic_query() 결과
+        time_context: 기간 (없으면 전체 기록)
+
+    Returns:
+        {"similar_days": [...정확한 행], "count": int, "mode": "aggregate",
+         "aggregate": compute_aggregate() 결과}
+    """
+    if time_context and time_context["type"] == "range":
+        items = get_summaries_by_date_range(
+            user_id, time_context["start_date"], time_context["end_date"]
+        )
+    elif time_context and time_context["type"] == "specific":
+        items = get_summaries_by_date(user_id, time_context["target_date"])
+    else:
+        items = get_all_summaries(user_id)
+
+    aggregate = compute_aggregate(items, analytic)
+    rows = aggregate["rows"]
+
+    return {
+        "similar_days": _clean_results(rows),
+        "count": len(rows),
+        "mode": "aggregate",
+        "aggregate": aggregate,
+    }
+
+
+# ------------------------------------------------------------
+# 8) 통합 쿼리 함수 (메인)
 # ------------------------------------------------------------
 def query_health_data(
     message: str, user_id: str, intent_result: dict = None, top_k: int = 3
@@ -163,7 +204,8 @@ def query_health_data(
     동작 방식:
     1. 시간 표현 없고 비교/패턴 아님 → 최신 데이터
     2. 시간 표현 있음 → 해당 날짜/기간 필터링
-    3. 비교/패턴 키워드 있음 → 의미 유사도 검색
+    3. 지표 집계 질문 → 해당 기간(없으면 전체) 직접 계산 (하루 지정이면 2와 동일)
+    4. 비교/패턴 키워드 있음 → 의미 유사도 검색
 
     Args:
         message: 사용자 질문
@@ -184,6 +226,13 @@ def query_health_data(
 
     time_context = intent_result.get("time_context")
     use_similarity = intent_result.get("use_similarity", False)
+    analytic = intent_result.get("analytic")
+
+    # Case 0: 지표 집계 질문 → 직접 계산 (기간이 있으면 그 기간만)
+    # 하루 지정("어제 평균 심박")은 집계할 날이 하나뿐 → 날짜 조회(Case 2)
+    single_day = time_context and time_context["type"] == "specific"
+    if analytic and not single_day:
+        return query_by_aggregation(user_id, analytic, time_context)
 
     # Case 1: 비교/패턴 키워드 → 의미 유사도 검색
     if use_similarity:
@@ -219,7 +268,7 @@ def query_health_data(
 
 
 # ------------------------------------------------------------
-# 8) 하위 호환용 (기존 코드 호환)
+# 9) 하위 호환용 (기존 코드 호환)
 # ------------------------------------------------------------
 def query_health_data_legacy(message: str, user_id: str, top_k: int = 3) -> dict:
     """
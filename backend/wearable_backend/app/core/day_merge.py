@@ -0,0 +1,141 @@
+"""
+같은 날짜 여러 출처 summary 병합 (저장 시점, 필드 단위)
+
+doc_id가 {user}_{date}_{source}이던 때는 같은 날짜가 출처마다 최대 4번
+(api_samsung / zip_samsung / api_apple / zip_apple) 저장되고, 조회할 때마다
+_deduplicate_by_date로 updated_at 최신 문서 하나만 남겨서 다른 출처에만 있는 필드는 버려졌다.
+
+- 출처별 원본 summary는 summary_store의 summary_sources에 보관 (다시 병합할 때 사용)
+- 날짜별 문서 1개 (doc_id = {user}_{date}, 벡터 1개)에 병합 결과를 저장
+- 필드마다 우선순위가 가장 높은 출처 중 값이 있는(0 / None이 아닌) 값을 사용
+  (normalize_raw가 측정 안 된 값을 0으로 채우므로 0은 "없음"으로 본다)
+- 함께 바뀌어야 하는 필드(수면 분/시간, 혈압, 심박 분포)는 묶음 단위로 한 출처에서 가져옴
+- provenance: {필드: 출처}, sources: 병합에 쓴 출처 (우선순위 순)
+
+우선순위: FIELD_SOURCE_PRECEDENCE[필드] → SOURCE_PRECEDENCE → 최근 저장 순
+(설정이 없으면 최근 저장한 출처 우선 = 이전 중복 제거와 같은 문서가 기준)
+"""
+
+from app.config import SOURCE_PRECEDENCE, FIELD_SOURCE_PRECEDENCE
+from app.utils.preprocess import generate_summary_text
+
+# 한 출처에서 함께 가져오는 필드 묶음
+FIELD_GROUPS = (
+    ("sleep_min", "sleep_hr"),
+    ("systolic", "diastolic"),
+    (
+        "heart_rate_p5",
+        "heart_rate_p50",
+        "heart_rate_p95",
+        "hr_zone1_pct",
+        "hr_zone2_pct",
+        "hr_zone3_pct",
+        "hr_zone4_pct",
+        "hr_zone5_pct",
+    ),
+)
+_GROUP_OF = {field: group for group in FIELD_GROUPS for field in group}
+
+# 다른 출처 값으로 다시 계산하는 필드
+DERIVED = "derived"
+
+
+def day_document_id(user_id: str, date: str) -> str:
+    """날짜별 병합 문서 id (예: "user_1@aaa.com_2024-10-01")"""
+    return f"{user_id}_{date}"
+
+
+def _present(value) -> bool:
+    return value is not None and value != 0 and value != ""
+
+
+def source_order(updated_at: dict[str, str], precedence: list[str]) -> list[str]:
+    """precedence에 있는 출처 먼저 (그 순서), 나머지는 updated_at 최신순"""
+    listed = [source for source in precedence if source in updated_at]
+    rest = sorted(
+        (source for source in updated_at if source not in listed),
+        key=lambda source: (updated_at[source], source),
+        reverse=True,
+    )
+    return listed + rest
+
+
+def _field_precedence(group: tuple[str, ...]) -> list[str]:
+    for field in group:
+        if field in FIELD_SOURCE_PRECEDENCE:
+            return FIELD_SOURCE_PRECEDENCE[field]
+    return SOURCE_PRECEDENCE
+
+
+def merge_day(records: dict[str, dict]) -> dict:
+    """
+    같은 날짜 출처별 summary → 병합 summary
+
+    Args:
+        records: {source: {"summary": summary, "updated_at": "YYYYmmddHHMMSS"}}
+
+    Returns:
+        summary 형식 + sources (우선순위 순) + provenance ({필드: 출처})
+        (출처가 하나면 raw / summary_text는 그 출처 그대로)
+    """
+    updated_at = {source: record["updated_at"] for source, record in records.items()}
+    order = source_order(updated_at, SOURCE_PRECEDENCE)
+    primary = records[order[0]]["summary"]
+    raws = {source: records[source]["summary"].get("raw", {}) for source in order}
+
+    if len(order) == 1:
+        raw = primary.get("raw", {})
+        provenance = {
+            field: order[0] for field, value in raw.items() if _present(value)
+        }
+        return {**primary, "sources": order, "provenance": provenance}
+
+    # 필드 순서: 기준 출처 raw 순서 + 다른 출처에만 있는 필드
+    fields = list(dict.fromkeys(field for raw in raws.values() for field in raw))
+
+    raw, provenance = {}, {}
+    for field in fields:
+        if field in raw:
+            continue
+        group = _GROUP_OF.get(field, (field,))
+        group_order = source_order(updated_at, _field_precedence(group))
+
+        chosen = next(
+            (
+                source
+                for source in group_order
+                if any(_present(raws[source].get(f)) for f in group)
+            ),
+            None,
+        )
+        for f in group:
+            if chosen is None:
+                raw[f] = raws[order[0]].get(f, 0)
+            else:
+                raw[f] = raws[chosen].get(f, 0)
+                provenance[f] = chosen
+
+    # BMI: 체중 / 키를 다른 출처에서 가져왔으면 병합된 값으로 다시 계산
+    weight, height = raw.get("weight", 0), raw.get("height_m", 0)
+    if (
+        _present(weight)
+        and _present(height)
+        and provenance.get("bmi") != provenance.get("weight")
+    ):
+        raw["bmi"] = weight / (height**2)
+        provenance["bmi"] = DERIVED
+
+    raw = {field: raw[field] for field in fields if field in raw}
+    try:
+        summary_text = generate_summary_text(raw)
+    except (KeyError, TypeError):
+        summary_text = primary.get("summary_text", "")
+
+    return {
+        "created_at": primary.get("created_at"),
+        "summary_text": summary_text,
+        "raw": raw,
+        "platform": primary.get("platform", "unknown"),
+        "sources": order,
+        "provenance": provenance,
+    }
@@ -2,6 +2,12 @@ import statistics
 from typing import Dict
 from datetime import datetime, timezone, timedelta
 
+from app.core.heart_rate_series import (
+    new_heart_rate_sketch,
+    add_heart_rate_sample,
+    heart_rate_summary,
+)
+
 
 # =============================================================
 # 내부 유틸
@@ -65,7 +71,7 @@ def _init_day_bucket():
         "total_calories": [],
         "active_calories": [],
         # Vitals
-        "heart_rate": [],
+        "heart_rate": new_heart_rate_sketch(),  # 샘플 리스트 대신 고정 크기 분포 요약
         "resting_heart_rate": [],
         "oxygen_saturation": [],
     }
@@ -86,6 +92,8 @@ def parse_db_json_to_raw_data_by_day(db_json: dict) -> Dict[int, dict[str, float
     - steps, distance, stepsCadence
     - totalCaloriesBurned, calories
     - heartRate, restingHeartRate, oxygenSaturation
+    (+ 심박수 분포 요약: heart_rate_p5/p50/p95, min_overnight_heart_rate,
+       hr_zone1_pct ~ hr_zone5_pct)
 
     return:
       {
@@ -171,7 +179,9 @@ def parse_db_json_to_raw_data_by_day(db_json: dict) -> Dict[int, dict[str, float
         if date is None:
             continue
 
-        add(date, "heart_rate", bpm)
+        if date not in grouped:
+            grouped[date] = _init_day_bucket()
+        add_heart_rate_sample(grouped[date]["heart_rate"], bpm, epoch_millis)
 
     # ---------------------------------------------------------
     # 휴식기 심박수
@@ -233,6 +243,7 @@ def parse_db_json_to_raw_data_by_day(db_json: dict) -> Dict[int, dict[str, float
 
     for date_key, d in grouped.items():
         sleep_min = _total(d["sleep"])
+        hr = d["heart_rate"]
 
         result_by_day[date_key] = {
             # Sleep
@@ -249,9 +260,10 @@ def parse_db_json_to_raw_data_by_day(db_json: dict) -> Dict[int, dict[str, float
             "totalCaloriesBurned": _total(d["total_calories"]),
             "calories": _total(d["active_calories"]),
             # Vitals
-            "heartRate": _mean(d["heart_rate"]),
+            "heartRate": hr["sum"] / hr["count"] if hr["count"] else 0,
             "restingHeartRate": _mean(d["resting_heart_rate"]),
             "oxygenSaturation": _mean(d["oxygen_saturation"]),
+            **heart_rate_summary(hr),
         }
 
     return result_by_day
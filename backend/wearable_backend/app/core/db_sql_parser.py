@@ -0,0 +1,200 @@
+"""
+Health Connect SQLite SQL pushdown 파서
+
+parse_db_json_to_raw_data_by_day가 하는 일은 대부분
+local_date 기준 GROUP BY + SUM/AVG 이므로, 이를 SQLite에 그대로 맡긴다.
+
+- 레코드 테이블마다 집계 쿼리 1개 (QUERY_PLAN)
+- heart_rate_record_series_table은 local_date가 없어 행마다 날짜 계산이 필요하므로
+  SQLite 행 단위 연산 대신 heart_rate_series(NumPy)로 버킷팅 (시간대 오프셋 지정 가능)
+- 테이블별 쿼리는 서로 독립적이라 스레드별 연결에서 동시에 실행
+  (sqlite3는 쿼리 실행 중 GIL을 놓고, 집계 결과 행은 날짜 수만큼이라 fetch 부담이 작음)
+- 결과 구조는 parse_db_json_to_raw_data_by_day와 동일
+  (Python 파서는 기준 구현으로 유지, test/test_db_parser_equivalence.py 참고)
+"""
+
+import sqlite3
+from typing import Dict
+
+from app.core.heart_rate_series import DEFAULT_TZ_OFFSET_MINUTES, heart_rate_by_day
+from app.core.sqlite_reader import (
+    DEFAULT_SCAN_WORKERS,
+    open_readonly,
+    run_parallel_scans,
+)
+from app.core.db_stream_parser import (
+    list_tables,
+    table_columns,
+    _init_stream_bucket,
+    build_raw_json,
+)
+
+# =============================================================
+# 쿼리 계획
+# =============================================================
+# 각 항목은 테이블 1개에 대한 집계 쿼리 1개로 변환된다.
+# (heart_rate_record_series_table은 heart_rate_by_day에서 별도 처리)
+# - date:    날짜 키 표현식 (기본 local_date)
+# - value:   집계할 값 표현식 ({컬럼} 자리에 실제 컬럼 또는 NULL)
+# - where:   기존 파서의 skip 조건과 동일한 필터
+# - columns: 값/필터에 쓰이는 컬럼 (없으면 NULL로 대체 → row.get 기본값과 동일)
+QUERY_PLAN = [
+    {
+        "table": "steps_record_table",
+        "key": "steps",
+        "value": "COALESCE({count}, 0)",
+        "columns": ["count"],
+    },
+    {
+        "table": "distance_record_table",
+        "key": "distance",
+        "value": "COALESCE({distance}, 0)",
+        "columns": ["distance"],
+    },
+    {
+        "table": "total_calories_burned_record_table",
+        "key": "total_calories",
+        "value": "COALESCE({energy}, 0) / 1000.0",
+        "columns": ["energy"],
+    },
+    {
+        "table": "active_calories_burned_record_table",
+        "key": "active_calories",
+        "value": "COALESCE({energy}, 0) / 1000.0",
+        "columns": ["energy"],
+    },
+    {
+        "table": "resting_heart_rate_record_table",
+        "key": "resting_heart_rate",
+        "value": "COALESCE({value}, 0)",
+        "columns": ["value"],
+    },
+    {
+        "table": "oxygen_saturation_record_table",
+        "key": "oxygen_saturation",
+        "value": "COALESCE({percentage}, 0)",
+        "columns": ["percentage"],
+    },
+    {
+        "table": "weight_record_table",
+        "key": "weight",
+        "value": (
+            "CASE WHEN COALESCE({weight}, 0) > 0 THEN {weight} / 1000.0"
+            " ELSE COALESCE({weight}, 0) END"
+        ),
+        "columns": ["weight"],
+    },
+    {
+        "table": "height_record_table",
+        "key": "height",
+        "value": "COALESCE({height}, 0)",
+        "columns": ["height"],
+    },
+    {
+        "table": "sleep_session_record_table",
+        "key": "sleep",
+        "value": "({end_time} - {start_time}) / 1000.0 / 60",
+        "where": "{start_time} != 0 AND {end_time} != 0",
+        "columns": ["start_time", "end_time"],
+    },
+]
+
+
+def build_aggregate_sql(plan: dict, existing_columns: set) -> str | None:
+    """
+    쿼리 계획 1개 → SELECT date, SUM(value), COUNT(*) ... GROUP BY date
+
+    날짜 컬럼(local_date)이 없는 테이블은 기존 파서에서도 모두 skip 되므로 None
+    """
+    if "date" not in plan and "local_date" not in existing_columns:
+        return None
+
+    cols = {
+        col: (col if col in existing_columns else "NULL") for col in plan["columns"]
+    }
+
+    date_expr = plan.get("date", "local_date").format(**cols)
+    value_expr = plan["value"].format(**cols)
+
+    conditions = [f"{date_expr} IS NOT NULL"]
+    if plan.get("where"):
+        conditions.append(plan["where"].format(**cols))
+
+    return (
+        f"SELECT {date_expr} AS d, SUM({value_expr}), COUNT(*) "
+        f"FROM {plan['table']} "
+        f"WHERE {' AND '.join(conditions)} "
+        f"GROUP BY d;"
+    )
+
+
+# =============================================================
+# 날짜별 raw_json 생성 (SQL 집계)
+# =============================================================
+
+
+def _aggregate_task(table: str, sql: str):
+    """집계 쿼리 1개 → 스캔 작업 (실패한 테이블은 기존과 같이 건너뜀)"""
+
+    def task(conn: sqlite3.Connection) -> list:
+        try:
+            return conn.execute(sql).fetchall()
+        except sqlite3.Error as e:
+            print(f"[WARN] {table} 집계 실패 (건너뜀): {e}")
+            return []
+
+    return task
+
+
+def parse_db_file_to_raw_data_by_day_sql(
+    db_path: str,
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+    scan_workers: int = DEFAULT_SCAN_WORKERS,
+) -> Dict[int, dict]:
+    """
+    Health Connect SQLite DB 파일을 테이블별 집계 쿼리로 파싱한다.
+    tz_offset_minutes: 심박수 series 날짜 버킷팅 시간대 (분, 기본 KST)
+    scan_workers: 동시 스캔 스레드 수 (1이면 연결 1개로 순차)
+
+    return:
+      {
+        local_date(int): raw_json(dict),
+        ...
+      }
+    """
+    # 쿼리 계획 (테이블 / 컬럼 목록만 조회)
+    conn = open_readonly(db_path)
+    try:
+        tables = list_tables(conn)
+        if not tables:
+            raise ValueError("DB 내부에 테이블이 없습니다.")
+
+        # 가장 큰 심박수 series 스캔을 먼저 시작
+        tasks = {"heart_rate": lambda c: heart_rate_by_day(c, tz_offset_minutes)}
+        for plan in QUERY_PLAN:
+            if plan["table"] not in tables:
+                continue
+
+            sql = build_aggregate_sql(plan, table_columns(conn, plan["table"]))
+            if sql is not None:
+                tasks[plan["key"]] = _aggregate_task(plan["table"], sql)
+    finally:
+        conn.close()
+
+    results = run_parallel_scans(db_path, tasks, scan_workers)
+
+    grouped = {}
+
+    for plan in QUERY_PLAN:
+        for date_key, total, count in results.get(plan["key"], []):
+            if date_key not in grouped:
+                grouped[date_key] = _init_stream_bucket()
+            grouped[date_key][plan["key"]] = [total or 0, count]
+
+    for date_key, stats in results["heart_rate"].items():
+        if date_key not in grouped:
+            grouped[date_key] = _init_stream_bucket()
+        grouped[date_key]["heart_rate"] = [stats["sum"], stats["count"]]
+        grouped[date_key]["heart_rate_sketch"] = stats
+
+    return {date_key: build_raw_json(d) for date_key, d in grouped.items()}
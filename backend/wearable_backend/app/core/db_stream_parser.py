@@ -0,0 +1,273 @@
+"""
+Health Connect SQLite 스트리밍 파서
+
+db_to_json → parse_db_json_to_raw_data_by_day 경로는
+DB 전체 테이블을 dict로 올리고 BLOB을 base64로 인코딩한 뒤에야 파싱을 시작한다.
+
+이 모듈은 파서가 실제로 사용하는 테이블/컬럼만 SELECT 하고,
+커서를 chunk 단위로 순회하면서 날짜별 누적값(합계/개수)에 바로 더한다.
+- 전체 JSON / base64 payload를 만들지 않음
+- 날짜별 메모리는 항목 수만큼의 고정 크기 (행 수와 무관)
+- 심박수 series는 heart_rate_series에서 NumPy로 날짜 버킷팅
+  (SQLite 스캔이 대부분이라 나머지 테이블 누적과 별도 연결에서 동시에 실행)
+- 결과 구조는 parse_db_json_to_raw_data_by_day와 동일
+"""
+
+import sqlite3
+from typing import Dict, Iterator
+
+from app.core.sqlite_reader import (
+    DEFAULT_SCAN_WORKERS,
+    open_readonly,
+    run_parallel_scans,
+)
+from app.core.heart_rate_series import (
+    DEFAULT_TZ_OFFSET_MINUTES,
+    heart_rate_by_day,
+    heart_rate_summary,
+)
+
+# fetchmany 단위 (행)
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# =============================================================
+# 내부 유틸
+# =============================================================
+
+
+def list_tables(conn: sqlite3.Connection) -> set:
+    """DB 내부 테이블 이름 집합"""
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+    return {name for (name,) in rows}
+
+
+def list_db_tables(db_path: str) -> set:
+    """DB 파일의 테이블 이름 집합 (플랫폼 감지용, 데이터는 읽지 않음)"""
+    conn = open_readonly(db_path)
+    try:
+        return list_tables(conn)
+    finally:
+        conn.close()
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> set:
+    """테이블의 컬럼 이름 집합"""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table});")}
+
+
+def iter_table_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: list[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple]:
+    """
+    필요한 컬럼만 chunk 단위로 읽어 tuple로 반환한다.
+
+    - 테이블에 없는 컬럼은 NULL로 채운다 (기존 row.get(col) 동작과 동일)
+    - 테이블이 없으면 아무것도 반환하지 않는다
+    """
+    existing = table_columns(conn, table)
+    if not existing:
+        return
+
+    select_cols = ", ".join(col if col in existing else "NULL" for col in columns)
+
+    try:
+        cursor = conn.execute(f"SELECT {select_cols} FROM {table};")
+    except sqlite3.Error:
+        return
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def _init_stream_bucket():
+    """
+    날짜별 누적 bucket: 항목별 [합계, 개수]
+    (_init_day_bucket의 리스트 대신 고정 크기)
+    """
+    bucket = {
+        key: [0, 0]
+        for key in (
+            "sleep",
+            "weight",
+            "height",
+            "steps",
+            "distance",
+            "steps_cadence",
+            "total_calories",
+            "active_calories",
+            "heart_rate",
+            "resting_heart_rate",
+            "oxygen_saturation",
+        )
+    }
+    # 심박수 분포 요약 (heart_rate_by_day 날짜별 통계, 샘플이 없으면 None)
+    bucket["heart_rate_sketch"] = None
+    return bucket
+
+
+def _acc_total(acc):
+    return acc[0] if acc[1] else 0
+
+
+def _acc_mean(acc):
+    return acc[0] / acc[1] if acc[1] else 0
+
+
+def build_raw_json(d: dict) -> dict:
+    """누적 bucket → raw_json (parse_db_json_to_raw_data_by_day와 동일한 항목)"""
+    sleep_min = _acc_total(d["sleep"])
+
+    return {
+        # Sleep
+        "sleep": sleep_min,
+        "sleep_hr": sleep_min / 60 if sleep_min > 0 else 0,
+        # Body
+        "weight": _acc_mean(d["weight"]),
+        "height": _acc_mean(d["height"]),
+        # Activity
+        "steps": _acc_total(d["steps"]),
+        "distance": _acc_total(d["distance"]),
+        "stepsCadence": _acc_mean(d["steps_cadence"]),
+        # Calories
+        "totalCaloriesBurned": _acc_total(d["total_calories"]),
+        "calories": _acc_total(d["active_calories"]),
+        # Vitals
+        "heartRate": _acc_mean(d["heart_rate"]),
+        "restingHeartRate": _acc_mean(d["resting_heart_rate"]),
+        "oxygenSaturation": _acc_mean(d["oxygen_saturation"]),
+        **heart_rate_summary(d["heart_rate_sketch"]),
+    }
+
+
+# =============================================================
+# 날짜별 raw_json 생성 (스트리밍)
+# =============================================================
+
+
+def _stream_record_tables(conn: sqlite3.Connection, chunk_size: int) -> dict:
+    """심박수 series 이외의 레코드 테이블 → 날짜별 누적 bucket"""
+    grouped = {}
+
+    def add(date_key, key, value):
+        if date_key not in grouped:
+            grouped[date_key] = _init_stream_bucket()
+        acc = grouped[date_key][key]
+        acc[0] += value or 0
+        acc[1] += 1
+
+    # -----------------------------------------------------
+    # local_date + 단일 값 컬럼 테이블 (합계/평균)
+    # -----------------------------------------------------
+    simple_tables = [
+        ("steps_record_table", "count", "steps"),
+        ("distance_record_table", "distance", "distance"),
+        ("resting_heart_rate_record_table", "value", "resting_heart_rate"),
+        ("oxygen_saturation_record_table", "percentage", "oxygen_saturation"),
+        ("height_record_table", "height", "height"),
+    ]
+    for table, column, key in simple_tables:
+        for date, value in iter_table_rows(
+            conn, table, ["local_date", column], chunk_size
+        ):
+            if date is None:
+                continue
+            add(date, key, value)
+
+    # -----------------------------------------------------
+    # 칼로리 (energy = millikalories)
+    # -----------------------------------------------------
+    calorie_tables = [
+        ("total_calories_burned_record_table", "total_calories"),
+        ("active_calories_burned_record_table", "active_calories"),
+    ]
+    for table, key in calorie_tables:
+        for date, energy in iter_table_rows(
+            conn, table, ["local_date", "energy"], chunk_size
+        ):
+            if date is None:
+                continue
+            add(date, key, (energy or 0) / 1000)
+
+    # -----------------------------------------------------
+    # 걸음 빈도 (step cadence)
+    # SQLite에서 samples는 BLOB이므로 기존 JSON 경로에서도
+    # list로 해석되지 않아 집계되지 않는다 → 동일하게 건너뜀
+    # -----------------------------------------------------
+
+    # -----------------------------------------------------
+    # 체중 (gram → kg)
+    # -----------------------------------------------------
+    for date, w in iter_table_rows(
+        conn, "weight_record_table", ["local_date", "weight"], chunk_size
+    ):
+        if date is None:
+            continue
+
+        w = w or 0
+        if w > 0:
+            w = w / 1000
+        add(date, "weight", w)
+
+    # -----------------------------------------------------
+    # 수면 (start~end → minutes)
+    # -----------------------------------------------------
+    for date, s, e in iter_table_rows(
+        conn,
+        "sleep_session_record_table",
+        ["local_date", "start_time", "end_time"],
+        chunk_size,
+    ):
+        if date is None or not s or not e:
+            continue
+
+        add(date, "sleep", (e - s) / 1000 / 60)
+
+    return grouped
+
+
+def parse_db_file_to_raw_data_by_day(
+    db_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+    scan_workers: int = DEFAULT_SCAN_WORKERS,
+) -> Dict[int, dict]:
+    """
+    Health Connect SQLite DB 파일을 직접 읽어 날짜별 raw_json을 생성한다.
+    (db_to_json을 거치지 않는 스트리밍 버전)
+    tz_offset_minutes: 심박수 series 날짜 버킷팅 시간대 (분, 기본 KST)
+    scan_workers: 동시 스캔 스레드 수 (1이면 연결 1개로 순차)
+
+    return:
+      {
+        local_date(int): raw_json(dict),
+        ...
+      }
+    """
+    if not list_db_tables(db_path):
+        raise ValueError("DB 내부에 테이블이 없습니다.")
+
+    # 심박수 series (epoch_millis → 날짜는 배열 단위로 계산, 가장 큰 테이블이라 먼저 시작)
+    results = run_parallel_scans(
+        db_path,
+        {
+            "heart_rate": lambda conn: heart_rate_by_day(conn, tz_offset_minutes),
+            "records": lambda conn: _stream_record_tables(conn, chunk_size),
+        },
+        scan_workers,
+    )
+
+    grouped = results["records"]
+    for date, stats in results["heart_rate"].items():
+        if date not in grouped:
+            grouped[date] = _init_stream_bucket()
+        grouped[date]["heart_rate"] = [stats["sum"], stats["count"]]
+        grouped[date]["heart_rate_sketch"] = stats
+
+    return {date_key: build_raw_json(d) for date_key, d in grouped.items()}
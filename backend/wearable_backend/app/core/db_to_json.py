@@ -1,40 +1,26 @@
-import sqlite3
-import json
 import base64
 
+from app.core.sqlite_reader import read_tables
 
-def db_to_json(db_path: str) -> dict:
+
+def db_to_json(db_path: str, workers: int = 1) -> dict:
     """
     SQLite .db 파일을 받아서 내부 모든 테이블을 JSON(dict) 형태로 변환한다.
     bytes(BLOB) 타입은 base64 문자열로 자동 변환한다.
-    """
 
-    try:
-        conn = sqlite3.connect(db_path)
-    except Exception as e:
-        raise ValueError(f"DB 파일을 열 수 없습니다: {str(e)}")
-
-    cursor = conn.cursor()
+    업로드 파일은 바뀌지 않으므로 읽기 전용 + immutable 연결로 읽는다.
+    workers > 1이면 테이블별로 동시에 읽는다 (sqlite_reader.read_tables).
+    (전체 행 fetch는 GIL 안에서 일어나므로 기본은 순차)
+    """
 
-    # 테이블 목록 읽기
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+    tables = read_tables(db_path, workers=workers)
 
     if not tables:
-        conn.close()
         raise ValueError("DB 내부에 테이블이 없습니다.")
 
     result = {}
 
-    for (table_name,) in tables:
-        try:
-            cursor.execute(f"SELECT * FROM {table_name};")
-            rows = cursor.fetchall()
-        except Exception:
-            continue
-
-        col_names = [col[0] for col in cursor.description]
-
+    for table_name, (col_names, rows) in tables.items():
         table_rows = []
         for row in rows:
             row_dict = {}
@@ -50,8 +36,6 @@ def db_to_json(db_path: str) -> dict:
 
         result[table_name] = table_rows
 
-    conn.close()
-
     if not result:
         raise ValueError("DB는 열렸지만 데이터를 읽을 수 없습니다.")
 
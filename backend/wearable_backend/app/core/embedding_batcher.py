@@ -0,0 +1,189 @@
+"""
+임베딩 배치 분할 + 동시 요청 + 재시도
+
+기존 batch_embed_texts는 텍스트 전체를 embeddings.create 한 번으로 보냈다.
+1,000일치 업로드는 provider 입력 제한에 걸리거나 한 번의 큰 요청이 되고,
+중간에 한 번 실패하면 전체를 다시 보내야 했다.
+
+- 개수(EMBEDDING_BATCH_SIZE) + 토큰 예산(EMBEDDING_BATCH_MAX_TOKENS)으로 연속 구간 분할
+- 최대 concurrency개 배치를 스레드에서 동시에 요청 (네트워크 대기라 GIL 영향 없음)
+- 실패한 배치만 지수 백오프 + full jitter로 재시도
+- 결과는 입력 순서 그대로, 처리량(texts/s)은 로그 + stats로 보고
+
+provider와 무관한 모듈이라 embed_fn / retryable만 받는다. (설정은 호출하는 쪽에서 전달)
+"""
+
+import math
+import time
+import random
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken 미설치 / 인코딩 파일 다운로드 불가
+    _ENCODING = None
+
+
+# ------------------------------------------------
+# 1) 토큰 수 추정 + 배치 분할
+# ------------------------------------------------
+def estimate_tokens(text: str) -> int:
+    """
+    입력 토큰 수 (tiktoken이 있으면 정확히, 없으면 넉넉하게 추정)
+
+    추정: ASCII 4글자당 1토큰 + 그 외(한글 등) 1글자당 1.5토큰
+    (실제보다 크게 잡아야 provider 요청 한도를 넘지 않음)
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / 4 + other_chars * 1.5) + 1
+
+
+def split_batches(
+    texts: list[str], batch_size: int, max_tokens: int
+) -> list[tuple[int, int]]:
+    """
+    texts → 연속 구간 [(start, end), ...]
+
+    각 구간은 batch_size개 이하, 추정 토큰 합 max_tokens 이하
+    (텍스트 하나가 max_tokens보다 크면 단독 배치)
+    """
+    batches = []
+    start, tokens = 0, 0
+
+    for i, text in enumerate(texts):
+        n_tokens = estimate_tokens(text)
+        if i > start and (i - start >= batch_size or tokens + n_tokens > max_tokens):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += n_tokens
+
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+# ------------------------------------------------
+# 2) 재시도
+# ------------------------------------------------
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """attempt번째 재시도 대기 시간 (exponential backoff + full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2**attempt)))
+
+
+def _call_with_retry(
+    embed_fn: Callable,
+    texts: list[str],
+    label: str,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    retryable: Callable[[Exception], bool] | None,
+) -> tuple[list, int]:
+    """배치 1개 요청 → (벡터 list, 재시도 횟수)"""
+    attempt = 0
+    while True:
+        try:
+            vectors = embed_fn(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(
+                    f"임베딩 결과 개수가 다릅니다. (요청 {len(texts)}, 응답 {len(vectors)})"
+                )
+            return vectors, attempt
+        except Exception as e:
+            if attempt >= max_retries or (retryable and not retryable(e)):
+                raise
+
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            attempt += 1
+            print(
+                f"[WARN] 임베딩 {label} 실패 ({type(e).__name__}: {e}), "
+                f"{delay:.2f}초 후 재시도 ({attempt}/{max_retries})"
+            )
+            time.sleep(delay)
+
+
+# ------------------------------------------------
+# 3) 분할 + 동시 요청
+# ------------------------------------------------
+def embed_in_batches(
+    texts: list[str],
+    embed_fn: Callable[[list[str]], list],
+    batch_size: int = 100,
+    max_tokens: int = 100_000,
+    concurrency: int = 4,
+    max_retries: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 20.0,
+    retryable: Callable[[Exception], bool] | None = None,
+    stats: dict | None = None,
+) -> list:
+    """
+    texts를 배치로 나눠 embed_fn을 최대 concurrency개 동시에 호출하고 입력 순서대로 반환
+
+    retryable(e): 재시도할 오류인지 (None이면 모든 오류 재시도)
+    stats: 전달하면 texts / batches / retries / elapsed_sec / texts_per_sec를 채움
+
+    재시도 후에도 실패한 배치가 있으면 남은 배치를 취소하고 그 오류를 그대로 올린다.
+    """
+    if not texts:
+        return []
+
+    batches = split_batches(texts, batch_size, max_tokens)
+    workers = max(1, min(concurrency, len(batches)))
+    started = time.perf_counter()
+
+    def run(index: int):
+        start, end = batches[index]
+        return _call_with_retry(
+            embed_fn,
+            texts[start:end],
+            f"배치 {index + 1}/{len(batches)}",
+            max_retries,
+            base_delay,
+            max_delay,
+            retryable,
+        )
+
+    if workers == 1:
+        results = [run(i) for i in range(len(batches))]
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = [pool.submit(run, i) for i in range(len(batches))]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            # 실패 시 아직 시작하지 않은 배치는 보내지 않음
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    vectors = [vector for batch_vectors, _ in results for vector in batch_vectors]
+    elapsed = time.perf_counter() - started
+    retries = sum(attempts for _, attempts in results)
+    throughput = len(texts) / elapsed if elapsed > 0 else float("inf")
+
+    # 검색 쿼리 같은 단일 텍스트는 로그 생략
+    if len(texts) > 1:
+        print(
+            f"[INFO] 임베딩 {len(texts)}개 완료: {len(batches)}배치 (동시 {workers}), "
+            f"재시도 {retries}회, {elapsed:.2f}초 ({throughput:.1f} texts/s)"
+        )
+
+    if stats is not None:
+        stats.update(
+            {
+                "texts": len(texts),
+                "batches": len(batches),
+                "concurrency": workers,
+                "retries": retries,
+                "elapsed_sec": round(elapsed, 4),
+                "texts_per_sec": round(throughput, 1),
+            }
+        )
+
+    return vectors
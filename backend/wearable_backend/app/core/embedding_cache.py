@@ -0,0 +1,278 @@
+"""
+임베딩 캐시 ((모델, 정규화 텍스트 hash) → 벡터)
+
+기존 vector_store.embedding_cache는 프로세스 안의 dict라
+- 크기 제한 없이 계속 커지고, 재시작하면 사라지고, uvicorn 워커끼리 공유되지 않았다
+- batch_embed_texts(업로드 배치 저장)는 아예 캐시를 보지 않았다
+
+2단계로 보관한다.
+- 메모리: 최근 사용 EMBEDDING_CACHE_MEMORY_ITEMS개 (LRU, 프로세스별)
+- 디스크: SQLite (float16으로 압축한 벡터, WAL 모드로 워커 간 공유)
+  전체 크기가 EMBEDDING_CACHE_MAX_BYTES를 넘으면 오래 안 쓴 항목부터 삭제 (LRU)
+
+get_embeddings가 두 단계에서 못 찾은 텍스트만 모아 embed_fn(provider)을 한 번 호출한다.
+같은 텍스트가 항상 같은 벡터가 되도록 새로 받은 벡터도 float16으로 반올림해서 반환한다.
+(코사인 유사도 오차 ~1e-4 수준)
+"""
+
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from app.config import (
+    EMBEDDING_CACHE_DB,
+    EMBEDDING_CACHE_MEMORY_ITEMS,
+    EMBEDDING_CACHE_MAX_BYTES,
+)
+
+# SQLite IN (...) 조회 한 번에 넣는 key 수
+_LOOKUP_CHUNK = 500
+
+# 메모리 LRU (cache_key → float16 bytes, 1536차원 기준 3KB) + 프로세스별 hit / miss 카운터
+_memory: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+_stats = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+# ------------------------------------------------
+# 1) key
+# ------------------------------------------------
+def normalize_text(text: str) -> str:
+    """유니코드 정규화(NFC) + 앞뒤 공백 제거 + 연속 공백을 한 칸으로"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    payload = f"{model}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------
+# 2) 디스크 (SQLite)
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(EMBEDDING_CACHE_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(EMBEDDING_CACHE_DB, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            cache_key   TEXT    PRIMARY KEY,
+            model       TEXT    NOT NULL,
+            dim         INTEGER NOT NULL,
+            vector      BLOB    NOT NULL,
+            size_bytes  INTEGER NOT NULL,
+            last_access REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_embedding_cache_access
+            ON embedding_cache(last_access);
+        """
+    )
+    return conn
+
+
+def _pack(vector) -> bytes:
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    return np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+
+def _disk_get_many(keys: list[str]) -> dict:
+    """{cache_key: float16 bytes} (찾은 항목은 last_access 갱신)"""
+    found = {}
+    conn = _connect()
+    try:
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start : start + _LOOKUP_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for key, blob in conn.execute(
+                "SELECT cache_key, vector FROM embedding_cache "
+                f"WHERE cache_key IN ({placeholders})",
+                chunk,
+            ):
+                found[key] = blob
+
+        if found:
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "UPDATE embedding_cache SET last_access = ? WHERE cache_key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+    finally:
+        conn.close()
+
+
+def _disk_put_many(model: str, entries: dict):
+    """{cache_key: float16 bytes} 저장 후 전체 크기 제한에 맞게 LRU 정리"""
+    now = time.time()
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(cache_key, model, dim, vector, size_bytes, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (key, model, len(blob) // 2, blob, len(blob), now)
+                    for key, blob in entries.items()
+                ],
+            )
+        _evict(conn)
+    finally:
+        conn.close()
+
+
+def _evict(conn: sqlite3.Connection):
+    """전체 크기가 EMBEDDING_CACHE_MAX_BYTES 이하가 될 때까지 오래된 항목 삭제"""
+    total = conn.execute(
+        "SELECT COALESCE(SUM(size_bytes), 0) FROM embedding_cache"
+    ).fetchone()[0]
+    if total <= EMBEDDING_CACHE_MAX_BYTES:
+        return
+
+    evicted = []
+    for key, size_bytes in conn.execute(
+        "SELECT cache_key, size_bytes FROM embedding_cache ORDER BY last_access"
+    ).fetchall():
+        if total <= EMBEDDING_CACHE_MAX_BYTES:
+            break
+        evicted.append((key,))
+        total -= size_bytes
+
+    with conn:
+        conn.executemany("DELETE FROM embedding_cache WHERE cache_key = ?", evicted)
+    print(f"[INFO] 임베딩 캐시 LRU 정리: {len(evicted)}개 항목 삭제")
+
+
+# ------------------------------------------------
+# 3) 메모리 LRU
+# ------------------------------------------------
+def _memory_get(key: str) -> bytes | None:
+    with _lock:
+        blob = _memory.get(key)
+        if blob is not None:
+            _memory.move_to_end(key)
+        return blob
+
+
+def _memory_put(key: str, blob: bytes):
+    with _lock:
+        _memory[key] = blob
+        _memory.move_to_end(key)
+        while len(_memory) > EMBEDDING_CACHE_MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+
+# ------------------------------------------------
+# 4) 조회 (캐시 miss만 provider 호출)
+# ------------------------------------------------
+def get_embeddings(
+    texts: list[str], model: str, embed_fn: Callable[[list[str]], list]
+) -> list[list[float]]:
+    """
+    texts 순서대로 임베딩 반환
+
+    메모리 → 디스크 순으로 찾고, 없는 텍스트만 (중복 제거 후) embed_fn 한 번 호출
+    embed_fn: list[str] → 같은 순서의 벡터 list
+    """
+    keys = [cache_key(model, text) for text in texts]
+    blobs = {}
+
+    for key in keys:
+        if key not in blobs:
+            blob = _memory_get(key)
+            if blob is not None:
+                blobs[key] = blob
+    memory_hits = len(blobs)
+
+    pending = list(dict.fromkeys(key for key in keys if key not in blobs))
+    disk_found = _disk_get_many(pending) if pending else {}
+    for key, blob in disk_found.items():
+        blobs[key] = blob
+        _memory_put(key, blob)
+
+    # 캐시에 없는 텍스트 → provider (같은 key는 첫 텍스트만)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in blobs and key not in missing:
+            missing[key] = text
+
+    if missing:
+        fresh = embed_fn(list(missing.values()))
+        packed = {key: _pack(vector) for key, vector in zip(missing, fresh)}
+        for key, blob in packed.items():
+            blobs[key] = blob
+            _memory_put(key, blob)
+        _disk_put_many(model, packed)
+
+    with _lock:
+        _stats["requests"] += len(keys)
+        _stats["memory_hits"] += memory_hits
+        _stats["disk_hits"] += len(disk_found)
+        _stats["misses"] += len(missing)
+
+    return [_unpack(blobs[key]) for key in keys]
+
+
+# ------------------------------------------------
+# 5) 통계 / 초기화
+# ------------------------------------------------
+def embedding_cache_stats() -> dict:
+    """
+    hit rate (이 프로세스 기준) + 메모리 / 디스크 항목 수와 크기
+
+    requests는 요청한 텍스트 수 (같은 요청 안의 중복 텍스트는 한 번만 hit/miss로 셈)
+    """
+    with _lock:
+        stats = dict(_stats)
+        memory_entries = len(_memory)
+        memory_bytes = sum(len(blob) for blob in _memory.values())
+
+    conn = _connect()
+    try:
+        disk_entries, disk_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM embedding_cache"
+        ).fetchone()
+    finally:
+        conn.close()
+
+    lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    return {
+        **stats,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "memory_entries": memory_entries,
+        "memory_bytes": memory_bytes,
+        "memory_max_items": EMBEDDING_CACHE_MEMORY_ITEMS,
+        "disk_entries": disk_entries,
+        "disk_bytes": disk_bytes,
+        "disk_max_bytes": EMBEDDING_CACHE_MAX_BYTES,
+    }
+
+
+def clear_embedding_cache(disk: bool = True):
+    """메모리 캐시 + 카운터 초기화 (disk=True면 SQLite 항목도 삭제)"""
+    with _lock:
+        _memory.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+    if disk:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM embedding_cache")
+        finally:
+            conn.close()
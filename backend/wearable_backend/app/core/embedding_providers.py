@@ -0,0 +1,298 @@
+"""
+임베딩 provider (EMBEDDING_PROVIDER로 선택)
+
+vector_store는 provider가 무엇이든 embed(texts) → 벡터 list만 사용한다.
+
+- openai  : OpenAI 임베딩 API, 클라이언트 1개를 만들어 재사용 (요청마다 새로 만들지 않음)
+- hashing : 로컬 CPU feature hashing (단어 + 글자 3-gram + 숫자 크기 구간)
+            네트워크 / 모델 파일 없이 결정적으로 동작 → 오프라인 실행 / 테스트 / 빠른 수집용
+- sentence: 로컬 sentence-transformers 모델 (선택 설치, 첫 호출 시 로드)
+
+EMBEDDING_DIM > 0이면 provider 벡터의 앞 EMBEDDING_DIM개 차원만 남기고 재정규화한다.
+(Matryoshka 학습된 text-embedding-3 계열은 앞쪽 차원만으로도 검색 순위가 대부분 유지됨)
+
+provider / 차원마다 벡터 공간이 다르므로 ChromaDB 컬렉션과 임베딩 캐시 key(model)를 구분한다.
+"""
+
+import os
+import re
+import math
+import hashlib
+import threading
+import importlib.util
+from functools import lru_cache
+from collections import Counter
+
+import numpy as np
+import openai
+from openai import OpenAI
+
+from app.config import (
+    EMBEDDING_PROVIDER,
+    EMBEDDING_DIM,
+    OPENAI_EMBEDDING_MODEL,
+    HASHING_EMBEDDING_DIM,
+    SENTENCE_EMBEDDING_MODEL,
+)
+
+EMBEDDING_PROVIDERS = ("openai", "hashing", "sentence")
+
+
+class EmbeddingProvider:
+    """
+    provider 공통 인터페이스
+
+    name: provider 종류 / model: 캐시 key + 컬렉션 구분용 모델 식별자
+    cacheable: 임베딩 캐시 사용 여부 (계산이 캐시 조회보다 싸면 False)
+    concurrent: 배치를 동시에 보낼지 (원격 API만 True)
+    """
+
+    name = ""
+    model = ""
+    cacheable = True
+    concurrent = False
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+    def retryable(self, error: Exception) -> bool:
+        """embed 실패 시 재시도할 오류인지"""
+        return False
+
+    @property
+    def collection_suffix(self) -> str:
+        """ChromaDB 컬렉션 이름 접미사 (벡터 공간이 다른 provider끼리 섞이지 않도록)"""
+        digest = hashlib.sha1(self.model.encode("utf-8")).hexdigest()[:8]
+        return f"_{self.name}_{digest}"
+
+
+# ------------------------------------------------
+# 1) OpenAI
+# ------------------------------------------------
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    name = "openai"
+    concurrent = True
+
+    def __init__(self, model: str = OPENAI_EMBEDDING_MODEL):
+        self.model = model
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> OpenAI:
+        """공유 클라이언트 (연결 풀 재사용, 재시도는 embed_in_batches에서 처리)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    api_key = os.getenv("OPENAI_API_KEY")
+                    if not api_key:
+                        raise ValueError("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
+                    self._client = OpenAI(api_key=api_key, max_retries=0)
+        return self._client
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        response = self.client.embeddings.create(input=texts, model=self.model)
+        return [item.embedding for item in response.data]
+
+    def retryable(self, error: Exception) -> bool:
+        """연결 오류 / 시간 초과 / 429 / 5xx만 재시도 (400 등 요청 오류는 바로 실패)"""
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in (408, 409, 429) or error.status_code >= 500
+        return False
+
+    @property
+    def collection_suffix(self) -> str:
+        # 기존 컬렉션(summaries) 그대로 사용
+        return ""
+
+
+# ------------------------------------------------
+# 2) 로컬 feature hashing
+# ------------------------------------------------
+_WORD_RE = re.compile(r"\w+")
+# 숫자 + 바로 뒤 단위 (예: "8,000보", "70bpm", "7.5시간")
+_NUMBER_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([^\s\d.,]{0,3})")
+
+# 특징 종류별 가중치
+_CHAR_NGRAM_WEIGHT = 0.5
+_NUMBER_WEIGHT = 2.0
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash_feature(feature: str, dim: int) -> tuple[int, float]:
+    """특징 문자열 → (차원 index, 부호) (프로세스 / 실행과 무관하게 결정적)"""
+    h = int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return h % dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    단어 / 글자 3-gram / 숫자 크기 구간을 해시해 dim 차원에 더한 뒤 L2 정규화
+
+    숫자는 단위별 log 구간(약 28% 간격)과 이웃 구간에 나눠 더해서
+    "8,000보"와 "8,300보"처럼 가까운 값이 비슷한 벡터가 되도록 한다.
+    """
+
+    name = "hashing"
+    cacheable = False
+
+    def __init__(self, dim: int = HASHING_EMBEDDING_DIM):
+        self.dim = dim
+        self.model = f"hashing-v1-{dim}"
+
+    @staticmethod
+    def features(text: str) -> Counter:
+        text = text.lower()
+        feats = Counter()
+
+        for word in _WORD_RE.findall(text):
+            if any(ch.isdigit() for ch in word):
+                continue
+            feats[f"w:{word}"] += 1.0
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                feats[f"c:{padded[i:i + 3]}"] += _CHAR_NGRAM_WEIGHT
+
+        for number, unit in _NUMBER_RE.findall(text):
+            try:
+                value = float(number.replace(",", ""))
+            except ValueError:
+                continue
+            bucket = round(math.log1p(value) * 4)
+            for offset, weight in ((0, 1.0), (-1, 0.5), (1, 0.5)):
+                feats[f"n:{unit}:{bucket + offset}"] += weight * _NUMBER_WEIGHT
+
+        return feats
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text).items():
+                index, sign = _hash_feature(feature, self.dim)
+                vectors[row, index] += sign * weight
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).tolist()
+
+
+# ------------------------------------------------
+# 3) 로컬 sentence-transformers (선택)
+# ------------------------------------------------
+class SentenceTransformerProvider(EmbeddingProvider):
+    name = "sentence"
+
+    def __init__(self, model_name: str = SENTENCE_EMBEDDING_MODEL):
+        if importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError(
+                "EMBEDDING_PROVIDER=sentence 는 sentence-transformers 패키지가 필요합니다. "
+                "(pip install sentence-transformers)"
+            )
+        self.model_name = model_name
+        self.model = f"sentence:{model_name}"
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    print(f"[INFO] 로컬 임베딩 모델 로드: {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = self._load().encode(
+            texts,
+            batch_size=64,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.astype(np.float32).tolist()
+
+
+# ------------------------------------------------
+# 4) 차원 축소 (Matryoshka: 앞 dim개 차원 + L2 재정규화)
+# ------------------------------------------------
+def truncate_embeddings(vectors, dim: int) -> np.ndarray:
+    """(N, D) 벡터의 앞 dim개 차원만 남기고 행마다 L2 재정규화"""
+    vectors = np.asarray(vectors, dtype=np.float32)[..., :dim]
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class TruncatedEmbeddingProvider(EmbeddingProvider):
+    """
+    다른 provider 벡터를 dim 차원으로 줄여 반환 (저장 / 검색 비용이 차원에 비례해 감소)
+
+    model / 컬렉션 접미사에 차원을 붙여 원본 차원 데이터와 섞이지 않게 한다.
+    차원별 검색 결과 유지율은 benchmarks/eval_embedding_dims.py로 확인
+    """
+
+    def __init__(self, base: EmbeddingProvider, dim: int):
+        if dim <= 0:
+            raise ValueError(f"❌ 임베딩 차원은 1 이상이어야 합니다: {dim}")
+        self.base = base
+        self.dim = dim
+        self.name = base.name
+        self.model = f"{base.model}@{dim}"
+        self.cacheable = base.cacheable
+        self.concurrent = base.concurrent
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.base.embed(texts)
+        if vectors and len(vectors[0]) < self.dim:
+            raise ValueError(
+                f"❌ EMBEDDING_DIM({self.dim})이 {self.base.model} 차원"
+                f"({len(vectors[0])})보다 큽니다."
+            )
+        return truncate_embeddings(vectors, self.dim).tolist()
+
+    def retryable(self, error: Exception) -> bool:
+        return self.base.retryable(error)
+
+    @property
+    def collection_suffix(self) -> str:
+        return f"{self.base.collection_suffix}_d{self.dim}"
+
+
+# ------------------------------------------------
+# 5) 선택
+# ------------------------------------------------
+_PROVIDER_CLASSES = {
+    "openai": OpenAIEmbeddingProvider,
+    "hashing": HashingEmbeddingProvider,
+    "sentence": SentenceTransformerProvider,
+}
+
+_provider: EmbeddingProvider | None = None
+
+
+def create_embedding_provider(name: str) -> EmbeddingProvider:
+    """이름으로 provider 생성 (설정값 기본 옵션)"""
+    if name not in _PROVIDER_CLASSES:
+        raise ValueError(
+            f"❌ 알 수 없는 EMBEDDING_PROVIDER: {name} "
+            f"({' / '.join(EMBEDDING_PROVIDERS)})"
+        )
+    return _PROVIDER_CLASSES[name]()
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """EMBEDDING_PROVIDER (+ EMBEDDING_DIM) 설정의 provider (프로세스당 1개)"""
+    global _provider
+    if _provider is None:
+        provider = create_embedding_provider(EMBEDDING_PROVIDER)
+        if EMBEDDING_DIM > 0:
+            provider = TruncatedEmbeddingProvider(provider, EMBEDDING_DIM)
+        _provider = provider
+    return _provider
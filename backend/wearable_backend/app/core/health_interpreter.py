@@ -86,15 +86,32 @@ def interpret_heart_rate(raw: dict) -> dict:
     hr = raw.get("heart_rate", 0)
     resting_hr = raw.get("resting_heart_rate", 0)
 
+    # 일중 분포 (Health Connect 심박 series에서만 제공, 없으면 0)
+    overnight_min = raw.get("min_overnight_heart_rate", 0) or 0
+    high_zone_pct = (raw.get("hr_zone4_pct", 0) or 0) + (
+        raw.get("hr_zone5_pct", 0) or 0
+    )
+
     result = {
         "avg_hr": hr,
         "resting_hr": resting_hr,
+        "hr_p5": raw.get("heart_rate_p5", 0),
+        "hr_p50": raw.get("heart_rate_p50", 0),
+        "hr_p95": raw.get("heart_rate_p95", 0),
+        "min_overnight_hr": overnight_min,
+        "high_zone_pct": high_zone_pct,
         "status": "unknown",
         "fitness_level": "unknown",
         "message": "",
         "exercise_impact": "neutral",
     }
 
+    # 휴식기 심박이 없으면 새벽 최저 심박으로 추정
+    if resting_hr <= 0 and overnight_min > 0:
+        resting_hr = overnight_min
+        result["resting_hr"] = resting_hr
+        result["resting_hr_source"] = "overnight_min"
+
     if resting_hr <= 0 and hr <= 0:
         result["message"] = "심박수 데이터가 없습니다."
         return result
@@ -132,6 +149,15 @@ def interpret_heart_rate(raw: dict) -> dict:
             result["exercise_impact"] = "low_intensity"
             result["status"] = "warning"
 
+    # 고강도 구간(zone 4~5) 비중이 크면 회복 권장
+    if high_zone_pct >= 20:
+        result["message"] += (
+            f" 오늘 측정 시간의 {high_zone_pct:.0f}%가 고강도 심박 구간이었습니다."
+            " 충분히 회복하세요."
+        )
+        if result["exercise_impact"] in ("high_intensity_ok", "normal", "neutral"):
+            result["exercise_impact"] = "recovery"
+
     return result
 
 
@@ -342,8 +368,11 @@ def calculate_health_score(raw: dict) -> dict:
     # ========================================
     # 심박수 점수 (최대 ±10점)
     # ========================================
-    # resting_heart_rate 우선, 없으면 heart_rate 사용
+    # resting_heart_rate → 새벽 최저 심박 → heart_rate 순으로 사용
     resting_hr = raw.get("resting_heart_rate", 0)
+    if resting_hr == 0:
+        # 새벽 최저 심박 (일중 분포가 있는 경우) → 휴식기 심박에 가장 가까움
+        resting_hr = raw.get("min_overnight_heart_rate", 0) or 0
     if resting_hr == 0:
         # heart_rate가 있으면 참고 (일반 심박수는 휴식기보다 높음)
         heart_rate = raw.get("heart_rate", 0)
@@ -0,0 +1,338 @@
+"""
+심박수 series 날짜 버킷팅 (NumPy 벡터화)
+
+heart_rate_record_series_table에는 local_date가 없어서
+샘플마다 epoch_millis → 현지 날짜(Epoch Day)를 계산해야 한다.
+db_parser._epoch_millis_to_local_date는 행마다 timezone / datetime 객체를 만들기 때문에
+수백만 행짜리 내보내기에서는 이 변환이 파싱 시간 대부분을 차지한다.
+
+이 모듈은
+- epoch_millis 배열 전체를 정수 연산 한 번으로 Epoch Day로 변환
+  (day = (epoch_millis + offset) // DAY_MILLIS, 음수도 floor → datetime 결과와 동일)
+- 날짜별 합계 / 개수 / 최소 / 최대를 np.bincount / reduceat으로 집계
+- 날짜별 분포 요약(sketch): 1bpm 간격 고정 히스토그램 + 새벽 최저 심박
+  → 샘플 수와 무관하게 날짜당 크기 고정, 구간별로 더하기만 하면 병합
+  → p5 / p50 / p95, 심박 구간(zone)별 비율, 새벽(00~06시) 최저 심박
+- SQLite에서는 rowid 구간마다 group_concat 한 줄로 컬럼을 통째로 받아
+  Python tuple을 만들지 않고 배열로 변환 (구간별 부분 집계 → 메모리 고정)
+
+시간대 오프셋은 사용자별로 넘길 수 있다 (기본 KST, UTC+9).
+(_epoch_millis_to_local_date는 기준 구현으로 유지, test/test_heart_rate_series.py 참고)
+"""
+
+import sqlite3
+from typing import Dict
+
+import numpy as np
+
+DAY_MILLIS = 24 * 60 * 60 * 1000
+
+# 기본 시간대 (KST, 분 단위)
+DEFAULT_TZ_OFFSET_MINUTES = 9 * 60
+
+# group_concat 1회에 읽는 rowid 구간 크기
+SERIES_CHUNK_ROWS = 1_000_000
+
+SERIES_TABLE = "heart_rate_record_series_table"
+
+# 분포 요약: 0~255bpm을 1bpm 간격으로 (정수 bpm은 분위수가 정확, 실수는 반올림)
+HR_HIST_BINS = 256
+HR_PERCENTILES = (5, 50, 95)
+
+# 심박 구간: 최대 심박(HR_MAX_BPM)의 50/60/70/80/90% 경계 → zone 1~5
+# (나이 정보가 없으므로 30세 기준 220 - 30)
+HR_MAX_BPM = 190
+HR_ZONE_FRACTIONS = (0.5, 0.6, 0.7, 0.8, 0.9)
+HR_ZONE_EDGES = [round(HR_MAX_BPM * f) for f in HR_ZONE_FRACTIONS]
+
+# 새벽 최저 심박 집계 구간 (현지 00:00 ~ 06:00)
+OVERNIGHT_END_MILLIS = 6 * 60 * 60 * 1000
+
+# heart_rate_summary 출력 필드 (normalize_raw 필드명과 동일)
+HR_SUMMARY_FIELDS = [
+    "heart_rate_p5",
+    "heart_rate_p50",
+    "heart_rate_p95",
+    "min_overnight_heart_rate",
+    "hr_zone1_pct",
+    "hr_zone2_pct",
+    "hr_zone3_pct",
+    "hr_zone4_pct",
+    "hr_zone5_pct",
+]
+
+
+# =============================================================
+# 1) 배열 변환 / 집계
+# =============================================================
+
+
+def epoch_millis_to_local_days(
+    epoch_millis: np.ndarray, tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES
+) -> np.ndarray:
+    """epoch_millis 배열 → 현지 Epoch Day 배열 (int64)"""
+    offset = np.int64(tz_offset_minutes) * 60 * 1000
+    return (np.asarray(epoch_millis, dtype=np.int64) + offset) // DAY_MILLIS
+
+
+def aggregate_by_day(days: np.ndarray, values: np.ndarray) -> Dict[int, dict]:
+    """
+    날짜 배열 + 값 배열 → {day: {"sum", "count", "mean", "min", "max"}}
+    """
+    if len(days) == 0:
+        return {}
+
+    days = np.asarray(days, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+
+    first_day = days.min()
+    index = days - first_day
+
+    counts = np.bincount(index)
+    sums = np.bincount(index, weights=values)
+
+    # 최소 / 최대: 날짜순 정렬 후 날짜 경계마다 reduceat
+    # (series는 대부분 시간순이라 stable 정렬이 거의 선형)
+    order = np.argsort(index, kind="stable")
+    present = np.flatnonzero(counts)
+    starts = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+    sorted_values = values[order]
+    mins = np.minimum.reduceat(sorted_values, starts)
+    maxs = np.maximum.reduceat(sorted_values, starts)
+
+    return {
+        int(first_day + i): {
+            "sum": float(sums[i]),
+            "count": int(counts[i]),
+            "mean": float(sums[i] / counts[i]),
+            "min": float(lo),
+            "max": float(hi),
+        }
+        for i, lo, hi in zip(present.tolist(), mins.tolist(), maxs.tolist())
+    }
+
+
+def merge_day_stats(total: Dict[int, dict], part: Dict[int, dict]):
+    """구간별 부분 집계를 total에 합친다 (in-place)"""
+    for day, stats in part.items():
+        current = total.get(day)
+        if current is None:
+            total[day] = dict(stats)
+            continue
+        current["sum"] += stats["sum"]
+        current["count"] += stats["count"]
+        current["mean"] = current["sum"] / current["count"]
+        current["min"] = min(current["min"], stats["min"])
+        current["max"] = max(current["max"], stats["max"])
+        if "hist" in stats:
+            current["hist"] = current["hist"] + stats["hist"]
+            current["overnight_min"] = _min_or_none(
+                current["overnight_min"], stats["overnight_min"]
+            )
+
+
+def heart_rate_stats_from_arrays(
+    epoch_millis: np.ndarray,
+    bpm: np.ndarray,
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+) -> Dict[int, dict]:
+    """
+    epoch_millis / bpm 배열 → 날짜별 심박수 통계
+    기존 파서와 같이 epoch_millis 또는 bpm이 0(NULL)인 샘플은 제외
+
+    날짜별 sum / count / mean / min / max + 분포 요약
+    (hist: HR_HIST_BINS 크기 배열, overnight_min: 새벽 최저 심박 또는 None)
+    """
+    epoch_millis = np.asarray(epoch_millis, dtype=np.int64)
+    bpm = np.asarray(bpm, dtype=np.float64)
+
+    valid = (epoch_millis != 0) & (bpm != 0)
+    if not valid.all():
+        epoch_millis, bpm = epoch_millis[valid], bpm[valid]
+
+    days = epoch_millis_to_local_days(epoch_millis, tz_offset_minutes)
+    stats = aggregate_by_day(days, bpm)
+    if not stats:
+        return stats
+
+    # 샘플이 있는 날짜만 0..n_days-1로 압축 (날짜 범위가 넓어도 메모리 고정)
+    index = days - days.min()
+    present = np.bincount(index) > 0
+    compact = (np.cumsum(present) - 1)[index]
+    n_days = int(present.sum())
+
+    bins = np.clip(np.rint(bpm), 0, HR_HIST_BINS - 1).astype(np.int64)
+    hist = np.bincount(
+        compact * HR_HIST_BINS + bins, minlength=n_days * HR_HIST_BINS
+    ).reshape(n_days, HR_HIST_BINS)
+
+    offset = np.int64(tz_offset_minutes) * 60 * 1000
+    overnight = (epoch_millis + offset) % DAY_MILLIS < OVERNIGHT_END_MILLIS
+    overnight_min = np.full(n_days, np.inf)
+    np.minimum.at(overnight_min, compact[overnight], bpm[overnight])
+
+    # stats key 정렬 순서 = 압축 index 순서
+    for i, day in enumerate(sorted(stats)):
+        stats[day]["hist"] = hist[i]
+        lowest = float(overnight_min[i])
+        stats[day]["overnight_min"] = lowest if lowest != np.inf else None
+    return stats
+
+
+# =============================================================
+# 2) SQLite → 배열
+# =============================================================
+
+
+def iter_series_chunks(
+    conn: sqlite3.Connection, chunk_rows: int = SERIES_CHUNK_ROWS
+):
+    """
+    heart_rate_record_series_table → (epoch_millis, bpm) 배열을 rowid 구간별로 반환
+
+    - 같은 SELECT 안의 group_concat 두 개는 같은 행 순서로 이어지므로 배열이 정렬 일치
+    - NULL은 COALESCE로 0 (group_concat이 NULL을 건너뛰어 길이가 어긋나지 않도록)
+    - 컬럼이 없으면 기존 파서(row.get → None → skip)와 같이 아무것도 반환하지 않음
+    """
+    try:
+        columns = {
+            row[1] for row in conn.execute(f"PRAGMA table_info({SERIES_TABLE});")
+        }
+    except sqlite3.Error:
+        return
+    if not {"epoch_millis", "beats_per_minute"} <= columns:
+        return
+
+    low, high = conn.execute(
+        f"SELECT MIN(rowid), MAX(rowid) FROM {SERIES_TABLE};"
+    ).fetchone()
+    if low is None:
+        return
+
+    sql = (
+        "SELECT group_concat(COALESCE(epoch_millis, 0)), "
+        "group_concat(COALESCE(beats_per_minute, 0)) "
+        f"FROM {SERIES_TABLE} WHERE rowid >= ? AND rowid < ?;"
+    )
+    for start in range(low, high + 1, chunk_rows):
+        millis_text, bpm_text = conn.execute(
+            sql, (start, start + chunk_rows)
+        ).fetchone()
+        if not millis_text:
+            continue
+        yield _parse_numbers(millis_text), _parse_numbers(bpm_text)
+
+
+def _parse_numbers(text: str) -> np.ndarray:
+    """group_concat 결과 → 배열 (정수 파싱이 실수보다 몇 배 빠르므로 REAL 값이 있을 때만 float)"""
+    if "." in text or "e" in text:
+        return np.fromstring(text, dtype=np.float64, sep=",")
+    return np.fromstring(text, dtype=np.int64, sep=",")
+
+
+def heart_rate_by_day(
+    conn: sqlite3.Connection,
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+    chunk_rows: int = SERIES_CHUNK_ROWS,
+) -> Dict[int, dict]:
+    """DB 연결 → 날짜별 심박수 통계 (sum / count / mean / min / max + sketch)"""
+    stats = {}
+    for epoch_millis, bpm in iter_series_chunks(conn, chunk_rows):
+        merge_day_stats(
+            stats, heart_rate_stats_from_arrays(epoch_millis, bpm, tz_offset_minutes)
+        )
+    return stats
+
+
+# =============================================================
+# 3) 날짜별 분포 요약 (sketch)
+# =============================================================
+# 행 단위 파서(db_parser)와 배열 경로가 같은 구조를 쓴다.
+#   {"sum", "count", "hist", "overnight_min"}
+# hist는 list(행 단위) 또는 np.ndarray(배열 경로) 모두 가능
+
+
+def _min_or_none(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def new_heart_rate_sketch() -> dict:
+    """빈 날짜별 심박수 sketch (샘플 수와 무관한 고정 크기)"""
+    return {"sum": 0, "count": 0, "hist": [0] * HR_HIST_BINS, "overnight_min": None}
+
+
+def add_heart_rate_sample(
+    sketch: dict,
+    bpm,
+    epoch_millis: int,
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+):
+    """샘플 1개 추가 (행 단위 경로)"""
+    sketch["sum"] += bpm
+    sketch["count"] += 1
+    sketch["hist"][min(max(round(bpm), 0), HR_HIST_BINS - 1)] += 1
+
+    local_millis = epoch_millis + tz_offset_minutes * 60 * 1000
+    if local_millis % DAY_MILLIS < OVERNIGHT_END_MILLIS:
+        sketch["overnight_min"] = _min_or_none(sketch["overnight_min"], bpm)
+
+
+def _hist_percentiles(hist: list, count: int, percentiles=HR_PERCENTILES) -> list:
+    """
+    히스토그램 → 분위수 (누적 개수가 count * p / 100 이상이 되는 첫 bpm)
+    np.percentile(method="inverted_cdf")와 같은 정의
+    """
+    targets = [count * p / 100 for p in percentiles]
+    result = []
+    cumulative = 0
+    for value, n in enumerate(hist):
+        if not n:
+            continue
+        cumulative += n
+        while len(result) < len(targets) and cumulative >= targets[len(result)]:
+            result.append(value)
+        if len(result) == len(targets):
+            break
+    return result
+
+
+def heart_rate_summary(sketch: dict | None) -> dict:
+    """
+    sketch → raw 필드 (HR_SUMMARY_FIELDS, 샘플이 없으면 모두 0)
+
+    - heart_rate_p5 / p50 / p95: 일중 심박 분위수 (bpm)
+    - min_overnight_heart_rate: 현지 00~06시 최저 심박 (휴식기 심박 추정용)
+    - hr_zone1_pct ~ hr_zone5_pct: 측정 샘플 중 각 심박 구간 비율 (%)
+      (측정 간격이 일정하면 측정 시간 중 구간별 시간 비율과 같음)
+    """
+    if not sketch or not sketch["count"]:
+        return {field: 0 for field in HR_SUMMARY_FIELDS}
+
+    hist = sketch["hist"]
+    if isinstance(hist, np.ndarray):
+        hist = hist.tolist()
+    count = sketch["count"]
+
+    # 배열 경로는 float64 → 정수 bpm이면 행 단위 경로와 같이 int로
+    overnight_min = sketch["overnight_min"] or 0
+    if isinstance(overnight_min, float) and overnight_min.is_integer():
+        overnight_min = int(overnight_min)
+
+    p5, p50, p95 = _hist_percentiles(hist, count)
+    summary = {
+        "heart_rate_p5": p5,
+        "heart_rate_p50": p50,
+        "heart_rate_p95": p95,
+        "min_overnight_heart_rate": overnight_min,
+    }
+
+    edges = HR_ZONE_EDGES + [HR_HIST_BINS]
+    for zone in range(len(HR_ZONE_EDGES)):
+        in_zone = sum(hist[edges[zone] : edges[zone + 1]])
+        summary[f"hr_zone{zone + 1}_pct"] = round(in_zone / count * 100, 2)
+
+    return summary
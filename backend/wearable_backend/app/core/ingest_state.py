@@ -0,0 +1,230 @@
+"""
+업로드 증분 처리 상태 저장소 (SQLite)
+
+사용자는 Health Connect ZIP 전체를 며칠마다 다시 올린다.
+(user_id, source, collection)별로 아래 정보를 기록해 바뀌지 않은 날짜는
+전처리/임베딩/upsert를 건너뛴다.
+
+- 날짜별 content hash: raw dict의 SHA-256 (new / changed / skipped 분류 기준)
+- watermark: 지금까지 반영한 가장 최신 날짜 (응답 / 로그 표시용, 분류에는 쓰지 않음)
+- collection: 저장한 ChromaDB 컬렉션 (임베딩 provider / 모델 / 차원마다 다름)
+  → 임베딩 설정을 바꾸면 새 컬렉션 기준으로는 처음 보는 날짜라 다시 저장된다
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+from datetime import datetime
+
+from app.config import INGEST_STATE_DB
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(INGEST_STATE_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(INGEST_STATE_DB, timeout=30)
+    _drop_legacy_tables(conn)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_days (
+            user_id      TEXT    NOT NULL,
+            source       TEXT    NOT NULL,
+            collection   TEXT    NOT NULL,
+            local_date   INTEGER NOT NULL,
+            content_hash TEXT    NOT NULL,
+            ingested_at  TEXT    NOT NULL,
+            PRIMARY KEY (user_id, source, collection, local_date)
+        );
+        CREATE TABLE IF NOT EXISTS ingest_watermarks (
+            user_id    TEXT    NOT NULL,
+            source     TEXT    NOT NULL,
+            collection TEXT    NOT NULL,
+            watermark  INTEGER NOT NULL,
+            updated_at TEXT    NOT NULL,
+            PRIMARY KEY (user_id, source, collection)
+        );
+        """
+    )
+    return conn
+
+
+def _drop_legacy_tables(conn: sqlite3.Connection):
+    """
+    collection 컬럼이 없는 이전 버전 테이블 삭제
+    어느 컬렉션에 저장한 상태인지 알 수 없으므로 다음 업로드에서 모든 날짜를 다시 반영한다.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(ingest_days)")]
+    if not columns or "collection" in columns:
+        return
+
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS ingest_days")
+        conn.execute("DROP TABLE IF EXISTS ingest_watermarks")
+    print("[INFO] 이전 버전 증분 상태 삭제 (컬렉션 구분 추가, 다음 업로드에서 전체 반영)")
+
+
+# ------------------------------------------------
+# 2) 날짜별 content hash
+# ------------------------------------------------
+def compute_day_hash(raw: dict) -> str:
+    """raw dict → SHA-256 (키 순서와 무관)"""
+    payload = json.dumps(raw, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------
+# 3) 조회
+# ------------------------------------------------
+def get_watermark(user_id: str, source: str, collection: str = "") -> int | None:
+    """마지막으로 반영한 최신 날짜 (없으면 None)"""
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT watermark FROM ingest_watermarks "
+            "WHERE user_id = ? AND source = ? AND collection = ?",
+            (user_id, source, collection),
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def get_day_hashes(user_id: str, source: str, collection: str = "") -> dict:
+    """{local_date: content_hash}"""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT local_date, content_hash FROM ingest_days "
+            "WHERE user_id = ? AND source = ? AND collection = ?",
+            (user_id, source, collection),
+        ).fetchall()
+        return dict(rows)
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 4) 증분 계획
+# ------------------------------------------------
+def plan_incremental_ingest(
+    user_id: str, source: str, raw_by_day: dict, collection: str = ""
+) -> dict:
+    """
+    업로드된 날짜들을 저장된 날짜별 hash 기준으로 new / changed / skipped 로 분류한다.
+
+    - 저장된 hash가 없는 날짜 → new (watermark보다 과거여도 처음 보는 날짜면 new)
+    - 저장된 hash가 있는 날짜: 같으면 skipped, 다르면 changed (과거 데이터 보정)
+    - collection: 저장할 컬렉션 이름 (다른 컬렉션에 반영한 기록은 보지 않음)
+
+    watermark는 분류에 쓰지 않고 이전 반영 범위 표시용으로만 반환한다.
+    (watermark가 없으면 반영한 날짜도 없으므로 hash 조회를 생략)
+
+    Returns:
+        {
+            "new": [local_date, ...],
+            "changed": [...],
+            "skipped": [...],
+            "hashes": {local_date: hash},
+            "watermark": int | None,   # 이번 업로드 이전 watermark (표시용)
+        }
+    """
+    watermark = get_watermark(user_id, source, collection)
+    stored = (
+        get_day_hashes(user_id, source, collection) if watermark is not None else {}
+    )
+
+    plan = {
+        "new": [],
+        "changed": [],
+        "skipped": [],
+        "hashes": {},
+        "watermark": watermark,
+    }
+
+    for date_key in sorted(raw_by_day.keys()):
+        day_hash = compute_day_hash(raw_by_day[date_key])
+        plan["hashes"][date_key] = day_hash
+
+        previous = stored.get(date_key)
+        if previous is None:
+            plan["new"].append(date_key)
+        elif previous != day_hash:
+            plan["changed"].append(date_key)
+        else:
+            plan["skipped"].append(date_key)
+
+    return plan
+
+
+# ------------------------------------------------
+# 5) 반영 기록
+# ------------------------------------------------
+def record_ingested_days(user_id: str, source: str, hashes: dict, collection: str = ""):
+    """저장 완료된 날짜의 hash 기록 + watermark 갱신 (collection 단위)"""
+    if not hashes:
+        return
+
+    now = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingest_days "
+                "(user_id, source, collection, local_date, content_hash, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (user_id, source, collection, date_key, day_hash, now)
+                    for date_key, day_hash in hashes.items()
+                ],
+            )
+            conn.execute(
+                "INSERT INTO ingest_watermarks "
+                "(user_id, source, collection, watermark, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(user_id, source, collection) DO UPDATE SET "
+                "watermark = MAX(watermark, excluded.watermark), "
+                "updated_at = excluded.updated_at",
+                (user_id, source, collection, max(hashes.keys()), now),
+            )
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 6) 삭제 (VectorDB 데이터 삭제 시 함께 호출)
+# ------------------------------------------------
+def delete_ingest_state(user_id: str | None = None, source: str | None = None) -> int:
+    """
+    증분 상태 삭제 → 다음 업로드 때 모든 날짜를 다시 반영한다.
+
+    user_id / source 중 지정한 조건으로 모든 컬렉션의 상태를 삭제
+    (둘 다 None이면 아무것도 안 함)
+    """
+    conditions, params = [], []
+    if user_id:
+        conditions.append("user_id = ?")
+        params.append(user_id)
+    if source:
+        conditions.append("source = ?")
+        params.append(source)
+
+    if not conditions:
+        return 0
+
+    where = " AND ".join(conditions)
+
+    conn = _connect()
+    try:
+        with conn:
+            deleted = conn.execute(
+                f"DELETE FROM ingest_days WHERE {where}", params
+            ).rowcount
+            conn.execute(f"DELETE FROM ingest_watermarks WHERE {where}", params)
+        return deleted
+    finally:
+        conn.close()
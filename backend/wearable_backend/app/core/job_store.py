@@ -0,0 +1,350 @@
+"""
+업로드 비동기 작업 저장소 (SQLite)
+
+/api/file/upload/async 로 접수된 작업의 상태를 로컬 SQLite에 기록한다.
+- 단계별 진행 상태 + 소요 시간 (PIPELINE_STAGES)
+- 최종 결과 (summary + llm_result) / 오류 메시지
+- 서버(워커) 재시작 시 queued/running 작업을 다시 실행할 수 있도록 파라미터 보관
+- 실행은 queued → running 조건부 UPDATE로 한 워커만 가져가고(claim_job),
+  running 작업은 lease_until까지 유효 (워커가 renew_lease로 연장)
+  lease가 만료된 작업만 재등록하고, 최대 실행 횟수를 넘으면 failed 처리
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+from datetime import datetime
+
+from app.config import UPLOAD_JOB_DB
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(UPLOAD_JOB_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(UPLOAD_JOB_DB, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS upload_jobs (
+            job_id        TEXT PRIMARY KEY,
+            user_id       TEXT NOT NULL,
+            filename      TEXT NOT NULL,
+            status        TEXT NOT NULL,
+            current_stage TEXT,
+            stages        TEXT NOT NULL,
+            params        TEXT NOT NULL,
+            result        TEXT,
+            error         TEXT,
+            attempts      INTEGER NOT NULL DEFAULT 0,
+            lease_until   REAL,
+            created_at    TEXT NOT NULL,
+            updated_at    TEXT NOT NULL
+        )
+        """
+    )
+    # 이전 버전 DB (lease_until 없음) → 컬럼 추가, 기존 running 작업은 lease 만료로 취급
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(upload_jobs)")}
+    if "lease_until" not in columns:
+        conn.execute("ALTER TABLE upload_jobs ADD COLUMN lease_until REAL")
+    return conn
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["stages"] = json.loads(job["stages"])
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+# ------------------------------------------------
+# 2) 작업 생성 / 조회
+# ------------------------------------------------
+def create_job(
+    user_id: str,
+    filename: str,
+    stages: list[str],
+    params: dict,
+    done_stages: dict | None = None,
+    result: dict | None = None,
+) -> str:
+    """
+    작업 등록 (status=queued) 후 job_id 반환
+
+    done_stages: 접수 시점에 이미 끝난 단계 {stage: elapsed_sec} (예: 파일 저장)
+    result: 이미 결과가 있으면 (업로드 캐시) 바로 succeeded로 등록
+    """
+    job_id = uuid.uuid4().hex
+    now = _now()
+
+    stage_state = {stage: {"status": "pending"} for stage in stages}
+    for stage, elapsed in (done_stages or {}).items():
+        stage_state[stage] = {
+            "status": "done",
+            "finished_at": now,
+            "elapsed_sec": round(elapsed, 3),
+        }
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO upload_jobs "
+                "(job_id, user_id, filename, status, stages, params, result, "
+                "created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    user_id,
+                    filename,
+                    STATUS_SUCCEEDED if result is not None else STATUS_QUEUED,
+                    json.dumps(stage_state),
+                    json.dumps(params, ensure_ascii=False),
+                    (
+                        json.dumps(result, ensure_ascii=False, default=str)
+                        if result is not None
+                        else None
+                    ),
+                    now,
+                    now,
+                ),
+            )
+    finally:
+        conn.close()
+
+    return job_id
+
+
+def get_job(job_id: str) -> dict | None:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM upload_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return _row_to_job(row) if row else None
+    finally:
+        conn.close()
+
+
+def list_unfinished_jobs(
+    user_id: str | None = None, statuses: tuple = (STATUS_QUEUED, STATUS_RUNNING)
+) -> list[dict]:
+    """끝나지 않은 작업 (기본 queued/running), 접수 순"""
+    query = "SELECT * FROM upload_jobs WHERE status IN ({})".format(
+        ", ".join("?" * len(statuses))
+    )
+    args = list(statuses)
+    if user_id is not None:
+        query += " AND user_id = ?"
+        args.append(user_id)
+
+    conn = _connect()
+    try:
+        rows = conn.execute(query + " ORDER BY created_at", args).fetchall()
+        return [_row_to_job(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def recover_stale_jobs(max_attempts: int) -> dict:
+    """
+    lease가 만료된 running 작업 처리 (워커가 죽었거나 서버가 재시작됨)
+    - 실행 횟수 < max_attempts → queued로 되돌림 (재실행 대상)
+    - 실행 횟수 >= max_attempts → failed
+
+    lease가 남은 작업은 다른 프로세스의 워커가 실행 중이므로 건드리지 않는다.
+    """
+    stale = "status = ? AND (lease_until IS NULL OR lease_until < ?)"
+    now = _now()
+
+    conn = _connect()
+    try:
+        with conn:
+            failed = conn.execute(
+                f"UPDATE upload_jobs SET status = ?, error = ?, lease_until = NULL, "
+                f"updated_at = ? WHERE {stale} AND attempts >= ?",
+                (
+                    STATUS_FAILED,
+                    f"최대 실행 횟수({max_attempts}회)를 초과했습니다.",
+                    now,
+                    STATUS_RUNNING,
+                    time.time(),
+                    max_attempts,
+                ),
+            ).rowcount
+            requeued = conn.execute(
+                f"UPDATE upload_jobs SET status = ?, lease_until = NULL, "
+                f"updated_at = ? WHERE {stale}",
+                (STATUS_QUEUED, now, STATUS_RUNNING, time.time()),
+            ).rowcount
+    finally:
+        conn.close()
+
+    return {"requeued": requeued, "failed": failed}
+
+
+# ------------------------------------------------
+# 3) 상태 갱신
+# ------------------------------------------------
+def _update(job_id: str, **fields):
+    fields["updated_at"] = _now()
+    assignments = ", ".join(f"{key} = ?" for key in fields)
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                f"UPDATE upload_jobs SET {assignments} WHERE job_id = ?",
+                [*fields.values(), job_id],
+            )
+    finally:
+        conn.close()
+
+
+def claim_job(job_id: str, lease_sec: float, keep_stages: tuple = ()) -> dict | None:
+    """
+    queued 작업을 running으로 가져감 (조건부 UPDATE → 여러 워커 / 프로세스 중 하나만 성공)
+    실행 횟수 +1, lease_until = 지금 + lease_sec
+    keep_stages 외 단계는 pending으로 되돌린다 (재실행 시 이전 진행 상태 제거)
+
+    Returns:
+        가져간 작업 (이미 다른 워커가 가져갔거나 끝난 작업이면 None)
+    """
+    conn = _connect()
+    try:
+        with conn:
+            claimed = conn.execute(
+                "UPDATE upload_jobs SET status = ?, attempts = attempts + 1, "
+                "lease_until = ?, error = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = ?",
+                (
+                    STATUS_RUNNING,
+                    time.time() + lease_sec,
+                    _now(),
+                    job_id,
+                    STATUS_QUEUED,
+                ),
+            ).rowcount
+            if not claimed:
+                return None
+
+            job = _row_to_job(
+                conn.execute(
+                    "SELECT * FROM upload_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+            )
+            job["stages"] = {
+                stage: (state if stage in keep_stages else {"status": "pending"})
+                for stage, state in job["stages"].items()
+            }
+            conn.execute(
+                "UPDATE upload_jobs SET stages = ? WHERE job_id = ?",
+                (json.dumps(job["stages"]), job_id),
+            )
+    finally:
+        conn.close()
+
+    return job
+
+
+def renew_lease(job_id: str, lease_sec: float) -> bool:
+    """실행 중 작업의 lease 연장 (heartbeat), running이 아니면 False"""
+    conn = _connect()
+    try:
+        with conn:
+            return bool(
+                conn.execute(
+                    "UPDATE upload_jobs SET lease_until = ? "
+                    "WHERE job_id = ? AND status = ?",
+                    (time.time() + lease_sec, job_id, STATUS_RUNNING),
+                ).rowcount
+            )
+    finally:
+        conn.close()
+
+
+def mark_stage(job_id: str, stage: str, status: str):
+    """
+    단계 상태 기록
+    - running: started_at 기록
+    - done: finished_at + elapsed_sec 기록
+    """
+    job = get_job(job_id)
+    if not job:
+        return
+
+    stages = job["stages"]
+    state = stages.setdefault(stage, {})
+    state["status"] = status
+
+    if status == "running":
+        state["started_at"] = _now()
+        state["_started"] = time.time()
+        _update(job_id, stages=json.dumps(stages), current_stage=stage)
+        return
+
+    state["finished_at"] = _now()
+    if "_started" in state:
+        state["elapsed_sec"] = round(time.time() - state["_started"], 3)
+    _update(job_id, stages=json.dumps(stages))
+
+
+def mark_succeeded(job_id: str, result: dict):
+    _update(
+        job_id,
+        status=STATUS_SUCCEEDED,
+        current_stage=None,
+        lease_until=None,
+        result=json.dumps(result, ensure_ascii=False, default=str),
+    )
+
+
+def mark_failed(job_id: str, error: str):
+    job = get_job(job_id)
+    if job and job["current_stage"]:
+        stages = job["stages"]
+        stages[job["current_stage"]]["status"] = "failed"
+        _update(job_id, stages=json.dumps(stages))
+
+    _update(job_id, status=STATUS_FAILED, error=error, lease_until=None)
+
+
+# ------------------------------------------------
+# 4) 응답용 포맷
+# ------------------------------------------------
+def job_status_view(job: dict) -> dict:
+    """상태 조회 API 응답 (결과 본문 제외)"""
+    stages = {
+        stage: {k: v for k, v in state.items() if not k.startswith("_")}
+        for stage, state in job["stages"].items()
+    }
+    done = sum(1 for state in stages.values() if state.get("status") == "done")
+
+    return {
+        "job_id": job["job_id"],
+        "user_id": job["user_id"],
+        "filename": job["filename"],
+        "status": job["status"],
+        "current_stage": job["current_stage"],
+        "progress": round(done / len(stages), 2) if stages else 0,
+        "stages": stages,
+        "error": job["error"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
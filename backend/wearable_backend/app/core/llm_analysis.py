@@ -18,7 +18,7 @@ from app.core.rag_query import (
     build_rag_query,
     classify_rag_strength,
 )
-from app.core.vector_store import search_similar_summaries
+from app.core.vector_store import search_similar_metrics
 from app.core.health_interpreter import (
     interpret_health_data,
     build_health_context_for_llm,
@@ -687,12 +687,14 @@ def run_llm_analysis(
     # 2) 데이터 품질 확인
     data_quality = check_data_quality(raw)
 
-    # 3) RAG 검색
+    # 3) RAG 검색 (지표 벡터 kNN, 사용할 수 없을 때만 rag_query 임베딩 검색)
     rag_query = build_rag_query(raw)
-    rag_result = search_similar_summaries(
-        query_dict=rag_query,
+    rag_result = search_similar_metrics(
+        metrics=raw,
         user_id=user_id,
         top_k=3,
+        exclude_date=(summary.get("created_at") or "")[:10] or None,
+        fallback_query=rag_query,
     )
     similar_days = rag_result.get("similar_days", [])
     rag_strength = classify_rag_strength(similar_days)
@@ -0,0 +1,154 @@
+"""
+사용자별 지표 벡터 유사 검색 (숫자 kNN, 임베딩 없음)
+
+run_llm_analysis의 RAG 검색은 build_rag_query 결과를 "sleep_hr: 7.2, steps: 8000" 같은
+문자열로 만들어 임베딩 API를 한 번 호출한 뒤 검색했다. 숫자를 텍스트 임베딩으로 비교하면
+8000보와 7900보가 8000보와 800보보다 가깝다는 것도 보장되지 않는다.
+
+- 시계열 저장소(rows.npy)의 metrics 컬럼을 그대로 사용 (따로 저장하지 않음)
+- 사용자별 z-score 표준화 (지표마다 값이 있는 날만으로 평균 / 표준편차)
+- 값 없음(0 / None, normalize_raw가 측정 안 된 값을 0으로 채움)은 mask로 제외
+- 거리: 쿼리에 값이 있는 지표마다 (z_day - z_query)²,
+  그 날 값이 없으면 기대값 1 + z_query² (사용자 분포의 값과 쿼리 차이 제곱의 기대값)
+  → 지표 수로 나눈 뒤 sqrt
+- 사용자 전체 날짜 × 지표 한 번에 계산 → argpartition으로 top_k (네트워크 호출 없음)
+"""
+
+import numpy as np
+
+from app.core.timeseries_store import (
+    RAW_FIELDS,
+    KIND_FLOAT,
+    KIND_INT,
+    read_rows,
+    decode_rows,
+)
+
+# 유사도에 쓰는 지표 (같은 값의 단위만 다른 필드 / 체중에서 계산되는 BMI / 키는 제외)
+METRIC_FIELDS = [
+    field for field in RAW_FIELDS if field not in ("sleep_min", "height_m", "bmi")
+]
+_COLUMNS = [RAW_FIELDS.index(field) for field in METRIC_FIELDS]
+
+# 사용자별 표준화 결과 캐시 {user_id: (rows, (z, present, mean, std, count))}
+# rows는 시계열 저장소 읽기 캐시의 객체 → store가 바뀌면 다른 객체라 다시 계산
+_prepared: dict[str, tuple] = {}
+
+
+def standardize(values: np.ndarray, present: np.ndarray):
+    """
+    지표별 z-score (값이 있는 날만으로 평균 / 표준편차, 분산이 0이면 표준편차 1)
+
+    Returns:
+        (z float32 (값 없음은 0), mean, std, 지표별 값이 있는 날 수)
+    """
+    count = present.sum(axis=0)
+    safe_count = np.maximum(count, 1)
+    mean = np.where(present, values, 0.0).sum(axis=0) / safe_count
+    var = np.where(present, (values - mean) ** 2, 0.0).sum(axis=0) / safe_count
+    std = np.sqrt(var)
+    std[std < 1e-9] = 1.0
+
+    z = np.where(present, (values - mean) / std, 0.0).astype(np.float32)
+    return z, mean, std, count
+
+
+def _prepare(user_id: str, rows: np.ndarray) -> tuple:
+    cached = _prepared.get(user_id)
+    if cached and cached[0] is rows:
+        return cached[1]
+
+    values = np.asarray(rows["metrics"][:, _COLUMNS], dtype=np.float64)
+    kinds = np.asarray(rows["kinds"][:, _COLUMNS])
+    present = (
+        ((kinds == KIND_FLOAT) | (kinds == KIND_INT))
+        & np.isfinite(values)
+        & (values != 0)
+    )
+    z, mean, std, count = standardize(values, present)
+
+    prepared = (z, present, mean, std, count)
+    _prepared[user_id] = (rows, prepared)
+    return prepared
+
+
+def _query_vector(query: dict) -> tuple[np.ndarray, np.ndarray]:
+    """query dict → (METRIC_FIELDS 순서 값, 값 있음 mask) (숫자가 아닌 값 / 0은 없음)"""
+    values = np.zeros(len(METRIC_FIELDS))
+    present = np.zeros(len(METRIC_FIELDS), dtype=bool)
+    for j, field in enumerate(METRIC_FIELDS):
+        value = query.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if value != 0 and np.isfinite(value):
+            values[j] = value
+            present[j] = True
+    return values, present
+
+
+def masked_distances(
+    z: np.ndarray, present: np.ndarray, query_z: np.ndarray, dims: np.ndarray
+) -> np.ndarray:
+    """
+    날짜별 쿼리와의 거리 (dims 지표만, 그 날 값이 없는 지표는 기대값 1 + z_query²)
+    dims 중 값이 하나도 없는 날은 inf
+    """
+    z_dims = z[:, dims]
+    present_dims = present[:, dims]
+    q = query_z[dims].astype(np.float32)
+
+    squared = np.where(present_dims, (z_dims - q) ** 2, 1.0 + q**2)
+    distances = np.sqrt(squared.sum(axis=1) / len(dims))
+    distances[~present_dims.any(axis=1)] = np.inf
+    return distances
+
+
+def search_metrics(
+    user_id: str,
+    query: dict,
+    top_k: int,
+    exclude_timestamps: list[int] | None = None,
+) -> list[dict] | None:
+    """
+    query(raw 형식 지표 dict)와 지표 벡터가 가까운 날짜 top_k (가까운 순)
+
+    Args:
+        query: {필드: 값} (METRIC_FIELDS에 없는 키 / 숫자가 아닌 값은 무시)
+        exclude_timestamps: 제외할 날짜 (YYYYMMDD, 예: 쿼리 날짜 자신)
+
+    Returns:
+        시계열 저장소 조회 형식 item (+ similarity_distance),
+        store가 없거나 쿼리와 겹치는 지표가 없으면 None (호출 측에서 임베딩 검색)
+    """
+    loaded = read_rows(user_id)
+    if loaded is None:
+        return None
+    rows, meta = loaded
+    if len(rows) == 0:
+        return []
+
+    z, present, mean, std, count = _prepare(user_id, rows)
+    query_values, query_present = _query_vector(query)
+
+    # 사용자에게 한 번도 없는 지표는 척도가 없으므로 제외
+    dims = np.flatnonzero(query_present & (count > 0))
+    if len(dims) == 0:
+        return None
+
+    query_z = (query_values - mean) / std
+    distances = masked_distances(z, present, query_z, dims)
+    if exclude_timestamps:
+        distances[np.isin(rows["timestamp"], exclude_timestamps)] = np.inf
+
+    candidates = np.flatnonzero(np.isfinite(distances))
+    k = min(top_k, len(candidates))
+    if k == 0:
+        return []
+
+    top = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+    top = top[np.argsort(distances[top], kind="stable")]
+
+    items = decode_rows(user_id, np.asarray(rows[top]), meta)
+    for item, distance in zip(items, distances[top].tolist()):
+        item["similarity_distance"] = distance
+    return items
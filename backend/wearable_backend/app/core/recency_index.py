@@ -0,0 +1,245 @@
+"""
+사용자별 최신순 인덱스 (SQLite, (user_id, timestamp, updated_at, document_id) 정렬)
+
+get_recent_summaries / /api/app/latest / /api/user/latest-analysis는 최신 1~7일만 필요한데
+사용자 전체 문서를 읽고 Python에서 중복 제거 + 정렬했다. (히스토리 길이에 비례)
+
+- 저장할 때마다 (save_daily_summary / save_daily_summaries_batch) 해당 행만 갱신
+- 기본 key가 (user_id, timestamp, updated_at, document_id)인 WITHOUT ROWID 테이블
+  → 사용자 행이 정렬된 채로 붙어 있어 역순 cursor로 필요한 날짜 수만큼만 읽고 멈춘다.
+- 조회 결과는 metadata 필드만 (raw / summary_text는 vector_store가 summary_store에서 추가)
+
+인덱스가 아직 없는 사용자(recency_users에 없음)는 None을 반환하고
+vector_store가 Chroma metadata로 한 번 생성한다.
+"""
+
+import os
+import time
+import sqlite3
+from typing import Callable, Iterable
+
+from app.config import RECENCY_INDEX_DB
+
+_COLUMNS = (
+    "document_id",
+    "user_id",
+    "date",
+    "timestamp",
+    "health_score",
+    "recommended_intensity",
+    "source",
+    "platform",
+    "updated_at",
+)
+
+# 스키마를 만든 DB 경로 (프로세스별)
+_schema_ready: set[str] = set()
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    # 스키마 / WAL 설정은 DB 경로마다 1번만 (매번 하면 조회 연결 비용의 대부분)
+    ready = RECENCY_INDEX_DB in _schema_ready
+    if not ready:
+        os.makedirs(os.path.dirname(os.path.abspath(RECENCY_INDEX_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(RECENCY_INDEX_DB, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if ready:
+        return conn
+
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS recency_index (
+            user_id               TEXT    NOT NULL,
+            timestamp             INTEGER NOT NULL,
+            updated_at            TEXT    NOT NULL,
+            document_id           TEXT    NOT NULL,
+            date                  TEXT    NOT NULL,
+            health_score          INTEGER,
+            recommended_intensity TEXT,
+            source                TEXT    NOT NULL,
+            platform              TEXT    NOT NULL,
+            PRIMARY KEY (user_id, timestamp, updated_at, document_id)
+        ) WITHOUT ROWID;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_recency_document
+            ON recency_index(document_id);
+        CREATE TABLE IF NOT EXISTS recency_users (
+            user_id  TEXT PRIMARY KEY,
+            built_at REAL NOT NULL
+        );
+        """
+    )
+    _schema_ready.add(RECENCY_INDEX_DB)
+    return conn
+
+
+def _row_values(item: dict) -> tuple:
+    return (
+        item["user_id"],
+        int(item.get("timestamp") or 0),
+        item.get("updated_at") or "",
+        item["document_id"],
+        item.get("date") or "",
+        item.get("health_score"),
+        item.get("recommended_intensity"),
+        item.get("source") or "unknown",
+        item.get("platform") or "unknown",
+    )
+
+
+# ------------------------------------------------
+# 2) 최신순 선택 (인덱스 cursor / Chroma fallback 공통)
+# ------------------------------------------------
+def take_recent(
+    items: Iterable[dict],
+    days: int,
+    all_sources: bool = False,
+    accept: Callable[[dict], bool] | None = None,
+) -> list[dict]:
+    """
+    (timestamp, updated_at) 내림차순 items에서 최신 days개 날짜의 행
+
+    all_sources=False: 날짜마다 updated_at 최신 1행 (날짜별 병합 이전 데이터 대비)
+    all_sources=True : 선택한 날짜의 모든 출처 행
+    accept(item): False인 행은 건너뜀 (예: 플랫폼 필터)
+
+    items는 generator여도 되고, days개 날짜를 채우면 더 읽지 않는다.
+    """
+    selected = []
+    dates = set()
+
+    for item in items:
+        if accept is not None and not accept(item):
+            continue
+
+        date = item.get("date")
+        if date in dates:
+            if all_sources:
+                selected.append(item)
+            continue
+        if len(dates) >= days:
+            break
+
+        dates.add(date)
+        selected.append(item)
+
+    return selected
+
+
+# ------------------------------------------------
+# 3) 조회
+# ------------------------------------------------
+def index_exists(user_id: str) -> bool:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM recency_users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row is not None
+    finally:
+        conn.close()
+
+
+def recent_documents(
+    user_id: str,
+    days: int,
+    all_sources: bool = False,
+    accept: Callable[[dict], bool] | None = None,
+) -> list[dict] | None:
+    """
+    최신 days개 날짜의 행 (최신순, take_recent 기준), 인덱스가 없으면 None
+    """
+    conn = _connect()
+    try:
+        built = conn.execute(
+            "SELECT 1 FROM recency_users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if built is None:
+            return None
+
+        cursor = conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM recency_index WHERE user_id = ? "
+            "ORDER BY timestamp DESC, updated_at DESC, document_id DESC",
+            (user_id,),
+        )
+        return take_recent((dict(row) for row in cursor), days, all_sources, accept)
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 4) 갱신 / 삭제
+# ------------------------------------------------
+def upsert_recency(user_id: str, items: list[dict], replace: bool = False):
+    """
+    행 추가 / 갱신 (같은 document_id는 이전 행을 지우고 새 updated_at으로 삽입)
+
+    replace=True: 사용자 행을 모두 지우고 items로 새로 생성 (Chroma에서 재구축)
+    """
+    conn = _connect()
+    try:
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM recency_index WHERE user_id = ?", (user_id,))
+            else:
+                conn.executemany(
+                    "DELETE FROM recency_index WHERE document_id = ?",
+                    [(item["document_id"],) for item in items],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO recency_index "
+                "(user_id, timestamp, updated_at, document_id, date, health_score, "
+                "recommended_intensity, source, platform) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_row_values(item) for item in items],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO recency_users (user_id, built_at) "
+                "VALUES (?, ?)",
+                (user_id, time.time()),
+            )
+    finally:
+        conn.close()
+
+
+def delete_recency(
+    user_id: str | None = None,
+    doc_ids: list[str] | None = None,
+    source: str | None = None,
+) -> int:
+    """
+    행 삭제 (삭제한 행 수 반환)
+
+    - doc_ids: 해당 문서 행
+    - user_id만: 사용자 인덱스 전체 (다음 조회 시 Chroma에서 다시 생성)
+    - source (+ user_id): 해당 출처 행
+    """
+    conn = _connect()
+    try:
+        with conn:
+            if doc_ids:
+                return sum(
+                    conn.execute(
+                        "DELETE FROM recency_index WHERE document_id = ?", (doc_id,)
+                    ).rowcount
+                    for doc_id in doc_ids
+                )
+            if source is not None:
+                query = "DELETE FROM recency_index WHERE source = ?"
+                params = [source]
+                if user_id is not None:
+                    query += " AND user_id = ?"
+                    params.append(user_id)
+                return conn.execute(query, params).rowcount
+            if user_id is not None:
+                conn.execute("DELETE FROM recency_users WHERE user_id = ?", (user_id,))
+                return conn.execute(
+                    "DELETE FROM recency_index WHERE user_id = ?", (user_id,)
+                ).rowcount
+            return 0
+    finally:
+        conn.close()
@@ -0,0 +1,129 @@
+"""
+업로드 SQLite 읽기 전용 reader
+
+업로드된 DB 파일은 저장 후 바뀌지 않으므로
+- mode=ro + immutable=1: 잠금 / 변경 감지(WAL, journal 확인) 없이 읽음
+- mmap_size: 페이지를 복사하지 않고 OS 페이지 캐시에서 바로 읽음
+- cache_size: 연결별 페이지 캐시 확대
+로 연다.
+
+서로 독립적인 테이블 스캔은 테이블마다 별도 연결을 두고 스레드에서 동시에 실행한다.
+sqlite3는 sqlite3_step 동안 GIL을 놓으므로, 결과 행이 적은 집계 쿼리
+(GROUP BY, group_concat)는 코어 수만큼 실제로 병렬 실행된다.
+(행을 Python 객체로 만드는 fetch는 GIL 안이므로 전체 행 읽기(read_tables)는
+ 이득이 작고 코어 1개에서는 오히려 느리다, benchmarks/bench_sqlite_reader.py 참고)
+
+주의: immutable=1은 파일이 읽는 동안 바뀌지 않는다는 가정이다.
+      업로드 저장본 / 압축 해제본 이외의 DB에는 immutable=False로 연다.
+"""
+
+import os
+import sqlite3
+import threading
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+# 연결별 설정 (mmap은 가상 주소 공간만 예약, 실제 메모리는 OS 페이지 캐시)
+READ_MMAP_SIZE = 1024 * 1024 * 1024
+READ_CACHE_KIB = 32 * 1024
+
+# 동시 스캔 스레드 수 기본값 (config.SQLITE_SCAN_WORKERS)
+# 코어가 1개면 스레드 전환 비용만 늘어나므로 순차
+DEFAULT_SCAN_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def open_readonly(db_path: str, immutable: bool = True) -> sqlite3.Connection:
+    """업로드된 DB를 읽기 전용(+ immutable, mmap)으로 연다."""
+    uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+
+    try:
+        # 병렬 스캔 후 호출 스레드에서 닫을 수 있도록 check_same_thread=False
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={READ_MMAP_SIZE};")
+        conn.execute(f"PRAGMA cache_size=-{READ_CACHE_KIB};")
+    except Exception as e:
+        raise ValueError(f"DB 파일을 열 수 없습니다: {str(e)}")
+
+    return conn
+
+
+def run_parallel_scans(
+    db_path: str, tasks: dict, workers: int = DEFAULT_SCAN_WORKERS
+) -> dict:
+    """
+    독립적인 스캔 작업을 스레드별 연결에서 동시에 실행한다.
+
+    Args:
+        tasks: {key: func(conn) -> result} (오래 걸리는 작업을 앞에 두면 먼저 시작)
+        workers: 스레드 수 (1 이하면 연결 1개로 순차 실행)
+
+    Returns:
+        {key: result} (tasks 순서 유지, 작업 예외는 그대로 전파)
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        conn = open_readonly(db_path)
+        try:
+            return {key: func(conn) for key, func in tasks.items()}
+        finally:
+            conn.close()
+
+    local = threading.local()
+    connections = []
+    connections_lock = threading.Lock()
+
+    def run(func):
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = open_readonly(db_path)
+            with connections_lock:
+                connections.append(conn)
+        return func(conn)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = {key: pool.submit(run, func) for key, func in tasks.items()}
+            return {key: future.result() for key, future in futures.items()}
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def read_tables(
+    db_path: str, tables: list[str] | None = None, workers: int = DEFAULT_SCAN_WORKERS
+) -> dict:
+    """
+    테이블 전체 행 읽기 (db_to_json 읽기 단계)
+
+    Returns:
+        {table: (컬럼 이름 list, 행 tuple list)}
+        (tables 순서 유지, 읽을 수 없는 테이블은 제외)
+    """
+    if tables is None:
+        conn = open_readonly(db_path)
+        try:
+            tables = [
+                name
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table';"
+                )
+            ]
+        finally:
+            conn.close()
+
+    def scan(table):
+        def task(conn):
+            try:
+                cursor = conn.execute(f"SELECT * FROM {table};")
+                rows = cursor.fetchall()
+            except sqlite3.Error:
+                return None
+            return [col[0] for col in cursor.description], rows
+
+        return task
+
+    results = run_parallel_scans(
+        db_path, {table: scan(table) for table in tables}, workers
+    )
+    return {table: result for table, result in results.items() if result is not None}
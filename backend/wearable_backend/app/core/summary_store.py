@@ -0,0 +1,295 @@
+"""
+Summary 원본 저장소 (SQLite, document_id → summary JSON)
+
+기존에는 summary 전체를 Chroma metadata의 summary_json에 넣어서
+collection.get(where=user_id)가 날짜 / 점수만 필요할 때도 모든 JSON을 읽어 전송하고 파싱했다.
+(/api/vectordb/status는 전체 사용자의 metadata를 한 번에 읽음)
+
+- Chroma metadata: 필터 / 정렬용 작은 필드만 (user_id, date, timestamp, 점수, 출처 ...)
+- 이 저장소: document_id → summary JSON (기본 key 조회만 하는 WITHOUT ROWID 테이블)
+
+vector_store 조회 함수는 정렬 / top_k를 metadata로 끝낸 뒤,
+실제로 반환할 행의 document_id만 모아 get_summaries로 한 번에 읽는다.
+
+summary_sources: 날짜별 병합 전 출처별 원본 ((day_id, source) → summary JSON)
+같은 날짜에 다른 출처가 저장되거나 출처를 지울 때 이 원본들로 다시 병합한다. (day_merge)
+"""
+
+import os
+import json
+import time
+import sqlite3
+
+from app.config import SUMMARY_STORE_DB
+
+# SQLite IN (...) 조회 한 번에 넣는 key 수
+_LOOKUP_CHUNK = 500
+
+# 스키마를 만든 DB 경로 (프로세스별)
+_schema_ready: set[str] = set()
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    # 스키마 / WAL 설정은 DB 경로마다 1번만 (매번 하면 조회 연결 비용의 대부분)
+    ready = SUMMARY_STORE_DB in _schema_ready
+    if not ready:
+        os.makedirs(os.path.dirname(os.path.abspath(SUMMARY_STORE_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(SUMMARY_STORE_DB, timeout=30)
+    if ready:
+        return conn
+
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS summary_docs (
+            document_id  TEXT PRIMARY KEY,
+            user_id      TEXT NOT NULL,
+            summary_json TEXT NOT NULL,
+            updated_at   REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_summary_docs_user
+            ON summary_docs(user_id);
+        CREATE TABLE IF NOT EXISTS summary_sources (
+            day_id       TEXT NOT NULL,
+            source       TEXT NOT NULL,
+            user_id      TEXT NOT NULL,
+            summary_json TEXT NOT NULL,
+            updated_at   TEXT NOT NULL,
+            PRIMARY KEY (day_id, source)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_summary_sources_user
+            ON summary_sources(user_id, source);
+        CREATE TABLE IF NOT EXISTS summary_store_meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        """
+    )
+    _schema_ready.add(SUMMARY_STORE_DB)
+    return conn
+
+
+def _dumps(summary: dict) -> str:
+    try:
+        return json.dumps(summary, ensure_ascii=False)
+    except Exception as e:
+        print(f"[WARN] Summary JSON 직렬화 실패: {e}")
+        return json.dumps({"raw": {}, "summary_text": str(summary)}, ensure_ascii=False)
+
+
+# ------------------------------------------------
+# 2) 저장 / 조회 / 삭제
+# ------------------------------------------------
+def put_summaries(entries: list[tuple[str, str, dict]]):
+    """[(document_id, user_id, summary), ...] 저장 (같은 document_id는 덮어쓰기)"""
+    if not entries:
+        return
+
+    now = time.time()
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summary_docs "
+                "(document_id, user_id, summary_json, updated_at) VALUES (?, ?, ?, ?)",
+                [
+                    (doc_id, user_id, _dumps(summary), now)
+                    for doc_id, user_id, summary in entries
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def get_summaries(doc_ids: list[str]) -> dict:
+    """{document_id: summary dict} (저장소에 없는 id는 빠짐)"""
+    doc_ids = list(dict.fromkeys(doc_ids))
+    if not doc_ids:
+        return {}
+
+    found = {}
+    conn = _connect()
+    try:
+        for start in range(0, len(doc_ids), _LOOKUP_CHUNK):
+            chunk = doc_ids[start : start + _LOOKUP_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for doc_id, summary_json in conn.execute(
+                "SELECT document_id, summary_json FROM summary_docs "
+                f"WHERE document_id IN ({placeholders})",
+                chunk,
+            ):
+                try:
+                    found[doc_id] = json.loads(summary_json)
+                except json.JSONDecodeError:
+                    found[doc_id] = {}
+        return found
+    finally:
+        conn.close()
+
+
+def delete_summaries(doc_ids: list[str] | None = None, user_id: str | None = None):
+    """document_id 목록 또는 사용자 단위 삭제"""
+    conn = _connect()
+    try:
+        with conn:
+            if doc_ids:
+                conn.executemany(
+                    "DELETE FROM summary_docs WHERE document_id = ?",
+                    [(doc_id,) for doc_id in doc_ids],
+                )
+            if user_id is not None:
+                conn.execute("DELETE FROM summary_docs WHERE user_id = ?", (user_id,))
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 3) 출처별 원본 (날짜별 병합 입력)
+# ------------------------------------------------
+def put_source_summaries(entries: list[tuple[str, str, str, dict, str]]):
+    """[(day_id, user_id, source, summary, updated_at), ...] 저장 (같은 날짜 / 출처는 덮어쓰기)"""
+    if not entries:
+        return
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summary_sources "
+                "(day_id, source, user_id, summary_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (day_id, source, user_id, _dumps(summary), updated_at)
+                    for day_id, user_id, source, summary, updated_at in entries
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def get_source_summaries(day_ids: list[str]) -> dict:
+    """{day_id: {source: {"summary": dict, "updated_at": str}}} (merge_day 입력 형식)"""
+    day_ids = list(dict.fromkeys(day_ids))
+    found = {}
+    conn = _connect()
+    try:
+        for start in range(0, len(day_ids), _LOOKUP_CHUNK):
+            chunk = day_ids[start : start + _LOOKUP_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            for day_id, source, summary_json, updated_at in conn.execute(
+                "SELECT day_id, source, summary_json, updated_at FROM summary_sources "
+                f"WHERE day_id IN ({placeholders})",
+                chunk,
+            ):
+                try:
+                    summary = json.loads(summary_json)
+                except json.JSONDecodeError:
+                    summary = {}
+                found.setdefault(day_id, {})[source] = {
+                    "summary": summary,
+                    "updated_at": updated_at,
+                }
+        return found
+    finally:
+        conn.close()
+
+
+def source_days(source: str, user_id: str | None = None) -> list[tuple[str, str]]:
+    """해당 출처 원본이 있는 [(user_id, day_id), ...]"""
+    query = "SELECT user_id, day_id FROM summary_sources WHERE source = ?"
+    params = [source]
+    if user_id is not None:
+        query += " AND user_id = ?"
+        params.append(user_id)
+
+    conn = _connect()
+    try:
+        return [tuple(row) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+
+def delete_source_summaries(
+    user_id: str | None = None,
+    source: str | None = None,
+    day_ids: list[str] | None = None,
+):
+    """출처별 원본 삭제 (날짜 목록 / 사용자 / 출처 조건, 조건이 없으면 아무것도 안 함)"""
+    conditions, params = [], []
+    if user_id is not None:
+        conditions.append("user_id = ?")
+        params.append(user_id)
+    if source is not None:
+        conditions.append("source = ?")
+        params.append(source)
+    if not conditions and not day_ids:
+        return
+
+    conn = _connect()
+    try:
+        with conn:
+            if day_ids:
+                conn.executemany(
+                    "DELETE FROM summary_sources WHERE "
+                    + " AND ".join(conditions + ["day_id = ?"]),
+                    [(*params, day_id) for day_id in day_ids],
+                )
+            else:
+                conn.execute(
+                    "DELETE FROM summary_sources WHERE " + " AND ".join(conditions),
+                    params,
+                )
+    finally:
+        conn.close()
+
+
+def summary_store_stats() -> dict:
+    """저장된 문서 수 / 사용자 수 / JSON 크기 합"""
+    conn = _connect()
+    try:
+        documents, users, total_bytes = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT user_id), "
+            "COALESCE(SUM(LENGTH(CAST(summary_json AS BLOB))), 0) FROM summary_docs"
+        ).fetchone()
+        (source_records,) = conn.execute(
+            "SELECT COUNT(*) FROM summary_sources"
+        ).fetchone()
+    finally:
+        conn.close()
+
+    return {
+        "documents": documents,
+        "users": users,
+        "json_bytes": total_bytes,
+        "source_records": source_records,
+    }
+
+
+# ------------------------------------------------
+# 4) 기존 데이터 이전 여부 기록
+# ------------------------------------------------
+def get_meta(key: str) -> str | None:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT value FROM summary_store_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def set_meta(key: str, value: str):
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summary_store_meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+    finally:
+        conn.close()
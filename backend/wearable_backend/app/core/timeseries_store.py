@@ -0,0 +1,420 @@
+"""
+사용자별 건강 지표 시계열 저장소 (numpy memmap, 컬럼형)
+
+날짜 기반 조회(최근 N일, 날짜 범위, 히스토리)를 Chroma metadata 전체 조회 +
+summary_json 파싱 없이 처리하기 위한 로컬 저장소.
+Chroma는 유사도 검색(semantic index) 용도로만 사용한다.
+
+파일 구성 (TIMESERIES_DIR/<user_key>/)
+- rows.npy  : 구조화 배열 1개 (ROW_DTYPE, np.load(mmap_mode="r")로 읽음)
+              (timestamp, updated_at, source) 순 정렬 → searchsorted로 범위 조회
+- meta.json : user_id + 문자열 lookup (source / platform / intensity, 추가만 함)
+
+값 복원
+- metrics는 float64로 저장하고 kinds(0=없음, 1=float, 2=int, 3=None)로
+  원래 타입을 복원한다 → raw dict / summary_text가 Chroma 저장본과 같다.
+- RAW_FIELDS가 바뀌어 행 구조(dtype)가 다른 store는 없는 것으로 보고
+  Chroma에서 다시 생성한다.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+
+from app.config import TIMESERIES_DIR
+from app.core.day_merge import day_document_id
+from app.utils.preprocess import generate_summary_text
+
+# normalize_raw 출력 필드 (순서 유지)
+RAW_FIELDS = [
+    "sleep_min",
+    "sleep_hr",
+    "weight",
+    "height_m",
+    "bmi",
+    "body_fat",
+    "lean_body",
+    "distance_km",
+    "steps",
+    "steps_cadence",
+    "exercise_min",
+    "flights",
+    "active_calories",
+    "total_calories",
+    "calories_intake",
+    "oxygen_saturation",
+    "heart_rate",
+    "resting_heart_rate",
+    "walking_heart_rate",
+    "hrv",
+    "systolic",
+    "diastolic",
+    "glucose",
+    "heart_rate_p5",
+    "heart_rate_p50",
+    "heart_rate_p95",
+    "min_overnight_heart_rate",
+    "hr_zone1_pct",
+    "hr_zone2_pct",
+    "hr_zone3_pct",
+    "hr_zone4_pct",
+    "hr_zone5_pct",
+]
+
+# 값 타입 (kinds)
+KIND_MISSING = 0
+KIND_FLOAT = 1
+KIND_INT = 2
+KIND_NONE = 3
+
+ROW_DTYPE = np.dtype(
+    [
+        ("timestamp", "<i4"),  # YYYYMMDD
+        ("updated_at", "<i8"),  # YYYYMMDDHHMMSS (없으면 0)
+        ("source", "<i2"),
+        ("platform", "<i2"),
+        ("intensity", "<i2"),
+        ("score", "<f8"),
+        ("score_kind", "u1"),
+        ("metrics", "<f8", (len(RAW_FIELDS),)),
+        ("kinds", "u1", (len(RAW_FIELDS),)),
+    ]
+)
+
+# 사용자별 쓰기 lock + 읽기 캐시 {user_key: (stat key, rows, meta)}
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_read_cache: dict[str, tuple] = {}
+
+
+# ------------------------------------------------
+# 1) 경로 / lock
+# ------------------------------------------------
+def _user_key(user_id: str) -> str:
+    short = user_id.replace("@", "_").replace(".", "_")[:40]
+    digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:10]
+    return f"{short}_{digest}"
+
+
+def _user_dir(user_id: str) -> str:
+    return os.path.join(TIMESERIES_DIR, _user_key(user_id))
+
+
+def _user_lock(user_id: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(_user_key(user_id), threading.Lock())
+
+
+def timeseries_exists(user_id: str) -> bool:
+    """현재 행 구조(ROW_DTYPE)의 store가 있는지"""
+    return _load(user_id) is not None
+
+
+# ------------------------------------------------
+# 2) 값 인코딩 / 디코딩
+# ------------------------------------------------
+def _encode_value(value) -> tuple[float, int]:
+    if value is None:
+        return 0.0, KIND_NONE
+    if isinstance(value, bool):
+        return float(value), KIND_INT
+    if isinstance(value, int):
+        return float(value), KIND_INT
+    try:
+        return float(value), KIND_FLOAT
+    except (TypeError, ValueError):
+        return 0.0, KIND_NONE
+
+
+def _decode_value(value: float, kind: int):
+    if kind == KIND_INT:
+        return int(value)
+    if kind == KIND_NONE:
+        return None
+    return value
+
+
+def _lookup_id(values: list, value) -> int:
+    value = value if value is not None else ""
+    if value not in values:
+        values.append(value)
+    return values.index(value)
+
+
+def _encode_rows(items: list[dict], meta: dict) -> np.ndarray:
+    """조회 결과 형식의 item 목록 → 구조화 배열 (meta lookup 갱신)"""
+    rows = np.zeros(len(items), dtype=ROW_DTYPE)
+
+    for i, item in enumerate(items):
+        row = rows[i]
+        row["timestamp"] = int(item.get("timestamp") or 0)
+        updated_at = str(item.get("updated_at") or "")
+        row["updated_at"] = int(updated_at) if updated_at.isdigit() else 0
+        row["source"] = _lookup_id(meta["sources"], item.get("source", "unknown"))
+        row["platform"] = _lookup_id(
+            meta["platforms"], item.get("platform", "unknown")
+        )
+        row["intensity"] = _lookup_id(
+            meta["intensities"], item.get("recommended_intensity")
+        )
+        row["score"], row["score_kind"] = _encode_value(item.get("health_score"))
+
+        raw = item.get("raw") or {}
+        for j, field in enumerate(RAW_FIELDS):
+            if field in raw:
+                row["metrics"][j], row["kinds"][j] = _encode_value(raw[field])
+
+    return rows
+
+
+def _date_from_timestamp(timestamp: int) -> str:
+    year, month, day = timestamp // 10000, timestamp // 100 % 100, timestamp % 100
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def decode_rows(user_id: str, rows: np.ndarray, meta: dict) -> list[dict]:
+    """구조화 배열 → vector_store 조회 결과 형식 (raw / summary_text 포함)"""
+    sources = meta["sources"]
+    platforms = meta["platforms"]
+    intensities = meta["intensities"]
+
+    # 컬럼 단위로 Python 값 변환 (대부분 컬럼은 전부 float 또는 전부 int)
+    metrics = rows["metrics"]
+    kinds = rows["kinds"]
+    columns = []
+    for j in range(len(RAW_FIELDS)):
+        column_kinds = kinds[:, j]
+        if (column_kinds == KIND_FLOAT).all():
+            columns.append(metrics[:, j].tolist())
+        elif (column_kinds == KIND_INT).all():
+            columns.append(metrics[:, j].astype(np.int64).tolist())
+        else:
+            values = zip(metrics[:, j].tolist(), column_kinds.tolist())
+            columns.append([_decode_value(value, kind) for value, kind in values])
+    complete = (kinds != KIND_MISSING).all(axis=1).tolist()
+
+    items = []
+    for i, (row, values) in enumerate(zip(rows.tolist(), zip(*columns))):
+        timestamp, updated_at, source_id, platform_id, intensity_id = row[:5]
+        score, score_kind = row[5:7]
+
+        if complete[i]:
+            raw = dict(zip(RAW_FIELDS, values))
+        else:
+            raw = {
+                field: value
+                for field, value, kind in zip(RAW_FIELDS, values, kinds[i].tolist())
+                if kind != KIND_MISSING
+            }
+        try:
+            summary_text = generate_summary_text(raw) if raw else ""
+        except (KeyError, TypeError):
+            summary_text = ""
+
+        date = _date_from_timestamp(timestamp)
+        source = sources[source_id]
+
+        items.append(
+            {
+                "document_id": day_document_id(user_id, date),
+                "user_id": user_id,
+                "date": date,
+                "timestamp": timestamp,
+                "health_score": _decode_value(score, score_kind),
+                "recommended_intensity": intensities[intensity_id] or None,
+                "source": source,
+                "platform": platforms[platform_id],
+                "updated_at": str(updated_at) if updated_at else "",
+                "raw": raw,
+                "summary_text": summary_text,
+            }
+        )
+
+    return items
+
+
+# ------------------------------------------------
+# 3) 읽기 (memmap + 프로세스 내 캐시)
+# ------------------------------------------------
+def _load(user_id: str):
+    """(rows memmap, meta) 또는 store가 없으면 None"""
+    user_dir = _user_dir(user_id)
+    rows_path = os.path.join(user_dir, "rows.npy")
+
+    try:
+        stat = os.stat(rows_path)
+    except FileNotFoundError:
+        return None
+
+    stat_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _read_cache.get(user_dir)
+    if cached and cached[0] == stat_key:
+        return cached[1], cached[2]
+
+    rows = np.load(rows_path, mmap_mode="r")
+    if rows.dtype != ROW_DTYPE:
+        # 이전 RAW_FIELDS로 만든 store → 재구축 대상
+        return None
+    with open(os.path.join(user_dir, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    _read_cache[user_dir] = (stat_key, rows, meta)
+    return rows, meta
+
+
+def read_rows(user_id: str):
+    """
+    (rows memmap, meta) 또는 None (컬럼을 직접 계산하는 지표 kNN용)
+    store가 바뀌기 전까지 같은 rows 객체를 반환하므로 호출 측 캐시 key로 쓸 수 있다.
+    """
+    return _load(user_id)
+
+
+def _latest_per_date(rows: np.ndarray) -> np.ndarray:
+    """같은 날짜 중 updated_at 최신 행만 (정렬 순서상 날짜별 마지막 행)"""
+    if len(rows) == 0:
+        return rows
+    timestamps = rows["timestamp"]
+    last_of_date = np.empty(len(rows), dtype=bool)
+    last_of_date[:-1] = timestamps[1:] != timestamps[:-1]
+    last_of_date[-1] = True
+    return rows[last_of_date]
+
+
+def query_timeseries(
+    user_id: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+    latest_per_date: bool = True,
+    limit: int | None = None,
+) -> list[dict] | None:
+    """
+    날짜 범위 조회 (최신 날짜순)
+
+    Args:
+        start_timestamp / end_timestamp: YYYYMMDD (포함, None이면 제한 없음)
+        latest_per_date: 같은 날짜 여러 행 중 updated_at 최신만 유지 (병합 이전 데이터)
+        limit: 최신순 최대 개수
+
+    Returns:
+        조회 결과 리스트, store가 없으면 None (Chroma fallback 대상)
+    """
+    loaded = _load(user_id)
+    if loaded is None:
+        return None
+    rows, meta = loaded
+
+    timestamps = rows["timestamp"]
+    lo, hi = 0, len(rows)
+    if start_timestamp is not None:
+        lo = np.searchsorted(timestamps, start_timestamp, "left")
+    if end_timestamp is not None:
+        hi = np.searchsorted(timestamps, end_timestamp, "right")
+    selected = np.asarray(rows[lo:hi])
+
+    if latest_per_date:
+        selected = _latest_per_date(selected)
+
+    # 최신순 (timestamp, updated_at 내림차순 = 정렬 역순)
+    selected = selected[::-1]
+    if limit is not None:
+        selected = selected[:limit]
+
+    return decode_rows(user_id, selected, meta)
+
+
+# ------------------------------------------------
+# 4) 쓰기
+# ------------------------------------------------
+def _write(user_id: str, rows: np.ndarray, meta: dict):
+    """meta → rows 순서로 원자적 교체 (lookup은 추가만 하므로 meta가 먼저여도 안전)"""
+    user_dir = _user_dir(user_id)
+    os.makedirs(user_dir, exist_ok=True)
+
+    order = np.lexsort((rows["source"], rows["updated_at"], rows["timestamp"]))
+    rows = rows[order]
+
+    meta_tmp = os.path.join(user_dir, "meta.json.tmp")
+    with open(meta_tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(meta_tmp, os.path.join(user_dir, "meta.json"))
+
+    rows_tmp = os.path.join(user_dir, "rows.tmp.npy")
+    np.save(rows_tmp, rows)
+    os.replace(rows_tmp, os.path.join(user_dir, "rows.npy"))
+
+
+def _empty_meta(user_id: str) -> dict:
+    return {
+        "version": 1,
+        "user_id": user_id,
+        "fields": RAW_FIELDS,
+        "sources": [],
+        "platforms": [],
+        "intensities": [],
+    }
+
+
+def upsert_timeseries(user_id: str, items: list[dict], replace: bool = False):
+    """
+    행 추가/갱신 (timestamp가 같으면 덮어쓰기 = 날짜별 병합 문서 doc_id와 동일 기준)
+
+    replace=True: 기존 store를 버리고 items로 새로 생성 (Chroma에서 재구축)
+    """
+    with _user_lock(user_id):
+        loaded = _load(user_id)
+        existing = np.zeros(0, dtype=ROW_DTYPE)
+
+        if loaded is None:
+            meta = _empty_meta(user_id)
+        else:
+            # lookup 목록은 재구축 때도 유지 (읽는 쪽이 이전 rows + 새 meta를 봐도 안전)
+            rows, meta = loaded
+            meta = json.loads(json.dumps(meta))
+            if not replace:
+                existing = np.array(rows)
+
+        new_rows = _encode_rows(items, meta)
+
+        if len(existing):
+            keep = ~np.isin(existing["timestamp"], new_rows["timestamp"])
+            new_rows = np.concatenate([existing[keep], new_rows])
+
+        _write(user_id, new_rows, meta)
+
+
+def delete_timeseries(user_id: str | None = None, source: str | None = None) -> int:
+    """
+    store 삭제 (다음 조회 시 Chroma에서 다시 생성)
+
+    - user_id 지정: 해당 사용자 store
+    - source만 지정: 해당 source 데이터가 있는 모든 사용자 store
+    - 둘 다 None이면 아무것도 안 함
+    """
+    if user_id:
+        targets = [_user_dir(user_id)]
+    elif source:
+        targets = []
+        if os.path.isdir(TIMESERIES_DIR):
+            for name in os.listdir(TIMESERIES_DIR):
+                meta_path = os.path.join(TIMESERIES_DIR, name, "meta.json")
+                try:
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        if source in json.load(f).get("sources", []):
+                            targets.append(os.path.join(TIMESERIES_DIR, name))
+                except (OSError, ValueError):
+                    continue
+    else:
+        return 0
+
+    deleted = 0
+    for user_dir in targets:
+        if os.path.isdir(user_dir):
+            shutil.rmtree(user_dir, ignore_errors=True)
+            _read_cache.pop(user_dir, None)
+            deleted += 1
+    return deleted
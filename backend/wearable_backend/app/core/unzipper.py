@@ -1,39 +1,79 @@
 import zipfile
 import os
+import shutil
 import tempfile
 
+SQLITE_HEADER = b"SQLite format 3"
+
+# 이름만으로 DB일 가능성이 높은 확장자 (먼저 검사)
+DB_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# 압축 해제 시 스트리밍 버퍼 크기
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 def is_sqlite_file(path: str) -> bool:
     """SQLite 파일인지 시그니처로 검사"""
     try:
         with open(path, "rb") as f:
             header = f.read(16)
-            return header.startswith(b"SQLite format 3")
+            return header.startswith(SQLITE_HEADER)
     except:
         return False
 
 
-def extract_zip_to_temp(zip_path: str) -> str:
+def find_sqlite_member(zip_ref: zipfile.ZipFile) -> zipfile.ZipInfo | None:
     """
-    ZIP 파일을 임시 폴더에 압축해제하고,
-    그 안에서 SQLite DB 파일(.db 확장자 여부와 상관 없음)을 찾아 반환한다.
+    ZIP central directory만 훑어서 SQLite DB 항목을 찾는다.
+
+    - 디렉토리 / 16바이트 미만 항목은 제외
+    - .db/.sqlite 확장자 항목을 먼저 검사 (나머지는 ZIP 내 순서대로)
+    - 각 후보는 압축 스트림에서 앞 16바이트만 읽어 시그니처 확인
     """
+    candidates = [
+        info
+        for info in zip_ref.infolist()
+        if not info.is_dir() and info.file_size >= len(SQLITE_HEADER)
+    ]
+    candidates.sort(key=lambda info: not info.filename.lower().endswith(DB_EXTENSIONS))
+
+    for info in candidates:
+        try:
+            with zip_ref.open(info) as member:
+                if member.read(16).startswith(SQLITE_HEADER):
+                    return info
+        except Exception as e:
+            print(f"[WARN] ZIP 항목 확인 실패 (건너뜀): {info.filename} - {e}")
+
+    return None
 
-    # 1) 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp()
 
-    # 2) ZIP 해제
+def extract_zip_to_temp(zip_path: str, dest_dir: str | None = None) -> str:
+    """
+    ZIP 파일 안에서 SQLite DB 파일(.db 확장자 여부와 상관 없음)을 찾아
+    그 항목 하나만 dest_dir(없으면 임시 폴더)에 풀어서 경로를 반환한다.
+    """
+
+    # 1) 저장 디렉토리 (업로드 서비스는 사용자별 추출 폴더를 넘김)
+    if dest_dir is None:
+        dest_dir = tempfile.mkdtemp()
+    os.makedirs(dest_dir, exist_ok=True)
+
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(temp_dir)
+        # 2) SQLite 항목 탐색 (전체 해제 없이)
+        info = find_sqlite_member(zip_ref)
+
+        # 못 찾으면 에러
+        if info is None:
+            raise FileNotFoundError("ZIP 안에서 SQLite DB 파일을 찾지 못했습니다.")
 
-    # 2) SQLite 파일 탐색
-    for root, dirs, files in os.walk(temp_dir):
-        for f in files:
-            file_path = os.path.join(root, f)
+        # 3) DB 항목만 스트리밍 해제 (ZIP 내부 경로는 버리고 파일명만 사용)
+        file_name = os.path.basename(info.filename)
+        file_path = os.path.join(dest_dir, file_name)
+        if os.path.exists(file_path):
+            file_path = os.path.join(dest_dir, f"extracted_{file_name}")
 
-            # 확장자 확인 대신 SQLite signature 검사
-            if is_sqlite_file(file_path):
-                return file_path
+        with zip_ref.open(info) as src, open(file_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
 
-    # 못 찾으면 에러
-    raise FileNotFoundError("ZIP 안에서 SQLite DB 파일을 찾지 못했습니다.")
+    return file_path
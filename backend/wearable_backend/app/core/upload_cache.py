@@ -0,0 +1,245 @@
+"""
+업로드 결과 캐시 (파일 SHA-256 기준, 로컬 디스크)
+
+앱 재시도 / 더블탭으로 같은 ZIP이 연달아 올라오는 경우
+압축 해제 → 파싱 → 임베딩 → LLM 분석 전체를 다시 돌리지 않도록
+업로드 바이트의 SHA-256을 key로 결과를 보관한다.
+
+- raw: 파싱 결과 (platform + 날짜별 raw) → 압축 해제/파싱 생략
+- response: process_file 최종 응답 → 파이프라인 전체 생략
+  (difficulty / duration이 결과에 영향을 주므로 variant로 구분)
+
+저장 방식
+- 인덱스: SQLite (마지막 접근 시각, 크기)
+- 본문: LOCAL_DATA_DIR/upload_cache/<entry_key>.json
+- 전체 크기가 UPLOAD_CACHE_MAX_BYTES를 넘으면 오래 안 쓴 항목부터 삭제 (LRU)
+- 사용자 데이터 삭제 시 invalidate_upload_cache(user_id=...) 로 무효화
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+
+from app.config import UPLOAD_CACHE_DIR, UPLOAD_CACHE_MAX_BYTES
+
+# 캐시 종류
+KIND_RAW = "raw"
+KIND_RESPONSE = "response"
+
+_INDEX_DB = os.path.join(UPLOAD_CACHE_DIR, "index.sqlite3")
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+
+    conn = sqlite3.connect(_INDEX_DB, timeout=30)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS upload_cache (
+            entry_key   TEXT    PRIMARY KEY,
+            user_id     TEXT    NOT NULL,
+            sha256      TEXT    NOT NULL,
+            kind        TEXT    NOT NULL,
+            variant     TEXT    NOT NULL,
+            source      TEXT,
+            size_bytes  INTEGER NOT NULL,
+            created_at  REAL    NOT NULL,
+            last_access REAL    NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_upload_cache_user ON upload_cache(user_id)"
+    )
+    return conn
+
+
+def _entry_key(user_id: str, sha256: str, kind: str, variant: str) -> str:
+    payload = f"{user_id}\x00{sha256}\x00{kind}\x00{variant}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(entry_key: str) -> str:
+    return os.path.join(UPLOAD_CACHE_DIR, f"{entry_key}.json")
+
+
+def _remove_files(entry_keys: list[str]):
+    for entry_key in entry_keys:
+        try:
+            os.remove(_entry_path(entry_key))
+        except FileNotFoundError:
+            pass
+
+
+# ------------------------------------------------
+# 2) 조회 / 저장
+# ------------------------------------------------
+def get_cached(
+    user_id: str, sha256: str, kind: str, variant: str = ""
+) -> dict | None:
+    """캐시 조회 (hit이면 last_access 갱신), 없으면 None"""
+    entry_key = _entry_key(user_id, sha256, kind, variant)
+
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM upload_cache WHERE entry_key = ?", (entry_key,)
+        ).fetchone()
+        if not row:
+            return None
+
+        try:
+            with open(_entry_path(entry_key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            # 본문 파일이 사라졌거나 깨진 경우 → 인덱스 정리 후 miss
+            with conn:
+                conn.execute(
+                    "DELETE FROM upload_cache WHERE entry_key = ?", (entry_key,)
+                )
+            return None
+
+        with conn:
+            conn.execute(
+                "UPDATE upload_cache SET last_access = ? WHERE entry_key = ?",
+                (time.time(), entry_key),
+            )
+        return value
+    finally:
+        conn.close()
+
+
+def put_cached(
+    user_id: str,
+    sha256: str,
+    kind: str,
+    value: dict,
+    variant: str = "",
+    source: str | None = None,
+):
+    """캐시 저장 후 전체 크기 제한에 맞게 LRU 정리"""
+    entry_key = _entry_key(user_id, sha256, kind, variant)
+    body = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+    # 한 항목이 제한보다 크면 저장하지 않음
+    if len(body) > UPLOAD_CACHE_MAX_BYTES:
+        return
+
+    conn = _connect()
+    try:
+        path = _entry_path(entry_key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO upload_cache "
+                "(entry_key, user_id, sha256, kind, variant, source, "
+                "size_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry_key,
+                    user_id,
+                    sha256,
+                    kind,
+                    variant,
+                    source,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+        _evict(conn)
+    finally:
+        conn.close()
+
+
+def _evict(conn: sqlite3.Connection):
+    """전체 크기가 UPLOAD_CACHE_MAX_BYTES 이하가 될 때까지 오래된 항목 삭제"""
+    total = conn.execute(
+        "SELECT COALESCE(SUM(size_bytes), 0) FROM upload_cache"
+    ).fetchone()[0]
+    if total <= UPLOAD_CACHE_MAX_BYTES:
+        return
+
+    evicted = []
+    for entry_key, size_bytes in conn.execute(
+        "SELECT entry_key, size_bytes FROM upload_cache ORDER BY last_access"
+    ).fetchall():
+        if total <= UPLOAD_CACHE_MAX_BYTES:
+            break
+        evicted.append(entry_key)
+        total -= size_bytes
+
+    with conn:
+        conn.executemany(
+            "DELETE FROM upload_cache WHERE entry_key = ?",
+            [(entry_key,) for entry_key in evicted],
+        )
+    _remove_files(evicted)
+    print(f"[INFO] 업로드 캐시 LRU 정리: {len(evicted)}개 항목 삭제")
+
+
+# ------------------------------------------------
+# 3) 무효화 (VectorDB 데이터 삭제 시 함께 호출)
+# ------------------------------------------------
+def invalidate_upload_cache(
+    user_id: str | None = None, source: str | None = None
+) -> int:
+    """
+    조건에 맞는 캐시 항목 삭제
+
+    - user_id 지정: 해당 사용자의 모든 항목 (source와 무관하게 응답이 바뀌므로)
+    - source만 지정: 해당 source 데이터를 캐시한 사용자들의 모든 항목
+    - 둘 다 None이면 아무것도 안 함
+    """
+    if not user_id and not source:
+        return 0
+
+    conn = _connect()
+    try:
+        if user_id:
+            rows = conn.execute(
+                "SELECT entry_key FROM upload_cache WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT entry_key FROM upload_cache WHERE user_id IN "
+                "(SELECT user_id FROM upload_cache WHERE source = ?)",
+                (source,),
+            ).fetchall()
+
+        entry_keys = [row[0] for row in rows]
+        with conn:
+            conn.executemany(
+                "DELETE FROM upload_cache WHERE entry_key = ?",
+                [(entry_key,) for entry_key in entry_keys],
+            )
+        _remove_files(entry_keys)
+        return len(entry_keys)
+    finally:
+        conn.close()
+
+
+def cache_stats() -> dict:
+    """항목 수 / 전체 크기 (inspect용)"""
+    conn = _connect()
+    try:
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM upload_cache"
+        ).fetchone()
+        return {
+            "entries": count,
+            "bytes": total,
+            "max_bytes": UPLOAD_CACHE_MAX_BYTES,
+        }
+    finally:
+        conn.close()
@@ -0,0 +1,190 @@
+"""
+이어받기(resumable) 업로드 세션 저장소 (SQLite)
+
+모바일에서 수백 MB 내보내기 파일을 multipart 한 번으로 올리다 끊기면
+처음부터 다시 올려야 한다. tus 방식처럼
+- handshake: 파일 SHA-256 + 크기로 세션 생성 / 조회
+- PATCH: 받은 위치(offset)부터 chunk를 이어서 기록
+- 완료: 파이프라인 작업(job_id)을 세션에 연결 → 같은 파일 handshake는 "ingested"
+
+받은 위치는 부분 파일의 실제 크기를 기준으로 하므로 chunk마다 offset을 기록하지 않는다.
+(서버가 재시작되거나 chunk 도중 연결이 끊겨도 디스크에 남은 만큼부터 이어받음)
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+from datetime import datetime
+
+from app.config import RESUMABLE_UPLOAD_DB
+
+# 세션 상태
+STATUS_UPLOADING = "uploading"
+STATUS_COMPLETE = "complete"
+
+
+# ------------------------------------------------
+# 1) 연결 + 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(RESUMABLE_UPLOAD_DB)), exist_ok=True)
+
+    conn = sqlite3.connect(RESUMABLE_UPLOAD_DB, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS upload_sessions (
+            upload_id     TEXT    PRIMARY KEY,
+            user_id       TEXT    NOT NULL,
+            filename      TEXT    NOT NULL,
+            sha256        TEXT    NOT NULL,
+            size_bytes    INTEGER NOT NULL,
+            status        TEXT    NOT NULL,
+            params        TEXT    NOT NULL,
+            job_id        TEXT,
+            created_at    TEXT    NOT NULL,
+            last_activity REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_upload_sessions_file
+            ON upload_sessions(user_id, sha256, size_bytes);
+        """
+    )
+    return conn
+
+
+def _row_to_session(row: sqlite3.Row) -> dict:
+    session = dict(row)
+    session["params"] = json.loads(session["params"])
+    return session
+
+
+# ------------------------------------------------
+# 2) 생성 / 조회
+# ------------------------------------------------
+def create_session(
+    user_id: str, filename: str, sha256: str, size_bytes: int, params: dict
+) -> dict:
+    """세션 등록 (status=uploading)"""
+    upload_id = uuid.uuid4().hex
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO upload_sessions "
+                "(upload_id, user_id, filename, sha256, size_bytes, status, params, "
+                "created_at, last_activity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    upload_id,
+                    user_id,
+                    filename,
+                    sha256,
+                    size_bytes,
+                    STATUS_UPLOADING,
+                    json.dumps(params, ensure_ascii=False),
+                    datetime.now().isoformat(timespec="seconds"),
+                    time.time(),
+                ),
+            )
+    finally:
+        conn.close()
+
+    return get_session(upload_id)
+
+
+def get_session(upload_id: str) -> dict | None:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM upload_sessions WHERE upload_id = ?", (upload_id,)
+        ).fetchone()
+        return _row_to_session(row) if row else None
+    finally:
+        conn.close()
+
+
+def find_session(user_id: str, sha256: str, size_bytes: int) -> dict | None:
+    """같은 사용자 + 같은 파일의 가장 최근 세션 (완료된 세션 우선)"""
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT * FROM upload_sessions "
+            "WHERE user_id = ? AND sha256 = ? AND size_bytes = ? "
+            "ORDER BY status = ? DESC, last_activity DESC LIMIT 1",
+            (user_id, sha256, size_bytes, STATUS_COMPLETE),
+        ).fetchone()
+        return _row_to_session(row) if row else None
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 3) 상태 갱신
+# ------------------------------------------------
+def touch_session(upload_id: str):
+    """chunk 수신 시각 기록 (만료 기준)"""
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "UPDATE upload_sessions SET last_activity = ? WHERE upload_id = ?",
+                (time.time(), upload_id),
+            )
+    finally:
+        conn.close()
+
+
+def mark_complete(upload_id: str, job_id: str):
+    """모든 바이트 수신 + 해시 확인 완료 → 파이프라인 작업 연결"""
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "UPDATE upload_sessions SET status = ?, job_id = ?, last_activity = ? "
+                "WHERE upload_id = ?",
+                (STATUS_COMPLETE, job_id, time.time(), upload_id),
+            )
+    finally:
+        conn.close()
+
+
+def delete_session(upload_id: str):
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(
+                "DELETE FROM upload_sessions WHERE upload_id = ?", (upload_id,)
+            )
+    finally:
+        conn.close()
+
+
+def expire_sessions(ttl_hours: float) -> list[str]:
+    """
+    마지막 chunk 이후 ttl_hours가 지난 미완료 세션 삭제
+
+    Returns:
+        삭제한 upload_id 목록 (부분 파일 정리용)
+    """
+    cutoff = time.time() - ttl_hours * 3600
+
+    conn = _connect()
+    try:
+        upload_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT upload_id FROM upload_sessions "
+                "WHERE status = ? AND last_activity < ?",
+                (STATUS_UPLOADING, cutoff),
+            ).fetchall()
+        ]
+        with conn:
+            conn.executemany(
+                "DELETE FROM upload_sessions WHERE upload_id = ?",
+                [(upload_id,) for upload_id in upload_ids],
+            )
+        return upload_ids
+    finally:
+        conn.close()
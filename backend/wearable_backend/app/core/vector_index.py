@@ -0,0 +1,280 @@
+"""
+사용자별 정확(brute-force) 벡터 검색 인덱스 (numpy memmap)
+
+사용자당 summary는 많아야 수천 개인데 search_similar_summaries는 전체 사용자가 섞인
+Chroma HNSW 인덱스를 where={"user_id": ...}로 조회하고, top_k*3(최소 10)개를 받아
+날짜 중복 제거 후 잘라냈다. (근사 검색 + 필터 때문에 결과가 빠질 수 있음)
+
+사용자별로 L2 정규화한 벡터를 연속된 float32 행렬 1개로 저장하고
+- 코사인 유사도 = 행렬 × 쿼리 벡터 1번 (BLAS)
+- 날짜별 updated_at 최신 행만 후보 (저장 시점 기준 mask) → 중복 제거 후처리 없음
+- np.argpartition으로 top_k만 골라 정렬
+→ 정확한 top_k를 1ms 안쪽으로 반환한다. (365일 × 1536차원 ≈ 0.1ms)
+
+float16 저장은 numpy 행렬 곱에 BLAS 경로가 없어 10배 이상 느려서 사용하지 않는다.
+quantization="int8"이면 행마다 scale(최대 절댓값 / 127)로 나눈 int8을 저장한다.
+(파일 / 페이지 캐시 약 1/4, 대신 int8 → float32 변환 때문에 검색 계산은 3~4배)
+
+파일 구성 (<root>/<user_key>/)
+- vectors.<version>.npy : (N, dim) float32 또는 int8 (np.load(mmap_mode="r")로 읽음)
+- scales.<version>.npy  : (N,) float32 (int8일 때만)
+- docs.json             : {"version", "dim", "dtype", "docs": [metadata item, ...]}
+                          (docs 순서 = 벡터 행 순서)
+docs.json을 마지막에 교체하므로 읽는 쪽은 항상 같은 version의 벡터 파일을 연다.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+
+# 벡터 파일과 함께 저장하는 metadata 필드 (vector_store 조회 결과 item 형식)
+DOC_FIELDS = (
+    "document_id",
+    "user_id",
+    "date",
+    "timestamp",
+    "health_score",
+    "recommended_intensity",
+    "source",
+    "platform",
+    "updated_at",
+)
+
+
+def _latest_per_date_mask(docs: list[dict]) -> np.ndarray:
+    """날짜마다 updated_at 최신 행만 True (날짜별 병합 이전 데이터 대비)"""
+    best = {}
+    for i, doc in enumerate(docs):
+        date = doc.get("date")
+        if date not in best or doc.get("updated_at", "") > docs[best[date]].get(
+            "updated_at", ""
+        ):
+            best[date] = i
+
+    mask = np.zeros(len(docs), dtype=bool)
+    mask[list(best.values())] = True
+    return mask
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_int8(vectors) -> tuple[np.ndarray, np.ndarray]:
+    """행별 대칭 int8 양자화 → (codes, scales), 원래 값 ≈ codes * scales[:, None]"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class UserVectorIndex:
+    """
+    root_dir 아래 사용자별 벡터 행렬 (임베딩 모델 / 컬렉션마다 root_dir을 나눔)
+
+    search는 인덱스가 없으면 None → 호출 측에서 Chroma에서 생성하거나 Chroma로 검색
+    """
+
+    def __init__(self, root_dir: str, quantization: str = "float32"):
+        if quantization not in ("float32", "int8"):
+            raise ValueError(f"❌ 알 수 없는 벡터 인덱스 형식: {quantization}")
+        self.root_dir = root_dir
+        # 새로 쓰는 파일 형식 (읽기는 docs.json의 dtype 기준 → 바꾸면 다음 저장부터 적용)
+        self.quantization = quantization
+        # 사용자별 쓰기 lock + 읽기 캐시 {user_dir: (stat key, vectors, docs, mask, scales)}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._read_cache: dict[str, tuple] = {}
+
+    # ------------------------------------------------
+    # 1) 경로 / lock
+    # ------------------------------------------------
+    def _user_dir(self, user_id: str) -> str:
+        short = user_id.replace("@", "_").replace(".", "_")[:40]
+        digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:10]
+        return os.path.join(self.root_dir, f"{short}_{digest}")
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(self._user_dir(user_id), threading.Lock())
+
+    def exists(self, user_id: str) -> bool:
+        return self._load(user_id) is not None
+
+    # ------------------------------------------------
+    # 2) 읽기 (memmap + 프로세스 내 캐시)
+    # ------------------------------------------------
+    def _load(self, user_id: str):
+        """(vectors memmap, docs, 후보 mask, int8 scales 또는 None) / 인덱스가 없으면 None"""
+        user_dir = self._user_dir(user_id)
+        docs_path = os.path.join(user_dir, "docs.json")
+
+        # 쓰는 쪽이 docs.json 교체 직후 이전 벡터 파일을 지울 수 있어 한 번 더 시도
+        for _ in range(2):
+            try:
+                stat = os.stat(docs_path)
+            except FileNotFoundError:
+                return None
+
+            stat_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            cached = self._read_cache.get(user_dir)
+            if cached and cached[0] == stat_key:
+                return cached[1:]
+
+            try:
+                with open(docs_path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+                vectors_path = os.path.join(
+                    user_dir, f"vectors.{payload['version']}.npy"
+                )
+                vectors = np.load(vectors_path, mmap_mode="r")
+                scales = None
+                if payload.get("dtype") == "int8":
+                    scales = np.load(
+                        os.path.join(user_dir, f"scales.{payload['version']}.npy")
+                    )
+            except FileNotFoundError:
+                continue
+
+            docs = payload["docs"]
+            if vectors.shape[0] != len(docs):
+                return None
+
+            loaded = (vectors, docs, _latest_per_date_mask(docs), scales)
+            self._read_cache[user_dir] = (stat_key, *loaded)
+            return loaded
+        return None
+
+    def search(
+        self, user_id: str, query_embedding, top_k: int
+    ) -> list[tuple[dict, float]] | None:
+        """
+        코사인 유사도 정확한 top_k [(doc, similarity), ...] (유사도 내림차순)
+        날짜마다 updated_at 최신 행만 후보, 인덱스가 없거나 차원이 다르면 None
+        """
+        loaded = self._load(user_id)
+        if loaded is None:
+            return None
+        vectors, docs, mask, scales = loaded
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (vectors.shape[1],):
+            return None
+        query = _normalize(query)
+
+        scores = vectors @ query
+        if scales is not None:
+            scores = scores * scales
+        candidates = np.flatnonzero(mask)
+        k = min(top_k, len(candidates))
+        if k <= 0:
+            return []
+
+        candidate_scores = scores[candidates]
+        if k < len(candidates):
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+
+        return [
+            (dict(docs[candidates[i]]), float(candidate_scores[i])) for i in top
+        ]
+
+    # ------------------------------------------------
+    # 3) 쓰기
+    # ------------------------------------------------
+    def _write(self, user_id: str, vectors: np.ndarray, docs: list[dict]):
+        """새 version 벡터 파일 → docs.json 교체 → 이전 벡터 파일 삭제"""
+        user_dir = self._user_dir(user_id)
+        os.makedirs(user_dir, exist_ok=True)
+
+        version = f"{time.time_ns():x}"
+        arrays = {"vectors": np.ascontiguousarray(vectors, dtype=np.float32)}
+        if self.quantization == "int8":
+            arrays["vectors"], arrays["scales"] = quantize_int8(vectors)
+
+        current = set()
+        for prefix, array in arrays.items():
+            tmp_path = os.path.join(user_dir, f"{prefix}.{version}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(user_dir, f"{prefix}.{version}.npy"))
+            current.add(f"{prefix}.{version}.npy")
+
+        docs_tmp = os.path.join(user_dir, "docs.json.tmp")
+        with open(docs_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": version,
+                    "dim": int(vectors.shape[1]),
+                    "dtype": self.quantization,
+                    "docs": docs,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(docs_tmp, os.path.join(user_dir, "docs.json"))
+
+        for name in os.listdir(user_dir):
+            if name.startswith(("vectors.", "scales.")) and name not in current:
+                try:
+                    os.remove(os.path.join(user_dir, name))
+                except OSError:
+                    pass
+
+    def upsert(
+        self, user_id: str, items: list[dict], embeddings: list, replace: bool = False
+    ):
+        """
+        행 추가 / 갱신 (같은 document_id는 덮어쓰기 = Chroma upsert와 같은 기준)
+
+        replace=True: 기존 인덱스를 버리고 items로 새로 생성 (Chroma에서 재구축)
+        """
+        new_docs = [{field: item.get(field) for field in DOC_FIELDS} for item in items]
+        new_vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        if new_vectors.ndim != 2:
+            new_vectors = new_vectors.reshape(len(new_docs), -1)
+
+        with self._user_lock(user_id):
+            loaded = None if replace else self._load(user_id)
+
+            if loaded is not None and loaded[0].shape[1] == new_vectors.shape[1]:
+                vectors, docs, _, scales = loaded
+                new_ids = {doc["document_id"] for doc in new_docs}
+                keep = [
+                    i for i, doc in enumerate(docs) if doc["document_id"] not in new_ids
+                ]
+                kept = np.asarray(vectors[keep], dtype=np.float32)
+                if scales is not None:
+                    kept = _normalize(kept * scales[keep, None])
+                new_docs = [docs[i] for i in keep] + new_docs
+                new_vectors = np.concatenate([kept, new_vectors])
+
+            self._write(user_id, new_vectors, new_docs)
+
+    def delete(self, user_id: str | None = None) -> int:
+        """사용자 인덱스 삭제 (user_id=None이면 전체), 다음 검색 시 Chroma에서 다시 생성"""
+        if user_id is not None:
+            targets = [self._user_dir(user_id)]
+        elif os.path.isdir(self.root_dir):
+            targets = [
+                os.path.join(self.root_dir, name) for name in os.listdir(self.root_dir)
+            ]
+        else:
+            targets = []
+
+        deleted = 0
+        for user_dir in targets:
+            if os.path.isdir(user_dir):
+                shutil.rmtree(user_dir, ignore_errors=True)
+                self._read_cache.pop(user_dir, None)
+                deleted += 1
+        return deleted
@@ -1,29 +1,70 @@
 """
 VectorDB 중복 방지 + 검색 개선 버전
-- 같은 날짜, 같은 출처의 데이터는 덮어쓰기
-- 검색 시 같은 날짜 중복 제거 + 최신 날짜 우선 정렬
+- 같은 날짜 여러 출처는 저장 시점에 필드 단위로 병합 → 날짜별 문서 1개
+- 검색 시 최신 날짜 우선 정렬
 - 날짜 필터링 함수 추가 (개선)
 """
 
 import os, json, chromadb
+from typing import Callable
 from chromadb import PersistentClient
-from openai import OpenAI
 from datetime import datetime
 from app.utils.preprocess_for_embedding import summary_to_natural_text
 from app.core.health_interpreter import (
     calculate_health_score,
     recommend_exercise_intensity,
 )
+from app.core.timeseries_store import (
+    timeseries_exists,
+    query_timeseries,
+    upsert_timeseries,
+    delete_timeseries,
+)
+from app.core.summary_store import (
+    put_summaries,
+    get_summaries,
+    delete_summaries,
+    put_source_summaries,
+    get_source_summaries,
+    source_days,
+    delete_source_summaries,
+    get_meta,
+    set_meta,
+)
+from app.core.day_merge import day_document_id, merge_day
+from app.core.recency_index import (
+    index_exists,
+    recent_documents,
+    take_recent,
+    upsert_recency,
+    delete_recency,
+)
+from app.core.vector_index import UserVectorIndex
+from app.core.metric_index import search_metrics
+from app.core.embedding_cache import get_embeddings
+from app.core.embedding_providers import get_embedding_provider
+from app.core.embedding_batcher import embed_in_batches
+from app.config import (
+    TIMESERIES_STORE_ENABLED,
+    RECENCY_INDEX_ENABLED,
+    VECTOR_INDEX_ENABLED,
+    VECTOR_INDEX_DIR,
+    VECTOR_INDEX_QUANTIZATION,
+    METRIC_INDEX_ENABLED,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_RETRY_BASE_DELAY,
+    EMBEDDING_RETRY_MAX_DELAY,
+)
 
 
 # ------------------------------------------------
-# 1) OpenAI Client
+# 1) 임베딩 provider (EMBEDDING_PROVIDER: openai / hashing / sentence, EMBEDDING_DIM)
 # ------------------------------------------------
-def get_openai_client():
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
-    return OpenAI(api_key=api_key)
+embedding_provider = get_embedding_provider()
 
 
 # ------------------------------------------------
@@ -31,125 +72,106 @@ def get_openai_client():
 # ------------------------------------------------
 chroma_client = PersistentClient(path="./chroma_data")
 
+# provider / 차원마다 벡터 공간이 다르므로 컬렉션을 분리 (openai 원본 차원은 기존 summaries)
 collection = chroma_client.get_or_create_collection(
-    name="summaries", metadata={"hnsw:space": "cosine"}
+    name=f"summaries{embedding_provider.collection_suffix}",
+    metadata={"hnsw:space": "cosine"},
+)
+
+# 사용자별 정확 검색 인덱스 (컬렉션 = 임베딩 모델마다 폴더 분리)
+vector_index = UserVectorIndex(
+    os.path.join(VECTOR_INDEX_DIR, collection.name), VECTOR_INDEX_QUANTIZATION
 )
 
 
+def collection_name() -> str:
+    """
+    현재 저장 대상 컬렉션 이름 (임베딩 provider / 모델 / 차원마다 다름)
+    업로드 증분 상태 / 응답 캐시 key에 포함 → 임베딩 설정을 바꾸면 새 컬렉션을 다시 채운다
+    """
+    return collection.name
+
+
 # ------------------------------------------------
 # 3) 임베딩 + 캐싱
 # ------------------------------------------------
-embedding_cache = {}
+EMBEDDING_MODEL = embedding_provider.model
 
 
-def embed_text(text: str):
-    """단일 텍스트 임베딩"""
+def _prepare_text(text: str) -> str:
+    """빈 텍스트 대체 + 길이 제한 (임베딩 입력 형식)"""
     if not text or not text.strip():
-        text = "데이터 없음"
-
+        return "데이터 없음"
     if len(text) > 8000:
-        text = text[:8000]
+        return text[:8000]
+    return text
+
+
+def _embed_uncached(texts: list[str]) -> list[list[float]]:
+    """provider 임베딩 (캐시 없이, 배치 분할 + 동시 요청 + 재시도)"""
+    return embed_in_batches(
+        texts,
+        embedding_provider.embed,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        max_tokens=EMBEDDING_BATCH_MAX_TOKENS,
+        concurrency=EMBEDDING_CONCURRENCY if embedding_provider.concurrent else 1,
+        max_retries=EMBEDDING_MAX_RETRIES,
+        base_delay=EMBEDDING_RETRY_BASE_DELAY,
+        max_delay=EMBEDDING_RETRY_MAX_DELAY,
+        retryable=embedding_provider.retryable,
+    )
 
-    client = get_openai_client()
-    response = client.embeddings.create(input=text, model="text-embedding-3-small")
-    return response.data[0].embedding
+
+def embed_text(text: str):
+    """단일 텍스트 임베딩"""
+    return _embed_uncached([_prepare_text(text)])[0]
 
 
 def get_cached_embedding(text: str):
-    """캐시된 임베딩 반환"""
-    if text not in embedding_cache:
-        embedding_cache[text] = embed_text(text)
-    return embedding_cache[text]
+    """캐시된 임베딩 반환 (메모리 LRU → SQLite, 없을 때만 API 호출)"""
+    return batch_embed_texts([text])[0]
 
 
 def batch_embed_texts(texts: list[str]):
-    """배치 임베딩"""
+    """배치 임베딩 (캐시 miss인 텍스트만 API 호출)"""
     if not texts:
         return []
 
-    processed_texts = []
-    for text in texts:
-        if not text or not text.strip():
-            processed_texts.append("데이터 없음")
-        elif len(text) > 8000:
-            processed_texts.append(text[:8000])
-        else:
-            processed_texts.append(text)
+    processed_texts = [_prepare_text(text) for text in texts]
 
-    client = get_openai_client()
-    response = client.embeddings.create(
-        input=processed_texts, model="text-embedding-3-small"
-    )
+    if not (EMBEDDING_CACHE_ENABLED and embedding_provider.cacheable):
+        return _embed_uncached(processed_texts)
 
-    return [item.embedding for item in response.data]
+    return get_embeddings(processed_texts, EMBEDDING_MODEL, _embed_uncached)
 
 
 # ------------------------------------------------
-# 4) Summary 단일 저장 (중복 방지!)
+# 4) Summary 단일 저장 (날짜별 1개 문서로 병합)
 # ------------------------------------------------
 def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
     """
-    단일 요약 데이터를 VectorDB에 저장 (중복 방지 개선!)
+    단일 요약 데이터를 VectorDB에 저장
 
-    개선 사항:
-    - doc_id에서 timestamp 제거 → 같은 날짜/출처는 덮어쓰기
-    - upsert 사용으로 자동 중복 방지
+    - 출처별 원본은 summary_store에 보관 (같은 날짜/출처는 덮어쓰기)
+    - 같은 날짜 모든 출처를 필드 단위로 병합해 날짜별 문서 1개로 upsert
+      (doc_id = {user}_{date}, 출처가 늘어도 벡터는 날짜당 1개)
     """
-    raw = summary.get("raw", {})
-
-    health_score = calculate_health_score(raw)
-    intensity = recommend_exercise_intensity(raw)
-
     created_at = summary.get("created_at")
     if not created_at:
         raise ValueError("❌ summary['created_at']가 존재하지 않습니다.")
 
     date = created_at[:10]  # yyyy-mm-dd
-    platform = summary.get("platform", "unknown")
-
-    # ✅ 개선: timestamp 제거 - 중복 방지!
-    # 같은 날짜, 같은 출처는 하나만 저장
-    doc_id = f"{user_id}_{date}_{source}"
-    # 예: "user_1@aaa.com_2024-10-01_zip_samsung"
-
-    # Natural embedding 텍스트 생성
-    embedding_text = summary_to_natural_text(summary)
-
-    # 임베딩 생성
-    embedding = get_cached_embedding(embedding_text)
-
-    # Metadata 준비
-    try:
-        summary_json = json.dumps(summary, ensure_ascii=False)
-    except Exception as e:
-        print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-        summary_json = str(summary)
+    doc_id = day_document_id(user_id, date)
+    # 예: "user_1@aaa.com_2024-10-01"
 
     # 현재 시간 (업데이트 시간)
     update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
-    metadata = {
-        "user_id": user_id,
-        "date": date,
-        "timestamp": int(date.replace("-", "")),
-        "health_score": health_score.get("score", 0),
-        "recommended_intensity": intensity.get("recommended_level", "중"),
-        "fallback": False,
-        "summary_json": summary_json,
-        "source": source,
-        "platform": platform,
-        "updated_at": update_timestamp,  # ✅ 마지막 업데이트 시간
-    }
-
-    # ✅ upsert: 같은 doc_id면 덮어쓰기, 없으면 추가
-    collection.upsert(
-        ids=[doc_id],
-        embeddings=[embedding],
-        documents=[embedding_text],
-        metadatas=[metadata],
-    )
+    put_source_summaries([(doc_id, user_id, source, summary, update_timestamp)])
+    metadatas = _store_merged_days(user_id, [doc_id])
+    platform = metadatas[0]["platform"] if metadatas else "unknown"
 
-    print(f"[INFO] VectorDB 저장: {doc_id} (플랫폼: {platform})")
+    print(f"[INFO] VectorDB 저장: {doc_id} (출처: {source}, 플랫폼: {platform})")
 
     return {
         "status": "saved",
@@ -162,56 +184,84 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
 
 
 # ------------------------------------------------
-# 5) Summary 배치 저장 (중복 방지!)
+# 5) Summary 배치 저장 (날짜별 1개 문서로 병합)
 # ------------------------------------------------
 def save_daily_summaries_batch(
     summaries: list[dict], user_id: str, source: str = "zip"
 ):
     """
-    여러 요약 데이터를 한 번에 VectorDB에 저장 (중복 방지 개선!)
+    여러 요약 데이터를 한 번에 VectorDB에 저장 (출처별 원본 보관 + 날짜별 병합)
     """
     if not summaries:
         print("[WARN] summaries가 비어 있어서 저장하지 않습니다.")
         return {"status": "skipped", "reason": "empty summaries"}
 
-    ids = []
-    embeddings_list = []
-    documents = []
-    metadatas = []
-    embedding_texts = []
-
     update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
-    # 1단계: 데이터 준비
+    # 1단계: 출처별 원본 저장 (같은 날짜가 두 번 있으면 뒤의 것)
+    source_entries = {}
     for summary in summaries:
-        raw = summary.get("raw", {})
-        health_score = calculate_health_score(raw)
-        intensity = recommend_exercise_intensity(raw)
-
         created_at = summary.get("created_at")
         if not created_at:
             print(f"[WARN] summary에 created_at이 없어서 건너뜁니다")
             continue
 
-        date = created_at[:10]
-        platform = summary.get("platform", "unknown")
+        doc_id = day_document_id(user_id, created_at[:10])
+        source_entries[doc_id] = (doc_id, user_id, source, summary, update_timestamp)
 
-        # ✅ 개선: timestamp 제거 - 중복 방지!
-        doc_id = f"{user_id}_{date}_{source}"
-        ids.append(doc_id)
+    if not source_entries:
+        print("[WARN] 유효한 summary가 없어서 저장하지 않습니다.")
+        return {"status": "skipped", "reason": "no valid summaries"}
 
-        # Natural embedding 텍스트
-        embedding_text = summary_to_natural_text(summary)
-        embedding_texts.append(embedding_text)
-        documents.append(embedding_text)
+    put_source_summaries(list(source_entries.values()))
 
-        # Metadata
-        try:
-            summary_json = json.dumps(summary, ensure_ascii=False)
-        except Exception as e:
-            print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-            summary_json = str(summary)
+    # 2단계: 날짜별 병합 + 배치 임베딩 + ChromaDB 저장
+    metadatas = _store_merged_days(user_id, list(source_entries))
+
+    merged = sum(1 for metadata in metadatas if "," in metadata["sources"])
+    print(f"[SUCCESS] {len(metadatas)}개 데이터 VectorDB 저장 완료")
+    print(f"[INFO] 다른 출처와 병합된 날짜: {merged}개 (출처: {source})")
+
+    return {
+        "status": "batch_saved",
+        "count": len(metadatas),
+        "unique_dates": len(metadatas),
+        "user_id": user_id,
+        "source": source,
+    }
+
+
+def _store_merged_days(
+    user_id: str, doc_ids: list[str], embeddings_by_id: dict | None = None
+) -> list[dict]:
+    """
+    doc_ids 날짜의 출처별 원본을 병합해 Chroma / summary_store / 조회용 저장소에 저장
+
+    - 출처가 모두 지워진 날짜는 문서 삭제
+    - embeddings_by_id: 출처가 하나인 날짜에 다시 쓸 기존 임베딩 (데이터 이전용)
+    - updated_at은 병합에 쓴 출처 중 가장 최근 저장 시각
+
+    Returns:
+        저장한 문서의 metadata 리스트 (doc_ids 순서)
+    """
+    records_by_id = get_source_summaries(doc_ids)
+    embeddings_by_id = embeddings_by_id or {}
+
+    ids, metadatas, documents, summary_entries, items = [], [], [], [], []
+    removed = []
+    for doc_id in doc_ids:
+        records = records_by_id.get(doc_id)
+        if not records:
+            removed.append(doc_id)
+            continue
+
+        summary = merge_day(records)
+        raw = summary.get("raw", {})
+        health_score = calculate_health_score(raw)
+        intensity = recommend_exercise_intensity(raw)
+        date = summary["created_at"][:10]
 
+        # source / platform: 기준 출처 (필터 / 화면 표시용), sources: 병합한 전체 출처
         metadata = {
             "user_id": user_id,
             "date": date,
@@ -219,55 +269,68 @@ def save_daily_summaries_batch(
             "health_score": health_score.get("score", 0),
             "recommended_intensity": intensity.get("recommended_level", "중"),
             "fallback": False,
-            "summary_json": summary_json,
-            "source": source,
-            "platform": platform,
-            "updated_at": update_timestamp,
+            # summary 원본은 summary_store에 저장 (None: 기존 metadata의 summary_json 삭제)
+            "summary_json": None,
+            "source": summary["sources"][0],
+            "sources": ",".join(summary["sources"]),
+            "platform": summary.get("platform", "unknown"),
+            "updated_at": max(record["updated_at"] for record in records.values()),
         }
+
+        ids.append(doc_id)
         metadatas.append(metadata)
+        documents.append(summary_to_natural_text(summary))
+        summary_entries.append((doc_id, user_id, summary))
+        items.append(_item_from_metadata(doc_id, metadata, summary))
+
+    if ids:
+        # 새로 임베딩할 텍스트만 배치 임베딩 (출처가 하나인 날짜는 기존 벡터 재사용 가능)
+        reuse = [
+            embeddings_by_id.get(doc_id) if "," not in metadata["sources"] else None
+            for doc_id, metadata in zip(ids, metadatas)
+        ]
+        missing = [i for i, embedding in enumerate(reuse) if embedding is None]
+        if missing:
+            print(f"[INFO] 배치 임베딩 생성 중... ({len(missing)}개)")
+            for i, embedding in zip(
+                missing, batch_embed_texts([documents[i] for i in missing])
+            ):
+                reuse[i] = embedding
+        embeddings = reuse
+
+        # summary 원본 먼저 저장 (Chroma에서 찾은 행은 항상 원본이 있도록)
+        put_summaries(summary_entries)
+        collection.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+        )
 
-    if not ids:
-        print("[WARN] 유효한 summary가 없어서 저장하지 않습니다.")
-        return {"status": "skipped", "reason": "no valid summaries"}
+        _sync_timeseries(user_id, items)
+        _sync_recency(user_id, items)
+        _sync_vector_index(user_id, items, embeddings)
 
-    # 2단계: 배치 임베딩 생성
-    print(f"[INFO] 배치 임베딩 생성 중... ({len(embedding_texts)}개)")
-    embeddings_list = batch_embed_texts(embedding_texts)
-
-    # 3단계: ChromaDB에 한 번에 저장 (upsert로 중복 방지)
-    print(f"[INFO] ChromaDB에 {len(ids)}개 데이터 저장 중...")
-    collection.upsert(
-        ids=ids,
-        embeddings=embeddings_list,
-        documents=documents,
-        metadatas=metadatas,
-    )
+    if removed:
+        # 남은 출처가 없는 날짜 → 문서 삭제, 조회용 저장소는 다음 조회 때 다시 생성
+        collection.delete(ids=removed)
+        delete_summaries(removed)
+        delete_timeseries(user_id=user_id)
+        delete_recency(user_id=user_id)
+        vector_index.delete(user_id)
 
-    # ✅ 중복 체크
-    unique_dates = len(set([m["date"] for m in metadatas]))
-    print(f"[SUCCESS] {len(ids)}개 데이터 VectorDB 저장 완료")
-    print(
-        f"[INFO] 고유 날짜: {unique_dates}개 (플랫폼: {metadatas[0].get('platform', 'unknown')})"
-    )
-
-    return {
-        "status": "batch_saved",
-        "count": len(ids),
-        "unique_dates": unique_dates,
-        "user_id": user_id,
-        "source": source,
-    }
+    return metadatas
 
 
 # ------------------------------------------------
-# 6) 유사 Summary 검색 (개선: 중복 제거 + 최신 우선)
+# 6) 유사 Summary 검색 (개선: 최신 우선)
 # ------------------------------------------------
 def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) -> dict:
     """
     유사한 과거 Summary 검색 (개선 버전)
 
     개선 사항:
-    1. 같은 날짜에 여러 데이터가 있으면 updated_at이 최신인 것만 유지
+    1. 날짜별 문서가 1개 (저장 시점 병합) → 조회 시 중복 제거 없음
     2. 결과를 최신 날짜순으로 정렬
     3. top_k 개수만큼 반환
     """
@@ -281,63 +344,52 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
 
         query_embedding = get_cached_embedding(query_text)
 
-        # 더 많이 가져와서 중복 제거 후 top_k 반환
+        # 유사한 날짜를 더 많이 가져와서 최신 날짜 top_k 반환
         fetch_count = max(top_k * 3, 10)
 
+        # 사용자별 정확 검색 (유사도 상위 fetch_count개)
+        exact = _query_vector_index(user_id, query_embedding, fetch_count)
+        if exact is not None:
+            sorted_results = sorted(
+                exact,
+                key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
+                reverse=True,
+            )
+            similar_days = _attach_summaries(sorted_results[:top_k], {})
+            return {"similar_days": similar_days, "query": query_text}
+
         results = collection.query(
             query_embeddings=[query_embedding],
             n_results=fetch_count,
             where={"user_id": user_id},
+            include=["metadatas", "distances"],
         )
 
-        # 1단계: 결과 파싱
+        # 1단계: 결과 파싱 (metadata만, summary 원본은 반환할 행만 3단계에서)
         raw_results = []
+        metadata_by_id = {}
         if results and results["ids"] and len(results["ids"][0]) > 0:
             for i in range(len(results["ids"][0])):
                 doc_id = results["ids"][0][i]
                 metadata = results["metadatas"][0][i]
                 distance = (
-                    results["distances"][0][i] if "distances" in results else None
-                )
-
-                summary_json = metadata.get("summary_json", "{}")
-                try:
-                    summary_dict = json.loads(summary_json)
-                except:
-                    summary_dict = {}
-
-                raw = summary_dict.get("raw", {})
-                summary_text = summary_dict.get("summary_text", "")
-
-                raw_results.append(
-                    {
-                        "document_id": doc_id,
-                        "user_id": metadata.get("user_id"),
-                        "date": metadata.get("date"),
-                        "timestamp": metadata.get("timestamp", 0),
-                        "health_score": metadata.get("health_score"),
-                        "recommended_intensity": metadata.get("recommended_intensity"),
-                        "source": metadata.get("source", "unknown"),
-                        "platform": metadata.get("platform", "unknown"),
-                        "updated_at": metadata.get("updated_at", ""),
-                        "raw": raw,
-                        "summary_text": summary_text,
-                        "similarity_distance": distance,
-                    }
+                    results["distances"][0][i] if results.get("distances") else None
                 )
 
-        # 2단계: 같은 날짜 중복 제거 (updated_at 최신 유지)
-        deduplicated = _deduplicate_by_date(raw_results)
+                metadata_by_id[doc_id] = metadata
+                item = _item_from_metadata(doc_id, metadata)
+                item["similarity_distance"] = distance
+                raw_results.append(item)
 
-        # 3단계: 최신 날짜순 정렬
+        # 2단계: 최신 날짜순 정렬
         sorted_results = sorted(
-            deduplicated,
+            raw_results,
             key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
             reverse=True,
         )
 
-        # 4단계: top_k 개수만큼 반환
-        similar_days = sorted_results[:top_k]
+        # 3단계: top_k 개수만큼 반환 (이 행들만 summary 원본 조회)
+        similar_days = _attach_summaries(sorted_results[:top_k], metadata_by_id)
 
         return {"similar_days": similar_days, "query": query_text}
 
@@ -349,49 +401,6 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
         return {"similar_days": [], "query": query_dict, "error": str(e)}
 
 
-def _deduplicate_by_date(results: list) -> list:
-    """
-    같은 날짜의 데이터가 여러 개면 updated_at이 최신인 것만 유지
-
-    Args:
-        results: 검색 결과 리스트
-
-    Returns:
-        중복 제거된 리스트
-    """
-    if not results:
-        return []
-
-    # 날짜별로 그룹화
-    date_groups = {}
-    for item in results:
-        date = item.get("date", "")
-        if not date:
-            continue
-
-        if date not in date_groups:
-            date_groups[date] = []
-        date_groups[date].append(item)
-
-    # 각 날짜에서 최신 데이터만 선택
-    deduplicated = []
-    for date, items in date_groups.items():
-        if len(items) == 1:
-            deduplicated.append(items[0])
-        else:
-            # updated_at 기준 최신 선택
-            latest = max(items, key=lambda x: x.get("updated_at", ""))
-            deduplicated.append(latest)
-
-            # 로그 출력 (디버깅용)
-            sources = [
-                f"{i.get('source')}({i.get('updated_at', '')[:8]})" for i in items
-            ]
-            print(f"[INFO] {date} 중복 제거: {sources} → {latest.get('source')}")
-
-    return deduplicated
-
-
 # ------------------------------------------------
 # 7) 최신 데이터 조회 (고정형 챗봇용)
 # ------------------------------------------------
@@ -407,30 +416,34 @@ def get_recent_summaries(user_id: str, limit: int = 7) -> list:
     Returns:
         최신 날짜순 정렬된 summary 리스트
     """
+    # 최신순 인덱스 (최신 날짜부터 limit개 날짜만 읽음)
+    items = _query_recency(user_id, limit)
+    if items is not None:
+        return _attach_summaries(items, {})
+
+    # 시계열 저장소 (최신 날짜부터 limit개)
+    items = _query_timeseries(user_id, limit=limit)
+    if items is not None:
+        return items
+
     try:
         # 전체 데이터 조회 (해당 사용자)
         results = collection.get(
             where={"user_id": user_id},
-            include=["metadatas", "documents"],
+            include=["metadatas"],
         )
 
         if not results or not results["ids"]:
             return []
 
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거
-        deduplicated = _deduplicate_by_date(all_items)
-
-        # 최신 날짜순 정렬
+        # 파싱 + 최신 날짜순 정렬
         sorted_items = sorted(
-            deduplicated,
+            _parse_collection_results(results),
             key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
             reverse=True,
         )
 
-        return sorted_items[:limit]
+        return _attach_summaries(sorted_items[:limit], _metadata_by_id(results))
 
     except Exception as e:
         print(f"[ERROR] 최신 데이터 조회 실패: {str(e)}")
@@ -458,21 +471,23 @@ def get_summaries_by_date(user_id: str, target_date: str) -> list:
         # timestamp 변환 (YYYYMMDD 정수)
         target_timestamp = int(target_date.replace("-", ""))
 
+        # 시계열 저장소
+        items = _query_timeseries(user_id, target_timestamp, target_timestamp)
+        if items is not None:
+            return items
+
         results = collection.get(
             where={"$and": [{"user_id": user_id}, {"timestamp": target_timestamp}]},
-            include=["metadatas", "documents"],
+            include=["metadatas"],
         )
 
         if not results or not results["ids"]:
             return []
 
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거 (같은 날짜에 여러 소스가 있을 수 있음)
-        deduplicated = _deduplicate_by_date(all_items)
+        # 파싱 (같은 날짜 여러 출처는 저장 시점에 병합되어 1개)
+        items = _parse_collection_results(results)
 
-        return deduplicated
+        return _attach_summaries(items, _metadata_by_id(results))
 
     except Exception as e:
         print(f"[ERROR] 특정 날짜 데이터 조회 실패: {str(e)}")
@@ -502,6 +517,11 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
         start_timestamp = int(start_date.replace("-", ""))
         end_timestamp = int(end_date.replace("-", ""))
 
+        # 시계열 저장소
+        items = _query_timeseries(user_id, start_timestamp, end_timestamp)
+        if items is not None:
+            return items
+
         results = collection.get(
             where={
                 "$and": [
@@ -510,26 +530,20 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
                     {"timestamp": {"$lte": end_timestamp}},
                 ]
             },
-            include=["metadatas", "documents"],
+            include=["metadatas"],
         )
 
         if not results or not results["ids"]:
             return []
 
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거
-        deduplicated = _deduplicate_by_date(all_items)
-
-        # 최신순 정렬
+        # 파싱 + 최신순 정렬
         sorted_items = sorted(
-            deduplicated,
+            _parse_collection_results(results),
             key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
             reverse=True,
         )
 
-        return sorted_items
+        return _attach_summaries(sorted_items, _metadata_by_id(results))
 
     except Exception as e:
         print(f"[ERROR] 날짜 범위 데이터 조회 실패: {str(e)}")
@@ -544,43 +558,486 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
 # ------------------------------------------------
 def _parse_collection_results(results: dict) -> list:
     """
-    ChromaDB 결과를 통일된 포맷으로 파싱
+    ChromaDB 결과를 통일된 포맷으로 파싱 (metadata만, raw / summary_text 없음)
 
     Args:
         results: collection.get() 결과
 
     Returns:
-        파싱된 리스트
+        파싱된 리스트 (반환 직전에 _attach_summaries로 summary 원본 추가)
     """
-    all_items = []
+    return [
+        _item_from_metadata(doc_id, metadata)
+        for doc_id, metadata in zip(results["ids"], results["metadatas"])
+    ]
 
-    for i in range(len(results["ids"])):
-        doc_id = results["ids"][i]
-        metadata = results["metadatas"][i]
 
-        summary_json = metadata.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
-
-        raw = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
-
-        all_items.append(
-            {
-                "document_id": doc_id,
-                "user_id": metadata.get("user_id"),
-                "date": metadata.get("date"),
-                "timestamp": metadata.get("timestamp", 0),
-                "health_score": metadata.get("health_score"),
-                "recommended_intensity": metadata.get("recommended_intensity"),
-                "source": metadata.get("source", "unknown"),
-                "platform": metadata.get("platform", "unknown"),
-                "updated_at": metadata.get("updated_at", ""),
-                "raw": raw,
-                "summary_text": summary_text,
-            }
+def _metadata_by_id(results: dict) -> dict:
+    return dict(zip(results["ids"], results["metadatas"]))
+
+
+def _item_from_metadata(
+    doc_id: str, metadata: dict, summary_dict: dict | None = None
+) -> dict:
+    """Chroma metadata (+ summary) → 조회 결과 item"""
+    item = {
+        "document_id": doc_id,
+        "user_id": metadata.get("user_id"),
+        "date": metadata.get("date"),
+        "timestamp": metadata.get("timestamp", 0),
+        "health_score": metadata.get("health_score"),
+        "recommended_intensity": metadata.get("recommended_intensity"),
+        "source": metadata.get("source", "unknown"),
+        "platform": metadata.get("platform", "unknown"),
+        "updated_at": metadata.get("updated_at", ""),
+    }
+    if summary_dict is not None:
+        item["raw"] = summary_dict.get("raw", {})
+        item["summary_text"] = summary_dict.get("summary_text", "")
+    return item
+
+
+def _legacy_summary(metadata: dict) -> dict:
+    """이전 버전이 Chroma metadata에 넣은 summary_json (없으면 빈 dict)"""
+    try:
+        return json.loads(metadata.get("summary_json") or "{}")
+    except (TypeError, ValueError):
+        return {}
+
+
+def load_summary(doc_id: str, metadata: dict | None = None) -> dict:
+    """document_id의 summary 원본 (summary_store → 이전 metadata summary_json 순)"""
+    summary = get_summaries([doc_id]).get(doc_id)
+    if summary is None:
+        summary = _legacy_summary(metadata or {})
+    return summary
+
+
+def _attach_summaries(items: list[dict], metadata_by_id: dict) -> list[dict]:
+    """반환할 item에만 raw / summary_text 추가 (summary_store 한 번 조회)"""
+    stored = get_summaries([item["document_id"] for item in items])
+
+    for item in items:
+        summary = stored.get(item["document_id"])
+        if summary is None:
+            summary = _legacy_summary(metadata_by_id.get(item["document_id"], {}))
+        item["raw"] = summary.get("raw", {})
+        item["summary_text"] = summary.get("summary_text", "")
+
+    return items
+
+
+# ------------------------------------------------
+# 11) 사용자 전체 데이터 조회 (히스토리 API용, NEW)
+# ------------------------------------------------
+def get_all_summaries(user_id: str) -> list:
+    """
+    사용자의 모든 저장 데이터 (날짜별 병합 문서, 최신 날짜순)
+    /api/app/history, /api/user/raw-history 에서 사용
+    """
+    items = _query_timeseries(user_id, latest_per_date=False)
+    if items is not None:
+        return items
+
+    results = collection.get(where={"user_id": user_id}, include=["metadatas"])
+    if not results or not results["ids"]:
+        return []
+
+    items = sorted(
+        _parse_collection_results(results),
+        key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
+        reverse=True,
+    )
+    return _attach_summaries(items, _metadata_by_id(results))
+
+
+# ------------------------------------------------
+# 12) 시계열 저장소 연동 (날짜 기반 조회용, NEW)
+# ------------------------------------------------
+def _rebuild_timeseries(user_id: str) -> bool:
+    """Chroma의 사용자 전체 데이터로 시계열 저장소 생성 (데이터 없으면 False)"""
+    results = collection.get(where={"user_id": user_id}, include=["metadatas"])
+    if not results or not results["ids"]:
+        return False
+
+    items = _attach_summaries(
+        _parse_collection_results(results), _metadata_by_id(results)
+    )
+    upsert_timeseries(user_id, items, replace=True)
+    print(f"[INFO] 시계열 저장소 생성: {user_id} ({len(items)}개)")
+    return True
+
+
+def _sync_timeseries(user_id: str, items: list[dict]):
+    """
+    Chroma 저장 직후 호출
+    - 저장소가 있으면 해당 행만 upsert
+    - 없으면 Chroma 전체(방금 저장한 행 포함)로 생성
+    실패 시 저장소를 지워서 다음 조회 때 Chroma에서 다시 만들도록 한다.
+    """
+    if not TIMESERIES_STORE_ENABLED:
+        return
+
+    try:
+        if timeseries_exists(user_id):
+            upsert_timeseries(user_id, items)
+        else:
+            _rebuild_timeseries(user_id)
+    except Exception as e:
+        print(f"[WARN] 시계열 저장소 갱신 실패 → 초기화: {e}")
+        delete_timeseries(user_id=user_id)
+
+
+def _query_timeseries(
+    user_id: str,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+    latest_per_date: bool = True,
+    limit: int | None = None,
+) -> list | None:
+    """
+    시계열 저장소 조회 (없으면 Chroma에서 생성 후 조회)
+    None 반환 시 호출 측에서 기존 Chroma 조회로 처리
+    """
+    if not TIMESERIES_STORE_ENABLED:
+        return None
+
+    try:
+        items = query_timeseries(
+            user_id, start_timestamp, end_timestamp, latest_per_date, limit
         )
+        if items is None and _rebuild_timeseries(user_id):
+            items = query_timeseries(
+                user_id, start_timestamp, end_timestamp, latest_per_date, limit
+            )
+        return items
+    except Exception as e:
+        print(f"[WARN] 시계열 저장소 조회 실패 → ChromaDB 조회: {e}")
+        return None
 
-    return all_items
+
+# ------------------------------------------------
+# 13) 이전 데이터 이전 (metadata summary_json → summary_store)
+# ------------------------------------------------
+def migrate_legacy_summaries(page_size: int = 500) -> int:
+    """
+    Chroma metadata에 summary_json이 남아 있는 행을 summary_store로 옮기고 metadata에서 삭제
+    컬렉션별로 한 번만 실행 (완료 여부는 summary_store에 기록), 옮긴 행 수 반환
+    """
+    meta_key = f"legacy_migrated:{collection.name}"
+    if get_meta(meta_key):
+        return 0
+
+    migrated = 0
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        if not page or not page["ids"]:
+            break
+
+        legacy = [
+            (doc_id, metadata)
+            for doc_id, metadata in zip(page["ids"], page["metadatas"])
+            if metadata.get("summary_json")
+        ]
+        if legacy:
+            put_summaries(
+                [
+                    (doc_id, metadata.get("user_id", ""), _legacy_summary(metadata))
+                    for doc_id, metadata in legacy
+                ]
+            )
+            collection.update(
+                ids=[doc_id for doc_id, _ in legacy],
+                metadatas=[{"summary_json": None} for _ in legacy],
+            )
+            migrated += len(legacy)
+
+        offset += len(page["ids"])
+
+    set_meta(meta_key, datetime.now().isoformat(timespec="seconds"))
+    if migrated:
+        print(f"[INFO] summary_json → summary_store 이전: {migrated}개")
+    return migrated
+
+
+# ------------------------------------------------
+# 14) 최신순 인덱스 연동 (최신 N일 조회용)
+# ------------------------------------------------
+def get_recent_documents(
+    user_id: str,
+    days: int = 1,
+    all_sources: bool = False,
+    accept: Callable[[dict], bool] | None = None,
+) -> list:
+    """
+    최신 days개 날짜의 summary (최신순, raw / summary_text 포함)
+    /api/app/latest, /api/user/latest-analysis 에서 사용
+
+    all_sources: 같은 날짜의 모든 행 포함 (병합 이전 데이터, False면 날짜별 최신 1개)
+    accept(item): 포함할 행 조건 (예: 플랫폼 필터, metadata 필드만 있음)
+    """
+    items = _query_recency(user_id, days, all_sources, accept)
+    if items is not None:
+        return _attach_summaries(items, {})
+
+    # 인덱스 사용 불가 → Chroma metadata 전체 정렬
+    results = collection.get(where={"user_id": user_id}, include=["metadatas"])
+    if not results or not results["ids"]:
+        return []
+
+    ordered = sorted(
+        _parse_collection_results(results),
+        key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
+        reverse=True,
+    )
+    items = take_recent(ordered, days, all_sources, accept)
+    return _attach_summaries(items, _metadata_by_id(results))
+
+
+def _rebuild_recency(user_id: str):
+    """Chroma의 사용자 metadata로 최신순 인덱스 생성 (데이터가 없어도 빈 인덱스 생성)"""
+    results = collection.get(where={"user_id": user_id}, include=["metadatas"])
+    items = _parse_collection_results(results) if results and results["ids"] else []
+    upsert_recency(user_id, items, replace=True)
+    print(f"[INFO] 최신순 인덱스 생성: {user_id} ({len(items)}개)")
+
+
+def _sync_recency(user_id: str, items: list[dict]):
+    """
+    Chroma 저장 직후 호출 (저장한 행만 갱신, 인덱스가 없으면 Chroma 전체로 생성)
+    실패 시 인덱스를 지워서 다음 조회 때 다시 만들도록 한다.
+    """
+    if not RECENCY_INDEX_ENABLED:
+        return
+
+    try:
+        if index_exists(user_id):
+            upsert_recency(user_id, items)
+        else:
+            _rebuild_recency(user_id)
+    except Exception as e:
+        print(f"[WARN] 최신순 인덱스 갱신 실패 → 초기화: {e}")
+        delete_recency(user_id=user_id)
+
+
+def _query_recency(
+    user_id: str,
+    days: int,
+    all_sources: bool = False,
+    accept: Callable[[dict], bool] | None = None,
+) -> list | None:
+    """
+    최신순 인덱스 조회 (없으면 Chroma에서 생성 후 조회)
+    None 반환 시 호출 측에서 시계열 저장소 / Chroma 조회로 처리
+    """
+    if not RECENCY_INDEX_ENABLED:
+        return None
+
+    try:
+        items = recent_documents(user_id, days, all_sources, accept)
+        if items is None:
+            _rebuild_recency(user_id)
+            items = recent_documents(user_id, days, all_sources, accept)
+        return items
+    except Exception as e:
+        print(f"[WARN] 최신순 인덱스 조회 실패 → 기존 조회: {e}")
+        return None
+
+
+# ------------------------------------------------
+# 15) 사용자별 정확 벡터 검색 인덱스 연동 (유사 summary 검색용)
+# ------------------------------------------------
+def _rebuild_vector_index(user_id: str):
+    """Chroma의 사용자 임베딩 + metadata로 정확 검색 인덱스 생성"""
+    results = collection.get(
+        where={"user_id": user_id}, include=["embeddings", "metadatas"]
+    )
+    if not results or not results["ids"]:
+        return
+
+    items = _parse_collection_results(results)
+    vector_index.upsert(user_id, items, results["embeddings"], replace=True)
+    print(f"[INFO] 벡터 인덱스 생성: {user_id} ({len(items)}개)")
+
+
+def _sync_vector_index(user_id: str, items: list[dict], embeddings: list):
+    """
+    Chroma 저장 직후 호출 (저장한 행만 갱신, 인덱스가 없으면 Chroma 전체로 생성)
+    실패 시 인덱스를 지워서 다음 검색 때 다시 만들도록 한다.
+    """
+    if not VECTOR_INDEX_ENABLED:
+        return
+
+    try:
+        if vector_index.exists(user_id):
+            vector_index.upsert(user_id, items, embeddings)
+        else:
+            _rebuild_vector_index(user_id)
+    except Exception as e:
+        print(f"[WARN] 벡터 인덱스 갱신 실패 → 초기화: {e}")
+        vector_index.delete(user_id)
+
+
+def _query_vector_index(
+    user_id: str, query_embedding, top_k: int
+) -> list[dict] | None:
+    """
+    정확 검색 인덱스 조회 (없으면 Chroma에서 생성 후 조회)
+    None 반환 시 호출 측에서 Chroma HNSW 검색으로 처리
+    """
+    if not VECTOR_INDEX_ENABLED:
+        return None
+
+    try:
+        hits = vector_index.search(user_id, query_embedding, top_k)
+        if hits is None:
+            _rebuild_vector_index(user_id)
+            hits = vector_index.search(user_id, query_embedding, top_k)
+        if hits is None:
+            return None
+    except Exception as e:
+        print(f"[WARN] 벡터 인덱스 검색 실패 → ChromaDB 검색: {e}")
+        return None
+
+    items = []
+    for doc, similarity in hits:
+        doc["similarity_distance"] = 1.0 - similarity  # Chroma cosine distance와 같은 값
+        items.append(doc)
+    return items
+
+
+# ------------------------------------------------
+# 16) 같은 날짜 여러 출처 병합 (출처 삭제 / 이전 데이터 이전)
+# ------------------------------------------------
+def delete_source_data(
+    source: str, user_id: str | None = None, doc_ids: list[str] | None = None
+) -> int:
+    """
+    source의 원본 삭제 후 해당 날짜를 남은 출처로 다시 병합 (남은 출처가 없으면 문서 삭제)
+    user_id가 None이면 모든 사용자, doc_ids를 주면 그 날짜만, 영향받은 날짜 수 반환
+    """
+    days_by_user = {}
+    for day_user_id, doc_id in source_days(source, user_id):
+        if doc_ids is None or doc_id in doc_ids:
+            days_by_user.setdefault(day_user_id, []).append(doc_id)
+    if not days_by_user:
+        return 0
+
+    delete_source_summaries(
+        user_id=user_id,
+        source=source,
+        day_ids=[doc_id for days in days_by_user.values() for doc_id in days],
+    )
+    for day_user_id, doc_ids in days_by_user.items():
+        _store_merged_days(day_user_id, doc_ids)
+
+    return sum(len(doc_ids) for doc_ids in days_by_user.values())
+
+
+def migrate_day_documents(page_size: int = 500) -> int:
+    """
+    출처별 문서({user}_{date}_{source})를 출처별 원본 + 날짜별 병합 문서로 이전
+    컬렉션별로 한 번만 실행 (migrate_legacy_summaries 다음), 이전한 문서 수 반환
+
+    출처가 하나인 날짜는 기존 임베딩을 그대로 쓰고, 여러 출처가 병합된 날짜만 새로 임베딩한다.
+    """
+    meta_key = f"day_merged:{collection.name}"
+    if get_meta(meta_key):
+        return 0
+
+    # 1단계: 병합 이전 문서 (metadata에 sources 없음) 사용자별 수집
+    legacy_by_user = {}
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["metadatas", "embeddings"], limit=page_size, offset=offset
+        )
+        if not page or not page["ids"]:
+            break
+
+        for doc_id, metadata, embedding in zip(
+            page["ids"], page["metadatas"], page["embeddings"]
+        ):
+            user_id, date = metadata.get("user_id"), metadata.get("date")
+            if "sources" in metadata or not user_id or not date:
+                continue
+            legacy_by_user.setdefault(user_id, []).append(
+                (doc_id, metadata, list(embedding))
+            )
+
+        offset += len(page["ids"])
+
+    # 2단계: 출처별 원본 저장 → 날짜별 병합 문서 저장 → 이전 문서 삭제
+    migrated = 0
+    for user_id, legacy in legacy_by_user.items():
+        old_ids = [doc_id for doc_id, _, _ in legacy]
+        stored = get_summaries(old_ids)
+
+        entries, embeddings_by_id = [], {}
+        for doc_id, metadata, embedding in legacy:
+            day_id = day_document_id(user_id, metadata["date"])
+            summary = stored.get(doc_id) or _legacy_summary(metadata)
+            source = metadata.get("source", "unknown")
+            entries.append(
+                (day_id, user_id, source, summary, metadata.get("updated_at", ""))
+            )
+            embeddings_by_id[day_id] = embedding
+
+        put_source_summaries(entries)
+        day_ids = list(dict.fromkeys(entry[0] for entry in entries))
+        _store_merged_days(user_id, day_ids, embeddings_by_id)
+
+        collection.delete(ids=old_ids)
+        delete_summaries(old_ids)
+
+        # 이전 doc_id 행이 남은 조회용 저장소는 다음 조회 때 다시 생성
+        delete_timeseries(user_id=user_id)
+        delete_recency(user_id=user_id)
+        vector_index.delete(user_id)
+        migrated += len(legacy)
+
+    set_meta(meta_key, datetime.now().isoformat(timespec="seconds"))
+    if migrated:
+        print(f"[INFO] 출처별 문서 → 날짜별 병합 문서 이전: {migrated}개")
+    return migrated
+
+
+# ------------------------------------------------
+# 17) 지표 벡터 유사 검색 (분석 RAG용, 임베딩 호출 없음)
+# ------------------------------------------------
+def search_similar_metrics(
+    metrics: dict,
+    user_id: str,
+    top_k: int = 3,
+    exclude_date: str | None = None,
+    fallback_query: dict | None = None,
+) -> dict:
+    """
+    지표(raw 형식 dict)가 비슷한 과거 날짜 검색 (search_similar_summaries와 같은 반환 형식)
+
+    - 시계열 저장소 metrics로 사용자별 z-score kNN (임베딩 API 호출 없음)
+    - 가까운 fetch_count개 중 최신 날짜순 top_k (search_similar_summaries와 같은 기준)
+    - exclude_date: 제외할 날짜 (YYYY-MM-DD, 분석 대상 날짜 자신)
+    - 사용할 수 없으면 fallback_query(없으면 metrics)로 search_similar_summaries
+    """
+    if METRIC_INDEX_ENABLED and TIMESERIES_STORE_ENABLED:
+        fetch_count = max(top_k * 3, 10)
+        exclude = [int(exclude_date.replace("-", ""))] if exclude_date else None
+        try:
+            if not timeseries_exists(user_id):
+                _rebuild_timeseries(user_id)
+            hits = search_metrics(user_id, metrics, fetch_count, exclude)
+        except Exception as e:
+            print(f"[WARN] 지표 벡터 검색 실패 → 임베딩 검색: {e}")
+            hits = None
+
+        if hits is not None:
+            sorted_results = sorted(
+                hits,
+                key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
+                reverse=True,
+            )
+            return {"similar_days": sorted_results[:top_k], "query": metrics}
+
+    return search_similar_summaries(fallback_query or metrics, user_id, top_k)
@@ -0,0 +1,133 @@
+"""
+업로드 파이프라인의 CPU 집약 단계 (프로세스 풀 실행용)
+
+DB / Apple export.xml 파싱과 날짜별 전처리는 순수 Python 루프라 GIL에 묶인다.
+ThreadPoolExecutor에서는 동시 업로드 4개가 사실상 직렬로 실행되므로
+CPU_POOL_WORKERS > 0 이면 이 모듈의 함수들을 ProcessPoolExecutor에서 실행한다.
+
+- 모든 작업 함수는 모듈 최상위 함수 (pickle 가능)
+- 파싱 결과는 날짜별 dict 대신 컬럼형 tuple로 압축해서 반환 (pack_raw_by_day)
+- 전처리는 app.utils.preprocess.preprocess_health_json_batch를 그대로 제출
+- app.config를 import하지 않음 (설정값은 호출 측에서 인자로 전달)
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.db_stream_parser import parse_db_file_to_raw_data_by_day
+from app.core.db_sql_parser import parse_db_file_to_raw_data_by_day_sql
+from app.core.apple_health_parser import parse_apple_export
+from app.core.heart_rate_series import DEFAULT_TZ_OFFSET_MINUTES
+from app.core.sqlite_reader import DEFAULT_SCAN_WORKERS
+
+# 파서 출력(raw 필드) 스키마 버전 → 업로드 캐시 variant에 포함
+# raw 필드를 추가 / 변경하면 올려서 이전 파서 결과(raw / 응답 캐시)를 쓰지 않게 한다
+# 1: 기본 지표, 2: 심박 분위수 / 심박 구간 비율 / 새벽 최저 심박
+RAW_SCHEMA_VERSION = 2
+
+# DB 파싱 방식 (config.DB_PARSE_MODE)
+DB_PARSERS = {
+    "sql": parse_db_file_to_raw_data_by_day_sql,
+    "stream": parse_db_file_to_raw_data_by_day,
+}
+
+
+# ------------------------------------------------
+# 1) 결과 압축 / 복원
+# ------------------------------------------------
+def pack_raw_by_day(raw_by_day: dict) -> dict:
+    """
+    {date: {field: value}}
+    → {"fields": (...), "dates": [...], "values": [(...), ...], "irregular": {...}}
+    날짜마다 반복되는 key 문자열을 한 번만 보내서 pickle 크기를 줄인다.
+
+    fields는 모든 날짜 key의 합집합 (처음 나온 순서).
+    key 구성이 fields와 다른 날짜는 values에 None을 두고 irregular[index]에 dict 그대로 보낸다.
+    (없는 key를 0으로 채우거나 빠뜨리지 않음 → unpack 결과가 원본과 같음)
+    """
+    fields = tuple(dict.fromkeys(f for raw in raw_by_day.values() for f in raw))
+    dates = list(raw_by_day.keys())
+    values = []
+    irregular = {}
+    for i, date_key in enumerate(dates):
+        raw = raw_by_day[date_key]
+        if len(raw) == len(fields):
+            values.append(tuple(raw[f] for f in fields))
+        else:
+            values.append(None)
+            irregular[i] = raw
+
+    return {
+        "fields": fields,
+        "dates": dates,
+        "values": values,
+        "irregular": irregular,
+    }
+
+
+def unpack_raw_by_day(packed: dict) -> dict:
+    fields = packed["fields"]
+    irregular = packed.get("irregular", {})
+    return {
+        date_key: (dict(zip(fields, row)) if row is not None else dict(irregular[i]))
+        for i, (date_key, row) in enumerate(zip(packed["dates"], packed["values"]))
+    }
+
+
+# ------------------------------------------------
+# 2) 작업 함수 (프로세스/스레드 공용)
+# ------------------------------------------------
+def parse_db_file_packed(
+    db_path: str,
+    mode: str = "sql",
+    tz_offset_minutes: int = DEFAULT_TZ_OFFSET_MINUTES,
+    scan_workers: int = DEFAULT_SCAN_WORKERS,
+) -> dict:
+    """DB 파일 → 날짜별 raw (압축 형태)"""
+    parser = DB_PARSERS.get(mode, parse_db_file_to_raw_data_by_day_sql)
+    return pack_raw_by_day(
+        parser(
+            db_path, tz_offset_minutes=tz_offset_minutes, scan_workers=scan_workers
+        )
+    )
+
+
+def parse_apple_export_packed(path: str, mode: str = "scan") -> dict:
+    """Apple Health export.xml / export.zip → 날짜별 raw (압축 형태)"""
+    return pack_raw_by_day(parse_apple_export(path, mode))
+
+
+# ------------------------------------------------
+# 3) 프로세스 풀
+# ------------------------------------------------
+_process_pool = None
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor | None:
+    """
+    workers > 0 이면 프로세스 풀(싱글톤) 반환, 0 이하면 None (스레드 모드)
+
+    uvicorn 이벤트 루프/스레드가 있는 프로세스에서 fork 하지 않도록 spawn 사용
+    """
+    global _process_pool
+
+    if workers <= 0:
+        return None
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        print(f"[INFO] CPU 프로세스 풀 시작 (workers: {workers})")
+
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """서버 종료 시 프로세스 풀 정리"""
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True)
+        _process_pool = None
@@ -1,21 +1,45 @@
-import os, shutil, tempfile, uuid
+import os, shutil, tempfile, uuid, hashlib, inspect
 from pathlib import Path
 from datetime import datetime
 from fastapi import UploadFile, HTTPException
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from app.core.unzipper import extract_zip_to_temp
-from app.core.db_to_json import db_to_json
-from app.core.db_parser import parse_db_json_to_raw_data_by_day
-
-from app.utils.preprocess import preprocess_health_json
-from app.core.vector_store import save_daily_summaries_batch
+from app.core.unzipper import extract_zip_to_temp, COPY_BUFFER_SIZE
+from app.core.db_stream_parser import list_db_tables
+from app.core.apple_health_parser import is_apple_export_zip
+from app.core.upload_cache import get_cached, put_cached, KIND_RAW, KIND_RESPONSE
+from app.core import job_store
+from app.config import (
+    DB_PARSE_MODE,
+    APPLE_PARSE_MODE,
+    DEFAULT_TZ_OFFSET_MINUTES,
+    SQLITE_SCAN_WORKERS,
+    CPU_POOL_WORKERS,
+    UPLOAD_CACHE_ENABLED,
+)
+from app.service.cpu_tasks import (
+    RAW_SCHEMA_VERSION,
+    get_process_pool,
+    parse_db_file_packed,
+    parse_apple_export_packed,
+    unpack_raw_by_day,
+)
+from app.utils.preprocess import preprocess_health_json_batch
+
+from app.core.vector_store import save_daily_summaries_batch, collection_name
+from app.core.ingest_state import plan_incremental_ingest, record_ingested_days
 from app.core.llm_analysis import run_llm_analysis
 
 # 비동기 처리용 Executor
 executor = ThreadPoolExecutor(max_workers=4)
 
+# run_pipeline 단계 (비동기 작업 진행률 표시용, "save"는 업로드 요청 중에 완료)
+PIPELINE_STAGES = ["save", "extract", "parse", "preprocess", "embed", "llm"]
+
+# 업로드 가능한 파일 (Health Connect ZIP/DB, Apple Health export.zip/export.xml)
+UPLOAD_EXTENSIONS = (".zip", ".db", ".xml")
+
 # ============================================================
 # ZIP 저장 경로 설정
 # ============================================================
@@ -28,6 +52,24 @@ EXTRACTED_DIR = ZIP_DATA_DIR / "extracted"
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
+# 이 프로세스에서 저장 / 처리 중인 업로드 경로 (new_upload ~ run_pipeline 종료)
+_active_paths: set[str] = set()
+
+
+def _protected_upload_paths(user_id: str) -> set[Path]:
+    """
+    이전 데이터 정리에서 제외할 경로
+    - 저장 / 처리 중인 업로드 (동기 /upload 포함)
+    - 끝나지 않은 비동기 작업(queued / running)의 원본 + 추출 폴더
+    """
+    paths = {Path(path) for path in _active_paths}
+    for job in job_store.list_unfinished_jobs(user_id):
+        upload = job["params"].get("upload") or {}
+        for key in ("temp_dir", "original_save_path"):
+            if upload.get(key):
+                paths.add(Path(upload[key]))
+    return paths
+
 
 class FileUploadService:
     """
@@ -53,10 +95,42 @@ class FileUploadService:
         return await loop.run_in_executor(executor, lambda: func(*args))
 
     @staticmethod
-    def detect_platform(filename: str, db_json: dict) -> str:
+    async def run_cpu_bound(func, *args):
+        """
+        CPU 집약 함수 실행
+        CPU_POOL_WORKERS > 0 이면 프로세스 풀, 아니면 run_blocking과 동일 (스레드)
+        """
+        pool = get_process_pool(CPU_POOL_WORKERS)
+        if pool is None:
+            return await FileUploadService.run_blocking(func, *args)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(pool, func, *args)
+
+    @staticmethod
+    def cache_variants(
+        difficulty: str, duration: int, tz_offset_minutes: int | None
+    ) -> tuple[str, str, str]:
+        """
+        업로드 결과 재사용 variant (raw, ingest, response)
+
+        - raw: 파서 스키마 버전 + 파싱 옵션 → 같을 때만 파싱 결과(raw 캐시) 재사용
+        - ingest: raw + 저장 대상 컬렉션(임베딩 설정) → 같으면 이미 저장한 데이터와 같음
+        - response: ingest + 분석 옵션 → 같을 때만 응답 캐시 재사용
+        """
+        if tz_offset_minutes is None:
+            tz_offset_minutes = DEFAULT_TZ_OFFSET_MINUTES
+        raw_variant = f"v{RAW_SCHEMA_VERSION}|{DB_PARSE_MODE}|{tz_offset_minutes}"
+        ingest_variant = f"{raw_variant}|{collection_name()}"
+        return raw_variant, ingest_variant, f"{ingest_variant}|{difficulty}|{duration}"
+
+    @staticmethod
+    def detect_platform(filename: str, db_json) -> str:
         """
         플랫폼 자동 감지
 
+        db_json: db_to_json 결과(dict) 또는 테이블 이름 집합(set)
+
         Returns:
             "apple" or "samsung" or "unknown"
         """
@@ -89,111 +163,320 @@ class FileUploadService:
 
         return "unknown"
 
-    async def process_file(
-        self,
-        file: UploadFile,
-        user_id: str | None,
-        difficulty: str,
-        duration: int,
-    ):
-        user_id = self.get_or_create_user_id(user_id)
+    @staticmethod
+    def new_upload(filename: str, user_id: str) -> dict:
+        """
+        업로드 저장 위치 생성 (uploads/ 원본 경로 + 사용자별 추출 폴더)
 
+        원본은 uploads/ 에 바로 기록하고 파이프라인도 그 파일을 읽는다.
+        (추출 폴더에는 ZIP에서 꺼낸 DB만 둔다)
+
+        Returns:
+            업로드 정보 dict (run_pipeline에 그대로 전달, JSON 직렬화 가능)
+        """
         # 사용자별 타임스탬프 디렉토리
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         user_short = user_id.replace("@", "_").replace(".", "_")
+        filename = os.path.basename(filename)
 
         temp_dir = str(EXTRACTED_DIR / f"{user_short}_{timestamp}")
         os.makedirs(temp_dir, exist_ok=True)
 
-        temp_path = os.path.join(temp_dir, file.filename)
+        original_save_name = f"{user_short}_{timestamp}_{filename}"
+        original_save_path = str(UPLOADS_DIR / original_save_name)
+        _active_paths.update((temp_dir, original_save_path))
+
+        return {
+            "filename": filename,
+            "user_short": user_short,
+            "temp_dir": temp_dir,
+            "temp_path": original_save_path,
+            "original_save_name": original_save_name,
+            "original_save_path": original_save_path,
+        }
+
+    async def save_upload(self, file: UploadFile, user_id: str) -> dict:
+        """
+        업로드 파일을 uploads/ 에 저장한다. (복사본 없이 한 번만 기록)
+
+        Returns:
+            업로드 정보 dict (new_upload + sha256)
+        """
+        upload = self.new_upload(file.filename, user_id)
 
         try:
             print(f"[INFO] 파일 업로드 시작: {file.filename}")
 
-            # 1️⃣ 파일 저장
-            with open(temp_path, "wb") as buffer:
-                buffer.write(await file.read())
-
-            # ============================================================
-            # 📌 수정: ZIP/DB 모두 uploads/ 폴더에 원본 저장
-            # ============================================================
-            original_save_name = f"{user_short}_{timestamp}_{file.filename}"
-            original_save_path = UPLOADS_DIR / original_save_name
-            shutil.copy2(temp_path, original_save_path)
-            print(f"[INFO] 원본 파일 저장: {original_save_path}")
-
-            # 2️⃣ ZIP 또는 DB 판별
-            if file.filename.lower().endswith(".zip"):
-                print("[INFO] ZIP 파일 압축 해제 중...")
-                db_path = await self.run_blocking(extract_zip_to_temp, temp_path)
-            elif file.filename.lower().endswith(".db"):
-                db_path = temp_path
-            else:
-                raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
+            # 1️⃣ 파일 저장 (chunk 단위로 쓰면서 SHA-256 계산 → 업로드 캐시 key)
+            file_hash = hashlib.sha256()
+            with open(upload["original_save_path"], "wb") as buffer:
+                while chunk := await file.read(COPY_BUFFER_SIZE):
+                    file_hash.update(chunk)
+                    buffer.write(chunk)
+            upload["sha256"] = file_hash.hexdigest()
+            print(f"[INFO] 원본 파일 저장: {upload['original_save_path']}")
 
-            if not db_path:
-                raise HTTPException(500, "DB 파일 경로를 찾을 수 없습니다.")
+        except Exception as e:
+            print(f"[ERROR] 파일 저장 중 오류: {str(e)}")
+            _active_paths.difference_update(
+                (upload["temp_dir"], upload["original_save_path"])
+            )
+            raise HTTPException(500, f"파일 저장 중 오류 발생: {str(e)}")
 
-            # 3️⃣ DB → JSON (비동기 처리)
-            print("[INFO] DB 파싱 중...")
-            raw_db_json = await self.run_blocking(db_to_json, db_path)
+        return upload
 
-            # ✅ 개선: 플랫폼 감지
-            platform = self.detect_platform(file.filename, raw_db_json)
-            print(f"[INFO] 감지된 플랫폼: {platform}")
+    async def process_file(
+        self,
+        file: UploadFile,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+        tz_offset_minutes: int | None = None,
+    ):
+        user_id = self.get_or_create_user_id(user_id)
 
-            # 4️⃣ 날짜별 raw 추출
-            print("[INFO] 날짜별 데이터 추출 중...")
-            raw_by_day = await self.run_blocking(
-                parse_db_json_to_raw_data_by_day, raw_db_json
+        upload = await self.save_upload(file, user_id)
+        upload["tz_offset_minutes"] = tz_offset_minutes
+
+        return await self.run_pipeline(upload, user_id, difficulty, duration)
+
+    async def _extract_and_parse(
+        self, upload: dict, report, tz_offset_minutes: int
+    ) -> tuple[str, dict]:
+        """업로드 파일 → (platform, 날짜별 raw)"""
+        filename = upload["filename"]
+        temp_dir = upload["temp_dir"]
+        temp_path = upload["temp_path"]
+
+        # 2️⃣ Apple Health 내보내기 (export.xml / export.zip) → 압축 해제 없이 스트리밍 파싱
+        await report("extract", "running")
+        lower_name = filename.lower()
+        if lower_name.endswith(".xml") or (
+            lower_name.endswith(".zip")
+            and await self.run_blocking(is_apple_export_zip, temp_path)
+        ):
+            await report("extract", "done")
+            return "apple", await self._parse_apple_export(temp_path, report)
+
+        # ZIP 또는 DB 판별
+        if lower_name.endswith(".zip"):
+            # DB 항목 하나만 사용자별 추출 폴더로 해제
+            print("[INFO] ZIP 파일에서 DB 추출 중...")
+            db_path = await self.run_blocking(extract_zip_to_temp, temp_path, temp_dir)
+        elif lower_name.endswith(".db"):
+            db_path = temp_path
+        else:
+            raise HTTPException(400, "ZIP, DB 또는 XML 파일만 업로드 가능합니다.")
+
+        if not db_path:
+            raise HTTPException(500, "DB 파일 경로를 찾을 수 없습니다.")
+        await report("extract", "done")
+
+        # 3️⃣ 플랫폼 감지 (테이블 목록만 조회)
+        await report("parse", "running")
+        db_tables = await self.run_blocking(list_db_tables, db_path)
+        platform = self.detect_platform(filename, db_tables)
+        print(f"[INFO] 감지된 플랫폼: {platform}")
+
+        # 4️⃣ 날짜별 raw 추출 (DB → JSON 변환 없이 SQL/스트리밍 집계)
+        print(
+            f"[INFO] DB 파싱 중... (mode: {DB_PARSE_MODE}, "
+            f"tz: UTC{tz_offset_minutes / 60:+g})"
+        )
+        raw_packed = await self.run_cpu_bound(
+            parse_db_file_packed,
+            db_path,
+            DB_PARSE_MODE,
+            tz_offset_minutes,
+            SQLITE_SCAN_WORKERS,
+        )
+        raw_by_day = unpack_raw_by_day(raw_packed)
+
+        if not raw_by_day:
+            raise HTTPException(500, "DB Parser가 건강 데이터를 추출하지 못했습니다.")
+
+        print(f"[INFO] 총 {len(raw_by_day)}일치 데이터 추출 완료")
+
+        # 날짜 범위 출력
+        dates = sorted(raw_by_day.keys())
+        if dates:
+            print(f"[INFO] 날짜 범위: {dates[0]} ~ {dates[-1]}")
+        await report("parse", "done")
+
+        return platform, raw_by_day
+
+    async def _parse_apple_export(self, path: str, report) -> dict:
+        """Apple Health export.xml / export.zip → 날짜별 raw (YYYYMMDD key)"""
+        await report("parse", "running")
+        print(f"[INFO] Apple Health export.xml 파싱 중... (mode: {APPLE_PARSE_MODE})")
+        raw_packed = await self.run_cpu_bound(
+            parse_apple_export_packed, path, APPLE_PARSE_MODE
+        )
+        raw_by_day = unpack_raw_by_day(raw_packed)
+
+        if not raw_by_day:
+            raise HTTPException(
+                500, "Apple Health export.xml에서 건강 데이터를 추출하지 못했습니다."
             )
 
-            if not raw_by_day:
-                raise HTTPException(
-                    500, "DB Parser가 건강 데이터를 추출하지 못했습니다."
+        dates = sorted(raw_by_day.keys())
+        print(f"[INFO] 총 {len(raw_by_day)}일치 데이터 추출 완료")
+        print(f"[INFO] 날짜 범위: {dates[0]} ~ {dates[-1]}")
+        await report("parse", "done")
+
+        return raw_by_day
+
+    async def run_pipeline(
+        self,
+        upload: dict,
+        user_id: str,
+        difficulty: str,
+        duration: int,
+        on_stage=None,
+    ):
+        """
+        저장된 업로드 파일 → 추출 → 파싱 → 전처리 → VectorDB 저장 → LLM 분석
+
+        on_stage(stage, status): 단계별 진행 콜백 (비동기 작업 모드에서 사용)
+        - stage: PIPELINE_STAGES 중 하나
+        - status: "running" | "done"
+        - awaitable을 반환하면 기다린 뒤 다음 단계로 진행 (기록 순서 유지)
+        """
+        filename = upload["filename"]
+        user_short = upload["user_short"]
+        temp_dir = upload["temp_dir"]
+        original_save_name = upload["original_save_name"]
+        original_save_path = upload["original_save_path"]
+        file_info = {
+            "file_type": filename.split(".")[-1],
+            "original_path": original_save_path,
+            "extract_dir": temp_dir,
+        }
+
+        # 업로드 캐시 key (이전 버전에서 접수된 작업은 sha256 없음 → 캐시 미사용)
+        sha256 = upload.get("sha256") if UPLOAD_CACHE_ENABLED else None
+
+        # 심박수 날짜 버킷팅 시간대 (요청에 없으면 기본값) → 캐시 variant에 포함
+        tz_offset_minutes = upload.get("tz_offset_minutes")
+        if tz_offset_minutes is None:
+            tz_offset_minutes = DEFAULT_TZ_OFFSET_MINUTES
+        raw_variant, _, response_variant = self.cache_variants(
+            difficulty, duration, tz_offset_minutes
+        )
+
+        async def report(stage: str, status: str):
+            if on_stage:
+                reported = on_stage(stage, status)
+                if inspect.isawaitable(reported):
+                    await reported
+
+        try:
+            # 🔁 같은 파일 + 같은 옵션 → 이전 응답 그대로 반환 (파이프라인 전체 생략)
+            if sha256:
+                cached_response = await self.run_blocking(
+                    get_cached, user_id, sha256, KIND_RESPONSE, response_variant
+                )
+                if cached_response:
+                    print(f"[INFO] 업로드 캐시 hit (응답): {sha256[:12]}")
+                    for stage in PIPELINE_STAGES[1:]:
+                        await report(stage, "done")
+                    cached_response["file_info"] = file_info
+                    cached_response["cache"] = {"sha256": sha256, "hit": "response"}
+                    return cached_response
+
+            cached_raw = None
+            if sha256:
+                cached_raw = await self.run_blocking(
+                    get_cached, user_id, sha256, KIND_RAW, raw_variant
                 )
 
-            total_days = len(raw_by_day)
-            print(f"[INFO] 총 {total_days}일치 데이터 추출 완료")
+            if cached_raw:
+                # 🔁 같은 파일 → 압축 해제 / 파싱 생략
+                print(f"[INFO] 업로드 캐시 hit (raw): {sha256[:12]}")
+                await report("extract", "done")
+                await report("parse", "done")
+                platform = cached_raw["platform"]
+                # JSON key는 문자열 → epoch day(int)로 복원
+                raw_by_day = {
+                    int(date_key): raw
+                    for date_key, raw in cached_raw["raw_by_day"].items()
+                }
+            else:
+                platform, raw_by_day = await self._extract_and_parse(
+                    upload, report, tz_offset_minutes
+                )
+                if sha256:
+                    await self.run_blocking(
+                        put_cached,
+                        user_id,
+                        sha256,
+                        KIND_RAW,
+                        {"platform": platform, "raw_by_day": raw_by_day},
+                        raw_variant,
+                        f"zip_{platform}",
+                    )
 
-            # 날짜 범위 출력
+            total_days = len(raw_by_day)
             dates = sorted(raw_by_day.keys())
-            if dates:
-                print(f"[INFO] 날짜 범위: {dates[0]} ~ {dates[-1]}")
 
-            # 5️⃣ 최신 날짜 결정
+            # 5️⃣ 증분 계획 (hash가 같은 날짜는 임베딩/저장 생략)
+            # 전처리가 raw에 platform을 추가하므로 먼저 계산
+            # 컬렉션(임베딩 설정)마다 따로 → 설정을 바꾸면 새 컬렉션에 전체 저장
+            source = f"zip_{platform}"
+            collection = collection_name()
+            ingest_plan = await self.run_blocking(
+                plan_incremental_ingest, user_id, source, raw_by_day, collection
+            )
+            ingest_dates = ingest_plan["new"] + ingest_plan["changed"]
+            print(
+                f"[INFO] 증분 업로드: 신규 {len(ingest_plan['new'])}일 / "
+                f"변경 {len(ingest_plan['changed'])}일 / "
+                f"생략 {len(ingest_plan['skipped'])}일 "
+                f"(watermark: {ingest_plan['watermark']})"
+            )
+
+            # 최신 날짜 결정
             latest_date = max(raw_by_day.keys())
-            latest_raw = raw_by_day[latest_date]
 
-            # 6️⃣ 최신 1일치 summary (분석용)
-            print("[INFO] 최신 데이터 전처리 중...")
-            latest_summary = await self.run_blocking(
-                preprocess_health_json, latest_raw, latest_date, platform
+            # 6️⃣ 최신 1일치(분석용) + 신규/변경 날짜 summary
+            # 필요한 날짜만 골라 한 번에 전처리 (프로세스 풀 왕복 1회)
+            await report("preprocess", "running")
+            print(f"[INFO] 데이터 전처리 중... ({len(ingest_dates)}일 + 최신일)")
+            preprocess_dates = sorted(set(ingest_dates) | {latest_date})
+            summaries_by_date = await self.run_cpu_bound(
+                preprocess_health_json_batch,
+                {d: raw_by_day[d] for d in preprocess_dates},
+                platform,
             )
+            latest_summary = summaries_by_date[latest_date]
+            all_summaries = [summaries_by_date[d] for d in ingest_dates]
+            await report("preprocess", "done")
 
-            # 7️⃣ 전체 날짜 summary → Vector DB 배치 저장
-            print(f"[INFO] VectorDB에 {total_days}일치 데이터 배치 저장 중...")
+            # 7️⃣ 신규/변경 날짜 summary → Vector DB 배치 저장
+            print(f"[INFO] VectorDB에 {len(ingest_dates)}일치 데이터 배치 저장 중...")
 
-            all_summaries = []
-            for date_int, raw in raw_by_day.items():
-                daily_summary = await self.run_blocking(
-                    preprocess_health_json,
-                    raw,
-                    date_int,
-                    platform,
+            await report("embed", "running")
+            if all_summaries:
+                await self.run_blocking(
+                    save_daily_summaries_batch, all_summaries, user_id, source
                 )
-                all_summaries.append(daily_summary)
 
-            source = f"zip_{platform}"
+            # 저장이 끝난 날짜만 hash/watermark 기록
             await self.run_blocking(
-                save_daily_summaries_batch, all_summaries, user_id, source
+                record_ingested_days,
+                user_id,
+                source,
+                {d: ingest_plan["hashes"][d] for d in ingest_dates},
+                collection,
             )
 
             print(
-                f"[SUCCESS] {total_days}일치 데이터 VectorDB 저장 완료 (플랫폼: {platform})"
+                f"[SUCCESS] {len(ingest_dates)}일치 데이터 VectorDB 저장 완료 (플랫폼: {platform})"
             )
+            await report("embed", "done")
 
             # 8️⃣ LLM 분석 (최신 데이터만)
+            await report("llm", "running")
             print("[INFO] LLM 분석 실행 중...")
             llm_result = await self.run_blocking(
                 run_llm_analysis,
@@ -204,35 +487,55 @@ class FileUploadService:
             )
 
             print("[SUCCESS] 분석 완료")
+            await report("llm", "done")
 
             # ============================================================
             # 📌 수정: 저장 경로 정보 로그
             # ============================================================
             print(f"\n{'='*70}")
             print(f"📦 파일 저장 정보:")
-            print(f"  • 파일 타입: {file.filename.split('.')[-1].upper()}")
+            print(f"  • 파일 타입: {filename.split('.')[-1].upper()}")
             print(f"  • 원본 파일: {original_save_path}")
             print(f"  • 압축 해제: {temp_dir}")
             print(f"  • 플랫폼: {platform}")
             print(f"  • 날짜 범위: {dates[0]} ~ {dates[-1]}")
             print(f"{'='*70}\n")
 
-            return {
+            response = {
                 "message": "ZIP/DB 업로드 및 분석 성공",
                 "user_id": user_id,
                 "total_days_saved": total_days,
                 "date_range": f"{dates[0]} ~ {dates[-1]}" if dates else "",
                 "latest_date": latest_date,
                 "platform": platform,
+                "ingest": {
+                    "new_days": len(ingest_plan["new"]),
+                    "changed_days": len(ingest_plan["changed"]),
+                    "skipped_days": len(ingest_plan["skipped"]),
+                    "previous_watermark": ingest_plan["watermark"],
+                },
                 "summary": latest_summary,
                 "llm_result": llm_result,
-                "file_info": {
-                    "file_type": file.filename.split(".")[-1],
-                    "original_path": str(original_save_path),
-                    "extract_dir": temp_dir,
-                },
+                "file_info": file_info,
             }
 
+            if sha256:
+                await self.run_blocking(
+                    put_cached,
+                    user_id,
+                    sha256,
+                    KIND_RESPONSE,
+                    response,
+                    response_variant,
+                    source,
+                )
+
+            response["cache"] = {
+                "sha256": sha256,
+                "hit": "raw" if cached_raw else None,
+            }
+            return response
+
         except HTTPException:
             raise
         except Exception as e:
@@ -244,14 +547,20 @@ class FileUploadService:
 
         finally:
             # 9️⃣ 이전 데이터 정리 + 현재 데이터 보존
+            _active_paths.difference_update((temp_dir, original_save_path))
             try:
+                # 다른 요청 / 작업이 아직 쓰는 파일은 남김
+                protected = await self.run_blocking(_protected_upload_paths, user_id)
+
                 # 1. 현재 사용자의 모든 추출 디렉토리 찾기
                 user_pattern = f"{user_short}_*"
                 user_dirs = list(EXTRACTED_DIR.glob(user_pattern))
 
-                # 2. 현재 디렉토리 제외
+                # 2. 현재 디렉토리 + 진행 중인 업로드 제외
                 current_dir = Path(temp_dir)
-                old_dirs = [d for d in user_dirs if d != current_dir]
+                old_dirs = [
+                    d for d in user_dirs if d != current_dir and d not in protected
+                ]
 
                 # 3. 이전 추출 디렉토리 삭제
                 for old_dir in old_dirs:
@@ -265,9 +574,11 @@ class FileUploadService:
                 file_pattern = f"{user_short}_*.*"  # 모든 확장자
                 old_files = list(UPLOADS_DIR.glob(file_pattern))
 
-                # 현재 파일 제외
+                # 현재 파일 + 진행 중인 업로드 제외
                 current_file = UPLOADS_DIR / original_save_name
-                old_files = [f for f in old_files if f != current_file]
+                old_files = [
+                    f for f in old_files if f != current_file and f not in protected
+                ]
 
                 for old_file in old_files:
                     print(f"[INFO] 이전 원본 파일 삭제: {old_file.name}")
@@ -0,0 +1,370 @@
+"""
+이어받기(resumable) 업로드 서비스 (tus 방식)
+
+1) handshake  POST /api/file/uploads (filename, size, sha256)
+   - "ingested": 같은 파일을 이미 받아 분석 작업까지 접수함 → 업로드 생략, job 정보 반환
+     (/upload, /upload/async로 처리해 업로드 캐시에 응답이 있는 파일 포함)
+   - "resume"  : 받던 세션이 있음 → offset부터 이어서 PATCH
+   - "start"   : 새 세션 → offset 0부터 PATCH
+2) PATCH /api/file/uploads/{upload_id} (Upload-Offset 헤더 + chunk 바이트)
+   - 요청 본문을 메모리에 모으지 않고 받은 만큼 부분 파일 끝에 바로 기록
+   - 서버 offset과 Upload-Offset이 다르면 409 (HEAD로 현재 offset 확인 후 재시도)
+3) 마지막 chunk → SHA-256 확인 → uploads/ 로 rename (복사 없음) → 비동기 작업 등록
+
+SHA-256은 chunk를 쓰면서 이어서 계산한다.
+(서버 재시작 등으로 계산 상태가 없으면 디스크에 있는 부분 파일로 다시 계산)
+"""
+
+import os
+import re
+import time
+import asyncio
+import hashlib
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from app.config import RESUMABLE_UPLOAD_TTL_HOURS, UPLOAD_CACHE_ENABLED
+from app.core import job_store, upload_sessions
+from app.core.upload_cache import get_cached, KIND_RESPONSE
+from app.core.unzipper import COPY_BUFFER_SIZE
+from app.service.file_upload_service import UPLOADS_DIR, UPLOAD_EXTENSIONS
+from app.service.upload_job_service import UploadJobService
+
+# 받는 중인 부분 파일 (uploads/ 하위 폴더라 이전 원본 정리 대상에서 제외됨)
+PARTIAL_DIR = UPLOADS_DIR / "partial"
+PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+
+# handshake 응답
+ACTION_INGESTED = "ingested"
+ACTION_RESUME = "resume"
+ACTION_START = "start"
+
+# handshake sha256 (16진수 64자리, 소문자로 바꾼 뒤 비교)
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def partial_path(upload_id: str) -> str:
+    return str(PARTIAL_DIR / f"{upload_id}.part")
+
+
+def received_bytes(upload_id: str) -> int:
+    """현재 받은 바이트 수 (= 다음 chunk offset)"""
+    try:
+        return os.path.getsize(partial_path(upload_id))
+    except FileNotFoundError:
+        return 0
+
+
+def hash_file_prefix(path: str, length: int):
+    """파일 앞 length 바이트의 SHA-256 계산 객체 (이어서 update 가능)"""
+    file_hash = hashlib.sha256()
+    if length <= 0:
+        return file_hash
+
+    with open(path, "rb") as f:
+        remaining = length
+        while remaining and (chunk := f.read(min(COPY_BUFFER_SIZE, remaining))):
+            file_hash.update(chunk)
+            remaining -= len(chunk)
+    return file_hash
+
+
+def _remove_partial(upload_id: str):
+    try:
+        os.remove(partial_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+class ResumableUploadService:
+    def __init__(self, job_service: UploadJobService):
+        self.job_service = job_service
+        self.upload_service = job_service.upload_service
+        # upload_id → 동시 PATCH 직렬화용 lock
+        self.locks: dict[str, asyncio.Lock] = {}
+        # upload_id → (SHA-256 계산 객체, 계산한 바이트 수)
+        self.hashers: dict[str, tuple] = {}
+
+    # ------------------------------------------------
+    # 1) handshake
+    # ------------------------------------------------
+    async def handshake(
+        self,
+        filename: str,
+        size: int,
+        sha256: str,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+        tz_offset_minutes: int | None = None,
+    ) -> dict:
+        """파일 hash + 크기 → ingested / resume / start"""
+        if not filename.lower().endswith(UPLOAD_EXTENSIONS):
+            raise HTTPException(400, "ZIP, DB 또는 XML 파일만 업로드 가능합니다.")
+
+        sha256 = sha256.lower()
+        if not SHA256_PATTERN.fullmatch(sha256):
+            raise HTTPException(400, "sha256은 64자리 16진수 문자열이어야 합니다.")
+
+        user_id = self.upload_service.get_or_create_user_id(user_id)
+        _, ingest_variant, response_variant = self.upload_service.cache_variants(
+            difficulty, duration, tz_offset_minutes
+        )
+
+        run_blocking = self.upload_service.run_blocking
+        for upload_id in await run_blocking(
+            upload_sessions.expire_sessions, RESUMABLE_UPLOAD_TTL_HOURS
+        ):
+            print(f"[INFO] 만료된 이어받기 업로드 삭제: {upload_id}")
+            _remove_partial(upload_id)
+            self.hashers.pop(upload_id, None)
+
+        session = await run_blocking(
+            upload_sessions.find_session, user_id, sha256, size
+        )
+
+        # 이미 받은 파일 → 분석 작업이 실패하지 않았고 같은 파서 / 시간대 / 컬렉션으로
+        # 처리했으면 업로드 생략 (임베딩 설정을 바꿨으면 새 컬렉션에 저장하도록 다시 받음)
+        if session and session["status"] == upload_sessions.STATUS_COMPLETE:
+            job = await run_blocking(job_store.get_job, session["job_id"])
+            if (
+                job
+                and job["status"] != job_store.STATUS_FAILED
+                and session["params"].get("ingest_variant") == ingest_variant
+            ):
+                print(f"[INFO] 이어받기 업로드: 이미 받은 파일 {sha256[:12]}")
+                return self._ingested(session, job)
+            await run_blocking(upload_sessions.delete_session, session["upload_id"])
+            session = None
+
+        params = {
+            "difficulty": difficulty,
+            "duration": duration,
+            "tz_offset_minutes": tz_offset_minutes,
+            "ingest_variant": ingest_variant,
+        }
+        filename = os.path.basename(filename)
+
+        # /upload, /upload/async로 이미 처리한 파일 → 캐시된 응답으로 완료 처리
+        if session is None and UPLOAD_CACHE_ENABLED:
+            cached = await run_blocking(
+                get_cached, user_id, sha256, KIND_RESPONSE, response_variant
+            )
+            if cached:
+                print(f"[INFO] 이어받기 업로드: 업로드 캐시 hit {sha256[:12]}")
+                job = await run_blocking(
+                    self.job_service.complete_from_cache,
+                    user_id,
+                    filename,
+                    sha256,
+                    cached,
+                )
+                session = await run_blocking(
+                    upload_sessions.create_session,
+                    user_id,
+                    filename,
+                    sha256,
+                    size,
+                    params,
+                )
+                await run_blocking(
+                    upload_sessions.mark_complete, session["upload_id"], job["job_id"]
+                )
+                return {
+                    "action": ACTION_INGESTED,
+                    **self._session_view(session, size),
+                    **job,
+                }
+
+        if session is None:
+            session = await run_blocking(
+                upload_sessions.create_session,
+                user_id,
+                filename,
+                sha256,
+                size,
+                params,
+            )
+
+        upload_id = session["upload_id"]
+        offset = received_bytes(upload_id)
+
+        # 바이트는 모두 받았는데 완료 처리 전에 끊긴 경우
+        # 마지막 PATCH와 동시에 올 수 있으므로 같은 lock 안에서 상태를 다시 확인
+        if offset == size:
+            async with self.locks.setdefault(upload_id, asyncio.Lock()):
+                current = await run_blocking(upload_sessions.get_session, upload_id)
+                if current is None:
+                    raise HTTPException(
+                        409, "업로드 세션이 변경되었습니다. 다시 시도하세요."
+                    )
+                if current["status"] == upload_sessions.STATUS_COMPLETE:
+                    job = await run_blocking(job_store.get_job, current["job_id"])
+                    return self._ingested(current, job)
+
+                offset = received_bytes(upload_id)
+                if offset == size:
+                    return {"action": ACTION_INGESTED, **await self._complete(current)}
+
+        return {
+            "action": ACTION_RESUME if offset else ACTION_START,
+            **self._session_view(session, offset),
+        }
+
+    # ------------------------------------------------
+    # 2) 현재 offset (HEAD)
+    # ------------------------------------------------
+    def get_offset(self, upload_id: str) -> dict:
+        session = self._get_session(upload_id)
+        if session["status"] == upload_sessions.STATUS_COMPLETE:
+            return self._session_view(session, session["size_bytes"])
+        return self._session_view(session, received_bytes(upload_id))
+
+    # ------------------------------------------------
+    # 3) chunk 기록 (PATCH)
+    # ------------------------------------------------
+    async def append_chunk(
+        self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]
+    ) -> dict:
+        """
+        chunk를 부분 파일 끝에 기록하고 다음 offset 반환
+        마지막 chunk면 해시 확인 후 작업 등록 결과를 함께 반환
+        """
+        await self._load_session(upload_id)
+        lock = self.locks.setdefault(upload_id, asyncio.Lock())
+
+        async with lock:
+            # lock을 기다리는 동안 handshake / 다른 PATCH가 완료 처리했을 수 있음
+            session = await self._load_session(upload_id)
+            if session["status"] == upload_sessions.STATUS_COMPLETE:
+                raise HTTPException(409, "이미 완료된 업로드입니다.")
+
+            size = session["size_bytes"]
+            current = received_bytes(upload_id)
+            if offset != current:
+                raise HTTPException(
+                    409, f"Upload-Offset이 일치하지 않습니다. (서버 offset: {current})"
+                )
+
+            file_hash = await self._hasher_at(upload_id, current)
+            written = current
+            try:
+                with open(partial_path(upload_id), "ab") as f:
+                    async for chunk in chunks:
+                        if written + len(chunk) > size:
+                            # 버퍼에 남은 chunk를 먼저 기록해야 truncate 뒤에 다시 붙지 않음
+                            f.flush()
+                            os.truncate(f.fileno(), current)
+                            written = current
+                            file_hash = None
+                            raise HTTPException(
+                                413, "선언한 파일 크기보다 많은 데이터를 받았습니다."
+                            )
+                        f.write(chunk)
+                        file_hash.update(chunk)
+                        written += len(chunk)
+            finally:
+                # 연결이 끊겨도 기록된 만큼은 유지 (다음 PATCH가 이어서 씀)
+                if file_hash is not None:
+                    self.hashers[upload_id] = (file_hash, written)
+                else:
+                    self.hashers.pop(upload_id, None)
+
+            await self.upload_service.run_blocking(
+                upload_sessions.touch_session, upload_id
+            )
+
+            if written == size:
+                return await self._complete(session)
+
+        return self._session_view(session, written)
+
+    # ------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------
+    @staticmethod
+    def _get_session(upload_id: str) -> dict:
+        session = upload_sessions.get_session(upload_id)
+        if not session:
+            raise HTTPException(404, "업로드 세션을 찾을 수 없습니다.")
+        return session
+
+    async def _load_session(self, upload_id: str) -> dict:
+        """_get_session (이벤트 루프 밖 스레드에서 조회)"""
+        return await self.upload_service.run_blocking(self._get_session, upload_id)
+
+    def _ingested(self, session: dict, job: dict) -> dict:
+        """이미 받은 파일 응답 (세션 + 작업 정보)"""
+        return {
+            "action": ACTION_INGESTED,
+            **self._session_view(session, session["size_bytes"]),
+            **self.job_service.job_links(
+                job["job_id"], session["user_id"], job["status"]
+            ),
+        }
+
+    @staticmethod
+    def _session_view(session: dict, offset: int) -> dict:
+        return {
+            "upload_id": session["upload_id"],
+            "user_id": session["user_id"],
+            "offset": offset,
+            "size": session["size_bytes"],
+            "upload_url": f"/api/file/uploads/{session['upload_id']}",
+        }
+
+    async def _hasher_at(self, upload_id: str, offset: int):
+        """offset까지 계산된 SHA-256 객체 (메모리에 없으면 부분 파일로 다시 계산)"""
+        entry = self.hashers.pop(upload_id, None)
+        if entry and entry[1] == offset:
+            return entry[0]
+        return await self.upload_service.run_blocking(
+            hash_file_prefix, partial_path(upload_id), offset
+        )
+
+    async def _complete(self, session: dict) -> dict:
+        """해시 확인 → uploads/ 로 이동 → 비동기 작업 등록"""
+        upload_id = session["upload_id"]
+        started = time.time()
+
+        entry = self.hashers.pop(upload_id, None)
+        if entry and entry[1] == session["size_bytes"]:
+            sha256 = entry[0].hexdigest()
+        else:
+            sha256 = (
+                await self.upload_service.run_blocking(
+                    hash_file_prefix, partial_path(upload_id), session["size_bytes"]
+                )
+            ).hexdigest()
+
+        if sha256 != session["sha256"]:
+            _remove_partial(upload_id)
+            await self.upload_service.run_blocking(
+                upload_sessions.delete_session, upload_id
+            )
+            self.locks.pop(upload_id, None)
+            raise HTTPException(
+                400, "파일 SHA-256이 일치하지 않습니다. 처음부터 다시 업로드하세요."
+            )
+
+        # 같은 파일시스템 안의 rename → 다시 쓰지 않음
+        upload = self.upload_service.new_upload(session["filename"], session["user_id"])
+        os.replace(partial_path(upload_id), upload["original_save_path"])
+        upload["sha256"] = sha256
+        upload["tz_offset_minutes"] = session["params"]["tz_offset_minutes"]
+        print(f"[INFO] 이어받기 업로드 완료: {upload['original_save_path']}")
+
+        job = await self.job_service.enqueue(
+            upload,
+            session["user_id"],
+            session["params"]["difficulty"],
+            session["params"]["duration"],
+            time.time() - started,
+        )
+        await self.upload_service.run_blocking(
+            upload_sessions.mark_complete, upload_id, job["job_id"]
+        )
+        self.locks.pop(upload_id, None)
+
+        return {**self._session_view(session, session["size_bytes"]), **job}
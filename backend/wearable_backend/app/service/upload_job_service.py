@@ -0,0 +1,247 @@
+"""
+ZIP/DB 업로드 비동기 작업 서비스
+
+/api/file/upload 는 저장 → 압축해제 → 파싱 → 전처리 → 임베딩 → LLM 분석까지
+요청을 붙잡고 있어 큰 파일은 모바일에서 타임아웃이 난다.
+
+- 업로드 요청에서는 파일 저장까지만 하고 job_id를 바로 반환
+- 나머지 단계는 고정 개수의 워커(UPLOAD_JOB_WORKERS)가 큐에서 꺼내 실행
+- 단계별 진행 상태/소요 시간과 최종 결과는 job_store(SQLite)에 기록
+- 서버 재시작 시 끝나지 않은 작업을 다시 큐에 넣음
+  (실행은 job_store.claim_job으로 한 워커만, running 작업은 lease가 만료된 것만 재등록,
+   UPLOAD_JOB_MAX_ATTEMPTS회를 넘으면 failed)
+- job_store(SQLite) 호출은 이벤트 루프를 막지 않도록 스레드에서 실행
+"""
+
+import time
+import asyncio
+from fastapi import UploadFile, HTTPException
+
+from app.config import (
+    UPLOAD_JOB_WORKERS,
+    UPLOAD_JOB_LEASE_SEC,
+    UPLOAD_JOB_MAX_ATTEMPTS,
+)
+from app.core import job_store
+from app.service.file_upload_service import (
+    FileUploadService,
+    PIPELINE_STAGES,
+    UPLOAD_EXTENSIONS,
+)
+
+
+class UploadJobService:
+    def __init__(self, upload_service: FileUploadService | None = None):
+        self.upload_service = upload_service or FileUploadService()
+        self.queue: asyncio.Queue | None = None
+        self.workers: list[asyncio.Task] = []
+
+    # ------------------------------------------------
+    # 1) 워커 풀
+    # ------------------------------------------------
+    async def start(self):
+        """워커 시작 + 끝나지 않은 작업 재등록 (서버 startup 시 호출)"""
+        if self.workers:
+            return
+
+        self.queue = asyncio.Queue()
+        self.workers = [
+            asyncio.create_task(self._worker(i)) for i in range(UPLOAD_JOB_WORKERS)
+        ]
+        print(f"[INFO] 업로드 작업 워커 {UPLOAD_JOB_WORKERS}개 시작")
+
+        # lease가 남은 running 작업은 다른 워커가 실행 중 → queued 작업만 다시 큐에
+        run_blocking = self.upload_service.run_blocking
+        recovered = await run_blocking(
+            job_store.recover_stale_jobs, UPLOAD_JOB_MAX_ATTEMPTS
+        )
+        if recovered["failed"]:
+            print(f"[WARN] 최대 실행 횟수 초과 작업 {recovered['failed']}개 failed 처리")
+
+        for job in await run_blocking(
+            job_store.list_unfinished_jobs, None, (job_store.STATUS_QUEUED,)
+        ):
+            print(f"[INFO] 미완료 작업 재등록: {job['job_id']} (시도 {job['attempts']}회)")
+            self.queue.put_nowait(job["job_id"])
+
+    async def stop(self):
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def _worker(self, worker_no: int):
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                print(f"[ERROR] 작업 워커 {worker_no} 오류: {job_id} - {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    # ------------------------------------------------
+    # 2) 작업 접수
+    # ------------------------------------------------
+    async def submit(
+        self,
+        file: UploadFile,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+        tz_offset_minutes: int | None = None,
+    ) -> dict:
+        """파일 저장 후 작업 등록 → job_id 즉시 반환"""
+        if not file.filename.lower().endswith(UPLOAD_EXTENSIONS):
+            raise HTTPException(400, "ZIP, DB 또는 XML 파일만 업로드 가능합니다.")
+
+        await self.start()
+
+        user_id = self.upload_service.get_or_create_user_id(user_id)
+
+        started = time.time()
+        upload = await self.upload_service.save_upload(file, user_id)
+        upload["tz_offset_minutes"] = tz_offset_minutes
+
+        return await self.enqueue(
+            upload, user_id, difficulty, duration, time.time() - started
+        )
+
+    async def enqueue(
+        self,
+        upload: dict,
+        user_id: str,
+        difficulty: str,
+        duration: int,
+        save_elapsed: float = 0.0,
+    ) -> dict:
+        """
+        저장이 끝난 업로드(save_upload / 이어받기 업로드 완료) 작업 등록
+
+        save_elapsed: "save" 단계 소요 시간 (초)
+        """
+        await self.start()
+
+        job_id = await self.upload_service.run_blocking(
+            lambda: job_store.create_job(
+                user_id=user_id,
+                filename=upload["filename"],
+                stages=PIPELINE_STAGES,
+                params={
+                    "upload": upload,
+                    "difficulty": difficulty,
+                    "duration": duration,
+                },
+                done_stages={"save": save_elapsed},
+            )
+        )
+        self.queue.put_nowait(job_id)
+
+        print(f"[INFO] 업로드 작업 접수: {job_id} (user: {user_id})")
+
+        return self.job_links(job_id, user_id)
+
+    def complete_from_cache(
+        self, user_id: str, filename: str, sha256: str, response: dict
+    ) -> dict:
+        """
+        업로드 캐시에 응답이 있는 파일 → 파일 / 파이프라인 없이 완료된 작업으로 등록
+        (이어받기 handshake에서 /upload, /upload/async로 이미 처리한 파일)
+        """
+        response["cache"] = {"sha256": sha256, "hit": "response"}
+        job_id = job_store.create_job(
+            user_id=user_id,
+            filename=filename,
+            stages=PIPELINE_STAGES,
+            params={},
+            done_stages={stage: 0.0 for stage in PIPELINE_STAGES},
+            result=response,
+        )
+        print(f"[INFO] 업로드 캐시 응답으로 작업 완료: {job_id} (user: {user_id})")
+
+        return self.job_links(job_id, user_id, job_store.STATUS_SUCCEEDED)
+
+    @staticmethod
+    def job_links(job_id: str, user_id: str, status: str | None = None) -> dict:
+        """작업 접수 / 조회 응답 (상태 조회 · 결과 URL)"""
+        return {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": status or job_store.STATUS_QUEUED,
+            "status_url": f"/api/file/jobs/{job_id}",
+            "result_url": f"/api/file/jobs/{job_id}/result",
+        }
+
+    # ------------------------------------------------
+    # 3) 작업 실행
+    # ------------------------------------------------
+    async def _run_job(self, job_id: str):
+        run_blocking = self.upload_service.run_blocking
+
+        # queued → running 조건부 UPDATE (이미 다른 워커가 가져갔거나 끝난 작업이면 None)
+        job = await run_blocking(
+            job_store.claim_job, job_id, UPLOAD_JOB_LEASE_SEC, ("save",)
+        )
+        if not job:
+            return
+
+        params = job["params"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+
+        try:
+            result = await self.upload_service.run_pipeline(
+                params["upload"],
+                job["user_id"],
+                params["difficulty"],
+                params["duration"],
+                on_stage=lambda stage, status: run_blocking(
+                    job_store.mark_stage, job_id, stage, status
+                ),
+            )
+        except HTTPException as e:
+            await run_blocking(job_store.mark_failed, job_id, str(e.detail))
+            return
+        except Exception as e:
+            await run_blocking(job_store.mark_failed, job_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await run_blocking(job_store.mark_succeeded, job_id, result)
+        print(f"[SUCCESS] 업로드 작업 완료: {job_id}")
+
+    async def _heartbeat(self, job_id: str):
+        """실행 중 lease 연장 (lease의 1/3마다)"""
+        while True:
+            await asyncio.sleep(UPLOAD_JOB_LEASE_SEC / 3)
+            await self.upload_service.run_blocking(
+                job_store.renew_lease, job_id, UPLOAD_JOB_LEASE_SEC
+            )
+
+    # ------------------------------------------------
+    # 4) 상태 / 결과 조회
+    # ------------------------------------------------
+    @staticmethod
+    def get_status(job_id: str) -> dict:
+        job = job_store.get_job(job_id)
+        if not job:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+        return job_store.job_status_view(job)
+
+    @staticmethod
+    def get_result(job_id: str) -> dict:
+        job = job_store.get_job(job_id)
+        if not job:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+
+        if job["status"] == job_store.STATUS_FAILED:
+            raise HTTPException(500, f"ZIP/DB 처리 중 오류 발생: {job['error']}")
+
+        if job["status"] != job_store.STATUS_SUCCEEDED:
+            raise HTTPException(
+                409,
+                f"작업이 아직 완료되지 않았습니다. (status: {job['status']}, "
+                f"stage: {job['current_stage']})",
+            )
+
+        return {"job_id": job_id, **job["result"]}
@@ -7,7 +7,10 @@ Health Data Preprocessing 모듈 (None 값 안전 처리 버전)
 - Infinity/NaN → null → None 처리
 """
 
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
+
+# 1970-01-01의 proleptic ordinal (epoch day + 이 값 = date ordinal)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 
 def epoch_day_to_date_string(epoch_day: int) -> str:
@@ -139,6 +142,16 @@ def normalize_raw(raw_json: dict) -> dict:
         "systolic": safe_get("systolic", 0),
         "diastolic": safe_get("diastolic", 0),
         "glucose": safe_get("glucose", 0),
+        # 심박수 일중 분포 (Health Connect 심박 series, 없으면 0)
+        "heart_rate_p5": safe_get("heart_rate_p5", 0),
+        "heart_rate_p50": safe_get("heart_rate_p50", 0),
+        "heart_rate_p95": safe_get("heart_rate_p95", 0),
+        "min_overnight_heart_rate": safe_get("min_overnight_heart_rate", 0),
+        "hr_zone1_pct": safe_get("hr_zone1_pct", 0),
+        "hr_zone2_pct": safe_get("hr_zone2_pct", 0),
+        "hr_zone3_pct": safe_get("hr_zone3_pct", 0),
+        "hr_zone4_pct": safe_get("hr_zone4_pct", 0),
+        "hr_zone5_pct": safe_get("hr_zone5_pct", 0),
     }
 
 
@@ -246,3 +259,75 @@ def preprocess_health_json(
         "raw": raw_norm,
         "platform": platform,
     }
+
+
+def _created_at_from_date_key(date_int) -> str | None:
+    """
+    날짜 key → created_at (로그 없음, 배치용)
+    YYYYMMDD / Epoch Day 가 아니면 None
+    """
+    date_str = str(date_int)
+
+    if len(date_str) == 8:
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}T00:00:00+00:00"
+
+    if len(date_str) <= 5 and date_str.isdigit():
+        day = date.fromordinal(EPOCH_ORDINAL + int(date_int))
+        return f"{day.isoformat()}T00:00:00+00:00"
+
+    return None
+
+
+def preprocess_health_json_batch(
+    raw_by_day: dict, platform: str = "unknown", dates: list | None = None
+) -> dict:
+    """
+    날짜별 raw 전체를 한 번에 전처리 (preprocess_health_json 배치 버전)
+
+    - Epoch Day → 날짜: datetime 연산 대신 EPOCH_ORDINAL 오프셋으로 계산
+    - 날짜별 로그 대신 요약 1줄만 출력
+
+    Args:
+        raw_by_day: {date_int: raw_json}
+        platform: 플랫폼 ('samsung', 'apple', 'unknown')
+        dates: 전처리할 날짜 목록 (None이면 전체)
+
+    Returns:
+        {date_int: summary} (preprocess_health_json과 같은 형식)
+    """
+    if dates is None:
+        dates = list(raw_by_day.keys())
+
+    now_iso = None
+    invalid = 0
+    summaries = {}
+
+    for date_int in dates:
+        raw_json = raw_by_day[date_int]
+        raw_json["platform"] = platform
+
+        created_at = _created_at_from_date_key(date_int) if date_int else None
+        if created_at is None:
+            if date_int:
+                invalid += 1
+            if now_iso is None:
+                now_iso = datetime.now(timezone.utc).isoformat()
+            created_at = now_iso
+
+        raw_norm = normalize_raw(raw_json)
+        summaries[date_int] = {
+            "created_at": created_at,
+            "summary_text": generate_summary_text(raw_norm),
+            "raw": raw_norm,
+            "platform": platform,
+        }
+
+    if summaries:
+        print(
+            f"[INFO] 배치 전처리 완료: {len(summaries)}일 "
+            f"({min(dates)} ~ {max(dates)}, 플랫폼: {platform})"
+        )
+    if invalid:
+        print(f"[WARN] 잘못된 date_int 형식 {invalid}건, 현재 시간 사용")
+
+    return summaries
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Apple Health export.xml 파싱 처리량 벤치마크 (scan vs iterparse)
+
+합성 export.xml(또는 --xml로 지정한 실제 파일)을 파싱 방식별로
+별도 프로세스에서 1회씩 파싱하여 처리량(records/s)과 최대 RSS를 비교한다.
+(최대 RSS는 프로세스 단위로만 측정 가능하므로 방식마다 새 프로세스 사용)
+
+사용법:
+  python benchmarks/bench_apple_health_parser.py
+  python benchmarks/bench_apple_health_parser.py --records 2000000 --json out.json
+  python benchmarks/bench_apple_health_parser.py --xml ./apple_health_export/export.xml
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core import apple_health_parser
+
+# (type, unit, 값 생성) - 실제 내보내기에서 많은 순서대로
+SYNTHETIC_TYPES = [
+    ("HKQuantityTypeIdentifierHeartRate", "count/min", lambda r: r.uniform(55, 140)),
+    ("HKQuantityTypeIdentifierActiveEnergyBurned", "kcal", lambda r: r.random() * 5),
+    ("HKQuantityTypeIdentifierBasalEnergyBurned", "kcal", lambda r: r.random() * 3),
+    ("HKQuantityTypeIdentifierStepCount", "count", lambda r: r.randint(1, 200)),
+    (
+        "HKQuantityTypeIdentifierDistanceWalkingRunning",
+        "km",
+        lambda r: r.random() * 0.1,
+    ),
+]
+
+DEVICE = (
+    "&lt;&lt;HKDevice: 0x283b4c0a0&gt;, name:Apple Watch, manufacturer:Apple Inc., "
+    "model:Watch, hardware:Watch6,2, software:10.1&gt;"
+)
+
+
+def write_synthetic_export(path: str, records: int, seed: int = 7):
+    """30초 간격 Record N개짜리 export.xml 생성 (7개 중 1개는 MetadataEntry 포함)"""
+    rnd = random.Random(seed)
+    start = datetime(2022, 1, 1)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<HealthData locale="ko_KR">\n')
+        f.write(' <ExportDate value="2025-01-01 09:00:00 +0900"/>\n')
+        for i in range(records):
+            rtype, unit, make_value = SYNTHETIC_TYPES[i % len(SYNTHETIC_TYPES)]
+            stamp = (start + timedelta(seconds=i * 30)).strftime(
+                "%Y-%m-%d %H:%M:%S +0900"
+            )
+            f.write(
+                f' <Record type="{rtype}" sourceName="Apple Watch" sourceVersion="10.1"'
+                f' device="{DEVICE}" unit="{unit}" creationDate="{stamp}"'
+                f' startDate="{stamp}" endDate="{stamp}" value="{make_value(rnd):.3f}"'
+            )
+            if i % 7 == 0:
+                f.write(
+                    '>\n  <MetadataEntry key="HKMetadataKeyHeartRateMotionContext"'
+                    ' value="0"/>\n </Record>\n'
+                )
+            else:
+                f.write("/>\n")
+        f.write("</HealthData>\n")
+
+
+def run_parser(xml_path: str, mode: str) -> dict:
+    """별도 프로세스에서 실행: 파싱 1회 → 처리량 / 최대 RSS"""
+    import resource
+
+    parse_stream = {
+        "scan": apple_health_parser._scan_stream,
+        "iterparse": apple_health_parser._iterparse_stream,
+    }[mode]
+
+    start = time.perf_counter()
+    acc = apple_health_parser._run_on_source(xml_path, parse_stream)
+    days = len(acc.result())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "records": acc.records,
+        "days": days,
+        "elapsed_sec": round(elapsed, 3),
+        "records_per_sec": round(acc.records / elapsed),
+        # Linux: KB 단위
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apple Health export.xml 파싱 벤치마크")
+    parser.add_argument("--xml", help="실제 export.xml / export.zip 경로 (없으면 합성)")
+    parser.add_argument(
+        "--records", type=int, default=1_000_000, help="합성 Record 수"
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=["scan", "iterparse"], help="파싱 방식"
+    )
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    xml_path = args.xml
+    temp_dir = None
+    if not xml_path:
+        temp_dir = tempfile.mkdtemp(prefix="apple_export_bench_")
+        xml_path = os.path.join(temp_dir, "export.xml")
+        print(f"[INFO] 합성 export.xml 생성 중... ({args.records:,} records)")
+        write_synthetic_export(xml_path, args.records)
+
+    size_mb = os.path.getsize(xml_path) / (1024 * 1024)
+    print(f"📄 {xml_path} ({size_mb:.1f} MB)")
+
+    results = {"xml": xml_path, "size_mb": round(size_mb, 1), "modes": {}}
+    ctx = multiprocessing.get_context("spawn")
+    for mode in args.modes:
+        with ctx.Pool(1) as pool:
+            result = pool.apply(run_parser, (xml_path, mode))
+        results["modes"][mode] = result
+        print(
+            f"  • {mode:<9} {result['records_per_sec']:>10,} records/s "
+            f"({result['elapsed_sec']:.2f}s, {result['days']}일, "
+            f"최대 RSS {result['peak_rss_mb']} MB)"
+        )
+
+    if temp_dir:
+        os.remove(xml_path)
+        os.rmdir(temp_dir)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+임베딩 배치 처리량 벤치마크 (texts/s)
+
+합성 N일치 summary → 임베딩 텍스트(summary_to_natural_text)를 만들고 세 가지 방식으로 측정한다.
+- single     : 전체를 요청 1번으로 (기존 batch_embed_texts)
+- sequential : EMBEDDING_BATCH_SIZE 단위 배치를 순서대로 (동시 1)
+- concurrent : 같은 배치를 --concurrency개 동시에
+
+기본 provider는 네트워크 지연을 흉내 낸 가짜 함수다.
+(요청 1번 = --rtt-ms + 토큰당 --per-token-us, --failure-rate 확률로 일시 오류 → 재시도)
+--openai 를 주면 실제 OpenAI 임베딩 API로 측정한다. (OPENAI_API_KEY 필요, 과금 주의)
+
+사용법:
+  python benchmarks/bench_embedding_batcher.py
+  python benchmarks/bench_embedding_batcher.py --days 1000 --concurrency 8 --failure-rate 0.1
+  python benchmarks/bench_embedding_batcher.py --days 200 --openai --json out.json
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+# .env 파일 로드 (OPENAI_API_KEY 등 app.config 필수값)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+from app.core.embedding_batcher import embed_in_batches, estimate_tokens
+from app.utils.preprocess import preprocess_health_json_batch
+from app.utils.preprocess_for_embedding import summary_to_natural_text
+
+
+def make_texts(days: int, seed: int = 7) -> list[str]:
+    """최근 days일치 합성 summary의 임베딩 텍스트"""
+    rnd = random.Random(seed)
+    first = date.today() - timedelta(days=days)
+
+    raw_by_day = {}
+    for i in range(days):
+        day = first + timedelta(days=i)
+        raw_by_day[int(day.strftime("%Y%m%d"))] = {
+            "steps": rnd.randint(0, 20000),
+            "heart_rate": rnd.uniform(55, 95),
+            "sleep_hr": rnd.choice([0, 5.5, 6.5, 7.5]),
+            "weight": 70,
+            "height": 175,
+            "distance": rnd.random() * 8000,
+        }
+    summaries = preprocess_health_json_batch(raw_by_day, "samsung")
+    return [summary_to_natural_text(summary) for summary in summaries.values()]
+
+
+def simulated_provider(rtt_ms: float, per_token_us: float, failure_rate: float):
+    """네트워크 지연 + 일시 오류를 흉내 내는 embed_fn"""
+    rnd = random.Random(11)
+    lock = threading.Lock()
+
+    def embed(texts):
+        tokens = sum(estimate_tokens(text) for text in texts)
+        time.sleep(rtt_ms / 1000 + tokens * per_token_us / 1e6)
+        with lock:
+            failed = rnd.random() < failure_rate
+        if failed:
+            raise ConnectionError("simulated 503")
+        return [[0.0] * 8 for _ in texts]
+
+    return embed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 배치 처리량 벤치마크")
+    parser.add_argument("--days", type=int, default=1000, help="임베딩할 날짜 수")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-tokens", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rtt-ms", type=float, default=250.0, help="요청 1번 고정 지연")
+    parser.add_argument(
+        "--per-token-us", type=float, default=20.0, help="토큰당 처리 시간 (µs)"
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--openai", action="store_true", help="실제 OpenAI API 사용")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    texts = make_texts(args.days)
+    total_tokens = sum(estimate_tokens(text) for text in texts)
+    print(f"📦 임베딩 텍스트 {len(texts)}개 (추정 {total_tokens:,} 토큰)")
+
+    if args.openai:
+        from app.core.embedding_providers import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider()
+        embed_fn, retryable = provider.embed, provider.retryable
+    else:
+        embed_fn = simulated_provider(
+            args.rtt_ms, args.per_token_us, args.failure_rate
+        )
+        retryable = None
+
+    variants = {
+        "single": {"batch_size": len(texts), "max_tokens": 10**9, "concurrency": 1},
+        "sequential": {
+            "batch_size": args.batch_size,
+            "max_tokens": args.max_tokens,
+            "concurrency": 1,
+        },
+        "concurrent": {
+            "batch_size": args.batch_size,
+            "max_tokens": args.max_tokens,
+            "concurrency": args.concurrency,
+        },
+    }
+
+    results = {"texts": len(texts), "estimated_tokens": total_tokens, "variants": {}}
+    for name, options in variants.items():
+        stats = {}
+        try:
+            embed_in_batches(
+                texts,
+                embed_fn,
+                base_delay=0.1,
+                max_delay=2.0,
+                retryable=retryable,
+                stats=stats,
+                **options,
+            )
+        except Exception as e:
+            stats = {"error": f"{type(e).__name__}: {e}"}
+        results["variants"][name] = stats
+        print(f"  • {name:<11} {stats}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+임베딩 provider별 수집 / 검색 지연 벤치마크
+
+합성 N일치 summary 임베딩 텍스트로 provider마다
+- ingest: 전체 텍스트 임베딩(embed_in_batches, 캐시 없음) + 임시 ChromaDB upsert
+- search: 검색 쿼리 1개 임베딩 + collection.query (search_similar_summaries 경로)
+를 측정한다. (search는 --queries회 평균 / p50 / p95)
+
+provider:
+- hashing : 항상 측정 (로컬 CPU, 네트워크 없음)
+- sentence: sentence-transformers가 설치되어 있으면 측정 (첫 호출 모델 로드 시간은 별도 표시)
+- openai  : --openai 를 주면 측정 (OPENAI_API_KEY 필요, 과금 주의)
+
+사용법:
+  python benchmarks/bench_embedding_providers.py
+  python benchmarks/bench_embedding_providers.py --days 1000 --queries 200 --json out.json
+  python benchmarks/bench_embedding_providers.py --openai --days 200 --queries 30
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import importlib.util
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# .env 파일 로드 (OPENAI_API_KEY 등 app.config 필수값)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+from chromadb import PersistentClient
+
+from bench_embedding_batcher import make_texts
+from app.core.embedding_batcher import embed_in_batches
+from app.core.embedding_providers import create_embedding_provider
+from app.config import EMBEDDING_BATCH_SIZE, EMBEDDING_CONCURRENCY
+
+USER_ID = "bench@example.com"
+
+
+def make_queries(count: int, seed: int = 3) -> list[str]:
+    """search_similar_summaries가 만드는 형태의 쿼리 ("key: value, ...")"""
+    rnd = random.Random(seed)
+    return [
+        f"steps: {rnd.randint(0, 20000)}, heart_rate: {rnd.randint(55, 95)}, "
+        f"sleep_hr: {rnd.choice([5.5, 6.5, 7.5])}"
+        for _ in range(count)
+    ]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def bench_provider(provider, texts: list[str], queries: list[str], work_dir: str):
+    result = {"model": provider.model}
+
+    # 모델 로드 등 첫 호출 비용은 따로 측정
+    start = time.perf_counter()
+    provider.embed(["warm up"])
+    result["first_call_sec"] = round(time.perf_counter() - start, 4)
+
+    # 1) ingest
+    stats = {}
+    embeddings = embed_in_batches(
+        texts,
+        provider.embed,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        concurrency=EMBEDDING_CONCURRENCY if provider.concurrent else 1,
+        retryable=provider.retryable,
+        stats=stats,
+    )
+
+    client = PersistentClient(path=os.path.join(work_dir, provider.name))
+    collection = client.get_or_create_collection(
+        name="bench", metadata={"hnsw:space": "cosine"}
+    )
+    start = time.perf_counter()
+    collection.upsert(
+        ids=[f"{USER_ID}_{i}" for i in range(len(texts))],
+        embeddings=embeddings,
+        documents=texts,
+        metadatas=[{"user_id": USER_ID, "day": i} for i in range(len(texts))],
+    )
+    upsert_sec = time.perf_counter() - start
+
+    result["ingest"] = {
+        "dim": len(embeddings[0]),
+        "embed_sec": stats["elapsed_sec"],
+        "embed_texts_per_sec": stats["texts_per_sec"],
+        "upsert_sec": round(upsert_sec, 4),
+        "total_sec": round(stats["elapsed_sec"] + upsert_sec, 4),
+    }
+
+    # 2) search (쿼리 임베딩 + 벡터 검색)
+    embed_ms, total_ms = [], []
+    for query in queries:
+        start = time.perf_counter()
+        (query_embedding,) = provider.embed([query])
+        embedded = time.perf_counter()
+        collection.query(
+            query_embeddings=[query_embedding],
+            n_results=10,
+            where={"user_id": USER_ID},
+        )
+        done = time.perf_counter()
+        embed_ms.append((embedded - start) * 1000)
+        total_ms.append((done - start) * 1000)
+
+    result["search_ms"] = {
+        "embed_mean": round(sum(embed_ms) / len(embed_ms), 3),
+        "total_mean": round(sum(total_ms) / len(total_ms), 3),
+        "total_p50": round(_percentile(total_ms, 0.5), 3),
+        "total_p95": round(_percentile(total_ms, 0.95), 3),
+    }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 provider별 수집 / 검색 지연")
+    parser.add_argument("--days", type=int, default=365, help="수집할 날짜 수")
+    parser.add_argument("--queries", type=int, default=100, help="검색 쿼리 수")
+    parser.add_argument("--openai", action="store_true", help="OpenAI provider 포함")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    names = ["hashing"]
+    if importlib.util.find_spec("sentence_transformers") is not None:
+        names.append("sentence")
+    else:
+        print("[INFO] sentence-transformers 미설치 → sentence provider 생략")
+    if args.openai:
+        names.append("openai")
+
+    texts = make_texts(args.days)
+    queries = make_queries(args.queries)
+    print(f"📦 텍스트 {len(texts)}개, 검색 쿼리 {len(queries)}개")
+
+    results = {"days": args.days, "queries": args.queries, "providers": {}}
+    with tempfile.TemporaryDirectory(prefix="embedding_provider_bench_") as work_dir:
+        for name in names:
+            provider = create_embedding_provider(name)
+            result = bench_provider(provider, texts, queries, work_dir)
+            results["providers"][name] = result
+
+            ingest, search = result["ingest"], result["search_ms"]
+            print(
+                f"  • {name:<8} dim {ingest['dim']:>4} | "
+                f"ingest {ingest['total_sec']:.2f}s "
+                f"(embed {ingest['embed_texts_per_sec']:.0f} texts/s, "
+                f"upsert {ingest['upsert_sec']:.2f}s) | "
+                f"search mean {search['total_mean']:.2f}ms "
+                f"p95 {search['total_p95']:.2f}ms "
+                f"(embed {search['embed_mean']:.2f}ms)"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+심박수 series 날짜 버킷팅 벤치마크 (행 단위 기준 구현 vs NumPy 벡터화)
+
+heart_rate_record_series_table 형태의 샘플 N개(기본 5백만, 1분 간격)를 만들어
+두 구간을 따로 측정한다.
+
+- arrays: 메모리의 (epoch_millis, bpm) → 날짜별 통계
+    row   : _epoch_millis_to_local_date + dict 누적 (기존 파서 루프)
+    numpy : heart_rate_stats_from_arrays
+- db: SQLite 파일 → 날짜별 통계 (SQLite 읽기 포함, 실제 업로드 경로)
+    row   : iter_table_rows + _epoch_millis_to_local_date (기존 stream 파서 루프)
+    numpy : heart_rate_by_day (group_concat 구간 읽기 + 벡터화)
+
+사용법:
+  python benchmarks/bench_heart_rate_series.py
+  python benchmarks/bench_heart_rate_series.py --samples 1000000 --json hr.json
+  python benchmarks/bench_heart_rate_series.py --db ./health_connect_export.db
+"""
+
+import sys
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+
+import numpy as np
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.core.db_parser import _epoch_millis_to_local_date
+from app.core.db_stream_parser import iter_table_rows
+from app.core.heart_rate_series import (
+    SERIES_TABLE,
+    heart_rate_by_day,
+    heart_rate_stats_from_arrays,
+)
+
+START_MILLIS = 1_609_459_200_000  # 2021-01-01 00:00 UTC
+
+
+def make_samples(n: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """1분 간격 샘플 N개 (bpm 45~180)"""
+    rng = np.random.default_rng(seed)
+    millis = START_MILLIS + np.arange(n, dtype=np.int64) * 60_000
+    bpm = rng.integers(45, 181, n)
+    return millis, bpm
+
+
+def write_series_db(path: str, millis: np.ndarray, bpm: np.ndarray):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        f"CREATE TABLE {SERIES_TABLE}(row_id INTEGER PRIMARY KEY, "
+        "parent_key INTEGER, beats_per_minute INTEGER, epoch_millis INTEGER)"
+    )
+    conn.executemany(
+        f"INSERT INTO {SERIES_TABLE}(parent_key, beats_per_minute, epoch_millis) "
+        "VALUES (?, ?, ?)",
+        zip((millis // 3_600_000).tolist(), bpm.tolist(), millis.tolist()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def row_stats(pairs) -> dict:
+    """기존 파서의 행 단위 루프 (날짜별 [합계, 개수])"""
+    grouped = {}
+    for epoch_millis, bpm in pairs:
+        if not epoch_millis or not bpm:
+            continue
+        date = _epoch_millis_to_local_date(epoch_millis)
+        if date is None:
+            continue
+        acc = grouped.setdefault(date, [0, 0])
+        acc[0] += bpm
+        acc[1] += 1
+    return grouped
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _check_same(row: dict, vectorized: dict):
+    assert row.keys() == vectorized.keys(), "날짜 집합 불일치"
+    for day, (total, count) in row.items():
+        assert vectorized[day]["count"] == count, day
+        assert abs(vectorized[day]["sum"] - total) < 1e-6 * max(1, total), day
+
+
+def main():
+    parser = argparse.ArgumentParser(description="심박수 series 날짜 버킷팅 벤치마크")
+    parser.add_argument("--samples", type=int, default=5_000_000, help="샘플 수")
+    parser.add_argument("--db", help="기존 Health Connect DB (없으면 합성 DB 생성)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = {}
+    temp_dir = None
+
+    if args.db:
+        db_path = args.db
+    else:
+        millis, bpm = make_samples(args.samples)
+        n = len(millis)
+
+        # 1) 배열 → 통계
+        row, row_sec = _timed(lambda: row_stats(zip(millis.tolist(), bpm.tolist())))
+        vec, vec_sec = _timed(lambda: heart_rate_stats_from_arrays(millis, bpm))
+        _check_same(row, vec)
+        results["arrays"] = {
+            "samples": n,
+            "days": len(vec),
+            "row_sec": round(row_sec, 3),
+            "numpy_sec": round(vec_sec, 3),
+            "speedup": round(row_sec / vec_sec, 1),
+        }
+
+        temp_dir = tempfile.mkdtemp(prefix="hr_series_bench_")
+        db_path = os.path.join(temp_dir, "series.db")
+        print(f"[INFO] 합성 series DB 생성 중... ({n:,} samples)")
+        write_series_db(db_path, millis, bpm)
+
+    # 2) SQLite 파일 → 통계
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        n = conn.execute(f"SELECT COUNT(*) FROM {SERIES_TABLE};").fetchone()[0]
+        row, row_sec = _timed(
+            lambda: row_stats(
+                iter_table_rows(
+                    conn, SERIES_TABLE, ["epoch_millis", "beats_per_minute"], 5000
+                )
+            )
+        )
+        vec, vec_sec = _timed(lambda: heart_rate_by_day(conn))
+        _check_same(row, vec)
+    finally:
+        conn.close()
+
+    results["db"] = {
+        "samples": n,
+        "days": len(vec),
+        "row_sec": round(row_sec, 3),
+        "numpy_sec": round(vec_sec, 3),
+        "speedup": round(row_sec / vec_sec, 1),
+    }
+
+    if temp_dir:
+        os.remove(db_path)
+        os.rmdir(temp_dir)
+
+    for name, r in results.items():
+        print(
+            f"  • {name:<6} {r['samples']:>10,} samples  row {r['row_sec']:.2f}s → "
+            f"numpy {r['numpy_sec']:.3f}s  (x{r['speedup']}, {r['days']}일)"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
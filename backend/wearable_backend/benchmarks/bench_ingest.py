@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+ZIP 업로드 수집(ingest) 단계별 벤치마크
+
+합성 Health Connect DB(make_health_connect_db.py)를 ZIP으로 묶어
+업로드 파이프라인의 CPU/IO 단계를 그대로 실행하고 단계별로 측정한다.
+
+  unzip → [db_to_json] → parse → preprocess → vector_store
+
+- 파서 방식별(legacy / sql / stream)로 새 프로세스에서 실행 (최대 RSS 분리)
+  legacy: db_to_json → parse_db_json_to_raw_data_by_day (기준 구현)
+  sql / stream: DB_PARSE_MODE와 같은 파서 (db_to_json 없음)
+- 단계별: 소요 시간, 처리 행 수 / 초, 단계 종료 시점 최대 RSS
+  (unzip~parse는 DB 행 수, preprocess / vector_store는 날짜 수 기준)
+- vector_store는 임시 디렉토리의 ChromaDB에 저장하며 임베딩은 로컬 stub
+  (텍스트 hash 기반 고정 벡터, OpenAI 호출 없음)
+- 결과 JSON에 git commit / 생성 인자를 함께 기록 → CI에서 커밋 간 비교
+
+사용법:
+  python benchmarks/bench_ingest.py
+  python benchmarks/bench_ingest.py --years 3 --hr-per-day 1440 --json ingest.json
+  python benchmarks/bench_ingest.py --db ./health_connect_export.db --parsers sql
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+
+# 백엔드 경로 추가 (작업 프로세스는 임시 디렉토리로 cwd를 옮기므로 절대 경로)
+BACKEND_DIR = os.path.abspath(".")
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from make_health_connect_db import write_health_connect_db, zip_db, TABLES
+
+PARSERS = ["legacy", "sql", "stream"]
+USER_ID = "bench@example.com"
+
+
+# ------------------------------------------------
+# 1) 측정 유틸
+# ------------------------------------------------
+def _peak_rss_mb() -> float:
+    import resource
+
+    # Linux: KB 단위
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _count_db_rows(db_path: str) -> int:
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = {
+            name
+            for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table';"
+            )
+        }
+        return sum(
+            conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+            for table in TABLES
+            if table in tables
+        )
+    finally:
+        conn.close()
+
+
+def _stub_embeddings(dim: int):
+    """텍스트 → 고정 단위 벡터 (같은 텍스트는 항상 같은 벡터)"""
+    import numpy as np
+
+    def embed(text: str) -> list:
+        seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    return embed
+
+
+# ------------------------------------------------
+# 2) 작업 프로세스: 파서 방식 1개 파이프라인
+# ------------------------------------------------
+def run_pipeline(zip_path: str, parser: str, embed_dim: int) -> dict:
+    work_dir = tempfile.mkdtemp(prefix="ingest_bench_")
+
+    # vector_store / 시계열 저장소가 import 시점 cwd / 설정을 사용 → 임시 디렉토리로
+    os.chdir(work_dir)
+    os.environ["LOCAL_DATA_DIR"] = os.path.join(work_dir, "local_data")
+    os.environ.setdefault("OPENAI_API_KEY", "bench-stub")
+
+    from app.core.unzipper import extract_zip_to_temp
+    from app.core.db_to_json import db_to_json
+    from app.core.db_parser import parse_db_json_to_raw_data_by_day
+    from app.service.cpu_tasks import DB_PARSERS
+    from app.utils.preprocess import preprocess_health_json_batch
+    from app.core import vector_store
+
+    embed = _stub_embeddings(embed_dim)
+    vector_store.batch_embed_texts = lambda texts: [embed(t) for t in texts]
+    vector_store.get_cached_embedding = embed
+
+    # import(chromadb 등)까지의 RSS → 단계별 RSS와 비교 기준
+    baseline_rss_mb = _peak_rss_mb()
+    stages = {}
+    state = {}
+
+    def stage(name: str, rows: int, func):
+        # 각 단계 로그(print)는 측정에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+
+        stages[name] = {
+            "sec": round(elapsed, 4),
+            "rows": rows,
+            "rows_per_sec": round(rows / elapsed) if elapsed > 0 else None,
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        return result
+
+    try:
+        db_path = stage(
+            "unzip",
+            0,
+            lambda: extract_zip_to_temp(zip_path, os.path.join(work_dir, "extract")),
+        )
+        db_rows = _count_db_rows(db_path)
+        stages["unzip"]["rows"] = db_rows
+        stages["unzip"]["rows_per_sec"] = round(db_rows / stages["unzip"]["sec"])
+
+        if parser == "legacy":
+            db_json = stage("db_to_json", db_rows, lambda: db_to_json(db_path))
+            raw_by_day = stage(
+                "parse", db_rows, lambda: parse_db_json_to_raw_data_by_day(db_json)
+            )
+            del db_json
+        else:
+            raw_by_day = stage("parse", db_rows, lambda: DB_PARSERS[parser](db_path))
+
+        days = len(raw_by_day)
+        summaries = stage(
+            "preprocess",
+            days,
+            lambda: preprocess_health_json_batch(raw_by_day, "samsung"),
+        )
+        state["saved"] = stage(
+            "vector_store",
+            days,
+            lambda: vector_store.save_daily_summaries_batch(
+                list(summaries.values()), USER_ID, "zip_samsung"
+            ),
+        )
+    finally:
+        os.chdir(BACKEND_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    total = sum(s["sec"] for s in stages.values())
+    return {
+        "days": days,
+        "db_rows": db_rows,
+        "saved": state["saved"].get("count"),
+        "total_sec": round(total, 4),
+        "baseline_rss_mb": baseline_rss_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+# ------------------------------------------------
+# 3) 메인
+# ------------------------------------------------
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZIP 업로드 수집 단계별 벤치마크")
+    parser.add_argument("--db", help="기존 Health Connect DB (없으면 합성 DB 생성)")
+    parser.add_argument("--years", type=float, default=1.0, help="합성 DB 기간 (년)")
+    parser.add_argument(
+        "--hr-per-day", type=int, default=1440, help="합성 DB 하루 심박수 샘플 수"
+    )
+    parser.add_argument("--seed", type=int, default=7, help="합성 DB seed")
+    parser.add_argument(
+        "--parsers", nargs="+", default=PARSERS, choices=PARSERS, help="파서 방식"
+    )
+    parser.add_argument("--embed-dim", type=int, default=1536, help="stub 임베딩 차원")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp(prefix="ingest_fixture_")
+    try:
+        if args.db:
+            db_path = args.db
+            fixture = {"db": os.path.abspath(args.db)}
+        else:
+            db_path = os.path.join(temp_dir, "health_connect_export.db")
+            print(
+                f"[INFO] 합성 DB 생성 중... ({args.years}년, "
+                f"심박 {args.hr_per_day}회/일)"
+            )
+            fixture = write_health_connect_db(
+                db_path, args.years, args.hr_per_day, args.seed
+            )
+
+        zip_path = zip_db(db_path, os.path.join(temp_dir, "upload.zip"))
+        fixture["db_mb"] = round(os.path.getsize(db_path) / (1024 * 1024), 2)
+        fixture["zip_mb"] = round(os.path.getsize(zip_path) / (1024 * 1024), 2)
+
+        results = {
+            "meta": {
+                "git_commit": _git_commit(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "embed_dim": args.embed_dim,
+            },
+            "fixture": fixture,
+            "pipelines": {},
+        }
+
+        print(f"📦 DB {fixture['db_mb']} MB / ZIP {fixture['zip_mb']} MB")
+        ctx = multiprocessing.get_context("spawn")
+        for name in args.parsers:
+            with ctx.Pool(1) as pool:
+                result = pool.apply(run_pipeline, (zip_path, name, args.embed_dim))
+            results["pipelines"][name] = result
+
+            print(
+                f"\n▶ {name}: 총 {result['total_sec']:.2f}s, {result['days']}일, "
+                f"{result['db_rows']:,}행, 최대 RSS {result['peak_rss_mb']} MB "
+                f"(import 후 {result['baseline_rss_mb']} MB)"
+            )
+            for stage, s in result["stages"].items():
+                print(
+                    f"  • {stage:<12} {s['sec']:>8.3f}s  "
+                    f"{s['rows_per_sec'] or 0:>12,} rows/s  RSS {s['peak_rss_mb']} MB"
+                )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
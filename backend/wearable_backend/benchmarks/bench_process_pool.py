@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+업로드 CPU 단계 처리량 벤치마크 (스레드 풀 vs 프로세스 풀)
+
+동시 업로드 N개를 흉내 내어 DB 파싱 + 전체 날짜 전처리를 실행하고
+워커 수(코어 수)별 처리량(uploads/s)을 비교한다.
+
+- thread: 기존 방식 (ThreadPoolExecutor, GIL 공유)
+- process: CPU_POOL_WORKERS 모드 (ProcessPoolExecutor, spawn)
+
+사용법:
+  python benchmarks/bench_process_pool.py --db ./health_connect_export.db
+  python benchmarks/bench_process_pool.py --db ./a.db --uploads 8 --workers 1 2 4 --json out.json
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+from app.service.cpu_tasks import parse_db_file_packed, unpack_raw_by_day
+from app.utils.preprocess import preprocess_health_json_batch
+
+
+def run_upload(db_path: str, mode: str) -> int:
+    """업로드 1건의 CPU 단계 (파싱 → 전체 날짜 전처리), 처리한 날짜 수 반환"""
+    raw_by_day = unpack_raw_by_day(parse_db_file_packed(db_path, mode))
+    summaries = preprocess_health_json_batch(raw_by_day, "android")
+    return len(summaries)
+
+
+def bench(executor, db_path: str, uploads: int, mode: str) -> dict:
+    # 워커 기동 비용 제외 (프로세스 spawn + import)
+    warmup = executor._max_workers
+    list(executor.map(run_upload, [db_path] * warmup, [mode] * warmup))
+
+    start = time.perf_counter()
+    days = sum(executor.map(run_upload, [db_path] * uploads, [mode] * uploads))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "uploads": uploads,
+        "days": days,
+        "elapsed_sec": round(elapsed, 3),
+        "uploads_per_sec": round(uploads / elapsed, 3),
+    }
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="업로드 CPU 단계 처리량 벤치마크")
+    parser.add_argument("--db", required=True, help="Health Connect DB 파일 경로")
+    parser.add_argument("--uploads", type=int, default=8, help="동시 업로드 수")
+    parser.add_argument("--mode", default="sql", choices=["sql", "stream"])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, cpu_count}),
+        help="프로세스 풀 워커 수 목록",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=4, help="스레드 풀 기준 워커 수"
+    )
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    print(
+        f"📊 DB: {args.db} / 업로드 {args.uploads}건 / "
+        f"mode: {args.mode} / CPU {cpu_count}개"
+    )
+
+    results = {"db": args.db, "mode": args.mode, "cpu_count": cpu_count, "runs": []}
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        run = bench(executor, args.db, args.uploads, args.mode)
+    run.update({"executor": "thread", "workers": args.threads})
+    results["runs"].append(run)
+    print(
+        f"  thread  x{args.threads}: {run['elapsed_sec']:.3f}s "
+        f"({run['uploads_per_sec']:.2f} uploads/s)"
+    )
+
+    ctx = multiprocessing.get_context("spawn")
+    for workers in args.workers:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+            run = bench(executor, args.db, args.uploads, args.mode)
+        run.update({"executor": "process", "workers": workers})
+        results["runs"].append(run)
+        print(
+            f"  process x{workers}: {run['elapsed_sec']:.3f}s "
+            f"({run['uploads_per_sec']:.2f} uploads/s)"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
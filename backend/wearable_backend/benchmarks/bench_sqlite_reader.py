@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+업로드 SQLite 읽기 벤치마크 (기존 순차 reader vs 읽기 전용 immutable 병렬 reader)
+
+합성 Health Connect DB(make_health_connect_db.py) 또는 --db로 지정한 실제 내보내기로
+세 가지 읽기 경로를 측정한다. (각 경로 --repeat회 중 최솟값, OS 페이지 캐시는 warm)
+
+- read_all : 전체 테이블 SELECT * (db_to_json 읽기 단계)
+    legacy      기존 db_to_json과 같은 기본 연결 1개 + 테이블 순차 fetchall
+    sequential  sqlite_reader.read_tables(workers=1) (immutable + mmap, 순차)
+    parallel    sqlite_reader.read_tables(workers=N)
+- sql      : parse_db_file_to_raw_data_by_day_sql (scan_workers=1 vs N)
+- stream   : parse_db_file_to_raw_data_by_day     (scan_workers=1 vs N)
+
+GROUP BY / group_concat처럼 결과 행이 적은 쿼리는 sqlite3가 GIL을 놓고 실행하므로
+코어 수만큼 빨라지고, 행을 Python 객체로 만드는 read_all은 이득이 작다.
+(코어가 1개인 환경에서는 병렬 결과가 순차와 비슷하게 나온다)
+
+사용법:
+  python benchmarks/bench_sqlite_reader.py
+  python benchmarks/bench_sqlite_reader.py --years 3 --hr-per-day 1440 --workers 4
+  python benchmarks/bench_sqlite_reader.py --db ./health_connect_export.db --json r.json
+"""
+
+import sys
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from make_health_connect_db import write_health_connect_db
+from app.core.sqlite_reader import read_tables
+from app.core.db_sql_parser import parse_db_file_to_raw_data_by_day_sql
+from app.core.db_stream_parser import parse_db_file_to_raw_data_by_day
+
+
+def legacy_read_all(db_path: str) -> dict:
+    """기존 db_to_json 읽기 방식 (기본 연결 1개, 테이블 순차)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        result = {}
+        for (table,) in cursor.fetchall():
+            cursor.execute(f"SELECT * FROM {table};")
+            rows = cursor.fetchall()
+            result[table] = ([col[0] for col in cursor.description], rows)
+        return result
+    finally:
+        conn.close()
+
+
+def _best_of(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 SQLite 읽기 벤치마크")
+    parser.add_argument("--db", help="기존 Health Connect DB (없으면 합성 DB 생성)")
+    parser.add_argument("--years", type=float, default=2.0, help="합성 DB 기간 (년)")
+    parser.add_argument(
+        "--hr-per-day", type=int, default=1440, help="합성 DB 하루 심박수 샘플 수"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="병렬 스레드 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.db:
+        db_path = args.db
+    else:
+        temp_dir = tempfile.mkdtemp(prefix="sqlite_reader_bench_")
+        db_path = os.path.join(temp_dir, "health_connect_export.db")
+        print(
+            f"[INFO] 합성 DB 생성 중... ({args.years}년, 심박 {args.hr_per_day}회/일)"
+        )
+        write_health_connect_db(db_path, args.years, args.hr_per_day)
+
+    size_mb = os.path.getsize(db_path) / (1024 * 1024)
+    print(f"📦 {db_path} ({size_mb:.1f} MB, CPU {os.cpu_count()}개)")
+
+    n = args.workers
+    cases = {
+        "read_all": {
+            "legacy": lambda: legacy_read_all(db_path),
+            "sequential": lambda: read_tables(db_path, workers=1),
+            "parallel": lambda: read_tables(db_path, workers=n),
+        },
+        "sql": {
+            "sequential": lambda: parse_db_file_to_raw_data_by_day_sql(
+                db_path, scan_workers=1
+            ),
+            "parallel": lambda: parse_db_file_to_raw_data_by_day_sql(
+                db_path, scan_workers=n
+            ),
+        },
+        "stream": {
+            "sequential": lambda: parse_db_file_to_raw_data_by_day(
+                db_path, scan_workers=1
+            ),
+            "parallel": lambda: parse_db_file_to_raw_data_by_day(
+                db_path, scan_workers=n
+            ),
+        },
+    }
+
+    results = {
+        "db_mb": round(size_mb, 1),
+        "cpu_count": os.cpu_count(),
+        "workers": n,
+        "cases": {},
+    }
+    try:
+        for case, variants in cases.items():
+            timings = {
+                name: round(_best_of(func, args.repeat), 4)
+                for name, func in variants.items()
+            }
+            baseline = timings.get("legacy", timings["sequential"])
+            results["cases"][case] = timings
+            line = "  ".join(
+                f"{name} {sec:.3f}s (x{baseline / sec:.2f})"
+                for name, sec in timings.items()
+            )
+            print(f"  • {case:<8} {line}")
+    finally:
+        if temp_dir:
+            os.remove(db_path)
+            os.rmdir(temp_dir)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+시계열 저장소 조회 지연 벤치마크
+
+임시 디렉토리에 N일치 합성 데이터를 저장한 뒤
+- 30일 범위 조회 (get_summaries_by_date_range 경로, 목표 < 5ms)
+- 전체 히스토리 조회 (raw-history / app history 경로, 3년 목표 < 50ms)
+의 평균/최대 지연을 측정한다.
+
+사용법:
+  python benchmarks/bench_timeseries_store.py
+  python benchmarks/bench_timeseries_store.py --days 1095 --repeat 50 --json out.json
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+# .env 파일 로드 (OPENAI_API_KEY 등 app.config 필수값)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+from app.core import timeseries_store
+from app.utils.preprocess import preprocess_health_json_batch
+
+USER_ID = "bench@example.com"
+
+
+def make_items(days: int, seed: int = 7) -> list[dict]:
+    """최근 days일치 합성 데이터 (vector_store 조회 결과 형식)"""
+    rnd = random.Random(seed)
+    first = date.today() - timedelta(days=days)
+
+    raw_by_day = {}
+    for i in range(days):
+        day = first + timedelta(days=i)
+        raw_by_day[int(day.strftime("%Y%m%d"))] = {
+            "steps": rnd.randint(0, 20000),
+            "heart_rate": rnd.uniform(55, 95),
+            "sleep_hr": rnd.choice([0, 5.5, 6.5, 7.5]),
+            "weight": 70,
+            "height": 175,
+            "distance": rnd.random() * 8000,
+        }
+    summaries = preprocess_health_json_batch(raw_by_day, "samsung")
+
+    items = []
+    for timestamp, summary in summaries.items():
+        day = date(timestamp // 10000, timestamp // 100 % 100, timestamp % 100)
+        items.append(
+            {
+                "user_id": USER_ID,
+                "date": day.isoformat(),
+                "timestamp": timestamp,
+                "health_score": rnd.randint(40, 95),
+                "recommended_intensity": rnd.choice(["하", "중", "상"]),
+                "source": "zip_samsung",
+                "platform": "samsung",
+                "updated_at": "20250101120000",
+                "raw": summary["raw"],
+            }
+        )
+
+    return items
+
+
+def measure(func, repeat: int) -> dict:
+    func()  # 첫 호출 (memmap 열기) 제외
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시계열 저장소 조회 지연 벤치마크")
+    parser.add_argument("--days", type=int, default=3 * 365, help="저장할 일수")
+    parser.add_argument("--repeat", type=int, default=30, help="반복 횟수")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    timeseries_store.TIMESERIES_DIR = tempfile.mkdtemp(prefix="timeseries_bench_")
+
+    items = make_items(args.days)
+    start = time.perf_counter()
+    timeseries_store.upsert_timeseries(USER_ID, items, replace=True)
+    write_ms = (time.perf_counter() - start) * 1000
+
+    last = date.today() - timedelta(days=1)
+    range_start = int((last - timedelta(days=29)).strftime("%Y%m%d"))
+    range_end = int(last.strftime("%Y%m%d"))
+
+    results = {
+        "days": args.days,
+        "write_ms": round(write_ms, 3),
+        "range_30d": measure(
+            lambda: timeseries_store.query_timeseries(USER_ID, range_start, range_end),
+            args.repeat,
+        ),
+        "full_history": measure(
+            lambda: timeseries_store.query_timeseries(USER_ID, latest_per_date=False),
+            args.repeat,
+        ),
+    }
+
+    print(f"📊 시계열 저장소 ({args.days}일)")
+    print(f"  • 전체 저장: {results['write_ms']:.1f} ms")
+    print(
+        f"  • 30일 범위 조회: 평균 {results['range_30d']['mean_ms']:.2f} ms "
+        f"(최대 {results['range_30d']['max_ms']:.2f} ms)"
+    )
+    print(
+        f"  • 전체 히스토리 조회: 평균 {results['full_history']['mean_ms']:.2f} ms "
+        f"(최대 {results['full_history']['max_ms']:.2f} ms)"
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
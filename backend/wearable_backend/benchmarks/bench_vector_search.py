@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+사용자별 정확 벡터 검색 (vector_index) vs ChromaDB HNSW + user_id 필터 벤치마크
+
+여러 사용자의 summary 임베딩을 한 컬렉션에 넣고 (운영과 같은 구조) 사용자마다
+- chroma: collection.query(where={"user_id": ...}, n_results=k)
+- exact : UserVectorIndex.search (float32 memmap 행렬 × 쿼리)
+의 검색 지연 (mean / p50 / p95)과 recall@k를 측정한다.
+(정답 = 사용자 벡터 전체와 float64 코사인 유사도 정렬 top_k, 동점 행 포함)
+
+임베딩:
+- hashing: 합성 summary 텍스트 → HashingEmbeddingProvider (--dim, 실제 텍스트 분포)
+- random : 군집된 난수 벡터 (--dim 1536이면 OpenAI text-embedding-3-small과 같은 크기)
+
+사용법:
+  python benchmarks/bench_vector_search.py
+  python benchmarks/bench_vector_search.py --embeddings random --dim 1536 --users 20
+  python benchmarks/bench_vector_search.py --days 3000 --top-k 10 --json out.json
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# .env 파일 로드 (OPENAI_API_KEY 등 app.config 필수값)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+import numpy as np
+from chromadb import PersistentClient
+
+from bench_embedding_batcher import make_texts
+from bench_embedding_providers import make_queries
+from app.core.embedding_providers import HashingEmbeddingProvider
+from app.core.vector_index import UserVectorIndex
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _latency(values: list[float]) -> dict:
+    return {
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(_percentile(values, 0.5), 3),
+        "p95": round(_percentile(values, 0.95), 3),
+    }
+
+
+def make_embeddings(kind: str, users: int, days: int, queries: int, dim: int):
+    """사용자별 (days, dim) 벡터 목록 + 쿼리 (queries, dim)"""
+    if kind == "hashing":
+        provider = HashingEmbeddingProvider(dim=dim)
+        per_user = [
+            np.asarray(provider.embed(make_texts(days, seed=seed)))
+            for seed in range(users)
+        ]
+        query_vectors = np.asarray(provider.embed(make_queries(queries)))
+        return per_user, query_vectors
+
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(32, dim))
+    per_user = [
+        centers[rng.integers(0, 32, days)] + 0.5 * rng.normal(size=(days, dim))
+        for _ in range(users)
+    ]
+    query_vectors = centers[rng.integers(0, 32, queries)] + 0.5 * rng.normal(
+        size=(queries, dim)
+    )
+    return per_user, query_vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정확 벡터 검색 vs ChromaDB 검색")
+    parser.add_argument("--users", type=int, default=10, help="사용자 수")
+    parser.add_argument("--days", type=int, default=365, help="사용자당 날짜 수")
+    parser.add_argument("--queries", type=int, default=100, help="사용자당 검색 수")
+    parser.add_argument("--top-k", type=int, default=10, help="검색 개수")
+    parser.add_argument(
+        "--embeddings", choices=["hashing", "random"], default="hashing"
+    )
+    parser.add_argument("--dim", type=int, default=384, help="임베딩 차원")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    per_user, query_vectors = make_embeddings(
+        args.embeddings, args.users, args.days, args.queries, args.dim
+    )
+    user_ids = [f"bench_{i}@example.com" for i in range(args.users)]
+    print(
+        f"📦 사용자 {args.users}명 × {args.days}일, {args.dim}차원 ({args.embeddings}), "
+        f"사용자당 검색 {args.queries}회, top_k {args.top_k}"
+    )
+
+    with tempfile.TemporaryDirectory(prefix="vector_search_bench_") as work_dir:
+        collection = PersistentClient(
+            path=os.path.join(work_dir, "chroma")
+        ).get_or_create_collection(name="bench", metadata={"hnsw:space": "cosine"})
+        index = UserVectorIndex(os.path.join(work_dir, "vector_index"))
+
+        chroma_build = exact_build = 0.0
+        for user_id, vectors in zip(user_ids, per_user):
+            ids = [f"{user_id}_{day}" for day in range(args.days)]
+            docs = [
+                {"document_id": doc_id, "user_id": user_id, "date": str(day)}
+                for day, doc_id in enumerate(ids)
+            ]
+
+            start = time.perf_counter()
+            for s in range(0, len(ids), 1000):
+                collection.upsert(
+                    ids=ids[s : s + 1000],
+                    embeddings=vectors[s : s + 1000].tolist(),
+                    metadatas=[{"user_id": user_id} for _ in ids[s : s + 1000]],
+                )
+            chroma_build += time.perf_counter() - start
+
+            start = time.perf_counter()
+            index.upsert(user_id, docs, vectors, replace=True)
+            exact_build += time.perf_counter() - start
+
+        chroma_ms, exact_ms = [], []
+        chroma_hits = exact_hits = 0
+        for user_id, vectors in zip(user_ids, per_user):
+            unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            index.search(user_id, query_vectors[0], args.top_k)  # memmap 열기 제외
+
+            for query in query_vectors:
+                # 정답 top_k와 점수가 같은(동점) 행도 정답으로 인정
+                truth_scores = unit @ (query / np.linalg.norm(query))
+                kth = np.sort(truth_scores)[::-1][min(args.top_k, args.days) - 1]
+                truth = {
+                    f"{user_id}_{day}"
+                    for day in np.flatnonzero(truth_scores >= kth - 1e-6)
+                }
+
+                start = time.perf_counter()
+                results = collection.query(
+                    query_embeddings=[query.tolist()],
+                    n_results=args.top_k,
+                    where={"user_id": user_id},
+                    include=["distances"],
+                )
+                chroma_ms.append((time.perf_counter() - start) * 1000)
+                chroma_hits += len(truth & set(results["ids"][0]))
+
+                start = time.perf_counter()
+                hits = index.search(user_id, query, args.top_k)
+                exact_ms.append((time.perf_counter() - start) * 1000)
+                exact_hits += len(truth & {doc["document_id"] for doc, _ in hits})
+
+    total = args.users * len(query_vectors) * min(args.top_k, args.days)
+    results = {
+        "users": args.users,
+        "days": args.days,
+        "dim": args.dim,
+        "embeddings": args.embeddings,
+        "top_k": args.top_k,
+        "chroma": {
+            "build_sec": round(chroma_build, 3),
+            "recall": round(chroma_hits / total, 4),
+            "search_ms": _latency(chroma_ms),
+        },
+        "exact": {
+            "build_sec": round(exact_build, 3),
+            "recall": round(exact_hits / total, 4),
+            "search_ms": _latency(exact_ms),
+        },
+    }
+
+    for name in ("chroma", "exact"):
+        r = results[name]
+        print(
+            f"  • {name:<6} recall@{args.top_k} {r['recall']:.4f} | "
+            f"search mean {r['search_ms']['mean']:.3f}ms "
+            f"p50 {r['search_ms']['p50']:.3f}ms p95 {r['search_ms']['p95']:.3f}ms | "
+            f"build {r['build_sec']:.2f}s"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
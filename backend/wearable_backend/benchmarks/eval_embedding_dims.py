@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+임베딩 차원 축소 / int8 저장 오프라인 평가 (저장된 데이터 기준)
+
+ChromaDB에 저장된 원본 차원 임베딩을 사용자별로 읽어서
+- 원본 차원 코사인 top_k (정답)
+- 앞 dim개 차원 + 재정규화 (EMBEDDING_DIM) top_k
+- 위 벡터를 int8로 저장 (VECTOR_INDEX_QUANTIZATION=int8) 했을 때 top_k
+의 겹치는 비율(overlap@k)을 측정한다. API 호출 없음.
+
+쿼리는 사용자의 저장된 summary 벡터 중 --queries개 (자기 자신은 제외) 이고,
+검색 범위는 같은 사용자 벡터 전체 (search_similar_summaries와 같음).
+--target 이상을 유지하는 가장 작은 차원 / 형식을 추천한다.
+
+사용법:
+  python benchmarks/eval_embedding_dims.py
+  python benchmarks/eval_embedding_dims.py --collection summaries --dims 128,256,512
+  python benchmarks/eval_embedding_dims.py --top-k 3 --target 0.9 --json out.json
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# 백엔드 경로 추가
+sys.path.insert(0, os.path.abspath("."))
+
+# .env 파일 로드 (OPENAI_API_KEY 등 app.config 필수값)
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except ImportError:
+    pass
+
+import numpy as np
+from chromadb import PersistentClient
+
+from app.core.embedding_providers import truncate_embeddings
+from app.core.vector_index import quantize_int8
+
+DEFAULT_DIMS = "64,128,256,384,512,768,1024"
+
+
+def load_user_embeddings(
+    chroma_dir: str, collection_name: str, page_size: int = 1000
+) -> dict[str, np.ndarray]:
+    """{user_id: (N, D) float32} (ChromaDB 컬렉션 전체를 page 단위로 읽음)"""
+    collection = PersistentClient(path=chroma_dir).get_collection(collection_name)
+
+    by_user: dict[str, list] = {}
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "metadatas"], limit=page_size, offset=offset
+        )
+        if not page["ids"]:
+            break
+        for embedding, metadata in zip(page["embeddings"], page["metadatas"]):
+            by_user.setdefault(metadata.get("user_id"), []).append(embedding)
+        offset += len(page["ids"])
+
+    return {
+        user_id: np.asarray(rows, dtype=np.float32)
+        for user_id, rows in by_user.items()
+    }
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """행마다 점수 상위 k개 index (순서 무관)"""
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def _overlap(expected: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(a) & set(b)) for a, b in zip(expected, found))
+    return hits / expected.size
+
+
+def evaluate_user(
+    vectors: np.ndarray, dims: list[int], top_k: int, queries: int, seed: int
+) -> dict | None:
+    """{(dim, 형식): overlap@k} (쿼리 수 / 후보 수가 부족하면 None)"""
+    n = len(vectors)
+    k = min(top_k, n - 1)
+    if k < 1:
+        return None
+
+    rng = np.random.default_rng(seed)
+    query_rows = rng.choice(n, size=min(queries, n), replace=False)
+
+    def search(stored: np.ndarray, query: np.ndarray, scales=None) -> np.ndarray:
+        # 쿼리는 float (vector_index.search와 같음), 저장 벡터만 int8일 수 있음
+        scores = query @ stored.T.astype(np.float32)
+        if scales is not None:
+            scores *= scales
+        scores[np.arange(len(query_rows)), query_rows] = -np.inf  # 자기 자신 제외
+        return _top_k(scores, k)
+
+    full = truncate_embeddings(vectors, vectors.shape[1])
+    expected = search(full, full[query_rows])
+
+    result = {}
+    for dim in dims:
+        reduced = truncate_embeddings(vectors, dim)
+        result[(dim, "float32")] = _overlap(
+            expected, search(reduced, reduced[query_rows])
+        )
+
+        codes, scales = quantize_int8(reduced)
+        result[(dim, "int8")] = _overlap(
+            expected, search(codes, reduced[query_rows], scales)
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 차원 축소 / int8 검색 유지율")
+    parser.add_argument("--chroma-dir", default="./chroma_data")
+    parser.add_argument(
+        "--collection", default="summaries", help="원본 차원 컬렉션 이름"
+    )
+    parser.add_argument("--dims", default=DEFAULT_DIMS, help="평가할 차원 (쉼표 구분)")
+    parser.add_argument("--top-k", type=int, default=10, help="비교할 검색 개수")
+    parser.add_argument("--queries", type=int, default=50, help="사용자당 쿼리 수")
+    parser.add_argument("--target", type=float, default=0.9, help="추천 기준 overlap")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    users = load_user_embeddings(args.chroma_dir, args.collection)
+    if not users:
+        print(f"⚠️ 컬렉션 '{args.collection}'에 데이터가 없습니다.")
+        return
+
+    full_dim = next(iter(users.values())).shape[1]
+    dims = sorted(
+        {int(d) for d in args.dims.split(",") if d.strip() and int(d) < full_dim}
+    )
+    print(
+        f"📦 사용자 {len(users)}명, 벡터 {sum(len(v) for v in users.values())}개, "
+        f"원본 {full_dim}차원, top_k {args.top_k}"
+    )
+
+    # 사용자 평균 (사용자마다 같은 가중치)
+    totals: dict[tuple, list[float]] = {}
+    for i, vectors in enumerate(users.values()):
+        result = evaluate_user(vectors, dims, args.top_k, args.queries, args.seed + i)
+        for key, value in (result or {}).items():
+            totals.setdefault(key, []).append(value)
+
+    if not totals:
+        print("⚠️ 평가할 수 있는 사용자가 없습니다. (사용자당 벡터 2개 이상 필요)")
+        return
+
+    rows = []
+    for (dim, dtype), values in sorted(totals.items()):
+        bytes_per_vector = dim * 4 if dtype == "float32" else dim + 4
+        rows.append(
+            {
+                "dim": dim,
+                "dtype": dtype,
+                "overlap": round(float(np.mean(values)), 4),
+                "min_user_overlap": round(float(np.min(values)), 4),
+                "bytes_per_vector": bytes_per_vector,
+                "size_ratio": round(bytes_per_vector / (full_dim * 4), 4),
+            }
+        )
+
+    print(f"\n{'dim':>6} {'dtype':>8} {'overlap@k':>10} {'min user':>9} {'size':>7}")
+    for row in rows:
+        print(
+            f"{row['dim']:>6} {row['dtype']:>8} {row['overlap']:>10.4f} "
+            f"{row['min_user_overlap']:>9.4f} {row['size_ratio']:>6.1%}"
+        )
+
+    passing = [row for row in rows if row["overlap"] >= args.target]
+    best = min(passing, key=lambda row: row["bytes_per_vector"]) if passing else None
+    if best:
+        print(
+            f"\n✅ overlap ≥ {args.target}: EMBEDDING_DIM={best['dim']} "
+            f"VECTOR_INDEX_QUANTIZATION={best['dtype']} "
+            f"(원본 대비 {best['size_ratio']:.1%})"
+        )
+    else:
+        print(f"\n⚠️ overlap ≥ {args.target}인 축소 차원이 없습니다. (원본 차원 유지)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "collection": args.collection,
+                    "users": len(users),
+                    "full_dim": full_dim,
+                    "top_k": args.top_k,
+                    "results": rows,
+                    "recommended": best,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
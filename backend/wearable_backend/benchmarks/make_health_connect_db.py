@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+합성 Health Connect SQLite DB 생성기 (업로드/파싱 벤치마크용 fixture)
+
+parse_db_json_to_raw_data_by_day가 읽는 테이블 전부를
+Health Connect 내보내기와 비슷한 컬럼 구성(uuid BLOB, app_info_id, 시간대 오프셋 등)과
+하루 레코드 수로 채운다. 같은 인자 + seed면 항상 같은 파일이 나온다.
+
+- years: 기간 (end_date까지 거슬러 올라가는 일수 = years * 365)
+- hr_per_day: 하루 심박수 샘플 수 (heart_rate_record_series_table, 가장 큰 테이블)
+  워치 기본 측정 ~144 (10분 간격) / 연속 측정 1440 (1분 간격) 이상
+
+사용법:
+  python benchmarks/make_health_connect_db.py --out ./synthetic.db
+  python benchmarks/make_health_connect_db.py --out ./a.db --years 3 --hr-per-day 1440
+  python benchmarks/make_health_connect_db.py --out ./a.db --zip   # a.zip도 생성
+"""
+
+import os
+import random
+import sqlite3
+import zipfile
+import argparse
+from datetime import date
+
+DAY_MILLIS = 24 * 60 * 60 * 1000
+HOUR_MILLIS = 60 * 60 * 1000
+KST_OFFSET_SECONDS = 9 * 60 * 60
+
+# 결과가 날짜에 따라 바뀌지 않도록 종료일 고정 (CI 비교용)
+DEFAULT_END_DATE = "2025-01-01"
+
+# 레코드 테이블 공통 컬럼 (Health Connect 내보내기 구성)
+RECORD_COLUMNS = """
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid BLOB,
+    last_modified_time INTEGER,
+    client_record_id TEXT,
+    client_record_version INTEGER,
+    app_info_id INTEGER,
+    device_info_id INTEGER,
+    recording_method INTEGER,
+    local_date INTEGER
+"""
+
+INTERVAL_COLUMNS = """
+    start_time INTEGER,
+    start_zone_offset INTEGER,
+    end_time INTEGER,
+    end_zone_offset INTEGER
+"""
+
+INSTANT_COLUMNS = """
+    time INTEGER,
+    zone_offset INTEGER
+"""
+
+SCHEMA = f"""
+CREATE TABLE steps_record_table({RECORD_COLUMNS}, {INTERVAL_COLUMNS}, count INTEGER);
+CREATE TABLE distance_record_table({RECORD_COLUMNS}, {INTERVAL_COLUMNS}, distance REAL);
+CREATE TABLE steps_cadence_record_table(
+    {RECORD_COLUMNS}, {INTERVAL_COLUMNS}, samples BLOB
+);
+CREATE TABLE total_calories_burned_record_table(
+    {RECORD_COLUMNS}, {INTERVAL_COLUMNS}, energy REAL
+);
+CREATE TABLE active_calories_burned_record_table(
+    {RECORD_COLUMNS}, {INTERVAL_COLUMNS}, energy REAL
+);
+CREATE TABLE heart_rate_record_table({RECORD_COLUMNS}, {INTERVAL_COLUMNS});
+CREATE TABLE heart_rate_record_series_table(
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parent_key INTEGER,
+    beats_per_minute INTEGER,
+    epoch_millis INTEGER
+);
+CREATE TABLE resting_heart_rate_record_table(
+    {RECORD_COLUMNS}, {INSTANT_COLUMNS}, value REAL, measurement_method INTEGER
+);
+CREATE TABLE oxygen_saturation_record_table(
+    {RECORD_COLUMNS}, {INSTANT_COLUMNS}, percentage REAL
+);
+CREATE TABLE weight_record_table({RECORD_COLUMNS}, {INSTANT_COLUMNS}, weight REAL);
+CREATE TABLE height_record_table({RECORD_COLUMNS}, {INSTANT_COLUMNS}, height REAL);
+CREATE TABLE sleep_session_record_table(
+    {RECORD_COLUMNS}, {INTERVAL_COLUMNS}, notes TEXT, sleep_session_type INTEGER,
+    title TEXT
+);
+"""
+
+TABLES = [
+    "steps_record_table",
+    "distance_record_table",
+    "steps_cadence_record_table",
+    "total_calories_burned_record_table",
+    "active_calories_burned_record_table",
+    "heart_rate_record_table",
+    "heart_rate_record_series_table",
+    "resting_heart_rate_record_table",
+    "oxygen_saturation_record_table",
+    "weight_record_table",
+    "height_record_table",
+    "sleep_session_record_table",
+]
+
+
+def _record_base(rnd: random.Random, day: int, modified: int) -> tuple:
+    """공통 컬럼 값 (uuid, last_modified_time, ..., local_date)"""
+    return (rnd.randbytes(16), modified, None, 0, 1, 1, 1, day)
+
+
+def _day_start_millis(day: int) -> int:
+    """Epoch Day의 KST 자정 (UTC epoch millis)"""
+    return day * DAY_MILLIS - KST_OFFSET_SECONDS * 1000
+
+
+def _interval(start: int, end: int) -> tuple:
+    return (start, KST_OFFSET_SECONDS, end, KST_OFFSET_SECONDS)
+
+
+def write_health_connect_db(
+    path: str,
+    years: float = 1.0,
+    hr_per_day: int = 144,
+    seed: int = 7,
+    end_date: str = DEFAULT_END_DATE,
+) -> dict:
+    """
+    합성 Health Connect DB 파일 생성
+
+    Returns:
+        {"days", "first_day", "last_day", "rows": {table: 행 수}, "total_rows"}
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+    rnd = random.Random(seed)
+    last_day = (date.fromisoformat(end_date) - date(1970, 1, 1)).days
+    days = max(1, int(years * 365))
+    first_day = last_day - days + 1
+
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    rows = {table: 0 for table in TABLES}
+
+    def insert(table: str, values: list[tuple]):
+        if not values:
+            return
+        marks = ", ".join("?" * len(values[0]))
+        conn.executemany(f"INSERT INTO {table} VALUES (NULL, {marks})", values)
+        rows[table] += len(values)
+
+    weight = 72000 + rnd.random() * 8000  # gram
+    height = 1.6 + rnd.random() * 0.25  # meter
+    hr_parent_key = 0
+
+    for day in range(first_day, last_day + 1):
+        day_start = _day_start_millis(day)
+        modified = day_start + DAY_MILLIS + HOUR_MILLIS
+
+        # 1) 활동: 시간대별 걸음/거리/칼로리 구간 레코드 (깨어 있는 07~23시)
+        steps, distance, total_cal, active_cal, cadence = [], [], [], [], []
+        for hour in range(7, 23):
+            if rnd.random() < 0.2:
+                continue
+            start = day_start + hour * HOUR_MILLIS
+            end = start + rnd.randint(5, 59) * 60 * 1000
+            count = rnd.randint(50, 1500)
+            base = _record_base(rnd, day, modified)
+            steps.append(base + _interval(start, end) + (count,))
+            distance.append(base + _interval(start, end) + (count * 0.72,))
+            active_cal.append(
+                base + _interval(start, end) + (count * 40.0 + rnd.random() * 5000,)
+            )
+            if rnd.random() < 0.3:
+                cadence.append(base + _interval(start, end) + (rnd.randbytes(48),))
+
+        for hour in range(24):
+            start = day_start + hour * HOUR_MILLIS
+            total_cal.append(
+                _record_base(rnd, day, modified)
+                + _interval(start, start + HOUR_MILLIS)
+                + (60000 + rnd.random() * 60000,)
+            )
+
+        insert("steps_record_table", steps)
+        insert("distance_record_table", distance)
+        insert("steps_cadence_record_table", cadence)
+        insert("total_calories_burned_record_table", total_cal)
+        insert("active_calories_burned_record_table", active_cal)
+
+        # 2) 심박수: 1시간 단위 부모 레코드 + 샘플 (series)
+        if hr_per_day > 0:
+            interval = DAY_MILLIS // hr_per_day
+            parents, series = [], []
+            for hour in range(24):
+                start = day_start + hour * HOUR_MILLIS
+                parents.append(
+                    _record_base(rnd, day, modified)
+                    + _interval(start, start + HOUR_MILLIS)
+                )
+            for i in range(hr_per_day):
+                millis = day_start + i * interval + rnd.randint(0, interval - 1)
+                parent = hr_parent_key + (millis - day_start) // HOUR_MILLIS + 1
+                bpm = int(rnd.gauss(72, 12))
+                series.append((parent, max(40, min(bpm, 190)), millis))
+            insert("heart_rate_record_table", parents)
+            insert("heart_rate_record_series_table", series)
+            hr_parent_key += 24
+
+        # 3) 휴식 심박 / 산소포화도
+        insert(
+            "resting_heart_rate_record_table",
+            [
+                _record_base(rnd, day, modified)
+                + (day_start + 6 * HOUR_MILLIS, KST_OFFSET_SECONDS)
+                + (float(rnd.randint(52, 68)), 0)
+            ],
+        )
+        insert(
+            "oxygen_saturation_record_table",
+            [
+                _record_base(rnd, day, modified)
+                + (day_start + hour * HOUR_MILLIS, KST_OFFSET_SECONDS)
+                + (94 + rnd.random() * 5,)
+                for hour in rnd.sample(range(24), rnd.randint(0, 3))
+            ],
+        )
+
+        # 4) 체중 (주 2~3회) / 키 (분기 1회)
+        if rnd.random() < 0.35:
+            weight += rnd.gauss(0, 150)
+            insert(
+                "weight_record_table",
+                [
+                    _record_base(rnd, day, modified)
+                    + (day_start + 7 * HOUR_MILLIS, KST_OFFSET_SECONDS)
+                    + (weight,)
+                ],
+            )
+        if day % 90 == 0:
+            insert(
+                "height_record_table",
+                [
+                    _record_base(rnd, day, modified)
+                    + (day_start + 7 * HOUR_MILLIS, KST_OFFSET_SECONDS)
+                    + (height,)
+                ],
+            )
+
+        # 5) 수면: 전날 밤 22~01시 시작, 5~9시간
+        if rnd.random() < 0.92:
+            start = day_start - rnd.randint(-60, 120) * 60 * 1000
+            end = start + rnd.randint(300, 540) * 60 * 1000
+            insert(
+                "sleep_session_record_table",
+                [
+                    _record_base(rnd, day, modified)
+                    + _interval(start, end)
+                    + (None, 0, None)
+                ],
+            )
+
+    conn.commit()
+    conn.close()
+
+    return {
+        "days": days,
+        "first_day": first_day,
+        "last_day": last_day,
+        "hr_per_day": hr_per_day,
+        "seed": seed,
+        "rows": rows,
+        "total_rows": sum(rows.values()),
+    }
+
+
+def zip_db(db_path: str, zip_path: str) -> str:
+    """앱 내보내기처럼 DB 하나를 ZIP으로 압축"""
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(db_path, "health_connect_export.db")
+    return zip_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 Health Connect DB 생성기")
+    parser.add_argument("--out", required=True, help="생성할 DB 파일 경로")
+    parser.add_argument("--years", type=float, default=1.0, help="기간 (년)")
+    parser.add_argument(
+        "--hr-per-day", type=int, default=144, help="하루 심박수 샘플 수"
+    )
+    parser.add_argument("--seed", type=int, default=7, help="난수 seed")
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="마지막 날짜")
+    parser.add_argument("--zip", action="store_true", help="<out>.zip도 생성")
+    args = parser.parse_args()
+
+    info = write_health_connect_db(
+        args.out, args.years, args.hr_per_day, args.seed, args.end_date
+    )
+    size_mb = os.path.getsize(args.out) / (1024 * 1024)
+    print(f"✅ {args.out} ({size_mb:.1f} MB, {info['days']}일, {info['total_rows']:,}행)")
+    for table, count in info["rows"].items():
+        print(f"  • {table}: {count:,}")
+
+    if args.zip:
+        zip_path = zip_db(args.out, os.path.splitext(args.out)[0] + ".zip")
+        print(f"✅ {zip_path} ({os.path.getsize(zip_path) / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
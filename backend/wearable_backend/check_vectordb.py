@@ -23,7 +23,7 @@ except ImportError:
 except Exception as e:
     pass
 
-from app.core.vector_store import collection
+from app.core.vector_store import collection, load_summary
 
 
 def print_header(title):
@@ -76,12 +76,7 @@ def get_date(user_id: str, date: str):
             return None
 
         metadata = result["metadatas"][0]
-        summary_json = metadata.get("summary_json", "{}")
-
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
+        summary_dict = load_summary(result["ids"][0], metadata)
 
         return {
             "date": metadata.get("date"),
@@ -243,9 +238,13 @@ def view_user_data(user_id: str, detailed=False, show_all_fields=False):
         print(f"\n📊 총 {len(metadatas)}개 데이터\n")
 
         # 날짜별 정렬
-        sorted_data = sorted(metadatas, key=lambda x: x.get("date", ""), reverse=True)
+        sorted_data = sorted(
+            zip(all_data["ids"], metadatas),
+            key=lambda x: x[1].get("date", ""),
+            reverse=True,
+        )
 
-        for i, metadata in enumerate(sorted_data, 1):
+        for i, (doc_id, metadata) in enumerate(sorted_data, 1):
             date = metadata.get("date", "unknown")
             source = metadata.get("source", "unknown")
             platform = metadata.get("platform", "unknown")
@@ -253,12 +252,8 @@ def view_user_data(user_id: str, detailed=False, show_all_fields=False):
             health_score = metadata.get("health_score", 0)
             intensity = metadata.get("recommended_intensity", "중")
 
-            # summary_json 파싱
-            summary_json = metadata.get("summary_json", "{}")
-            try:
-                summary_dict = json.loads(summary_json)
-            except:
-                summary_dict = {}
+            # summary 원본 (summary_store)
+            summary_dict = load_summary(doc_id, metadata)
 
             raw = summary_dict.get("raw", {})
             summary_text = summary_dict.get("summary_text", "")
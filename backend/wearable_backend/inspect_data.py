@@ -29,7 +29,12 @@ except ImportError:
 except Exception:
     pass
 
-from app.core.vector_store import collection
+from app.core.vector_store import (
+    collection,
+    load_summary,
+    vector_index,
+    delete_source_data,
+)
 
 
 # ============================================================
@@ -452,12 +457,7 @@ def get_date(user_id: str, date: str):
             return None
 
         metadata = result["metadatas"][0]
-        summary_json = metadata.get("summary_json", "{}")
-
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
+        summary_dict = load_summary(result["ids"][0], metadata)
 
         return {
             "date": metadata.get("date"),
@@ -618,9 +618,13 @@ def view_user_data(user_id: str, detailed=False, show_all_fields=False):
         print(f"\n📊 총 {len(metadatas)}개 데이터\n")
 
         # 날짜별 정렬
-        sorted_data = sorted(metadatas, key=lambda x: x.get("date", ""), reverse=True)
+        sorted_data = sorted(
+            zip(all_data["ids"], metadatas),
+            key=lambda x: x[1].get("date", ""),
+            reverse=True,
+        )
 
-        for i, metadata in enumerate(sorted_data, 1):
+        for i, (doc_id, metadata) in enumerate(sorted_data, 1):
             date = metadata.get("date", "unknown")
             source = metadata.get("source", "unknown")
             platform = metadata.get("platform", "unknown")
@@ -628,12 +632,8 @@ def view_user_data(user_id: str, detailed=False, show_all_fields=False):
             health_score = metadata.get("health_score", 0)
             intensity = metadata.get("recommended_intensity", "중")
 
-            # summary_json 파싱
-            summary_json = metadata.get("summary_json", "{}")
-            try:
-                summary_dict = json.loads(summary_json)
-            except:
-                summary_dict = {}
+            # summary 원본 (summary_store)
+            summary_dict = load_summary(doc_id, metadata)
 
             raw = summary_dict.get("raw", {})
             summary_text = summary_dict.get("summary_text", "")
@@ -795,6 +795,21 @@ def delete_user_data(user_id: str, confirm: bool = False):
         collection.delete(ids=ids)
         print(f"\n✅ {len(ids)}개 레코드 삭제 완료!")
 
+        # summary 원본 + 증분 업로드 상태 + 업로드 캐시 + 시계열 저장소도 초기화
+        from app.core.summary_store import delete_summaries, delete_source_summaries
+        from app.core.ingest_state import delete_ingest_state
+        from app.core.upload_cache import invalidate_upload_cache
+        from app.core.timeseries_store import delete_timeseries
+        from app.core.recency_index import delete_recency
+
+        delete_summaries(ids)
+        delete_source_summaries(user_id=user_id)
+        delete_ingest_state(user_id=user_id)
+        invalidate_upload_cache(user_id=user_id)
+        delete_timeseries(user_id=user_id)
+        delete_recency(user_id=user_id)
+        vector_index.delete(user_id)
+
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
         import traceback
@@ -806,6 +821,8 @@ def delete_old_format_data(user_id: str = None, confirm: bool = False):
     """
     예전 형식 데이터 삭제 (source가 'api', 'zip' 등 플랫폼 없는 것)
     새 형식: 'api_samsung', 'api_apple', 'zip_samsung', 'zip_apple'
+
+    날짜별 병합 문서에서는 예전 형식 출처의 원본만 지우고 남은 출처로 다시 병합
     """
     print_header("🗑️ 예전 형식 데이터 삭제")
 
@@ -823,27 +840,29 @@ def delete_old_format_data(user_id: str = None, confirm: bool = False):
 
         to_delete = []
         for doc_id, meta in zip(ids, metadatas):
-            source = meta.get("source", "")
             platform = meta.get("platform", "")
-
-            # 예전 형식 조건
-            is_old = (
-                source in old_format_sources
-                or platform in ["unknown", None, ""]
-                or (source and "_" not in source)  # api_samsung 형식이 아닌 것
-            )
-
-            if is_old:
-                to_delete.append(
-                    {
-                        "id": doc_id,
-                        "user_id": meta.get("user_id"),
-                        "date": meta.get("date"),
-                        "source": source,
-                        "platform": platform,
-                    }
+            # 병합한 출처 목록 (sources, 병합 이전 문서는 source 하나)
+            sources = (meta.get("sources") or meta.get("source") or "").split(",")
+
+            for index, source in enumerate(sources):
+                # 예전 형식 조건 (platform은 기준 출처 = 첫 번째 출처의 값)
+                is_old = (
+                    source in old_format_sources
+                    or (index == 0 and platform in ["unknown", None, ""])
+                    or (source and "_" not in source)  # api_samsung 형식이 아닌 것
                 )
 
+                if is_old:
+                    to_delete.append(
+                        {
+                            "id": doc_id,
+                            "user_id": meta.get("user_id"),
+                            "date": meta.get("date"),
+                            "source": source,
+                            "platform": platform,
+                        }
+                    )
+
         if not to_delete:
             print("\n✅ 예전 형식 데이터가 없습니다!")
             return
@@ -872,10 +891,21 @@ def delete_old_format_data(user_id: str = None, confirm: bool = False):
             print(f"   예: python inspect_data.py --delete-old --confirm")
             return
 
-        # 삭제 실행
-        delete_ids = [item["id"] for item in to_delete]
-        collection.delete(ids=delete_ids)
-        print(f"\n✅ {len(delete_ids)}개 레코드 삭제 완료!")
+        # 삭제 실행 (출처 원본 삭제 → 남은 출처로 다시 병합, 없으면 문서 삭제)
+        from app.core.upload_cache import invalidate_upload_cache
+
+        targets = {}
+        for item in to_delete:
+            if item["user_id"]:
+                key = (item["user_id"], item["source"])
+                targets.setdefault(key, []).append(item["id"])
+        for (uid, source), doc_ids in targets.items():
+            delete_source_data(source, user_id=uid, doc_ids=doc_ids)
+        print(f"\n✅ {len(to_delete)}개 레코드 삭제 완료!")
+
+        for uid in by_user:
+            if uid:
+                invalidate_upload_cache(user_id=uid)
 
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
@@ -889,12 +919,11 @@ def delete_by_source(source: str, user_id: str = None, confirm: bool = False):
     print_header(f"🗑️ 출처별 데이터 삭제: {source}")
 
     try:
-        if user_id:
-            result = collection.get(
-                where={"$and": [{"user_id": user_id}, {"source": source}]}
-            )
-        else:
-            result = collection.get(where={"source": source})
+        # 다른 출처와 병합된 날짜도 포함 (출처별 원본 기준)
+        from app.core.summary_store import source_days
+
+        day_ids = [doc_id for _, doc_id in source_days(source, user_id)]
+        result = collection.get(ids=day_ids) if day_ids else {}
 
         ids = result.get("ids", [])
         metadatas = result.get("metadatas", [])
@@ -916,9 +945,17 @@ def delete_by_source(source: str, user_id: str = None, confirm: bool = False):
             print("\n⚠️ 실제 삭제하려면 --confirm 옵션을 추가하세요.")
             return
 
-        collection.delete(ids=ids)
+        # 출처 원본 삭제 → 남은 출처로 다시 병합 (남은 출처가 없는 날짜는 문서 삭제)
+        delete_source_data(source, user_id=user_id)
         print(f"\n✅ {len(ids)}개 레코드 삭제 완료!")
 
+        # 증분 업로드 상태 + 업로드 캐시도 초기화
+        from app.core.ingest_state import delete_ingest_state
+        from app.core.upload_cache import invalidate_upload_cache
+
+        delete_ingest_state(user_id=user_id, source=source)
+        invalidate_upload_cache(user_id=user_id, source=source)
+
     except Exception as e:
         print(f"❌ 오류 발생: {str(e)}")
         import traceback
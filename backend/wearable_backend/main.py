@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
@@ -6,7 +8,7 @@ from fastapi.exceptions import RequestValidationError
 
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.api.file_upload_api import router as file_upload_router
+from app.api.file_upload_api import router as file_upload_router, job_service
 from app.api.auto_upload_api import router as auto_upload_router
 from app.api.app_api import router as app_router
 from app.api.similar_api import router as similar_router
@@ -14,7 +16,15 @@ from app.api.chat_api import router as chat_router
 from app.api.user_api import router as user_router
 
 from fastapi import APIRouter
-from app.core.vector_store import collection, search_similar_summaries
+from app.core.vector_store import (
+    collection,
+    search_similar_summaries,
+    migrate_legacy_summaries,
+    migrate_day_documents,
+)
+from app.core.embedding_cache import embedding_cache_stats
+from app.core.summary_store import summary_store_stats
+from app.service.cpu_tasks import shutdown_process_pool
 
 from dotenv import load_dotenv
 
@@ -25,11 +35,39 @@ print("🔥🔥 FASTAPI SERVER LOADED: VERSION TEST 🔥🔥")
 # ==========================
 # 1) FastAPI 앱 생성
 # ==========================
+def migrate_summary_store():
+    """이전 버전이 Chroma metadata에 넣은 summary_json → summary_store (컬렉션당 1회)"""
+    try:
+        migrate_legacy_summaries()
+    except Exception as e:
+        print(f"[WARN] summary_json 이전 실패 (조회 시 metadata에서 읽음): {e}")
+
+    # 출처별 문서 → 날짜별 병합 문서 (컬렉션당 1회, 여러 출처 날짜만 다시 임베딩)
+    try:
+        migrate_day_documents()
+    except Exception as e:
+        print(f"[WARN] 날짜별 병합 이전 실패 (다음 시작 때 다시 시도): {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 / 종료 (앱 단위로 한 번씩)"""
+    # 저장 형식 이전을 마친 뒤 작업 워커 시작 (재등록된 작업이 새 형식으로 저장)
+    migrate_summary_store()
+
+    # 비동기 업로드 작업 워커 + 미완료 작업 재등록
+    await job_service.start()
+    yield
+    await job_service.stop()
+    shutdown_process_pool()
+
+
 app = FastAPI(
     title="Health Trainer API",
     description="DB → JSON → AI 분석 트레이너 서비스",
     version="0.1.0",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # ==========================
@@ -83,6 +121,8 @@ async def get_vectordb_status():
             "status": "ok",
             "total_count": count,
             "users": user_summary,
+            "embedding_cache": embedding_cache_stats(),
+            "summary_store": summary_store_stats(),
         }
 
     except Exception as e:
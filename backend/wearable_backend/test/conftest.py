@@ -0,0 +1,65 @@
+# conftest.py
+# 공통 fixture: 임시 폴더 / 메모리 ChromaDB / 해시 임베딩으로 격리한 vector_store
+#
+# - vs: 테스트마다 새 컬렉션 + 임시 summary_store / 최신순 인덱스 / 벡터 인덱스 / 시계열 저장소
+# - embedded: vs의 batch_embed_texts로 임베딩한 텍스트 (임베딩 호출 확인용)
+# - vs_timeseries: 시계열 저장소 사용 여부 (기본 False, 모듈에서 fixture를 재정의해 변경)
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import uuid
+
+import chromadb
+import pytest
+
+from app.core import recency_index, summary_store, timeseries_store
+from app.core.embedding_providers import HashingEmbeddingProvider
+from app.core.vector_index import UserVectorIndex
+
+EMBEDDER = HashingEmbeddingProvider(dim=64)
+
+
+@pytest.fixture
+def embedded() -> list:
+    """vs의 batch_embed_texts로 임베딩한 텍스트"""
+    return []
+
+
+@pytest.fixture
+def vs_timeseries() -> bool:
+    """vs에서 시계열 저장소 사용 여부"""
+    return False
+
+
+@pytest.fixture
+def vs(tmp_path, monkeypatch, embedded, vs_timeseries):
+    # vector_store import 시 ./chroma_data를 만들므로 임시 폴더에서 import
+    monkeypatch.chdir(tmp_path)
+    from app.core import vector_store
+
+    collection = chromadb.EphemeralClient().get_or_create_collection(
+        name=f"test_{uuid.uuid4().hex}", metadata={"hnsw:space": "cosine"}
+    )
+
+    def embed(texts):
+        embedded.extend(texts)
+        return EMBEDDER.embed(texts)
+
+    monkeypatch.setattr(vector_store, "collection", collection)
+    monkeypatch.setattr(
+        vector_store, "vector_index", UserVectorIndex(str(tmp_path / "vi"))
+    )
+    monkeypatch.setattr(vector_store, "TIMESERIES_STORE_ENABLED", vs_timeseries)
+    monkeypatch.setattr(vector_store, "batch_embed_texts", embed)
+    monkeypatch.setattr(
+        vector_store, "get_cached_embedding", lambda text: EMBEDDER.embed([text])[0]
+    )
+    monkeypatch.setattr(timeseries_store, "TIMESERIES_DIR", str(tmp_path / "ts"))
+    monkeypatch.setattr(
+        summary_store, "SUMMARY_STORE_DB", str(tmp_path / "summary_store.sqlite3")
+    )
+    monkeypatch.setattr(
+        recency_index, "RECENCY_INDEX_DB", str(tmp_path / "recency.sqlite3")
+    )
+    return vector_store
@@ -0,0 +1,150 @@
+# test_analytic_query.py
+# 지표 집계 질문: "가장 많이 / 최저 / 평균 / 추이" 질문 파싱(조언 / 일반 질문은 제외),
+# max / min / avg / trend 계산, 챗봇 조회가 임베딩 없이 정확한 최댓값 날짜를 반환하는지,
+# 하루 지정 질문은 날짜 조회로 처리하는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_analytic_query.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest
+
+from app.core.chatbot_engine.analytic_query import (
+    compute_aggregate,
+    format_aggregate,
+    parse_analytic_query,
+)
+from app.utils.preprocess import preprocess_health_json
+
+USER_ID = "analytic@test.com"
+
+
+def _item(date: str, steps: int, sleep_hr: float = 7.0) -> dict:
+    return {"date": date, "raw": {"steps": steps, "sleep_hr": sleep_hr}}
+
+
+@pytest.mark.parametrize(
+    "message, metric, aggregation",
+    [
+        ("언제 가장 많이 걸었어?", "steps", "max"),
+        ("가장 오래 잔 날이 언제야", "sleep_hr", "max"),
+        ("안정시 심박 평균 알려줘", "resting_heart_rate", "avg"),
+        ("최근 체중 추이는?", "weight", "trend"),
+        ("걸음 수 제일 적은 날", "steps", "min"),
+    ],
+)
+def test_parse(message, metric, aggregation):
+    parsed = parse_analytic_query(message)
+    assert (parsed["metric"], parsed["aggregation"]) == (metric, aggregation)
+
+
+def test_parse_without_metric_or_aggregation():
+    assert parse_analytic_query("가장 좋았던 날은?") is None
+    assert parse_analytic_query("오늘 걸음 수 알려줘") is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "하루 최소 몇 걸음 걸어야 건강해?",
+        "운동 몇 분 하면 칼로리 최대로 소모돼?",
+        "잠깐 평균이 뭐야?",
+        "수면 시간 평균은 보통 몇 시간이야?",
+    ],
+)
+def test_parse_ignores_advice_and_general_questions(message):
+    assert parse_analytic_query(message) is None
+
+
+def test_parse_period_counts_as_history_cue():
+    assert parse_analytic_query("걸음 평균") is None
+    assert parse_analytic_query("걸음 평균", has_period=True)["metric"] == "steps"
+
+
+def test_compute_aggregate():
+    items = [
+        _item("2025-01-03", 9000),
+        _item("2025-01-01", 5000),
+        _item("2025-01-02", 9000),
+        _item("2025-01-04", 0),  # 측정 없음 → 제외
+        _item("2025-01-05", 3000),
+    ]
+    steps_max = parse_analytic_query("가장 많이 걸은 날")
+
+    result = compute_aggregate(items, steps_max, top_n=2)
+    # 같은 값이면 최신 날짜 먼저
+    assert [row["date"] for row in result["rows"]] == ["2025-01-03", "2025-01-02"]
+    assert (result["value"], result["count"]) == (9000, 4)
+    assert "1. 2025-01-03: 9,000보" in format_aggregate(result)
+
+    result = compute_aggregate(items, {**steps_max, "aggregation": "min"})
+    assert result["value"] == 3000 and result["rows"][0]["date"] == "2025-01-05"
+
+    result = compute_aggregate(items, {**steps_max, "aggregation": "avg"})
+    assert result["value"] == pytest.approx(6500)
+    assert [row["date"] for row in result["rows"]] == ["2025-01-03", "2025-01-05"]
+
+    rising = [_item(f"2025-01-0{i}", 1000 * i) for i in range(1, 6)]
+    result = compute_aggregate(rising, {**steps_max, "aggregation": "trend"})
+    assert result["value"] == pytest.approx(1000)
+    assert result["trend"]["direction"] == "증가"
+    assert [row["date"] for row in result["rows"]] == ["2025-01-01", "2025-01-05"]
+
+    result = compute_aggregate([], steps_max)
+    assert result["value"] is None and result["rows"] == []
+    assert "데이터 없음" in format_aggregate(result)
+
+
+@pytest.fixture
+def vs_timeseries() -> bool:
+    """날짜별 조회는 시계열 저장소에서"""
+    return True
+
+
+def test_chat_query_returns_exact_max_without_embedding(vs, monkeypatch):
+    from app.core.chatbot_engine.intent_classifier import classify_intent
+    from app.core.chatbot_engine.rag_query import query_health_data
+
+    steps = [(i * 7919) % 20000 + 1000 for i in range(60)]
+    summaries = [
+        preprocess_health_json({"steps": s, "sleep_hr": 7}, 20000 + i, "samsung")
+        for i, s in enumerate(steps)
+    ]
+    vs.save_daily_summaries_batch(summaries, USER_ID, "zip_samsung")
+
+    def no_embedding(text):
+        raise AssertionError("임베딩 호출")
+
+    monkeypatch.setattr(vs, "get_cached_embedding", no_embedding)
+    message = "언제 가장 많이 걸었어?"
+    intent_result = classify_intent(message)
+    assert intent_result["intent"] == "health_query"
+
+    result = query_health_data(message, USER_ID, intent_result=intent_result)
+    best = max(range(len(steps)), key=lambda i: (steps[i], i))
+    assert result["mode"] == "aggregate"
+    assert result["similar_days"][0]["date"] == summaries[best]["created_at"][:10]
+    assert result["similar_days"][0]["raw"]["steps"] == max(steps)
+
+
+def test_single_day_question_uses_date_lookup(vs):
+    from app.core.chatbot_engine.rag_query import query_health_data
+
+    summaries = [
+        preprocess_health_json({"steps": 1000 * (i + 1)}, 20000 + i, "samsung")
+        for i in range(5)
+    ]
+    vs.save_daily_summaries_batch(summaries, USER_ID, "zip_samsung")
+    target = summaries[2]["created_at"][:10]
+
+    # "어제 평균 걸음 알려줘": 집계할 날이 하루뿐 → 그 날짜 조회
+    intent_result = {
+        "intent": "health_query",
+        "time_context": {"type": "specific", "target_date": target},
+        "use_similarity": False,
+        "analytic": parse_analytic_query("걸음 평균 알려줘"),
+    }
+    result = query_health_data("어제 평균 걸음 알려줘", USER_ID, intent_result)
+    assert result["mode"] == "specific_date"
+    assert [day["date"] for day in result["similar_days"]] == [target]
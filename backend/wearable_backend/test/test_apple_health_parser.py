@@ -0,0 +1,144 @@
+# test_apple_health_parser.py
+# Apple Health export.xml: scan 파서 결과가 iterparse 기준 구현과 같은지,
+# 단위 변환 / 수면 / Correlation 중복 제외가 맞는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_apple_health_parser.py
+import zipfile
+
+import pytest
+
+from app.core import apple_health_parser
+from app.core.apple_health_parser import (
+    parse_apple_export_iterparse,
+    parse_apple_export_scan,
+)
+from app.utils.preprocess import preprocess_health_json
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE HealthData [
+<!ELEMENT HealthData (ExportDate,Me,(Record|Correlation|Workout)*)>
+<!ATTLIST Record
+  type          CDATA #REQUIRED
+  unit          CDATA #IMPLIED
+  value         CDATA #IMPLIED
+>
+]>
+<HealthData locale="ko_KR">
+ <ExportDate value="2024-03-03 09:00:00 +0900"/>
+ <Me HKCharacteristicTypeIdentifierBiologicalSex="HKBiologicalSexFemale"/>
+"""
+
+DEVICE = 'device="&lt;&lt;HKDevice: 0x1&gt;, name:Apple Watch&gt;"'
+
+
+def _record(rtype, unit, start, value, end=None, children=""):
+    unit_attr = f' unit="{unit}"' if unit else ""
+    end = end or start
+    tag = (
+        f' <Record type="HKQuantityTypeIdentifier{rtype}" sourceName="Apple Watch"'
+        f' sourceVersion="10.1" {DEVICE}{unit_attr} creationDate="{end}"'
+        f' startDate="{start}" endDate="{end}" value="{value}"'
+    )
+    if children:
+        return f"{tag}>\n{children} </Record>\n"
+    return f"{tag}/>\n"
+
+
+def _sleep(start, end, value):
+    return (
+        ' <Record type="HKCategoryTypeIdentifierSleepAnalysis" sourceName="iPhone"'
+        f' creationDate="{end}" startDate="{start}" endDate="{end}"'
+        f' value="HKCategoryValueSleepAnalysis{value}"/>\n'
+    )
+
+
+def _export_xml() -> str:
+    body = [
+        _record("StepCount", "count", "2024-03-01 08:00:00 +0900", "1200"),
+        _record("StepCount", "count", "2024-03-01 18:00:00 +0900", "800"),
+        _record(
+            "HeartRate",
+            "count/min",
+            "2024-03-01 09:00:00 +0900",
+            "60",
+            children='  <MetadataEntry key="HKMetadataKeyMotionContext" value="1"/>\n',
+        ),
+        _record("HeartRate", "count/min", "2024-03-01 10:00:00 +0900", "80"),
+        _record("DistanceWalkingRunning", "m", "2024-03-01 08:00:00 +0900", "1500"),
+        _record("ActiveEnergyBurned", "kJ", "2024-03-01 08:00:00 +0900", "418.4"),
+        _record("BasalEnergyBurned", "kcal", "2024-03-01 08:00:00 +0900", "1500"),
+        _record("OxygenSaturation", "%", "2024-03-01 08:00:00 +0900", "0.97"),
+        _record("BodyMass", "lb", "2024-03-01 07:00:00 +0900", "150"),
+        _record("Height", "cm", "2024-03-01 07:00:00 +0900", "165"),
+        _record(
+            "WalkingHeartRateAverage", "count/min", "2024-03-02 20:00:00 +0900", "101"
+        ),
+        _sleep(
+            "2024-03-01 23:30:00 +0900", "2024-03-02 03:30:00 +0900", "AsleepCore"
+        ),
+        _sleep("2024-03-02 03:30:00 +0900", "2024-03-02 06:30:00 +0900", "AsleepREM"),
+        _sleep("2024-03-01 23:00:00 +0900", "2024-03-02 07:00:00 +0900", "InBed"),
+        # 혈압 Correlation 안의 Record는 최상위 Record와 중복 → 제외
+        ' <Correlation type="HKCorrelationTypeIdentifierBloodPressure"'
+        ' startDate="2024-03-02 08:00:00 +0900" endDate="2024-03-02 08:00:00 +0900">\n',
+        _record("BloodPressureSystolic", "mmHg", "2024-03-02 08:00:00 +0900", "999"),
+        " </Correlation>\n",
+        _record("BloodPressureSystolic", "mmHg", "2024-03-02 08:00:00 +0900", "120"),
+        ' <Workout workoutActivityType="HKWorkoutActivityTypeWalking"/>\n',
+        _record("StepCount", "count", "2024-03-02 08:00:00 +0900", "not-a-number"),
+    ]
+    return HEADER + "".join(body) + "</HealthData>\n"
+
+
+@pytest.fixture
+def export_xml(tmp_path):
+    path = tmp_path / "export.xml"
+    path.write_text(_export_xml(), encoding="utf-8")
+    return str(path)
+
+
+def test_expected_values(export_xml):
+    result = parse_apple_export_iterparse(export_xml)
+
+    assert sorted(result) == [20240301, 20240302]
+    day1, day2 = result[20240301], result[20240302]
+
+    assert day1["steps"] == 2000
+    assert day1["heart_rate"] == 70
+    assert day1["distance_km"] == pytest.approx(1.5)
+    assert day1["activeEnergy"] == pytest.approx(100)
+    assert day1["total_calories"] == pytest.approx(1600)
+    assert day1["oxygen_saturation"] == pytest.approx(97)
+    assert day1["weight"] == pytest.approx(68.0388555)
+    assert day1["height_m"] == pytest.approx(1.65)
+
+    assert day2["sleep_min"] == 420
+    assert day2["sleep_hr"] == 7
+    assert day2["systolic"] == 120
+    assert day2["walking_heart_rate"] == 101
+
+
+@pytest.mark.parametrize("chunk_size", [64, 997, 1 << 20])
+def test_scan_matches_iterparse(export_xml, monkeypatch, chunk_size):
+    monkeypatch.setattr(apple_health_parser, "READ_CHUNK_SIZE", chunk_size)
+
+    assert parse_apple_export_scan(export_xml) == parse_apple_export_iterparse(
+        export_xml
+    )
+
+
+def test_zip_input_and_normalize_raw_keys(tmp_path, export_xml):
+    zip_path = tmp_path / "export.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(export_xml, "apple_health_export/export.xml")
+        zf.writestr("apple_health_export/export_cda.xml", "<ClinicalDocument/>")
+
+    assert apple_health_parser.is_apple_export_zip(str(zip_path))
+    result = parse_apple_export_scan(str(zip_path))
+    assert result == parse_apple_export_iterparse(export_xml)
+
+    # normalize_raw (apple 분기)가 값을 그대로 읽는지
+    summary = preprocess_health_json(dict(result[20240301]), 20240301, "apple")
+    assert summary["raw"]["active_calories"] == pytest.approx(100)
+    assert summary["raw"]["distance_km"] == pytest.approx(1.5)
+    assert summary["raw"]["bmi"] == pytest.approx(68.0388555 / 1.65**2)
@@ -0,0 +1,36 @@
+# test_cpu_tasks.py
+# 프로세스 풀 전달용 날짜별 raw 압축(pack_raw_by_day): 날짜마다 key 구성이 달라도
+# 빠지거나 0으로 채워지는 값 없이 원본 그대로 복원되는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_cpu_tasks.py
+import pickle
+
+from app.service.cpu_tasks import pack_raw_by_day, unpack_raw_by_day
+
+
+def test_pack_round_trip_same_fields():
+    raw_by_day = {20000 + i: {"steps": i * 100, "sleep_hr": 7.5} for i in range(3)}
+    packed = pack_raw_by_day(raw_by_day)
+
+    assert packed["fields"] == ("steps", "sleep_hr")
+    assert packed["irregular"] == {}
+    assert unpack_raw_by_day(pickle.loads(pickle.dumps(packed))) == raw_by_day
+
+
+def test_pack_round_trip_mixed_fields():
+    raw_by_day = {
+        20000: {"steps": 1000},
+        20001: {"steps": 2000, "hr_p95": 150},  # 첫날에 없는 key
+        20002: {"steps": 3000, "hr_p95": 140},
+        20003: {"hr_p95": 130},  # 이후 날짜에 없는 key
+    }
+    packed = pack_raw_by_day(raw_by_day)
+
+    assert packed["fields"] == ("steps", "hr_p95")
+    unpacked = unpack_raw_by_day(pickle.loads(pickle.dumps(packed)))
+    assert unpacked == raw_by_day
+    assert list(unpacked) == list(raw_by_day)
+
+
+def test_pack_empty():
+    assert unpack_raw_by_day(pack_raw_by_day({})) == {}
@@ -0,0 +1,157 @@
+# test_day_merge.py
+# 같은 날짜 여러 출처 병합: 필드마다 우선순위 출처의 값(0은 없음)을 쓰는지, 묶음 필드는 한 출처에서
+# 가져오는지, provenance / BMI 재계산, 저장 시 날짜별 문서 1개만 남는지, 출처 삭제 시 다시 병합되는지,
+# 출처별 문서 → 날짜별 문서 이전 시 여러 출처 날짜만 다시 임베딩하는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_day_merge.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest
+
+from app.core import day_merge, summary_store
+from app.utils.preprocess import preprocess_health_json
+from conftest import EMBEDDER
+
+USER_ID = "merge@test.com"
+
+
+def _samsung(date_int: int, steps: int) -> dict:
+    raw = {"steps": steps, "heart_rate": 70, "sleep_min": 420, "weight": 70}
+    return preprocess_health_json(raw, date_int, "samsung")
+
+
+def _apple(date_int: int, steps: int) -> dict:
+    raw = {"steps": steps, "sleep_hr": 6, "weight": 72, "height": 175}
+    return preprocess_health_json(raw, date_int, "apple")
+
+
+def _records(**summaries) -> dict:
+    # 인자 순서 = 저장 순서 (뒤가 최근)
+    return {
+        source: {"summary": summary, "updated_at": f"2025010112000{i}"}
+        for i, (source, summary) in enumerate(summaries.items())
+    }
+
+
+def test_merge_fills_fields_from_other_sources():
+    records = _records(zip_samsung=_samsung(20100, 8000), api_apple=_apple(20100, 0))
+    merged = day_merge.merge_day(records)
+    raw, provenance = merged["raw"], merged["provenance"]
+
+    # 최근 저장 출처(api_apple) 우선, 걸음 수는 0이라 삼성 값 사용
+    assert merged["sources"] == ["api_apple", "zip_samsung"]
+    assert merged["platform"] == "apple"
+    assert raw["steps"] == 8000 and provenance["steps"] == "zip_samsung"
+    assert raw["heart_rate"] == 70 and provenance["heart_rate"] == "zip_samsung"
+    assert raw["weight"] == 72 and provenance["weight"] == "api_apple"
+
+    # 수면 분 / 시간은 같은 출처에서
+    assert (raw["sleep_min"], raw["sleep_hr"]) == (360, 6)
+    assert provenance["sleep_min"] == provenance["sleep_hr"] == "api_apple"
+    assert "8000" in merged["summary_text"].replace(",", "")
+
+
+def test_merge_precedence_and_derived_bmi(monkeypatch):
+    records = _records(api_apple=_apple(20100, 5000), zip_samsung=_samsung(20100, 0))
+    monkeypatch.setattr(day_merge, "SOURCE_PRECEDENCE", ["zip_samsung"])
+    monkeypatch.setattr(
+        day_merge, "FIELD_SOURCE_PRECEDENCE", {"sleep_hr": ["api_apple"]}
+    )
+    merged = day_merge.merge_day(records)
+    raw, provenance = merged["raw"], merged["provenance"]
+
+    assert merged["sources"] == ["zip_samsung", "api_apple"]
+    assert raw["weight"] == 70 and provenance["weight"] == "zip_samsung"
+    # 묶음 중 한 필드에 지정한 우선순위가 묶음 전체에 적용
+    assert (raw["sleep_min"], raw["sleep_hr"]) == (360, 6)
+    # 키는 애플, 체중은 삼성 → 병합된 값으로 BMI 재계산
+    assert provenance["height_m"] == "api_apple"
+    assert provenance["bmi"] == day_merge.DERIVED
+    assert raw["bmi"] == pytest.approx(70 / 1.75**2)
+
+
+def test_single_source_is_kept_verbatim():
+    summary = _samsung(20100, 1234)
+    merged = day_merge.merge_day(_records(zip_samsung=summary))
+
+    assert merged["raw"] == summary["raw"]
+    assert merged["summary_text"] == summary["summary_text"]
+    assert merged["sources"] == ["zip_samsung"]
+
+
+def test_saves_keep_one_document_per_day(vs, monkeypatch):
+    monkeypatch.setattr(day_merge, "SOURCE_PRECEDENCE", ["api_apple"])
+    vs.save_daily_summaries_batch(
+        [_samsung(20100 + i, 1000 * (i + 1)) for i in range(5)], USER_ID, "zip_samsung"
+    )
+    result = vs.save_daily_summary(_apple(20104, 0), USER_ID, "api_apple")
+
+    day_id = result["document_id"]
+    assert day_id == f"{USER_ID}_{result['date']}"
+    assert vs.collection.count() == 5
+
+    metadata = vs.collection.get(ids=[day_id], include=["metadatas"])["metadatas"][0]
+    assert metadata["source"] == "api_apple"
+    assert metadata["sources"] == "api_apple,zip_samsung"
+
+    summary = vs.load_summary(day_id)
+    assert summary["raw"]["steps"] == 5000
+    assert summary["provenance"]["steps"] == "zip_samsung"
+    assert summary["provenance"]["weight"] == "api_apple"
+
+    recent = vs.get_recent_summaries(USER_ID, limit=10)
+    assert [item["raw"]["steps"] for item in recent] == [5000, 4000, 3000, 2000, 1000]
+    similar = vs.search_similar_summaries({"steps": 5000}, USER_ID, top_k=10)
+    assert len(similar["similar_days"]) == 5
+
+    # 출처 삭제 → 남은 출처로 다시 병합, 남은 출처가 없는 날짜는 문서 삭제
+    assert vs.delete_source_data("api_apple", user_id=USER_ID) == 1
+    summary = vs.load_summary(day_id)
+    assert summary["sources"] == ["zip_samsung"]
+    assert summary["raw"]["weight"] == 70
+
+    assert vs.delete_source_data("zip_samsung") == 5
+    assert vs.collection.count() == 0
+    assert vs.get_recent_summaries(USER_ID) == []
+
+
+def test_migrates_source_documents_to_day_documents(vs, embedded):
+    # 병합 이전 형식: {user}_{date}_{source} 문서 (5일 삼성 + 1일 애플)
+    entries = [("zip_samsung", _samsung(20100 + i, 1000 * (i + 1))) for i in range(5)]
+    entries.append(("api_apple", _apple(20104, 0)))
+
+    ids, metadatas = [], []
+    for i, (source, summary) in enumerate(entries):
+        date = summary["created_at"][:10]
+        ids.append(f"{USER_ID}_{date}_{source}")
+        metadatas.append(
+            {
+                "user_id": USER_ID,
+                "date": date,
+                "timestamp": int(date.replace("-", "")),
+                "source": source,
+                "platform": summary["platform"],
+                "updated_at": f"2025010112000{i}",
+            }
+        )
+    summary_store.put_summaries(
+        [(doc_id, USER_ID, summary) for doc_id, (_, summary) in zip(ids, entries)]
+    )
+    vs.collection.add(ids=ids, embeddings=EMBEDDER.embed(ids), metadatas=metadatas)
+
+    assert vs.migrate_day_documents() == 6
+    assert vs.migrate_day_documents() == 0  # 컬렉션당 1회
+
+    # 여러 출처가 병합된 날짜만 새로 임베딩
+    assert len(embedded) == 1
+    stored = vs.collection.get(include=["metadatas"])
+    assert sorted(stored["ids"]) == sorted(
+        f"{USER_ID}_{metadata['date']}" for metadata in metadatas[:5]
+    )
+    assert summary_store.get_summaries(ids) == {}
+
+    latest = vs.get_recent_summaries(USER_ID, limit=1)[0]
+    assert latest["source"] == "api_apple"
+    assert latest["raw"]["steps"] == 5000
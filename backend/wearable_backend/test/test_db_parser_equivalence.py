@@ -0,0 +1,166 @@
+# test_db_parser_equivalence.py
+# 기준 구현(db_to_json → parse_db_json_to_raw_data_by_day)과
+# 스트리밍 / SQL 집계 파서의 결과가 같은지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_db_parser_equivalence.py
+import math
+import random
+import sqlite3
+
+import pytest
+
+from app.core.db_to_json import db_to_json
+from app.core.db_parser import parse_db_json_to_raw_data_by_day
+from app.core.db_stream_parser import parse_db_file_to_raw_data_by_day
+from app.core.db_sql_parser import parse_db_file_to_raw_data_by_day_sql
+
+DAY_MILLIS = 24 * 60 * 60 * 1000
+KST_OFFSET_MILLIS = 9 * 60 * 60 * 1000
+
+
+def _make_health_connect_db(path, days=20, hr_per_day=50, seed=7):
+    """Health Connect 스키마 일부를 흉내 낸 작은 DB"""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE steps_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, count INTEGER, app_info_id BLOB);
+        CREATE TABLE distance_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, distance REAL);
+        CREATE TABLE total_calories_burned_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, energy REAL);
+        CREATE TABLE active_calories_burned_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, energy REAL);
+        CREATE TABLE heart_rate_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER);
+        CREATE TABLE heart_rate_record_series_table(row_id INTEGER PRIMARY KEY, parent_key INTEGER, epoch_millis INTEGER, beats_per_minute INTEGER);
+        CREATE TABLE resting_heart_rate_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, value REAL);
+        CREATE TABLE oxygen_saturation_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, percentage REAL);
+        CREATE TABLE weight_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, weight REAL);
+        CREATE TABLE height_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER);
+        CREATE TABLE sleep_session_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, start_time INTEGER, end_time INTEGER);
+        CREATE TABLE steps_cadence_record_table(row_id INTEGER PRIMARY KEY, local_date INTEGER, samples BLOB);
+        """
+    )
+
+    first_day = 20000
+    for d in range(first_day, first_day + days):
+        for _ in range(rnd.randint(1, 4)):
+            conn.execute(
+                "INSERT INTO steps_record_table(local_date, count, app_info_id) VALUES (?, ?, ?)",
+                (d, rnd.randint(0, 3000), b"\x00\x01"),
+            )
+            conn.execute(
+                "INSERT INTO distance_record_table(local_date, distance) VALUES (?, ?)",
+                (d, rnd.random() * 2000),
+            )
+            conn.execute(
+                "INSERT INTO total_calories_burned_record_table(local_date, energy) VALUES (?, ?)",
+                (d, rnd.random() * 500000),
+            )
+            conn.execute(
+                "INSERT INTO active_calories_burned_record_table(local_date, energy) VALUES (?, ?)",
+                (d, rnd.random() * 200000),
+            )
+
+        conn.execute(
+            "INSERT INTO resting_heart_rate_record_table(local_date, value) VALUES (?, ?)",
+            (d, rnd.randint(50, 70)),
+        )
+        conn.execute(
+            "INSERT INTO oxygen_saturation_record_table(local_date, percentage) VALUES (?, ?)",
+            (d, 95 + rnd.random() * 4),
+        )
+
+        # 체중 0 (미측정) 행 포함
+        weight = 0 if d % 5 == 0 else 60000 + rnd.random() * 20000
+        conn.execute(
+            "INSERT INTO weight_record_table(local_date, weight) VALUES (?, ?)",
+            (d, weight),
+        )
+
+        # height 컬럼이 없는 테이블 → 기본값 0
+        conn.execute("INSERT INTO height_record_table(local_date) VALUES (?)", (d,))
+
+        start = d * DAY_MILLIS - KST_OFFSET_MILLIS - 60 * 60 * 1000
+        end = start + rnd.randint(4, 9) * 60 * 60 * 1000
+        conn.execute(
+            "INSERT INTO sleep_session_record_table(local_date, start_time, end_time) VALUES (?, ?, ?)",
+            (d, start, end),
+        )
+        conn.execute(
+            "INSERT INTO steps_cadence_record_table(local_date, samples) VALUES (?, ?)",
+            (d, b"\x01\x02\x03"),
+        )
+
+        # KST 자정 경계를 넘나드는 심박 샘플
+        for _ in range(hr_per_day):
+            ms = d * DAY_MILLIS + rnd.randint(-KST_OFFSET_MILLIS, 15 * 60 * 60 * 1000)
+            conn.execute(
+                "INSERT INTO heart_rate_record_series_table(epoch_millis, beats_per_minute) VALUES (?, ?)",
+                (ms, rnd.randint(50, 150)),
+            )
+
+    # skip 대상 행
+    conn.execute("INSERT INTO steps_record_table(local_date, count) VALUES (NULL, 5)")
+    conn.execute(
+        "INSERT INTO heart_rate_record_series_table(epoch_millis, beats_per_minute) VALUES (?, 0)",
+        (first_day * DAY_MILLIS,),
+    )
+    conn.execute(
+        "INSERT INTO sleep_session_record_table(local_date, start_time, end_time) VALUES (?, 0, ?)",
+        (first_day, first_day * DAY_MILLIS),
+    )
+
+    conn.commit()
+    conn.close()
+
+
+def _assert_same_by_day(expected: dict, actual: dict):
+    assert set(actual.keys()) == set(expected.keys())
+
+    for date_key, raw in expected.items():
+        assert set(actual[date_key].keys()) == set(raw.keys())
+        for field, value in raw.items():
+            assert math.isclose(
+                actual[date_key][field], value, rel_tol=1e-9, abs_tol=1e-9
+            ), (date_key, field, value, actual[date_key][field])
+
+
+@pytest.fixture
+def health_connect_db(tmp_path):
+    path = tmp_path / "health_connect_export.db"
+    _make_health_connect_db(str(path))
+    return str(path)
+
+
+@pytest.mark.parametrize("scan_workers", [1, 4])
+def test_stream_parser_matches_reference(health_connect_db, scan_workers):
+    expected = parse_db_json_to_raw_data_by_day(db_to_json(health_connect_db))
+    actual = parse_db_file_to_raw_data_by_day(
+        health_connect_db, chunk_size=7, scan_workers=scan_workers
+    )
+
+    _assert_same_by_day(expected, actual)
+
+
+@pytest.mark.parametrize("scan_workers", [1, 4])
+def test_sql_parser_matches_reference(health_connect_db, scan_workers):
+    expected = parse_db_json_to_raw_data_by_day(db_to_json(health_connect_db))
+    actual = parse_db_file_to_raw_data_by_day_sql(
+        health_connect_db, scan_workers=scan_workers
+    )
+
+    _assert_same_by_day(expected, actual)
+
+
+def test_sql_parser_skips_missing_tables(tmp_path):
+    path = tmp_path / "partial.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE steps_record_table(local_date INTEGER, count INTEGER)")
+    conn.execute("INSERT INTO steps_record_table VALUES (20000, 1200)")
+    conn.execute("INSERT INTO steps_record_table VALUES (20000, 300)")
+    conn.commit()
+    conn.close()
+
+    by_day = parse_db_file_to_raw_data_by_day_sql(str(path))
+
+    assert list(by_day.keys()) == [20000]
+    assert by_day[20000]["steps"] == 1500
+    assert by_day[20000]["heartRate"] == 0
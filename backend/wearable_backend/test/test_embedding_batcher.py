@@ -0,0 +1,89 @@
+# test_embedding_batcher.py
+# 임베딩 배치 분할(개수 + 토큰 예산), 동시 요청 결과 순서, 실패 배치만 재시도,
+# 재시도 불가 오류 / 재시도 소진 시 오류 전파 확인 (provider는 가짜 함수)
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_embedding_batcher.py
+import time
+import random
+import threading
+
+import pytest
+
+from app.core import embedding_batcher
+from app.core.embedding_batcher import embed_in_batches, estimate_tokens, split_batches
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(embedding_batcher, "backoff_delay", lambda *args: 0.0)
+
+
+def _vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 997)]
+
+
+def test_split_respects_count_and_token_budget():
+    texts = [f"day {i}" for i in range(25)]
+    assert split_batches(texts, 10, 10_000) == [(0, 10), (10, 20), (20, 25)]
+
+    long_text = "가" * 400
+    budget = estimate_tokens(long_text) * 2
+    texts = [long_text, long_text, long_text, "짧음"]
+    assert split_batches(texts, 100, budget) == [(0, 2), (2, 4)]
+
+    # 예산보다 큰 텍스트 하나는 단독 배치
+    assert split_batches([long_text, "a"], 100, 10) == [(0, 1), (1, 2)]
+
+
+def test_concurrent_batches_keep_order_and_retry_failed_only():
+    texts = [f"{i}일차 걸음 수 {i * 37}" for i in range(230)]
+    calls = []
+    failed_once = set()
+    lock = threading.Lock()
+
+    def provider(batch):
+        with lock:
+            calls.append(batch[0])
+        time.sleep(random.uniform(0, 0.01))
+        # 세 번째 배치는 처음 한 번 실패
+        if batch[0] == texts[40] and batch[0] not in failed_once:
+            failed_once.add(batch[0])
+            raise ConnectionError("temporary")
+        return [_vector(text) for text in batch]
+
+    stats = {}
+    vectors = embed_in_batches(
+        texts, provider, batch_size=20, concurrency=4, stats=stats
+    )
+
+    assert vectors == [_vector(text) for text in texts]
+    assert stats["batches"] == 12 and stats["retries"] == 1
+    assert stats["texts_per_sec"] > 0
+    assert sorted(calls) == sorted([texts[i] for i in range(0, 230, 20)] + [texts[40]])
+
+
+def test_non_retryable_and_exhausted_errors_raise():
+    attempts = []
+
+    def bad_request(batch):
+        attempts.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        embed_in_batches(
+            ["a", "b"],
+            bad_request,
+            batch_size=1,
+            concurrency=1,
+            retryable=lambda e: not isinstance(e, ValueError),
+        )
+    assert len(attempts) == 1
+
+    def always_down(batch):
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    attempts.clear()
+    with pytest.raises(ConnectionError):
+        embed_in_batches(["a"], always_down, max_retries=3)
+    assert len(attempts) == 4
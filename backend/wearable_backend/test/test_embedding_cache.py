@@ -0,0 +1,92 @@
+# test_embedding_cache.py
+# 임베딩 캐시: miss만 provider 호출, 요청 순서 / 중복 텍스트 처리, 메모리를 비워도
+# (재시작 / 다른 워커) SQLite에서 hit, float16 반올림 오차, 크기 제한 LRU 정리 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_embedding_cache.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import numpy as np
+import pytest
+
+from app.core import embedding_cache
+
+MODEL = "test-model"
+DIM = 64
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [
+            np.random.default_rng(sum(t.encode("utf-8"))).normal(0, 0.05, DIM).tolist()
+            for t in texts
+        ]
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        embedding_cache, "EMBEDDING_CACHE_DB", str(tmp_path / "emb.sqlite3")
+    )
+    embedding_cache.clear_embedding_cache()
+    yield
+    embedding_cache.clear_embedding_cache(disk=False)
+
+
+def test_only_misses_reach_provider():
+    provider = FakeProvider()
+    texts = ["걸음 수 8000", "수면  7시간", "걸음 수 8000", "심박 70"]
+
+    first = embedding_cache.get_embeddings(texts, MODEL, provider)
+    assert provider.calls == [["걸음 수 8000", "수면  7시간", "심박 70"]]
+    assert first[0] == first[2]
+
+    # 공백만 다른 텍스트는 같은 key, 메모리 초기화 후에도 SQLite에서 hit
+    embedding_cache.clear_embedding_cache(disk=False)
+    second = embedding_cache.get_embeddings(
+        [" 수면 7시간", "심박 70", "새 텍스트"], MODEL, provider
+    )
+    assert provider.calls[1] == ["새 텍스트"]
+    assert second[:2] == [first[1], first[3]]
+
+    # 다른 모델은 별도 key
+    embedding_cache.get_embeddings(["심박 70"], "other-model", provider)
+    assert provider.calls[2] == ["심박 70"]
+
+    stats = embedding_cache.embedding_cache_stats()
+    assert stats["disk_hits"] == 2 and stats["misses"] == 2
+    assert stats["disk_entries"] == 5
+    assert stats["disk_bytes"] == 5 * DIM * 2
+
+
+def test_float16_roundtrip_is_close():
+    provider = FakeProvider()
+    (original,) = provider(["정밀도"])
+    (cached,) = embedding_cache.get_embeddings(["정밀도"], MODEL, provider)
+
+    a, b = np.asarray(original), np.asarray(cached)
+    cosine = a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+    assert cosine > 0.9999
+
+
+def test_size_limits_evict_least_recently_used(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_MEMORY_ITEMS", 2)
+    monkeypatch.setattr(embedding_cache, "EMBEDDING_CACHE_MAX_BYTES", 3 * DIM * 2)
+    provider = FakeProvider()
+
+    for text in ["a", "b", "c", "d"]:
+        embedding_cache.get_embeddings([text], MODEL, provider)
+
+    stats = embedding_cache.embedding_cache_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["disk_entries"] == 3
+
+    # "a"는 디스크에서도 정리됨 → 다시 provider 호출
+    embedding_cache.clear_embedding_cache(disk=False)
+    embedding_cache.get_embeddings(["a", "d"], MODEL, provider)
+    assert provider.calls[-1] == ["a"]
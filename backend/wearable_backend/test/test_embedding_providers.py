@@ -0,0 +1,102 @@
+# test_embedding_providers.py
+# 임베딩 provider: 로컬 hashing 벡터의 결정성 / 차원 / 정규화, 비슷한 텍스트와 가까운 숫자가
+# 더 가깝게 나오는지, 이름으로 provider 선택, OpenAI 클라이언트 재사용, 차원 축소(앞 dim개 + 재정규화) 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_embedding_providers.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from app.core.embedding_providers import (
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    SentenceTransformerProvider,
+    TruncatedEmbeddingProvider,
+    create_embedding_provider,
+)
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b))
+
+
+def test_hashing_is_deterministic_and_normalized():
+    provider = HashingEmbeddingProvider(dim=128)
+    texts = ["2024년 3월 5일 걸음 수 8,000보, 평균 심박 70bpm", "", "수면 7.5시간"]
+
+    first = provider.embed(texts)
+    second = HashingEmbeddingProvider(dim=128).embed(texts)
+
+    assert first == second
+    assert all(len(vector) == 128 for vector in first)
+    assert np.linalg.norm(first[0]) == pytest.approx(1.0, abs=1e-5)
+    assert np.linalg.norm(first[1]) == 0.0  # 빈 텍스트는 0 벡터
+
+
+def test_hashing_similarity_follows_words_and_numbers():
+    provider = HashingEmbeddingProvider()
+    base, near, far, other = provider.embed(
+        [
+            "걸음 수 8,000보, 평균 심박 70bpm, 수면 7시간",
+            "걸음 수 8,300보, 평균 심박 71bpm, 수면 7시간",
+            "걸음 수 800보, 평균 심박 95bpm, 수면 3시간",
+            "체중 측정 기록 없음, 운동 일정 메모",
+        ]
+    )
+
+    assert _cosine(base, near) > _cosine(base, far) > _cosine(base, other)
+
+
+def test_factory_selects_provider_by_name():
+    assert isinstance(create_embedding_provider("hashing"), HashingEmbeddingProvider)
+    assert isinstance(create_embedding_provider("openai"), OpenAIEmbeddingProvider)
+
+    with pytest.raises(ValueError):
+        create_embedding_provider("unknown")
+
+    # provider마다 ChromaDB 컬렉션 분리 (openai는 기존 summaries 유지)
+    assert create_embedding_provider("openai").collection_suffix == ""
+    assert create_embedding_provider("hashing").collection_suffix.startswith(
+        "_hashing_"
+    )
+
+    if importlib.util.find_spec("sentence_transformers") is None:
+        with pytest.raises(ImportError):
+            SentenceTransformerProvider()
+
+
+def test_openai_client_is_shared():
+    provider = OpenAIEmbeddingProvider()
+    client = provider.client
+
+    assert provider.client is client
+    assert client.max_retries == 0  # 재시도는 embed_in_batches에서
+
+
+def test_truncated_provider_keeps_prefix_and_renormalizes():
+    base = HashingEmbeddingProvider(dim=128)
+    provider = TruncatedEmbeddingProvider(base, 32)
+    text = ["걸음 수 8,000보, 평균 심박 70bpm, 수면 7시간"]
+
+    (full,) = base.embed(text)
+    (short,) = provider.embed(text)
+
+    assert len(short) == 32
+    assert np.linalg.norm(short) == pytest.approx(1.0, abs=1e-5)
+    expected = np.asarray(full[:32]) / np.linalg.norm(full[:32])
+    assert np.allclose(short, expected, atol=1e-6)
+
+    # 원본 차원 데이터와 캐시 / 컬렉션이 섞이지 않도록 구분
+    assert provider.model == f"{base.model}@32"
+    assert provider.collection_suffix == f"{base.collection_suffix}_d32"
+    assert TruncatedEmbeddingProvider(
+        create_embedding_provider("openai"), 256
+    ).collection_suffix == "_d256"
+
+    with pytest.raises(ValueError):
+        TruncatedEmbeddingProvider(base, 256).embed(text)  # 원본보다 큰 차원
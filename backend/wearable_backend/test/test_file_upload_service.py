@@ -0,0 +1,131 @@
+# test_file_upload_service.py
+# 업로드 파이프라인(run_pipeline): 같은 파일 재업로드는 응답 캐시 / 증분 생략, 임베딩 차원(EMBEDDING_DIM)을
+# 바꿔 새 컬렉션이 되면 같은 파일을 다시 올렸을 때 새 컬렉션이 채워지는지 확인
+# 파이프라인 종료 후 이전 업로드 정리가 끝나지 않은 작업의 파일은 남기는지 확인
+# (압축 해제 / 파싱과 LLM 분석은 고정 결과로 대체)
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_file_upload_service.py
+import asyncio
+import os
+
+import chromadb
+import pytest
+
+from app.core import ingest_state, job_store, upload_cache
+from app.core.embedding_providers import TruncatedEmbeddingProvider
+from app.core.vector_index import UserVectorIndex
+from app.service import file_upload_service
+from app.service.file_upload_service import FileUploadService, PIPELINE_STAGES
+from conftest import EMBEDDER
+
+USER_ID = "pipeline@test.com"
+SHA256 = "c" * 64
+RAW_BY_DAY = {
+    20000 + i: {"steps": 1000 * (i + 1), "heart_rate": 70, "sleep_hr": 7}
+    for i in range(10)
+}
+
+
+@pytest.fixture(autouse=True)
+def local_state(tmp_path, monkeypatch):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "extracted").mkdir()
+    monkeypatch.setattr(file_upload_service, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(file_upload_service, "EXTRACTED_DIR", tmp_path / "extracted")
+    monkeypatch.setattr(file_upload_service, "UPLOAD_CACHE_ENABLED", True)
+    monkeypatch.setattr(
+        ingest_state, "INGEST_STATE_DB", str(tmp_path / "ingest_state.sqlite3")
+    )
+    cache_dir = tmp_path / "upload_cache"
+    monkeypatch.setattr(upload_cache, "UPLOAD_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(upload_cache, "_INDEX_DB", str(cache_dir / "index.sqlite3"))
+    monkeypatch.setattr(job_store, "UPLOAD_JOB_DB", str(tmp_path / "jobs.sqlite3"))
+
+    async def extract_and_parse(self, upload, report, tz_offset_minutes):
+        return "samsung", {day: dict(raw) for day, raw in RAW_BY_DAY.items()}
+
+    monkeypatch.setattr(FileUploadService, "_extract_and_parse", extract_and_parse)
+    monkeypatch.setattr(
+        file_upload_service, "run_llm_analysis", lambda *args: {"analysis": "ok"}
+    )
+
+
+def _upload(service: FileUploadService) -> dict:
+    upload = service.new_upload("healthconnect.zip", USER_ID)
+    upload["sha256"] = SHA256
+    return upload
+
+
+def _run(service: FileUploadService) -> dict:
+    return asyncio.run(service.run_pipeline(_upload(service), USER_ID, "중", 30))
+
+
+def test_dimension_switch_fills_new_collection(vs, tmp_path, monkeypatch):
+    service = FileUploadService()
+
+    first = _run(service)
+    assert first["ingest"]["new_days"] == 10
+    assert vs.collection.count() == 10
+
+    # 같은 파일 + 같은 설정 → 응답 캐시
+    assert _run(service)["cache"]["hit"] == "response"
+
+    # EMBEDDING_DIM=32 → 접미사 _d32 컬렉션 + 32차원 벡터
+    truncated = TruncatedEmbeddingProvider(EMBEDDER, 32)
+    collection = chromadb.EphemeralClient().get_or_create_collection(
+        name=f"summaries{truncated.collection_suffix}",
+        metadata={"hnsw:space": "cosine"},
+    )
+    monkeypatch.setattr(vs, "collection", collection)
+    monkeypatch.setattr(vs, "vector_index", UserVectorIndex(str(tmp_path / "vi32")))
+    monkeypatch.setattr(vs, "batch_embed_texts", truncated.embed)
+    monkeypatch.setattr(
+        vs, "get_cached_embedding", lambda text: truncated.embed([text])[0]
+    )
+
+    switched = _run(service)
+    assert switched["cache"]["hit"] == "raw"  # 파싱 결과만 재사용
+    assert switched["ingest"]["new_days"] == 10
+    assert switched["ingest"]["skipped_days"] == 0
+    assert collection.count() == 10
+
+    stored = collection.get(include=["embeddings"])
+    assert len(stored["embeddings"][0]) == 32
+    similar = vs.search_similar_summaries({"steps": 5000}, USER_ID, top_k=3)
+    assert len(similar["similar_days"]) == 3
+
+    # 새 컬렉션 기준으로도 두 번째부터는 생략
+    assert _run(service)["cache"]["hit"] == "response"
+
+
+def test_cleanup_keeps_files_of_unfinished_jobs(vs):
+    service = FileUploadService()
+    user_short = USER_ID.replace("@", "_").replace(".", "_")
+    uploads = file_upload_service.UPLOADS_DIR
+    extracted = file_upload_service.EXTRACTED_DIR
+
+    def leftover(stamp: str) -> dict:
+        (extracted / f"{user_short}_{stamp}").mkdir()
+        path = uploads / f"{user_short}_{stamp}_healthconnect.zip"
+        path.write_bytes(b"zip")
+        return {
+            "temp_dir": str(extracted / f"{user_short}_{stamp}"),
+            "original_save_path": str(path),
+        }
+
+    old = leftover("20250101_000000")
+    # 아직 워커가 실행하지 않은 작업의 파일
+    pending = leftover("20250102_000000")
+    job_store.create_job(
+        USER_ID, "healthconnect.zip", PIPELINE_STAGES, {"upload": pending}
+    )
+
+    current = _upload(service)
+    with open(current["original_save_path"], "wb") as f:
+        f.write(b"zip")
+    asyncio.run(service.run_pipeline(current, USER_ID, "중", 30))
+
+    for key in ("temp_dir", "original_save_path"):
+        assert not os.path.exists(old[key])
+        assert os.path.exists(pending[key])
+        assert os.path.exists(current[key])
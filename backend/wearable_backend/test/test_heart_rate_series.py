@@ -0,0 +1,209 @@
+# test_heart_rate_series.py
+# 심박수 series 벡터화 날짜 버킷팅이 행 단위 기준 구현
+# (db_parser._epoch_millis_to_local_date + 날짜별 누적)과 같은지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_heart_rate_series.py
+import math
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.core.db_parser import _epoch_millis_to_local_date
+from app.core.heart_rate_series import (
+    DAY_MILLIS,
+    HR_SUMMARY_FIELDS,
+    HR_ZONE_EDGES,
+    OVERNIGHT_END_MILLIS,
+    add_heart_rate_sample,
+    epoch_millis_to_local_days,
+    heart_rate_by_day,
+    heart_rate_stats_from_arrays,
+    heart_rate_summary,
+    merge_day_stats,
+    new_heart_rate_sketch,
+)
+
+KST_OFFSET_MILLIS = 9 * 60 * 60 * 1000
+
+
+def _reference_stats(samples, tz_offset_minutes=540):
+    """행 단위 기준 구현 (datetime으로 현지 날짜 계산)"""
+    tz = timezone(timedelta(minutes=tz_offset_minutes))
+    epoch = datetime(1970, 1, 1).date()
+    stats = {}
+    for epoch_millis, bpm in samples:
+        if not epoch_millis or not bpm:
+            continue
+        local = datetime.fromtimestamp(epoch_millis / 1000, tz=timezone.utc)
+        day = (local.astimezone(tz).date() - epoch).days
+        s = stats.setdefault(day, {"sum": 0, "count": 0, "min": bpm, "max": bpm})
+        s["sum"] += bpm
+        s["count"] += 1
+        s["min"] = min(s["min"], bpm)
+        s["max"] = max(s["max"], bpm)
+    return stats
+
+
+def _random_samples(n=5000, seed=7):
+    rnd = random.Random(seed)
+    samples = []
+    for _ in range(n):
+        day = rnd.randint(19000, 19010)
+        # KST 자정 전후 1초 안쪽 샘플 포함
+        if rnd.random() < 0.2:
+            ms = day * DAY_MILLIS - KST_OFFSET_MILLIS + rnd.randint(-1000, 1000)
+        else:
+            ms = day * DAY_MILLIS + rnd.randint(0, DAY_MILLIS - 1)
+        samples.append((ms, rnd.randint(45, 180)))
+    return samples
+
+
+def _assert_same_stats(expected: dict, actual: dict):
+    assert set(actual.keys()) == set(expected.keys())
+    for day, s in expected.items():
+        assert actual[day]["count"] == s["count"]
+        assert math.isclose(actual[day]["sum"], s["sum"])
+        assert math.isclose(actual[day]["mean"], s["sum"] / s["count"])
+        assert actual[day]["min"] == s["min"]
+        assert actual[day]["max"] == s["max"]
+
+
+def test_local_days_match_datetime_conversion():
+    samples = _random_samples()
+    millis = np.array([ms for ms, _ in samples], dtype=np.int64)
+
+    days = epoch_millis_to_local_days(millis)
+
+    assert days.tolist() == [_epoch_millis_to_local_date(ms) for ms, _ in samples]
+
+
+def test_local_days_boundaries_and_negative_offset():
+    # 자정 직전 / 자정 / 1970년 이전 (음수 epoch → floor)
+    midnight_kst = 20000 * DAY_MILLIS - KST_OFFSET_MILLIS
+    millis = np.array([midnight_kst - 1, midnight_kst, -1, -DAY_MILLIS - 1])
+
+    assert epoch_millis_to_local_days(millis, 540).tolist() == [19999, 20000, 0, -1]
+    # UTC-5: 같은 시각이 하루 전 날짜
+    assert epoch_millis_to_local_days(np.array([midnight_kst]), -300).tolist() == [
+        19999
+    ]
+
+
+def test_stats_match_row_reference():
+    samples = _random_samples()
+    samples += [(0, 80), (20000 * DAY_MILLIS, 0)]  # skip 대상 (0 = NULL)
+    millis, bpm = zip(*samples)
+
+    for tz_offset_minutes in (540, 0, -300, 330):
+        _assert_same_stats(
+            _reference_stats(samples, tz_offset_minutes),
+            heart_rate_stats_from_arrays(
+                np.array(millis), np.array(bpm), tz_offset_minutes
+            ),
+        )
+
+
+def test_db_chunks_match_row_reference(tmp_path):
+    samples = _random_samples(n=3000, seed=3)
+    rnd = random.Random(11)
+    rnd.shuffle(samples)  # 시간순이 아닌 행 순서
+
+    path = str(tmp_path / "hr.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE heart_rate_record_series_table("
+        "row_id INTEGER PRIMARY KEY, parent_key INTEGER, "
+        "epoch_millis INTEGER, beats_per_minute INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO heart_rate_record_series_table"
+        "(epoch_millis, beats_per_minute) VALUES (?, ?)",
+        samples,
+    )
+    # NULL / REAL 값 / rowid 구멍
+    conn.execute(
+        "INSERT INTO heart_rate_record_series_table"
+        "(epoch_millis, beats_per_minute) VALUES (NULL, 70)"
+    )
+    conn.execute(
+        "INSERT INTO heart_rate_record_series_table"
+        "(row_id, epoch_millis, beats_per_minute) VALUES (9000, ?, 72.5)",
+        (19005 * DAY_MILLIS,),
+    )
+    conn.commit()
+
+    expected = _reference_stats(samples + [(19005 * DAY_MILLIS, 72.5)])
+    _assert_same_stats(expected, heart_rate_by_day(conn, chunk_rows=257))
+    conn.close()
+
+
+def test_db_without_series_columns_returns_empty(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "empty.db"))
+    assert heart_rate_by_day(conn) == {}
+
+    conn.execute("CREATE TABLE heart_rate_record_series_table(row_id INTEGER)")
+    assert heart_rate_by_day(conn) == {}
+    conn.close()
+
+
+def _reference_summary(samples, tz_offset_minutes=540):
+    """날짜별 원본 샘플 리스트로 계산한 분포 요약 (sketch 기준값)"""
+    offset = tz_offset_minutes * 60 * 1000
+    by_day = {}
+    for epoch_millis, bpm in samples:
+        day = (epoch_millis + offset) // DAY_MILLIS
+        by_day.setdefault(day, []).append((epoch_millis, bpm))
+
+    expected = {}
+    for day, rows in by_day.items():
+        values = np.array([bpm for _, bpm in rows])
+        overnight = [
+            bpm for ms, bpm in rows if (ms + offset) % DAY_MILLIS < OVERNIGHT_END_MILLIS
+        ]
+        p5, p50, p95 = np.percentile(values, [5, 50, 95], method="inverted_cdf")
+        summary = {
+            "heart_rate_p5": p5,
+            "heart_rate_p50": p50,
+            "heart_rate_p95": p95,
+            "min_overnight_heart_rate": min(overnight) if overnight else 0,
+        }
+        edges = HR_ZONE_EDGES + [10**9]
+        for zone in range(len(HR_ZONE_EDGES)):
+            in_zone = ((values >= edges[zone]) & (values < edges[zone + 1])).sum()
+            summary[f"hr_zone{zone + 1}_pct"] = round(in_zone / len(values) * 100, 2)
+        expected[day] = summary
+    return expected
+
+
+def test_sketch_summary_matches_exact_percentiles():
+    samples = _random_samples(n=20000, seed=5)
+    expected = _reference_summary(samples)
+
+    # 행 단위 sketch
+    sketches = {}
+    for epoch_millis, bpm in samples:
+        day = (epoch_millis + KST_OFFSET_MILLIS) // DAY_MILLIS
+        sketch = sketches.setdefault(day, new_heart_rate_sketch())
+        add_heart_rate_sample(sketch, bpm, epoch_millis)
+
+    # 배열 경로 (두 구간으로 나눠 병합)
+    millis, bpm = map(np.array, zip(*samples))
+    stats = heart_rate_stats_from_arrays(millis[:7000], bpm[:7000])
+    merge_day_stats(stats, heart_rate_stats_from_arrays(millis[7000:], bpm[7000:]))
+
+    for day, summary in expected.items():
+        assert heart_rate_summary(sketches[day]) == summary
+        assert heart_rate_summary(stats[day]) == summary
+
+
+def test_sketch_size_is_constant_and_empty_summary_is_zero():
+    sketch = new_heart_rate_sketch()
+    size = len(sketch["hist"])
+    for i in range(10000):
+        add_heart_rate_sample(sketch, 60 + i % 120, 20000 * DAY_MILLIS + i * 1000)
+
+    assert len(sketch["hist"]) == size
+    assert heart_rate_summary(None) == {field: 0 for field in HR_SUMMARY_FIELDS}
+    assert heart_rate_summary(new_heart_rate_sketch())["heart_rate_p50"] == 0
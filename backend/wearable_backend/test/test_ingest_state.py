@@ -0,0 +1,136 @@
+# test_ingest_state.py
+# 증분 업로드 상태: 날짜별 new / changed / skipped 분류, watermark 갱신(더 과거 날짜로 내려가지 않음),
+# 키 순서와 무관한 hash, (user_id, source, collection) 단위 상태 분리와 삭제,
+# collection 컬럼이 없는 이전 버전 테이블 처리 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_ingest_state.py
+import sqlite3
+
+import pytest
+
+from app.core import ingest_state
+
+USER_ID = "ingest@test.com"
+SOURCE = "zip_samsung"
+
+
+@pytest.fixture(autouse=True)
+def state_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingest_state, "INGEST_STATE_DB", str(tmp_path / "ingest_state.sqlite3")
+    )
+
+
+def _raw(steps: int) -> dict:
+    return {"steps": steps, "heart_rate": 70, "sleep_hr": 7.0}
+
+
+def test_hash_ignores_key_order():
+    day_hash = ingest_state.compute_day_hash(_raw(1000))
+    reordered = dict(reversed(list(_raw(1000).items())))
+    assert ingest_state.compute_day_hash(reordered) == day_hash
+    assert ingest_state.compute_day_hash(_raw(1001)) != day_hash
+
+
+def test_plan_classifies_new_changed_skipped():
+    first = {20000: _raw(1000), 20001: _raw(2000), 20002: _raw(3000)}
+    plan = ingest_state.plan_incremental_ingest(USER_ID, SOURCE, first)
+    assert plan["new"] == [20000, 20001, 20002]
+    assert plan["changed"] == plan["skipped"] == []
+    assert plan["watermark"] is None
+
+    ingest_state.record_ingested_days(USER_ID, SOURCE, plan["hashes"])
+    assert ingest_state.get_watermark(USER_ID, SOURCE) == 20002
+
+    # 다시 올린 ZIP: 같은 날짜(키 순서만 다름) / 과거 보정 / 새 날짜
+    # (watermark보다 과거여도 처음 보는 날짜는 new)
+    second = {
+        19999: _raw(500),
+        20000: dict(reversed(list(_raw(1000).items()))),
+        20001: _raw(2500),
+        20003: _raw(4000),
+    }
+    plan = ingest_state.plan_incremental_ingest(USER_ID, SOURCE, second)
+    assert plan["new"] == [19999, 20003]
+    assert plan["changed"] == [20001]
+    assert plan["skipped"] == [20000]
+    assert plan["watermark"] == 20002
+
+    # 다른 출처는 상태가 따로
+    other = ingest_state.plan_incremental_ingest(USER_ID, "zip_apple", second)
+    assert other["new"] == [19999, 20000, 20001, 20003]
+
+
+def test_watermark_never_moves_back():
+    ingest_state.record_ingested_days(USER_ID, SOURCE, {20010: "a"})
+    # 과거 날짜만 보정 → watermark 유지
+    ingest_state.record_ingested_days(USER_ID, SOURCE, {20005: "b"})
+    assert ingest_state.get_watermark(USER_ID, SOURCE) == 20010
+    assert ingest_state.get_day_hashes(USER_ID, SOURCE) == {20010: "a", 20005: "b"}
+
+    # 빈 기록은 아무것도 안 함
+    ingest_state.record_ingested_days(USER_ID, "zip_apple", {})
+    assert ingest_state.get_watermark(USER_ID, "zip_apple") is None
+
+
+def test_delete_ingest_state():
+    for user_id in (USER_ID, "other@test.com"):
+        for source in (SOURCE, "zip_apple"):
+            ingest_state.record_ingested_days(user_id, source, {20000: "a"})
+
+    assert ingest_state.delete_ingest_state() == 0
+    assert ingest_state.delete_ingest_state(user_id=USER_ID, source=SOURCE) == 1
+    assert ingest_state.get_watermark(USER_ID, SOURCE) is None
+    assert ingest_state.get_watermark(USER_ID, "zip_apple") == 20000
+
+    assert ingest_state.delete_ingest_state(source="zip_apple") == 2
+    assert ingest_state.delete_ingest_state(user_id="other@test.com") == 1
+
+    # 삭제 후 다시 올리면 모든 날짜가 new
+    plan = ingest_state.plan_incremental_ingest(USER_ID, SOURCE, {20000: _raw(1)})
+    assert plan["new"] == [20000]
+
+
+def test_state_is_per_collection():
+    days = {20000: _raw(1000), 20001: _raw(2000)}
+    plan = ingest_state.plan_incremental_ingest(USER_ID, SOURCE, days, "summaries")
+    ingest_state.record_ingested_days(USER_ID, SOURCE, plan["hashes"], "summaries")
+
+    same = ingest_state.plan_incremental_ingest(USER_ID, SOURCE, days, "summaries")
+    assert same["skipped"] == [20000, 20001]
+
+    # 임베딩 설정 변경 → 새 컬렉션에는 아직 저장한 날짜가 없음
+    switched = ingest_state.plan_incremental_ingest(
+        USER_ID, SOURCE, days, "summaries_d256"
+    )
+    assert switched["new"] == [20000, 20001] and switched["watermark"] is None
+
+    # 삭제는 모든 컬렉션의 상태
+    ingest_state.record_ingested_days(
+        USER_ID, SOURCE, switched["hashes"], "summaries_d256"
+    )
+    assert ingest_state.delete_ingest_state(user_id=USER_ID) == 4
+
+
+def test_legacy_tables_without_collection_are_dropped():
+    conn = sqlite3.connect(ingest_state.INGEST_STATE_DB)
+    conn.executescript(
+        """
+        CREATE TABLE ingest_days (
+            user_id TEXT, source TEXT, local_date INTEGER,
+            content_hash TEXT, ingested_at TEXT,
+            PRIMARY KEY (user_id, source, local_date)
+        );
+        CREATE TABLE ingest_watermarks (
+            user_id TEXT, source TEXT, watermark INTEGER, updated_at TEXT,
+            PRIMARY KEY (user_id, source)
+        );
+        INSERT INTO ingest_days VALUES ('u', 'zip_samsung', 20000, 'a', 'x');
+        INSERT INTO ingest_watermarks VALUES ('u', 'zip_samsung', 20000, 'x');
+        """
+    )
+    conn.close()
+
+    # 어느 컬렉션에 저장했는지 모르는 이전 상태 → 전체 다시 반영
+    plan = ingest_state.plan_incremental_ingest("u", "zip_samsung", {20000: _raw(1)})
+    assert plan["new"] == [20000] and plan["watermark"] is None
@@ -0,0 +1,131 @@
+# test_metric_index.py
+# 지표 벡터 kNN: 값 없음 mask를 반영한 z-score 거리 top_k가 numpy 직접 계산 결과와 같은지,
+# 쿼리 날짜 제외, search_similar_metrics가 임베딩 없이 검색하고 사용할 수 없으면 임베딩 검색으로
+# 넘어가는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_metric_index.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import numpy as np
+import pytest
+
+from app.core import metric_index, timeseries_store
+from app.utils.preprocess import preprocess_health_json
+from conftest import EMBEDDER
+
+USER_ID = "metric@test.com"
+
+
+def _summary(date_int: int, steps: int, sleep_hr: float, heart_rate: int) -> dict:
+    raw = {"steps": steps, "sleep_hr": sleep_hr, "heart_rate": heart_rate}
+    return preprocess_health_json(raw, date_int, "samsung")
+
+
+def _item(summary: dict) -> dict:
+    date = summary["created_at"][:10]
+    return {
+        "document_id": f"{USER_ID}_{date}",
+        "user_id": USER_ID,
+        "date": date,
+        "timestamp": int(date.replace("-", "")),
+        "health_score": 70,
+        "recommended_intensity": "중",
+        "source": "zip_samsung",
+        "platform": "samsung",
+        "updated_at": "20250101120000",
+        "raw": summary["raw"],
+        "summary_text": summary["summary_text"],
+    }
+
+
+@pytest.fixture(autouse=True)
+def timeseries_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries_store, "TIMESERIES_DIR", str(tmp_path / "ts"))
+
+
+@pytest.fixture
+def vs_timeseries() -> bool:
+    """지표 kNN은 시계열 저장소를 읽음"""
+    return True
+
+
+def test_search_matches_masked_reference():
+    rng = np.random.default_rng(0)
+    summaries = []
+    for i in range(200):
+        steps = int(rng.integers(2000, 15000))
+        # 일부 날은 수면 / 심박 측정 없음 (0)
+        sleep_hr = float(rng.uniform(4, 9)) if i % 5 else 0
+        heart_rate = int(rng.integers(55, 90)) if i % 7 else 0
+        summaries.append(_summary(20000 + i, steps, sleep_hr, heart_rate))
+    timeseries_store.upsert_timeseries(USER_ID, [_item(s) for s in summaries])
+
+    query = {"steps": 8000, "sleep_hr": 7.0, "heart_rate": 0, "activity_level": "x"}
+    got = metric_index.search_metrics(USER_ID, query, top_k=10)
+
+    # 기준: 사용자 분포로 표준화한 steps / sleep_hr 거리 (수면 없는 날은 1 + z²)
+    steps = np.array([s["raw"]["steps"] for s in summaries], dtype=float)
+    sleep = np.array([s["raw"]["sleep_hr"] for s in summaries], dtype=float)
+    has_sleep = sleep != 0
+    z_steps = (steps - steps.mean()) / steps.std()
+    mean, std = sleep[has_sleep].mean(), sleep[has_sleep].std()
+    q_steps = (8000 - steps.mean()) / steps.std()
+    q_sleep = (7.0 - mean) / std
+    sleep_term = np.where(
+        has_sleep, ((sleep - mean) / std - q_sleep) ** 2, 1 + q_sleep**2
+    )
+    reference = np.sqrt(((z_steps - q_steps) ** 2 + sleep_term) / 2)
+
+    expected = np.argsort(reference, kind="stable")[:10]
+    got_steps = [item["raw"]["steps"] for item in got]
+    assert got_steps == steps[expected].astype(int).tolist()
+    np.testing.assert_allclose(
+        [item["similarity_distance"] for item in got], reference[expected], rtol=1e-4
+    )
+    assert got[0]["summary_text"]
+
+
+def test_exclude_and_unusable_query():
+    items = [_item(_summary(20000 + i, 1000 * (i + 1), 7, 70)) for i in range(5)]
+    timeseries_store.upsert_timeseries(USER_ID, items)
+
+    got = metric_index.search_metrics(
+        USER_ID, {"steps": 3000}, top_k=1, exclude_timestamps=[items[2]["timestamp"]]
+    )
+    assert [item["raw"]["steps"] for item in got] == [2000]
+
+    # 겹치는 지표가 없으면 None (임베딩 검색 대상)
+    assert metric_index.search_metrics(USER_ID, {"glucose": 100}, top_k=1) is None
+    assert metric_index.search_metrics("nobody@test.com", {"steps": 1}, 1) is None
+
+
+def test_search_similar_metrics_skips_embedding(vs, monkeypatch):
+    summaries = [_summary(20000 + i, 1000 * (i + 1), 7, 70) for i in range(20)]
+    vs.save_daily_summaries_batch(summaries, USER_ID, "zip_samsung")
+
+    def no_embedding(text):
+        raise AssertionError("임베딩 호출")
+
+    monkeypatch.setattr(vs, "get_cached_embedding", no_embedding)
+    today = summaries[-1]
+    result = vs.search_similar_metrics(
+        today["raw"], USER_ID, top_k=3, exclude_date=today["created_at"][:10]
+    )
+
+    # 가까운 10일(19000 ~ 10000보) 중 최신 날짜 3개, 분석 날짜(20000보) 제외
+    steps = [day["raw"]["steps"] for day in result["similar_days"]]
+    assert steps == [19000, 18000, 17000]
+    assert all(day["summary_text"] for day in result["similar_days"])
+
+    # 시계열 저장소를 쓸 수 없으면 fallback_query로 임베딩 검색
+    monkeypatch.setattr(vs, "TIMESERIES_STORE_ENABLED", False)
+    monkeypatch.setattr(
+        vs, "get_cached_embedding", lambda text: EMBEDDER.embed([text])[0]
+    )
+    result = vs.search_similar_metrics(
+        today["raw"], USER_ID, top_k=3, fallback_query={"steps": 20000}
+    )
+    assert result["query"] == "steps: 20000"
+    assert len(result["similar_days"]) == 3
@@ -0,0 +1,119 @@
+# test_recency_index.py
+# 최신순 인덱스: 필요한 날짜 수만큼만 읽고 멈추는지, 같은 날짜 여러 출처 중 updated_at 최신 선택,
+# 재저장 시 이전 행 교체, 저장할 때마다 갱신된 인덱스 결과가 ChromaDB 전체 정렬 결과와 같은지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_recency_index.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import pytest
+
+from app.core import day_merge, recency_index, summary_store
+from app.utils.preprocess import preprocess_health_json
+
+USER_ID = "recent@test.com"
+
+
+def _row(day: int, source: str, updated_at: str) -> dict:
+    date = f"2025-01-{day:02d}"
+    return {
+        "document_id": f"{USER_ID}_{date}_{source}",
+        "user_id": USER_ID,
+        "date": date,
+        "timestamp": int(date.replace("-", "")),
+        "health_score": 70,
+        "recommended_intensity": "중",
+        "source": source,
+        "platform": "samsung",
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture(autouse=True)
+def stores(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        recency_index, "RECENCY_INDEX_DB", str(tmp_path / "recency.sqlite3")
+    )
+    monkeypatch.setattr(
+        summary_store, "SUMMARY_STORE_DB", str(tmp_path / "summary_store.sqlite3")
+    )
+
+
+def test_take_recent_stops_after_requested_days():
+    consumed = []
+
+    def rows():
+        for day in range(31, 0, -1):
+            for source in ("zip_samsung", "api_samsung"):
+                consumed.append(day)
+                yield _row(day, source, "20250101000000")
+
+    picked = recency_index.take_recent(rows(), days=3)
+    assert [row["date"][-2:] for row in picked] == ["31", "30", "29"]
+    # 4번째 날짜의 첫 행을 본 뒤 멈춤 (히스토리 길이와 무관)
+    assert len(consumed) == 7
+
+    picked = recency_index.take_recent(
+        (_row(day, "zip_samsung", "x") for day in (5, 5, 4)), days=1, all_sources=True
+    )
+    assert len(picked) == 2
+
+
+def test_index_orders_by_date_then_updated_at_and_replaces_documents():
+    assert recency_index.recent_documents(USER_ID, 1) is None  # 아직 생성 전
+
+    recency_index.upsert_recency(
+        USER_ID,
+        [
+            _row(1, "zip_samsung", "20250101000000"),
+            _row(2, "zip_samsung", "20250102000000"),
+            _row(2, "api_samsung", "20250103000000"),
+        ],
+    )
+    latest = recency_index.recent_documents(USER_ID, 1)
+    assert [row["source"] for row in latest] == ["api_samsung"]
+
+    # 같은 문서를 다시 저장 → 이전 행 교체 (updated_at이 바뀌어도 1행)
+    recency_index.upsert_recency(USER_ID, [_row(2, "zip_samsung", "20250104000000")])
+    rows = recency_index.recent_documents(USER_ID, 5, all_sources=True)
+    assert [(row["date"][-2:], row["source"]) for row in rows] == [
+        ("02", "zip_samsung"),
+        ("02", "api_samsung"),
+        ("01", "zip_samsung"),
+    ]
+
+    only_api = recency_index.recent_documents(
+        USER_ID, 5, accept=lambda row: row["source"].startswith("api_")
+    )
+    assert [row["date"][-2:] for row in only_api] == ["02"]
+
+
+def test_saves_keep_index_equal_to_chroma_scan(vs, monkeypatch):
+    # 두 출처를 같은 초에 저장하므로 updated_at 대신 우선순위로 기준 출처 지정
+    monkeypatch.setattr(day_merge, "SOURCE_PRECEDENCE", ["api_samsung"])
+
+    def summary(date_int, steps):
+        raw = {"steps": steps, "heart_rate": 70, "sleep_hr": 7}
+        return preprocess_health_json(raw, date_int, "samsung")
+
+    vs.save_daily_summaries_batch(
+        [summary(20000 + i, 100 * i) for i in range(30)], USER_ID, "zip_samsung"
+    )
+    vs.save_daily_summary(summary(20029, 777), USER_ID, "api_samsung")
+
+    # 같은 날짜 두 출처 → 병합 문서 1개 (기준 출처 api_samsung)
+    latest_day = vs.get_recent_documents(USER_ID, days=1, all_sources=True)
+    assert [item["source"] for item in latest_day] == ["api_samsung"]
+
+    from_app = vs.get_recent_documents(
+        USER_ID, days=1, accept=lambda item: item["source"].startswith("api_")
+    )
+    assert from_app[0]["raw"]["steps"] == 777
+
+    indexed = vs.get_recent_summaries(USER_ID, limit=7)
+    monkeypatch.setattr(vs, "RECENCY_INDEX_ENABLED", False)
+    scanned = vs.get_recent_summaries(USER_ID, limit=7)
+
+    assert [item["date"] for item in indexed] == [item["date"] for item in scanned]
+    assert [item["raw"] for item in indexed] == [item["raw"] for item in scanned]
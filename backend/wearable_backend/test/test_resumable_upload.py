@@ -0,0 +1,224 @@
+# test_resumable_upload.py
+# 이어받기 업로드: handshake(start / resume / ingested), 끊긴 chunk 이후 offset,
+# Upload-Offset 불일치 / 크기 초과 / SHA-256 불일치 처리, 완료 파일이 uploads/ 에
+# 그대로 옮겨졌는지, 마지막 PATCH와 동시에 온 handshake가 작업을 한 번만 등록하는지,
+# 업로드 캐시에 응답이 있으면 업로드 없이 ingested, 임베딩 설정이 바뀌면 다시 받는지 확인
+# (파이프라인 작업은 job_store 기록까지만)
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_resumable_upload.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import job_store, upload_cache, upload_sessions
+from app.core.upload_cache import KIND_RESPONSE
+from app.service import file_upload_service, resumable_upload_service
+from app.service.file_upload_service import FileUploadService
+from app.service.upload_job_service import UploadJobService
+from app.service.resumable_upload_service import ResumableUploadService
+
+USER_ID = "resume@test.com"
+DATA = os.urandom(300_000)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+class FakeJobService:
+    """작업 등록만 기록 (워커 / 파이프라인 실행 없음)"""
+
+    job_links = staticmethod(UploadJobService.job_links)
+    complete_from_cache = UploadJobService.complete_from_cache
+
+    def __init__(self):
+        self.upload_service = FileUploadService()
+        self.enqueued = []
+
+    async def enqueue(self, upload, user_id, difficulty, duration, save_elapsed=0.0):
+        job_id = job_store.create_job(user_id, upload["filename"], ["save"], {})
+        self.enqueued.append(upload)
+        return self.job_links(job_id, user_id)
+
+
+@pytest.fixture(autouse=True)
+def local_dirs(tmp_path, monkeypatch):
+    uploads = tmp_path / "uploads"
+    (uploads / "partial").mkdir(parents=True)
+    (tmp_path / "extracted").mkdir()
+    monkeypatch.setattr(file_upload_service, "UPLOADS_DIR", uploads)
+    monkeypatch.setattr(file_upload_service, "EXTRACTED_DIR", tmp_path / "extracted")
+    monkeypatch.setattr(resumable_upload_service, "PARTIAL_DIR", uploads / "partial")
+    monkeypatch.setattr(
+        upload_sessions, "RESUMABLE_UPLOAD_DB", str(tmp_path / "sessions.sqlite3")
+    )
+    monkeypatch.setattr(job_store, "UPLOAD_JOB_DB", str(tmp_path / "jobs.sqlite3"))
+    cache_dir = tmp_path / "upload_cache"
+    monkeypatch.setattr(upload_cache, "UPLOAD_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(upload_cache, "_INDEX_DB", str(cache_dir / "index.sqlite3"))
+    monkeypatch.setattr(resumable_upload_service, "UPLOAD_CACHE_ENABLED", True)
+
+
+async def _chunks(data: bytes, size: int = 64 * 1024, fail_after: int | None = None):
+    for i, start in enumerate(range(0, len(data), size)):
+        if fail_after is not None and i == fail_after:
+            raise ConnectionResetError("client disconnected")
+        yield data[start : start + size]
+
+
+def _handshake(service, sha256=SHA256, size=len(DATA)):
+    return service.handshake("healthconnect.zip", size, sha256, USER_ID, "중", 30)
+
+
+def test_resume_after_disconnect_and_ingested_handshake():
+    async def scenario():
+        jobs = FakeJobService()
+        service = ResumableUploadService(jobs)
+
+        first = await _handshake(service)
+        assert first["action"] == "start" and first["offset"] == 0
+        upload_id = first["upload_id"]
+
+        # 세 번째 chunk 전에 연결이 끊김 → 앞 두 chunk는 유지
+        with pytest.raises(ConnectionResetError):
+            await service.append_chunk(upload_id, 0, _chunks(DATA, fail_after=2))
+
+        # 서버 재시작 (해시 계산 상태 없음) 후 handshake → 이어받기
+        service = ResumableUploadService(jobs)
+        second = await _handshake(service)
+        assert second == {**first, "action": "resume", "offset": 2 * 64 * 1024}
+
+        offset = second["offset"]
+        done = await service.append_chunk(upload_id, offset, _chunks(DATA[offset:]))
+        assert done["offset"] == len(DATA) and done["job_id"]
+
+        (upload,) = jobs.enqueued
+        assert upload["sha256"] == SHA256
+        assert upload["temp_path"] == upload["original_save_path"]
+        with open(upload["original_save_path"], "rb") as f:
+            assert f.read() == DATA
+        assert not os.listdir(resumable_upload_service.PARTIAL_DIR)
+
+        third = await _handshake(service)
+        assert third["action"] == "ingested" and third["job_id"] == done["job_id"]
+        assert len(jobs.enqueued) == 1
+
+    asyncio.run(scenario())
+
+
+def test_rejects_bad_offset_oversize_and_hash_mismatch():
+    async def scenario():
+        service = ResumableUploadService(FakeJobService())
+        upload_id = (await _handshake(service))["upload_id"]
+
+        await service.append_chunk(upload_id, 0, _chunks(DATA[:1000]))
+
+        with pytest.raises(HTTPException) as e:
+            await service.append_chunk(upload_id, 0, _chunks(DATA[:1000]))
+        assert e.value.status_code == 409
+
+        with pytest.raises(HTTPException) as e:
+            await service.append_chunk(upload_id, 1000, _chunks(DATA[1000:] + b"x"))
+        assert e.value.status_code == 413
+        assert service.get_offset(upload_id)["offset"] == 1000
+
+        # 쓰기 버퍼보다 작은 chunk로 초과해도 버퍼에 남은 바이트가 붙지 않음
+        with pytest.raises(HTTPException) as e:
+            await service.append_chunk(
+                upload_id, 1000, _chunks(DATA[1000:] + b"x", size=1024)
+            )
+        assert e.value.status_code == 413
+        assert service.get_offset(upload_id)["offset"] == 1000
+        done = await service.append_chunk(upload_id, 1000, _chunks(DATA[1000:]))
+        assert done["job_id"]
+
+        # 64자리가 아닌 hash는 세션을 만들지 않음
+        for bad in ("ab", "g" * 64, "a" * 66):
+            with pytest.raises(HTTPException) as e:
+                await _handshake(service, sha256=bad)
+            assert e.value.status_code == 400
+
+        # 선언한 hash와 다른 파일 → 세션 삭제, 다시 start
+        wrong = (await _handshake(service, sha256="0" * 64))["upload_id"]
+        with pytest.raises(HTTPException) as e:
+            await service.append_chunk(wrong, 0, _chunks(DATA))
+        assert e.value.status_code == 400
+        assert upload_sessions.get_session(wrong) is None
+        assert (await _handshake(service, sha256="0" * 64))["action"] == "start"
+
+    asyncio.run(scenario())
+
+
+def test_handshake_during_last_chunk_enqueues_once():
+    async def scenario():
+        jobs = FakeJobService()
+        service = ResumableUploadService(jobs)
+        upload_id = (await _handshake(service))["upload_id"]
+        written = asyncio.Event()
+
+        async def last_chunk_then_wait():
+            yield DATA
+            # 마지막 바이트까지 기록됨 → 완료 처리 전에 handshake가 끼어듦
+            written.set()
+            await asyncio.sleep(0.05)
+
+        async def handshake_after_write():
+            await written.wait()
+            return await _handshake(service)
+
+        done, again = await asyncio.gather(
+            service.append_chunk(upload_id, 0, last_chunk_then_wait()),
+            handshake_after_write(),
+        )
+        assert again["action"] == "ingested" and again["job_id"] == done["job_id"]
+        assert len(jobs.enqueued) == 1
+
+        # 완료 후 늦게 온 PATCH는 거절
+        with pytest.raises(HTTPException) as e:
+            await service.append_chunk(upload_id, len(DATA), _chunks(b""))
+        assert e.value.status_code == 409
+
+    asyncio.run(scenario())
+
+
+def test_upload_cache_hit_skips_upload():
+    async def scenario():
+        jobs = FakeJobService()
+        service = ResumableUploadService(jobs)
+        _, _, response_variant = jobs.upload_service.cache_variants("중", 30, None)
+        upload_cache.put_cached(
+            USER_ID, SHA256, KIND_RESPONSE, {"summary": {}}, response_variant
+        )
+
+        # /upload 로 이미 처리한 파일 → 바이트를 받지 않고 완료된 작업 반환
+        first = await _handshake(service)
+        assert first["action"] == "ingested" and first["status"] == "succeeded"
+        assert not jobs.enqueued
+        result = UploadJobService.get_result(first["job_id"])
+        assert result["cache"]["hit"] == "response"
+
+        again = await _handshake(service)
+        assert again["action"] == "ingested" and again["job_id"] == first["job_id"]
+
+    asyncio.run(scenario())
+
+
+def test_ingested_handshake_reuploads_after_collection_switch(monkeypatch):
+    async def scenario():
+        jobs = FakeJobService()
+        service = ResumableUploadService(jobs)
+        upload_id = (await _handshake(service))["upload_id"]
+        await service.append_chunk(upload_id, 0, _chunks(DATA))
+        assert (await _handshake(service))["action"] == "ingested"
+
+        # 임베딩 설정 변경 → 새 컬렉션에 저장하도록 처음부터 다시 받음
+        monkeypatch.setattr(
+            file_upload_service, "collection_name", lambda: "summaries_d256"
+        )
+        switched = await _handshake(service)
+        assert switched["action"] == "start" and switched["upload_id"] != upload_id
+
+    asyncio.run(scenario())
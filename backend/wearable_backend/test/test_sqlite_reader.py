@@ -0,0 +1,68 @@
+# test_sqlite_reader.py
+# 읽기 전용 immutable reader의 병렬 스캔 결과가 순차 스캔 / 기존 db_to_json 읽기와 같은지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_sqlite_reader.py
+import sqlite3
+
+import pytest
+
+from app.core.db_to_json import db_to_json
+from app.core.sqlite_reader import open_readonly, read_tables, run_parallel_scans
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # URI 특수 문자가 들어간 경로
+    path = tmp_path / "health connect #1?.db"
+    conn = sqlite3.connect(path)
+    for i in range(6):
+        conn.execute(f"CREATE TABLE t{i}(local_date INTEGER, value REAL, raw BLOB)")
+        conn.executemany(
+            f"INSERT INTO t{i} VALUES (?, ?, ?)",
+            [(20000 + j % 9, j * 0.5 + i, bytes([j % 256])) for j in range(500)],
+        )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_parallel_read_matches_sequential(db_path):
+    sequential = read_tables(db_path, workers=1)
+    parallel = read_tables(db_path, workers=4)
+
+    assert list(parallel) == [f"t{i}" for i in range(6)]
+    assert parallel == sequential
+    assert db_to_json(db_path, workers=4) == db_to_json(db_path, workers=1)
+
+
+def test_parallel_scans_keep_task_order_and_raise(db_path):
+    tasks = {
+        f"t{i}": (
+            lambda conn, i=i: conn.execute(
+                f"SELECT local_date, SUM(value) FROM t{i} GROUP BY local_date"
+            ).fetchall()
+        )
+        for i in reversed(range(6))
+    }
+    results = run_parallel_scans(db_path, tasks, workers=3)
+    assert list(results) == list(tasks)
+    assert results == run_parallel_scans(db_path, tasks, workers=1)
+
+    def broken(conn):
+        conn.execute("SELECT * FROM missing_table")
+
+    with pytest.raises(sqlite3.OperationalError):
+        run_parallel_scans(db_path, {"ok": tasks["t0"], "broken": broken}, workers=2)
+
+
+def test_open_readonly_rejects_writes_and_missing_file(db_path, tmp_path):
+    conn = open_readonly(db_path)
+    try:
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] > 0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t0 VALUES (1, 1, NULL)")
+    finally:
+        conn.close()
+
+    with pytest.raises(ValueError):
+        open_readonly(str(tmp_path / "missing.db"))
@@ -0,0 +1,82 @@
+# test_summary_store.py
+# summary 원본 분리 저장: Chroma metadata에 summary_json이 남지 않는지, 조회 결과는 그대로
+# raw / summary_text를 갖는지, 반환할 행만 summary_store에서 읽는지(lazy),
+# 이전 버전 metadata(summary_json) 행을 읽고 summary_store로 옮기는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_summary_store.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import json
+
+from app.core import summary_store
+from app.utils.preprocess import preprocess_health_json
+from conftest import EMBEDDER
+
+USER_ID = "store@test.com"
+
+
+def _summary(date_int: int, steps: int) -> dict:
+    raw = {"steps": steps, "heart_rate": 70, "sleep_hr": 7, "weight": 70}
+    return preprocess_health_json(raw, date_int, "samsung")
+
+
+def test_payload_moves_out_of_metadata(vs, monkeypatch):
+    summaries = [_summary(20000 + i, 1000 * i) for i in range(20)]
+    vs.save_daily_summaries_batch(summaries, USER_ID, "zip_samsung")
+
+    stored = vs.collection.get(include=["metadatas"])
+    assert len(stored["ids"]) == 20
+    assert all("summary_json" not in meta for meta in stored["metadatas"])
+
+    # 반환할 행의 document_id만 summary_store에서 조회
+    requested = []
+    original = vs.get_summaries
+    monkeypatch.setattr(
+        vs, "get_summaries", lambda ids: requested.extend(ids) or original(ids)
+    )
+
+    result = vs.search_similar_summaries({"steps": 5000}, USER_ID, top_k=3)
+    days = result["similar_days"]
+    assert len(days) == 3
+    assert sorted(requested) == sorted(day["document_id"] for day in days)
+
+    by_date = {s["created_at"][:10]: s for s in summaries}
+    for day in days:
+        assert day["raw"] == by_date[day["date"]]["raw"]
+        assert day["summary_text"] == by_date[day["date"]]["summary_text"]
+
+    recent = vs.get_recent_summaries(USER_ID, limit=5)
+    steps = [day["raw"]["steps"] for day in recent]
+    assert steps == [19000, 18000, 17000, 16000, 15000]
+
+
+def test_legacy_metadata_is_read_and_migrated(vs):
+    summary = _summary(20100, 4321)
+    date = summary["created_at"][:10]
+    doc_id = f"{USER_ID}_{date}_zip_samsung"
+    vs.collection.add(
+        ids=[doc_id],
+        embeddings=EMBEDDER.embed(["legacy"]),
+        metadatas=[
+            {
+                "user_id": USER_ID,
+                "date": date,
+                "timestamp": int(date.replace("-", "")),
+                "source": "zip_samsung",
+                "summary_json": json.dumps(summary, ensure_ascii=False),
+            }
+        ],
+    )
+
+    # 이전 전에도 metadata의 summary_json으로 조회
+    assert vs.get_all_summaries(USER_ID)[0]["raw"]["steps"] == 4321
+
+    assert vs.migrate_legacy_summaries() == 1
+    assert vs.migrate_legacy_summaries() == 0  # 컬렉션당 1회
+
+    metadata = vs.collection.get(ids=[doc_id], include=["metadatas"])["metadatas"][0]
+    assert "summary_json" not in metadata
+    assert summary_store.get_summaries([doc_id])[doc_id]["raw"]["steps"] == 4321
+    assert vs.get_all_summaries(USER_ID)[0]["raw"]["steps"] == 4321
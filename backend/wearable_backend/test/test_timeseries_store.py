@@ -0,0 +1,115 @@
+# test_timeseries_store.py
+# 시계열 저장소 저장 → 조회 결과가 vector_store 조회 형식(_parse_collection_results)과
+# 같은지, 같은 날짜는 날짜별 병합 문서 1행만 남는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_timeseries_store.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import numpy as np
+import pytest
+
+from app.core import timeseries_store
+from app.utils.preprocess import preprocess_health_json
+
+USER_ID = "ts@test.com"
+
+
+def _item(date_int: int, source: str, updated_at: str, steps: int) -> dict:
+    raw = {"steps": steps, "heart_rate": 71.5, "sleep_hr": 7, "weight": 70}
+    summary = preprocess_health_json(raw, date_int, "samsung")
+    date = summary["created_at"][:10]
+    return {
+        "document_id": f"{USER_ID}_{date}",
+        "user_id": USER_ID,
+        "date": date,
+        "timestamp": int(date.replace("-", "")),
+        "health_score": 75,
+        "recommended_intensity": "중",
+        "source": source,
+        "platform": "samsung",
+        "updated_at": updated_at,
+        "raw": summary["raw"],
+        "summary_text": summary["summary_text"],
+    }
+
+
+@pytest.fixture(autouse=True)
+def timeseries_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries_store, "TIMESERIES_DIR", str(tmp_path))
+
+
+def test_roundtrip_matches_items():
+    items = [
+        _item(20000 + i, "zip_samsung", "20250101120000", 1000 + i) for i in range(40)
+    ]
+    timeseries_store.upsert_timeseries(USER_ID, items)
+
+    got = timeseries_store.query_timeseries(USER_ID)
+
+    assert got == list(reversed(items))
+    assert isinstance(got[0]["raw"]["steps"], int)
+
+
+def test_range_and_same_date_replaced():
+    items = [
+        _item(20000 + i, "zip_samsung", "20250101120000", 1000) for i in range(10)
+    ]
+    newer = _item(20005, "api_samsung", "20250102120000", 9999)
+    timeseries_store.upsert_timeseries(USER_ID, items)
+    timeseries_store.upsert_timeseries(USER_ID, [newer])
+
+    start, end = items[3]["timestamp"], items[6]["timestamp"]
+    got = timeseries_store.query_timeseries(USER_ID, start, end)
+
+    expected = [items[i]["timestamp"] for i in (6, 5, 4, 3)]
+    assert [x["timestamp"] for x in got] == expected
+    assert got[1] == newer
+
+    # 날짜별 병합 문서 기준: 같은 날짜는 기준 출처가 달라도 덮어쓰기
+    all_rows = timeseries_store.query_timeseries(USER_ID, latest_per_date=False)
+    assert len(all_rows) == 10
+
+
+def test_upsert_replaces_same_date():
+    timeseries_store.upsert_timeseries(
+        USER_ID, [_item(20000, "zip_samsung", "20250101120000", 1)]
+    )
+    timeseries_store.upsert_timeseries(
+        USER_ID, [_item(20000, "zip_samsung", "20250102120000", 2)]
+    )
+
+    got = timeseries_store.query_timeseries(USER_ID, latest_per_date=False)
+
+    assert len(got) == 1
+    assert got[0]["raw"]["steps"] == 2
+
+
+def test_missing_store_and_delete():
+    assert timeseries_store.query_timeseries(USER_ID) is None
+
+    timeseries_store.upsert_timeseries(
+        USER_ID, [_item(20000, "zip_samsung", "20250101120000", 1)]
+    )
+    assert timeseries_store.delete_timeseries(source="zip_samsung") == 1
+    assert timeseries_store.query_timeseries(USER_ID) is None
+
+
+def test_store_with_old_layout_is_treated_as_missing():
+    timeseries_store.upsert_timeseries(
+        USER_ID, [_item(20000, "zip_samsung", "20250101120000", 1)]
+    )
+    rows_path = os.path.join(timeseries_store._user_dir(USER_ID), "rows.npy")
+
+    # RAW_FIELDS가 더 적던 이전 버전 store (metrics 컬럼 수가 다름)
+    old_dtype = [
+        (name, "<f8", (len(timeseries_store.RAW_FIELDS) - 1,))
+        if name in ("metrics", "kinds")
+        else (name, timeseries_store.ROW_DTYPE[name])
+        for name in timeseries_store.ROW_DTYPE.names
+    ]
+    np.save(rows_path, np.zeros(1, dtype=old_dtype))
+
+    assert not timeseries_store.timeseries_exists(USER_ID)
+    assert timeseries_store.query_timeseries(USER_ID) is None
@@ -0,0 +1,136 @@
+# test_upload_cache.py
+# 업로드 결과 캐시: kind / variant / 사용자별 항목 분리, 전체 크기 제한을 넘으면 마지막 접근이 오래된
+# 항목부터 삭제(LRU), 본문 파일이 사라지면 miss, inspect_data 삭제 명령의 무효화 조건,
+# 파서 스키마 버전이 바뀌면 이전 raw / 응답을 쓰지 않는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_upload_cache.py
+import os
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import upload_cache
+from app.core.upload_cache import KIND_RAW, KIND_RESPONSE
+
+USER_ID = "cache@test.com"
+SHA = "a" * 64
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "upload_cache"
+    monkeypatch.setattr(upload_cache, "UPLOAD_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(upload_cache, "_INDEX_DB", str(cache_dir / "index.sqlite3"))
+
+    # last_access 순서가 같은 초에 겹치지 않도록 호출마다 1초씩 증가하는 시계
+    ticks = iter(range(1, 10_000))
+    monkeypatch.setattr(upload_cache, "time", SimpleNamespace(time=lambda: next(ticks)))
+    return cache_dir
+
+
+def _value(tag: str) -> dict:
+    # 본문 크기 약 100바이트
+    return {"tag": tag, "pad": "x" * 80}
+
+
+def test_variants_and_kinds_are_separate():
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("raw"), "sql|540")
+    upload_cache.put_cached(USER_ID, SHA, KIND_RESPONSE, _value("resp"), "중|30|540")
+
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, "sql|540")["tag"] == "raw"
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, "sql|0") is None
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RESPONSE, "sql|540") is None
+    assert upload_cache.get_cached("other@test.com", SHA, KIND_RAW, "sql|540") is None
+    assert upload_cache.get_cached(USER_ID, "b" * 64, KIND_RAW, "sql|540") is None
+
+    # 같은 key 재저장 → 교체
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("raw2"), "sql|540")
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, "sql|540")["tag"] == "raw2"
+    assert upload_cache.cache_stats()["entries"] == 2
+
+
+def test_lru_eviction_by_total_bytes(monkeypatch):
+    size = len(json.dumps(_value("a")).encode("utf-8"))
+    monkeypatch.setattr(upload_cache, "UPLOAD_CACHE_MAX_BYTES", size * 3)
+
+    for tag in ("a", "b", "c"):
+        upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value(tag), tag)
+    # a를 읽으면 가장 오래 안 쓴 항목은 b
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, "a")
+
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("d"), "d")
+    alive = [
+        tag
+        for tag in ("a", "b", "c", "d")
+        if upload_cache.get_cached(USER_ID, SHA, KIND_RAW, tag)
+    ]
+    assert alive == ["a", "c", "d"]
+    assert upload_cache.cache_stats()["bytes"] <= size * 3
+
+    # 본문 파일도 함께 삭제 (인덱스 DB + 남은 3개)
+    files = os.listdir(upload_cache.UPLOAD_CACHE_DIR)
+    assert len([name for name in files if name.endswith(".json")]) == 3
+
+    # 제한보다 큰 항목은 저장하지 않음
+    big = {"pad": "x" * size * 4}
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, big, "big")
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, "big") is None
+    assert upload_cache.cache_stats()["entries"] == 3
+
+
+def test_missing_body_is_a_miss(cache_dir):
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("a"))
+    for name in os.listdir(cache_dir):
+        if name.endswith(".json"):
+            os.remove(cache_dir / name)
+
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW) is None
+    assert upload_cache.cache_stats()["entries"] == 0
+
+
+def test_invalidate_like_inspect_delete_commands():
+    other = "other@test.com"
+    third = "third@test.com"
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("1"), "", "zip_samsung")
+    upload_cache.put_cached(USER_ID, SHA, KIND_RESPONSE, _value("2"), "", "zip_apple")
+    upload_cache.put_cached(other, SHA, KIND_RAW, _value("3"), "", "zip_samsung")
+    upload_cache.put_cached(third, SHA, KIND_RAW, _value("4"), "", "zip_apple")
+
+    assert upload_cache.invalidate_upload_cache() == 0
+
+    # 사용자 + 출처 삭제: 그 사용자의 모든 항목 (응답은 다른 출처와 병합된 결과)
+    assert (
+        upload_cache.invalidate_upload_cache(user_id=USER_ID, source="zip_samsung")
+        == 2
+    )
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RESPONSE) is None
+    assert upload_cache.get_cached(other, SHA, KIND_RAW)
+
+    # 출처 전체 삭제: 그 출처를 캐시한 사용자의 항목만
+    assert upload_cache.invalidate_upload_cache(source="zip_samsung") == 1
+    assert upload_cache.get_cached(other, SHA, KIND_RAW) is None
+    assert upload_cache.get_cached(third, SHA, KIND_RAW)
+
+
+def test_parser_schema_version_separates_raw(monkeypatch):
+    from app.service import file_upload_service
+
+    service = file_upload_service.FileUploadService
+    old_raw, _, old_response = service.cache_variants("중", 30, 540)
+    upload_cache.put_cached(USER_ID, SHA, KIND_RAW, _value("old"), old_raw)
+
+    # 파서 출력이 바뀌면(버전 올림) 이전 raw / 응답은 재사용하지 않음
+    version = file_upload_service.RAW_SCHEMA_VERSION
+    monkeypatch.setattr(file_upload_service, "RAW_SCHEMA_VERSION", version + 1)
+    new_raw, _, new_response = service.cache_variants("중", 30, 540)
+    assert new_raw != old_raw and new_response != old_response
+    assert upload_cache.get_cached(USER_ID, SHA, KIND_RAW, new_raw) is None
+
+    # 응답 variant는 분석 옵션 / 저장 대상 컬렉션(임베딩 설정)도 구분
+    assert service.cache_variants("상", 30, 540)[2] != new_response
+    monkeypatch.setattr(
+        file_upload_service, "collection_name", lambda: "summaries_d256"
+    )
+    switched_raw, _, switched_response = service.cache_variants("중", 30, 540)
+    assert switched_raw == new_raw and switched_response != new_response
@@ -0,0 +1,163 @@
+# test_upload_job_service.py
+# 비동기 업로드 작업: submit → 상태 / 결과 조회, 조건부 claim으로 한 워커만 실행,
+# 재시작 시 lease가 만료된 running 작업만 재등록하고 최대 실행 횟수를 넘으면 failed 처리
+# (파이프라인은 단계 콜백만 호출하는 고정 결과로 대체)
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_upload_job_service.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.core import job_store
+from app.service import file_upload_service, upload_job_service
+from app.service.file_upload_service import PIPELINE_STAGES
+from app.service.upload_job_service import UploadJobService
+
+USER_ID = "job@test.com"
+
+
+@pytest.fixture(autouse=True)
+def local_state(tmp_path, monkeypatch):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "extracted").mkdir()
+    monkeypatch.setattr(file_upload_service, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(file_upload_service, "EXTRACTED_DIR", tmp_path / "extracted")
+    monkeypatch.setattr(job_store, "UPLOAD_JOB_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(upload_job_service, "UPLOAD_JOB_MAX_ATTEMPTS", 2)
+
+
+def _service(gate: asyncio.Event | None = None) -> UploadJobService:
+    """run_pipeline을 단계 콜백만 호출하는 고정 결과로 대체한 작업 서비스"""
+    service = UploadJobService()
+    service.runs = []
+
+    async def run_pipeline(upload, user_id, difficulty, duration, on_stage=None):
+        service.runs.append(upload["filename"])
+        for stage in PIPELINE_STAGES[1:]:
+            await on_stage(stage, "running")
+            if gate is not None:
+                await gate.wait()
+            await on_stage(stage, "done")
+        if upload["filename"] == "broken.zip":
+            raise HTTPException(400, "지원하지 않는 파일")
+        return {"summary": {"days": 3}, "user_id": user_id}
+
+    service.upload_service.run_pipeline = run_pipeline
+    return service
+
+
+def _create_job(filename: str) -> str:
+    return job_store.create_job(
+        USER_ID,
+        filename,
+        PIPELINE_STAGES,
+        {"upload": {"filename": filename}, "difficulty": "중", "duration": 30},
+        done_stages={"save": 0.1},
+    )
+
+
+def test_submit_status_and_result():
+    async def scenario():
+        gate = asyncio.Event()
+        service = _service(gate)
+        file = UploadFile(file=io.BytesIO(b"zip-bytes"), filename="healthconnect.zip")
+
+        links = await service.submit(file, USER_ID, "중", 30)
+        assert links["status"] == "queued"
+        assert links["result_url"] == f"/api/file/jobs/{links['job_id']}/result"
+
+        # 실행 중 → 결과 조회는 409
+        while not service.runs:
+            await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as e:
+            service.get_result(links["job_id"])
+        assert e.value.status_code == 409
+
+        gate.set()
+        await service.queue.join()
+        await service.stop()
+
+        status = service.get_status(links["job_id"])
+        assert status["status"] == "succeeded" and status["progress"] == 1.0
+        assert status["attempts"] == 1
+        assert "_started" not in status["stages"]["extract"]
+        assert service.get_result(links["job_id"])["summary"] == {"days": 3}
+
+        with pytest.raises(HTTPException) as e:
+            service.get_status("missing")
+        assert e.value.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_result():
+    async def scenario():
+        service = _service()
+        job_id = _create_job("broken.zip")
+        await service.start()
+        await service.queue.join()
+        await service.stop()
+
+        status = service.get_status(job_id)
+        assert status["status"] == "failed" and status["error"] == "지원하지 않는 파일"
+        with pytest.raises(HTTPException) as e:
+            service.get_result(job_id)
+        assert e.value.status_code == 500
+
+    asyncio.run(scenario())
+
+
+def test_claim_is_exclusive():
+    job_id = _create_job("a.zip")
+    claimed = job_store.claim_job(job_id, 300, ("save",))
+    assert claimed["status"] == "running" and claimed["attempts"] == 1
+    assert claimed["stages"]["save"]["status"] == "done"
+    assert job_store.claim_job(job_id, 300) is None
+
+    # 이미 running인 작업을 큐에서 꺼낸 워커는 실행하지 않음
+    service = _service()
+    asyncio.run(service._run_job(job_id))
+    assert service.runs == []
+
+    assert job_store.renew_lease(job_id, 300)
+    job_store.mark_succeeded(job_id, {})
+    assert not job_store.renew_lease(job_id, 300)
+
+
+def test_restart_recovers_only_stale_jobs():
+    queued = _create_job("queued.zip")
+    stale = _create_job("stale.zip")
+    alive = _create_job("alive.zip")
+    exhausted = _create_job("exhausted.zip")
+
+    # 워커가 죽은 작업 (lease 만료) / 다른 워커가 실행 중인 작업 (lease 유효)
+    job_store.claim_job(stale, -1)
+    job_store.claim_job(alive, 300)
+    # 최대 실행 횟수(2)를 모두 쓴 작업
+    job_store.claim_job(exhausted, -1)
+    job_store.recover_stale_jobs(max_attempts=10)
+    job_store.claim_job(exhausted, -1)
+
+    async def scenario():
+        service = _service()
+        await service.start()
+        await service.queue.join()
+        await service.stop()
+        return service
+
+    service = asyncio.run(scenario())
+    assert sorted(service.runs) == ["queued.zip", "stale.zip"]
+
+    assert job_store.get_job(queued)["status"] == "succeeded"
+    assert job_store.get_job(stale)["status"] == "succeeded"
+    assert job_store.get_job(stale)["attempts"] == 2
+    assert job_store.get_job(alive)["status"] == "running"
+
+    failed = job_store.get_job(exhausted)
+    assert failed["status"] == "failed" and "최대 실행 횟수" in failed["error"]
@@ -0,0 +1,137 @@
+# test_vector_index.py
+# 사용자별 정확 벡터 인덱스: top_k가 numpy 전체 계산 결과와 같은지, 같은 날짜는 updated_at 최신 행만
+# 후보인지, 같은 document_id 재저장 시 교체되는지, int8 저장 시 순위가 유지되는지,
+# search_similar_summaries가 인덱스로 검색하는지 확인
+#
+# 실행: cd backend/wearable_backend && python -m pytest test/test_vector_index.py
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import numpy as np
+
+from app.core.vector_index import UserVectorIndex
+from app.utils.preprocess import preprocess_health_json
+
+USER_ID = "vector@test.com"
+
+
+def _doc(day: int, source: str = "zip_samsung", updated_at: str = "20250101000000"):
+    date = f"2025-{1 + day // 28:02d}-{1 + day % 28:02d}"
+    return {
+        "document_id": f"{USER_ID}_{date}_{source}",
+        "user_id": USER_ID,
+        "date": date,
+        "timestamp": int(date.replace("-", "")),
+        "source": source,
+        "platform": "samsung",
+        "updated_at": updated_at,
+    }
+
+
+def test_search_matches_brute_force_reference(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 32))
+    docs = [_doc(day) for day in range(300)]
+
+    index = UserVectorIndex(str(tmp_path))
+    index.upsert(USER_ID, docs, vectors)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    for _ in range(5):
+        query = rng.normal(size=32)
+        expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:7]
+
+        hits = index.search(USER_ID, query, top_k=7)
+        assert [doc["document_id"] for doc, _ in hits] == [
+            docs[i]["document_id"] for i in expected
+        ]
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    assert index.search("other@test.com", vectors[0], top_k=3) is None
+    assert index.search(USER_ID, np.ones(16), top_k=3) is None  # 차원 불일치
+
+
+def test_latest_row_per_date_and_upsert_replaces(tmp_path):
+    index = UserVectorIndex(str(tmp_path))
+    same = np.ones((1, 4))
+    index.upsert(USER_ID, [_doc(1, "zip_samsung", "20250101000000")], same)
+    index.upsert(USER_ID, [_doc(1, "api_samsung", "20250102000000")], same)
+    index.upsert(USER_ID, [_doc(2)], -same)
+
+    hits = index.search(USER_ID, np.ones(4), top_k=5)
+    assert [doc["source"] for doc, _ in hits] == ["api_samsung", "zip_samsung"]
+    assert [doc["date"] for doc, _ in hits] == ["2025-01-02", "2025-01-03"]
+
+    # 같은 문서 재저장 → 행 교체 (새 updated_at이 최신이 됨)
+    index.upsert(USER_ID, [_doc(1, "zip_samsung", "20250103000000")], same)
+    hits = index.search(USER_ID, np.ones(4), top_k=1)
+    assert hits[0][0]["source"] == "zip_samsung"
+    assert len(os.listdir(index._user_dir(USER_ID))) == 2  # 벡터 파일 1개 + docs.json
+
+    assert index.delete(USER_ID) == 1
+    assert not index.exists(USER_ID)
+
+
+def test_int8_index_keeps_ranking(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(200, 64))
+    docs = [_doc(day) for day in range(200)]
+
+    exact = UserVectorIndex(str(tmp_path / "f32"))
+    quantized = UserVectorIndex(str(tmp_path / "i8"), quantization="int8")
+    exact.upsert(USER_ID, docs[:150], vectors[:150])
+    quantized.upsert(USER_ID, docs[:150], vectors[:150])
+    # 기존 int8 행 + 새 행 병합 후에도 같은 결과
+    exact.upsert(USER_ID, docs[150:], vectors[150:])
+    quantized.upsert(USER_ID, docs[150:], vectors[150:])
+
+    overlap = []
+    for query in rng.normal(size=(20, 64)):
+        expected = {doc["document_id"] for doc, _ in exact.search(USER_ID, query, 10)}
+        hits = quantized.search(USER_ID, query, 10)
+        overlap.append(len(expected & {doc["document_id"] for doc, _ in hits}))
+    assert sum(overlap) / (20 * 10) >= 0.95
+
+    # int8 파일 크기 약 1/4 (벡터 + scale)
+    user_dir = quantized._user_dir(USER_ID)
+    sizes = {
+        name.split(".")[0]: os.path.getsize(os.path.join(user_dir, name))
+        for name in os.listdir(user_dir)
+    }
+    assert set(sizes) == {"vectors", "scales", "docs"}
+    f32_dir = exact._user_dir(USER_ID)
+    f32_size = max(
+        os.path.getsize(os.path.join(f32_dir, name))
+        for name in os.listdir(f32_dir)
+        if name.startswith("vectors.")
+    )
+    assert sizes["vectors"] + sizes["scales"] < f32_size / 3
+
+
+def test_search_similar_summaries_uses_exact_index(vs, monkeypatch):
+    def summary(date_int, steps):
+        raw = {"steps": steps, "heart_rate": 60 + date_int % 30, "sleep_hr": 7}
+        return preprocess_health_json(raw, date_int, "samsung")
+
+    vs.save_daily_summaries_batch(
+        [summary(20000 + i, 500 * i) for i in range(20)], USER_ID, "zip_samsung"
+    )
+    app_summary = summary(20010, 99999)
+    vs.save_daily_summary(app_summary, USER_ID, "api_samsung")
+
+    query = {"steps": 5000, "heart_rate": 70}
+    exact = vs.search_similar_summaries(query, USER_ID, top_k=5)
+    monkeypatch.setattr(vs, "VECTOR_INDEX_ENABLED", False)
+    chroma = vs.search_similar_summaries(query, USER_ID, top_k=5)
+
+    assert len(exact["similar_days"]) == 5
+    # 인덱스 검색도 Chroma 검색과 같은 형식 (raw 포함, 최신 날짜순, 날짜 중복 없음)
+    assert set(exact["similar_days"][0]) == set(chroma["similar_days"][0])
+    dates = [item["date"] for item in exact["similar_days"]]
+    assert dates == sorted(set(dates), reverse=True)
+    for item in exact["similar_days"]:
+        if item["date"] == app_summary["created_at"][:10]:
+            assert item["source"] == "api_samsung"
+            assert item["raw"]["steps"] == 99999